@@ -180,6 +180,26 @@ def parseAndRun(args):
     parser.add_option("--skipLoading", action="store", dest="skipLoading",
                       help=_("Skip loading discovered or schemaLocated files matching pattern (unix-style file name patterns separated by '|'), useful when not all linkbases are needed."))
     parser.add_option("--skiploading", action="store", dest="skipLoading", help=SUPPRESS_HELP)
+    parser.add_option("--discoveryThreads", type="int", action="store", dest="discoveryThreads",
+                      help=_("Number of threads to retrieve (from the web or web cache) and parse discovered files ahead of their discovery, "
+                             "which otherwise proceeds one file at a time.  Discovery order and the loaded DTS are the same as without threads."))
+    parser.add_option("--discoverythreads", type="int", action="store", dest="discoveryThreads", help=SUPPRESS_HELP)
+    parser.add_option("--prefetchThreads", type="int", action="store", dest="prefetchThreads",
+                      help=_("Number of parallel retrievals of the web files referenced by each parsed file into the web cache, "
+                             "before discovery loads them one at a time (when not using --discoveryThreads)."))
+    parser.add_option("--prefetchthreads", type="int", action="store", dest="prefetchThreads", help=SUPPRESS_HELP)
+    parser.add_option("--loadFactTable", action="store_true", dest="loadFactTable",
+                      help=_("Keep the facts of streamed instances (streamingExtensions plug-in) in a columnar fact table, "
+                             "instead of their fact elements, reducing the memory of large instances."))
+    parser.add_option("--loadfacttable", action="store_true", dest="loadFactTable", help=SUPPRESS_HELP)
+    parser.add_option("--internValues", action="store_true", dest="internValues",
+                      help=_("Intern (deduplicate) the QName, date, decimal and short string values of contexts, units and facts, "
+                             "reducing the memory of instances which repeat the same values, and report memory saved."))
+    parser.add_option("--internvalues", action="store_true", dest="internValues", help=SUPPRESS_HELP)
+    parser.add_option("--lazyLinkbases", action="store_true", dest="lazyLinkbases",
+                      help=_("Leave the label and reference resources of DTS linkbases unloaded until they are accessed, "
+                             "reducing the memory and load time of taxonomies whose labels or references are not all used."))
+    parser.add_option("--lazylinkbases", action="store_true", dest="lazyLinkbases", help=SUPPRESS_HELP)
     parser.add_option("--logFile", action="store", dest="logFile",
                       help=_("Write log messages into file, otherwise they go to standard output.  " 
                              "If file ends in .xml it is xml-formatted, otherwise it is text. "))
@@ -270,6 +290,39 @@ def parseAndRun(args):
     parser.add_option("--formularunids", action="store", dest="formulaRunIDs", help=SUPPRESS_HELP)
     parser.add_option("--formulaCompileOnly", action="store_true", dest="formulaCompileOnly", help=_("Specify formula are to be compiled but not executed."))
     parser.add_option("--formulacompileonly", action="store_true", dest="formulaCompileOnly", help=SUPPRESS_HELP)
+    parser.add_option("--formulaInterpretXPath", action="store_true", dest="formulaInterpretXPath", 
+                      help=_("Specify formula XPath expressions are interpreted instead of compiled (such as for comparing results)."))
+    parser.add_option("--formulainterpretxpath", action="store_true", dest="formulaInterpretXPath", help=SUPPRESS_HELP)
+    parser.add_option("--formulaXPathParser", action="store", dest="formulaXPathParser", choices=("pyparsing", "descent", "compare"),
+                      help=_("Specify the formula XPath expression parser, pyparsing (default), descent (recursive descent parser), "
+                             "or compare (parse with both, log their differences and use the pyparsing results)."))
+    parser.add_option("--formulaxpathparser", action="store", dest="formulaXPathParser", choices=("pyparsing", "descent", "compare"), help=SUPPRESS_HELP)
+    parser.add_option("--formulaProcesses", type="int", action="store", dest="formulaProcesses",
+                      help=_("Number of processes to evaluate value and existence assertions, which don't depend on other formulas, in parallel.  "
+                             "Assertion results and messages are the same, in the same order, as when evaluated by one process.  "
+                             "Requires forking processes (not available on Windows)."))
+    parser.add_option("--formulaprocesses", type="int", action="store", dest="formulaProcesses", help=SUPPRESS_HELP)
+    parser.add_option("--formulaParseCache", action="store_true", dest="formulaParseCache", 
+                      help=_("Specify parsed formula XPath expressions are cached (in the user application directory) "
+                             "and reused by later runs, until their linkbases change."))
+    parser.add_option("--formulaparsecache", action="store_true", dest="formulaParseCache", help=SUPPRESS_HELP)
+    parser.add_option("--formulaFunctionMemoSize", type="int", action="store", dest="formulaFunctionMemoSize",
+                      help=_("Maximum number of results of built-in XPath functions (such as xfi context, period and equality functions) "
+                             "memoized by formula evaluation, default 16384, 0 to not memoize function results."))
+    parser.add_option("--formulafunctionmemosize", type="int", action="store", dest="formulaFunctionMemoSize", help=SUPPRESS_HELP)
+    parser.add_option("--formulaFunctionMemoStatistics", action="store_true", dest="formulaFunctionMemoStatistics",
+                      help=_("Specify logging the hit rates of memoized XPath function results, by function."))
+    parser.add_option("--formulafunctionmemostatistics", action="store_true", dest="formulaFunctionMemoStatistics", help=SUPPRESS_HELP)
+    parser.add_option("--formulaProfile", action="store", dest="formulaProfile",
+                      help=_("File(s) to save a profile of formula evaluation in, with call counts, facts in and out, "
+                             "evaluations, skipped duplicate evaluations and times by variable set, variable and filter.  "
+                             "A .json file is saved as JSON, a .csv file as CSV and other files as folded stacks (for flame graphs).  "
+                             "Separate multiple files by a '|' character."))
+    parser.add_option("--formulaprofile", action="store", dest="formulaProfile", help=SUPPRESS_HELP)
+    parser.add_option("--formulaTrackFactDependencies", action="store_true", dest="formulaTrackFactDependencies",
+                      help=_("Specify recording the facts bound by the fact variables of each assertion, so that after facts "
+                             "are changed (such as by GUI edits) only the assertions they may affect are re-validated."))
+    parser.add_option("--formulatrackfactdependencies", action="store_true", dest="formulaTrackFactDependencies", help=SUPPRESS_HELP)
     parser.add_option("--uiLang", action="store", dest="uiLang",
                       help=_("Language for user interface (override system settings, such as program messages).  Does not save setting."))
     parser.add_option("--uilang", action="store", dest="uiLang", help=SUPPRESS_HELP)
@@ -291,6 +344,14 @@ def parseAndRun(args):
     parser.add_option("--internetLogDownloads", action="store_true", dest="internetLogDownloads", 
                       help=_("Log info message for downloads to web cache."))
     parser.add_option("--internetlogdownloads", action="store_true", dest="internetLogDownloads", help=SUPPRESS_HELP)
+    parser.add_option("--webCacheStore", action="store", dest="webCacheStore", 
+                      help=_("Specify a web cache store file (SQLite database of compressed, content-addressed files), "
+                             "used instead of the web cache directory, which may be shared by concurrent processes of a host "
+                             "(on a local disk, not a network file system)."))
+    parser.add_option("--webcachestore", action="store", dest="webCacheStore", help=SUPPRESS_HELP)
+    parser.add_option("--webCacheStoreMigrate", action="store_true", dest="webCacheStoreMigrate", 
+                      help=_("Migrate the files of the web cache directory into the web cache store (--webCacheStore)."))
+    parser.add_option("--webcachestoremigrate", action="store_true", dest="webCacheStoreMigrate", help=SUPPRESS_HELP)
     parser.add_option("--noCertificateCheck", action="store_true", dest="noCertificateCheck", 
                       help=_("Specify no checking of internet secure connection certificate"))
     parser.add_option("--nocertificatecheck", action="store_true", dest="noCertificateCheck", help=SUPPRESS_HELP)
@@ -328,6 +389,30 @@ def parseAndRun(args):
                           help=_("start web server on host:port[:server] for REST and web access, e.g., --webserver locahost:8080, "
                                  "or specify nondefault a server name, such as cherrypy, --webserver locahost:8080:cherrypy. "
                                  "(It is possible to specify options to be defaults for the web server, such as disclosureSystem and validations, but not including file names.) "))
+        parser.add_option("--webserverDtsPool", action="store", dest="webserverDtsPool", type="int",
+                          help=_("Retain DTSes of web-hosted (or taxonomy package mapped) entry points discovered by web server requests "
+                                 "in a pool shared by subsequent requests, up to the specified number of megabytes, "
+                                 "evicting least recently used DTSes.  Pool statistics are reported by /rest/dtsPool. "))
+        parser.add_option("--webserverdtspool", action="store", dest="webserverDtsPool", type="int", help=SUPPRESS_HELP)
+        parser.add_option("--webserverWorkers", action="store", dest="webserverWorkers", type="int",
+                          help=_("Run web server requests in the specified number of worker processes, each with "
+                                 "the web server's plugins and packages loaded, so that requests are processed concurrently "
+                                 "(requests wait for an idle worker).  Workers are reported by /rest/workers. "))
+        parser.add_option("--webserverworkers", action="store", dest="webserverWorkers", type="int", help=SUPPRESS_HELP)
+        parser.add_option("--webserverWorkerTimeout", action="store", dest="webserverWorkerTimeout", type="float",
+                          help=_("Seconds a worker may run a request before the worker is terminated (and replaced) "
+                                 "and the request is answered with a time limit error. "))
+        parser.add_option("--webserverworkertimeout", action="store", dest="webserverWorkerTimeout", type="float", help=SUPPRESS_HELP)
+        parser.add_option("--webserverWorkerMaxJobs", action="store", dest="webserverWorkerMaxJobs", type="int",
+                          help=_("Replace a worker by a new process after it has run the specified number of requests. "))
+        parser.add_option("--webserverworkermaxjobs", action="store", dest="webserverWorkerMaxJobs", type="int", help=SUPPRESS_HELP)
+        parser.add_option("--webserverWorkerMaxMemory", action="store", dest="webserverWorkerMaxMemory", type="int",
+                          help=_("Replace a worker by a new process after a request when its memory exceeds the specified number of megabytes. "))
+        parser.add_option("--webserverworkermaxmemory", action="store", dest="webserverWorkerMaxMemory", type="int", help=SUPPRESS_HELP)
+        parser.add_option("--webserverJobQueue", action="store", dest="webserverJobQueue", type="int",
+                          help=_("Maximum number of /rest/xbrl/jobs background jobs waiting for a worker process (default 100), "
+                                 "further job submissions are refused until queued jobs start. "))
+        parser.add_option("--webserverjobqueue", action="store", dest="webserverJobQueue", type="int", help=SUPPRESS_HELP)
     pluginOptionsIndex = len(parser.option_list)
 
     # install any dynamic plugins so their command line options can be parsed if present
@@ -433,6 +518,9 @@ def parseAndRun(args):
             cntlr.startLogging(logFileName='logToBuffer',
                                logTextMaxLength=options.logTextMaxLength,
                                logRefObjectProperties=options.logRefObjectProperties)
+            if options.webserverDtsPool and not options.webserverWorkers: # workers have their own pools
+                from arelle.DtsPool import DtsPool
+                cntlr.modelManager.dtsPool = DtsPool(cntlr.modelManager, options.webserverDtsPool)
             from arelle import CntlrWebMain
             app = CntlrWebMain.startWebserver(cntlr, options)
             if options.webserver == '::wsgi':
@@ -693,6 +781,14 @@ class CntlrCmdLine(Cntlr.Cntlr):
         if options.skipLoading: # skip loading matching files (list of unix patterns)
             self.modelManager.skipLoading = re.compile(
                 '|'.join(fnmatch.translate(f) for f in options.skipLoading.split('|')))
+        self.modelManager.discoveryThreads = options.discoveryThreads
+        self.modelManager.prefetchThreads = options.prefetchThreads
+        if options.loadFactTable:
+            self.modelManager.loadFactTable = True
+        if options.internValues:
+            self.modelManager.internValues = True
+        if options.lazyLinkbases:
+            self.modelManager.lazyLinkbases = True
             
         # disclosure system sets logging filters, override disclosure filters, if specified by command line
         if options.logLevelFilter:
@@ -728,6 +824,19 @@ class CntlrCmdLine(Cntlr.Cntlr):
             self.webCache.timeout = (options.internetTimeout or None)  # use None if zero specified to disable timeout
         if options.internetLogDownloads:
             self.webCache.logDownloads = True
+        if options.webCacheStore:
+            self.webCache.useStore(options.webCacheStore)
+            if options.webCacheStoreMigrate:
+                startedAt = time.time()
+                numFiles = self.webCache.migrateToStore()
+                self.addToLog(_("Web cache %(cacheDir)s migrated to store %(store)s, %(numberOfFiles)s files, in %(time)s secs, store status %(status)s"),
+                              messageArgs={"cacheDir": self.webCache.directoryCacheDir, "store": options.webCacheStore,
+                                           "numberOfFiles": numFiles, "time": "{:.3f}".format(time.time() - startedAt),
+                                           "status": self.webCache.store.status()},
+                              messageCode="info")
+        elif options.webCacheStoreMigrate:
+            self.addToLog(_("--webCacheStoreMigrate requires a web cache store (--webCacheStore)"),
+                          messageCode="arelle:webCacheStoreMigrate", level=logging.ERROR)
         fo = FormulaOptions()
         if options.parameters:
             parameterSeparator = (options.parameterSeparator or ',')
@@ -784,7 +893,24 @@ class CntlrCmdLine(Cntlr.Cntlr):
             fo.runIDs = options.formulaRunIDs   
         if options.formulaCompileOnly:
             fo.compileOnly = True
+        if options.formulaInterpretXPath:
+            fo.interpretXPath = True
+        if options.formulaXPathParser:
+            fo.xpathParser = options.formulaXPathParser
+        if options.formulaProcesses:
+            fo.parallelProcesses = options.formulaProcesses
+        if options.formulaFunctionMemoSize is not None:
+            fo.functionMemoSize = options.formulaFunctionMemoSize
+        if options.formulaFunctionMemoStatistics:
+            fo.traceFunctionMemoStatistics = True
+        if options.formulaProfile:
+            fo.profileFile = options.formulaProfile
+        if options.formulaTrackFactDependencies:
+            fo.trackFactDependencies = True
         self.modelManager.formulaOptions = fo
+        if options.formulaParseCache:
+            from arelle.XPathParseCache import XPathParseCache
+            self.modelManager.xpathParseCache = XPathParseCache(os.path.join(self.userAppDir, "formulaParseCache"))
         
         # run utility command line options that don't depend on entrypoint Files
         hasUtilityPlugin = False
@@ -895,6 +1021,12 @@ class CntlrCmdLine(Cntlr.Cntlr):
                                             _("loaded in %.2f secs at %s"), 
                                             (loadTime, timeNow)), 
                                             messageCode="info", file=self.entrypointFile)
+                if modelXbrl.valueInterner is not None:
+                    internStats = modelXbrl.valueInterner.statistics
+                    self.addToLog(format_string(self.modelManager.locale, 
+                                                _("interned %d values, %d duplicates not kept, saving about %d KB of %d KB memory used"), 
+                                                (internStats["interned"], internStats["duplicates"], internStats["memorySaved"], self.memoryUsed)), 
+                                                messageCode="info", file=self.entrypointFile)
                 if modelXbrl.hasTableRendering:
                     RenderingEvaluator.init(modelXbrl)
                 if options.importFiles:
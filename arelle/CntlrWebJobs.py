@@ -0,0 +1,161 @@
+'''
+Created on Oct 18, 2026
+
+Asynchronous jobs of web server (REST) requests, used by CntlrWebMain for */rest/xbrl/jobs*.
+
+A job is submitted with the options of a validation or view request and is queued (up to a maximum
+number of queued jobs) for background executor threads, which run it on the web server's worker processes
+(or on a job worker process when the web server was not started with worker processes).  Status and
+progress (status and profiled activity messages of the worker) may be polled while the job is queued
+or running, as may the log entries logged so far (streamed from the worker as they are logged), the job
+may be cancelled (terminating its worker), and the result is retained for retrieval until it expires.
+
+@author: Mark V Systems Limited
+(c) Copyright 2026 Mark V Systems Limited, All rights reserved.
+'''
+import io, queue, threading, time, uuid
+from collections import OrderedDict, deque
+from arelle.CntlrWebWorkers import WorkerCancelledError, WorkerFailedError, WorkerTimeoutError, WorkerUnavailableError
+
+DEFAULT_MAX_QUEUED_JOBS = 100
+JOB_RETENTION_SECONDS = 3600.0 # finished jobs and their results are discarded after this time
+MAX_PROGRESS_MESSAGES = 20 # most recent progress messages retained for status
+
+class JobQueueFullError(Exception):
+    def __init__(self, maxQueued):
+        self.maxQueued = maxQueued
+    def __repr__(self):
+        return _("Job queue is full ({0} jobs are waiting), please retry later").format(self.maxQueued)
+
+class Job:
+    def __init__(self, options, media, viewFile, sourceZipStream, logFormat):
+        self.id = uuid.uuid4().hex
+        self.options = options
+        self.file = getattr(options, "entrypointFile", None)
+        self.media = media
+        self.viewFile = viewFile
+        # posted zip must be read while the submitting request is active
+        self.sourceZipStream = io.BytesIO(sourceZipStream.read()) if sourceZipStream is not None else None
+        self.logFormat = logFormat
+        self.state = "queued"
+        self.submittedAt = time.time()
+        self.startedAt = self.finishedAt = None
+        self.progress = deque(maxlen=MAX_PROGRESS_MESSAGES)
+        self.log = [] # text of log entries, as logged by the running job
+        self.contentType = self.result = self.error = None
+        self.cancelRequested = False
+
+    def addProgress(self, message):
+        self.progress.append((round(time.time() - (self.startedAt or self.submittedAt), 3), message))
+
+    def addLog(self, text):
+        self.log.append(text)
+
+    @property
+    def isFinished(self):
+        return self.state in ("completed", "failed", "cancelled")
+
+    def status(self):
+        return OrderedDict((("id", self.id),
+                            ("state", self.state),
+                            ("file", self.file),
+                            ("media", self.media),
+                            ("submitted", time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.submittedAt))),
+                            ("queuedSecs", round((self.startedAt or self.finishedAt or time.time()) - self.submittedAt, 3)),
+                            ("runSecs", round((self.finishedAt or time.time()) - self.startedAt, 3) if self.startedAt else None),
+                            ("progress", [message for secs, message in self.progress]),
+                            ("logEntries", len(self.log)),
+                            ("error", self.error)))
+
+class JobQueue:
+    """
+    .. class:: JobQueue(workerPool, maxQueued)
+
+    JobQueue accepts jobs into a bounded queue and runs them on workerPool by executor threads (one per worker).
+
+    :param workerPool: Worker processes to run jobs
+    :type workerPool: CntlrWebWorkers.WorkerPool
+    :param maxQueued: Maximum number of jobs waiting to run
+    :type maxQueued: int
+    """
+    def __init__(self, workerPool, maxQueued=None):
+        self.workerPool = workerPool
+        self.maxQueued = maxQueued or DEFAULT_MAX_QUEUED_JOBS
+        self.pendingJobs = queue.Queue(self.maxQueued)
+        self.jobs = OrderedDict() # by job id, in order submitted
+        self.lock = threading.Lock()
+        for i in range(len(workerPool.workers)):
+            threading.Thread(target=self.executor, name="arelle-webserver-jobs", daemon=True).start()
+
+    def submit(self, options, media, viewFile, sourceZipStream=None, logFormat=None):
+        """Queues a job for options, returning the job (whose id is used for status, result and cancel requests).
+
+        :raises: JobQueueFullError
+        """
+        self.expire()
+        job = Job(options, media, viewFile, sourceZipStream, logFormat)
+        with self.lock:
+            try:
+                self.pendingJobs.put_nowait(job)
+            except queue.Full:
+                raise JobQueueFullError(self.maxQueued)
+            self.jobs[job.id] = job
+        return job
+
+    def executor(self):
+        while True:
+            job = self.pendingJobs.get()
+            if job.cancelRequested: # cancelled while queued
+                continue
+            job.state = "running"
+            job.startedAt = time.time()
+            try:
+                job.contentType, job.result = self.workerPool.run(
+                    job.options, job.media, job.viewFile, job.sourceZipStream, job.logFormat,
+                    progressCallback=job.addProgress, isCancelled=lambda: job.cancelRequested, logCallback=job.addLog)
+                job.state = "completed"
+            except WorkerCancelledError:
+                job.state = "cancelled"
+            except (WorkerTimeoutError, WorkerUnavailableError, WorkerFailedError) as err:
+                job.state = "failed"
+                job.error = repr(err)
+            except Exception as err:
+                job.state = "failed"
+                job.error = _("Exception running job: {0}").format(err)
+            job.finishedAt = time.time()
+            job.options = job.viewFile = job.sourceZipStream = None # dereference
+
+    def get(self, jobId):
+        return self.jobs.get(jobId)
+
+    def cancel(self, jobId):
+        """Cancels a queued or running job (a running job's worker is terminated).
+
+        :returns: Job -- job cancelled, or None if there is no such job
+        """
+        job = self.jobs.get(jobId)
+        if job is not None and not job.isFinished:
+            job.cancelRequested = True
+            if job.state == "queued":
+                job.state = "cancelled"
+                job.finishedAt = time.time()
+        return job
+
+    def remove(self, jobId):
+        with self.lock:
+            return self.jobs.pop(jobId, None)
+
+    def expire(self):
+        expireBefore = time.time() - JOB_RETENTION_SECONDS
+        with self.lock:
+            for jobId, job in list(self.jobs.items()):
+                if job.isFinished and job.finishedAt < expireBefore:
+                    del self.jobs[jobId]
+
+    def status(self):
+        with self.lock:
+            jobs = list(self.jobs.values())
+        return OrderedDict((("queued", sum(job.state == "queued" for job in jobs)),
+                            ("running", sum(job.state == "running" for job in jobs)),
+                            ("maxQueued", self.maxQueued),
+                            ("jobs", [job.status() for job in jobs])))
@@ -10,14 +10,18 @@ Use this module to start Arelle in web server mode
 from arelle.webserver.bottle import Bottle, request, response, static_file
 from arelle.Cntlr import LogFormatter
 import os, io, sys, time, threading, uuid, zipfile
-from arelle import Version
+from arelle import Version, CntlrWebWorkers, CntlrWebJobs
 from arelle.FileSource import FileNamedStringIO
 from arelle.PluginManager import pluginClassMethods
 _os_pid = os.getpid()
     
+workerPool = None
+jobQueue = None
+    
 GETorPOST = ('GET', 'POST')
 GET = 'GET'
 POST = 'POST'
+DELETE = 'DELETE'
 
 def startWebserver(_cntlr, options):
     """Called once from main program in CmtlrCmdLine to initiate web server on specified local port.
@@ -26,7 +30,7 @@ def startWebserver(_cntlr, options):
     :param options: OptionParser options from parse_args of main argv arguments (the argument *webserver* provides hostname and port), port being used to startup the webserver on localhost.
     :type options: optparse.Values
     """
-    global imagesDir, cntlr, optionsPrototype
+    global imagesDir, cntlr, optionsPrototype, workerPool
     cntlr = _cntlr
     imagesDir = cntlr.imagesDir
     optionValuesTypes = _STR_NUM_TYPES + (type(None),)
@@ -36,6 +40,11 @@ def startWebserver(_cntlr, options):
                             if isinstance(value,optionValuesTypes) and not option.startswith('_'))
     host, sep, portServer = options.webserver.partition(":")
     port, sep, server = portServer.partition(":")
+    if getattr(options, "webserverWorkers", None) and server not in ("cgi", "gae"):
+        workerPool = CntlrWebWorkers.WorkerPool(optionsPrototype, options.webserverWorkers,
+                                                timeout=options.webserverWorkerTimeout,
+                                                maxJobs=options.webserverWorkerMaxJobs,
+                                                maxMemoryMB=options.webserverWorkerMaxMemory)
     # start a Bottle application
     app = Bottle()
 
@@ -69,12 +78,21 @@ def startWebserver(_cntlr, options):
         app.route('/rest/xbrl/<file:path>/arcroleTypes', GETorPOST, validation)
         app.route('/rest/xbrl/<file:path>/formulae', GETorPOST, validation)
         app.route('/rest/xbrl/validation', GETorPOST, validation)
+        app.route('/rest/xbrl/jobs', POST, jobSubmit)
+        app.route('/rest/xbrl/jobs', GET, jobsStatus)
+        app.route('/rest/xbrl/jobs/<jobId>', GET, jobStatus)
+        app.route('/rest/xbrl/jobs/<jobId>', DELETE, jobCancel)
+        app.route('/rest/xbrl/jobs/<jobId>/cancel', GETorPOST, jobCancel)
+        app.route('/rest/xbrl/jobs/<jobId>/result', GET, jobResult)
+        app.route('/rest/xbrl/jobs/<jobId>/log', GET, jobLog)
         app.route('/rest/xbrl/view', GETorPOST, validation)
         app.route('/rest/xbrl/open', GETorPOST, validation)
         app.route('/rest/xbrl/close', GETorPOST, validation)
         app.route('/images/<imgFile>', GET, image)
         app.route('/rest/xbrl/diff', GET, diff)
         app.route('/rest/configure', GET, configure)
+        app.route('/rest/dtsPool', GET, dtsPoolStatus)
+        app.route('/rest/workers', GET, workersStatus)
         app.route('/rest/stopWebServer', GET, stopWebServer)
         app.route('/quickbooks/server.asmx', POST, quickbooksServer)
         app.route('/rest/quickbooks/<qbReport>/xbrl-gl/<file:path>', GET, quickbooksGLrequest)
@@ -101,6 +119,8 @@ def startWebserver(_cntlr, options):
             sys.exit(0)
         elif server:
             app.run(host=host, port=port or 80, server=server)
+        elif workerPool is not None: # dispatch concurrent requests to workers
+            app.run(host=host, port=port or 80, server_class=CntlrWebWorkers.ThreadingWSGIServer)
         else:
             app.run(host=host, port=port or 80)
         
@@ -214,14 +234,25 @@ def validation(file=None):
     
     :returns: html, xhtml, xml, json, text -- Return per media type argument and request arguments
     """
+    requestPathParts = request.urlparts[2].split('/')
+    isValidation = 'validation' == requestPathParts[-1] or 'validation' == requestPathParts[-2]
+    errors, options, media, viewFile, sourceZipStream = requestOptions(file, isValidation)
+    if errors:
+        return errorReport(errors, media)
+    return runOptionsAndGetResult(options, media, viewFile, sourceZipStream)
+    
+def requestOptions(file, isValidation):
+    """Sets up CntrlCmdLine options for a validation or view request from the request's get or post arguments.
+    
+    :returns: tuple -- (errors, options, media, viewFile, sourceZipStream), errors being a list of error lines if the request is not valid
+    """
     errors = []
     flavor = request.query.flavor or 'standard'
     media = request.query.media or 'html'
     requestPathParts = request.urlparts[2].split('/')
-    isValidation = 'validation' == requestPathParts[-1] or 'validation' == requestPathParts[-2]
     view = request.query.view
     viewArcrole = request.query.viewArcrole
-    if request.method == 'POST':
+    if request.method == 'POST' and (request.content_length > 0 or request.chunked): # else parameters only
         mimeType = request.get_header("Content-Type")
         if mimeType.startswith("multipart/form-data"):
             _upload = request.files.get("upload")
@@ -255,7 +286,7 @@ def validation(file=None):
         errors.append(_("View '{0}' is not supported").format(view))
     if errors:
         errors.insert(0, _("URL: ") + (file or request.query.file or '(no file)'))
-        return errorReport(errors, media)
+        return errors, None, media, None, None
     options = Options() # need named parameters to simulate options
     isFormulaOnly = False
     for key, value in request.query.items():
@@ -297,13 +328,169 @@ def validation(file=None):
         viewFile = FileNamedStringIO(media)
         setattr(options, "viewArcrole", viewArcrole)
         setattr(options, "viewFile", viewFile)
-    return runOptionsAndGetResult(options, media, viewFile, sourceZipStream)
+    return errors, options, media, viewFile, sourceZipStream
+    
+def getJobQueue():
+    """Returns the job queue, starting it (and a job worker process if the web server has no worker processes) on first use."""
+    global jobQueue
+    with jobQueueLock:
+        if jobQueue is None:
+            jobQueue = CntlrWebJobs.JobQueue(
+                workerPool or CntlrWebWorkers.WorkerPool(optionsPrototype, 1,
+                                                         timeout=optionsPrototype.get("webserverWorkerTimeout"),
+                                                         maxJobs=optionsPrototype.get("webserverWorkerMaxJobs"),
+                                                         maxMemoryMB=optionsPrototype.get("webserverWorkerMaxMemory")),
+                optionsPrototype.get("webserverJobQueue"))
+    return jobQueue
+jobQueueLock = threading.Lock()
+
+def jobSubmit():
+    """Submit a validation or view job, by *post* to */rest/xbrl/jobs*, with the arguments (and any posted zip file) of
+    */rest/xbrl/validation* or */rest/xbrl/view* (a job is a view when view or viewArcrole is specified).
+    
+    :returns: json -- Job id and status, result and cancel URLs (status 202), or error report
+    """
+    isValidation = not (request.query.view or request.query.viewArcrole)
+    errors, options, media, viewFile, sourceZipStream = requestOptions(None, isValidation)
+    if errors:
+        response.status = 400
+        return errorReport(errors, "text" if media == "text" else "html")
+    try:
+        job = getJobQueue().submit(options, media, viewFile, sourceZipStream, request.query.logFormat)
+    except CntlrWebJobs.JobQueueFullError as err:
+        response.status = 503
+        return errorReport([repr(err)], "text" if media == "text" else "html")
+    import json
+    response.status = 202
+    response.content_type = 'application/json; charset=UTF-8'
+    jobUrl = "/rest/xbrl/jobs/" + job.id
+    return json.dumps({"id": job.id, "state": job.state,
+                       "status": jobUrl, "result": jobUrl + "/result", "log": jobUrl + "/log", "cancel": jobUrl + "/cancel"}, indent=2)
+
+def jobsStatus():
+    """Report status of submitted jobs for *get* requests to */rest/xbrl/jobs*.
+    
+    :returns: html, json -- Queued and running counts and each job's status, per media argument
+    """
+    media = request.query.media or 'html'
+    if jobQueue is None:
+        status = {"queued": 0, "running": 0, "jobs": []}
+    else:
+        jobQueue.expire()
+        status = jobQueue.status()
+    if media == "json":
+        import json
+        response.content_type = 'application/json; charset=UTF-8'
+        return json.dumps(status, indent=2)
+    response.content_type = 'text/html; charset=UTF-8'
+    return htmlBody(tableRows(
+        [_("Queued: {0}, running: {1}").format(status["queued"], status["running"])] +
+        [_("{0}: {1} {2}").format(job["id"], job["state"], job["file"] or "") for job in status["jobs"]],
+        header=_("Jobs")))
+
+def jobStatus(jobId):
+    """Report status and progress of a job for *get* requests to */rest/xbrl/jobs/<jobId>*.
+    
+    :returns: html, json -- Job state, times, recent progress messages and error, per media argument
+    """
+    media = request.query.media or 'html'
+    job = jobQueue.get(jobId) if jobQueue is not None else None
+    if job is None:
+        response.status = 404
+        return errorReport([_("Job {0} not found").format(jobId)], media)
+    status = job.status()
+    if media == "json":
+        import json
+        response.content_type = 'application/json; charset=UTF-8'
+        return json.dumps(status, indent=2)
+    response.content_type = 'text/html; charset=UTF-8'
+    return htmlBody(tableRows(
+        ["{0}: {1}".format(key, value) for key, value in status.items() if key != "progress"] +
+        status["progress"],
+        header=_("Job {0}").format(jobId)))
+
+def jobResult(jobId):
+    """Result of a completed job for *get* requests to */rest/xbrl/jobs/<jobId>/result*, in the media requested when submitted.
     
+    :returns: html, xhtml, xml, json, text, zip -- Result of the job (or error report if the job is not completed)
+    """
+    media = request.query.media or 'html'
+    job = jobQueue.get(jobId) if jobQueue is not None else None
+    if job is None:
+        response.status = 404
+        return errorReport([_("Job {0} not found").format(jobId)], media)
+    if job.state != "completed":
+        response.status = 409
+        return errorReport([_("Job {0} is {1}").format(jobId, job.state)] + ([job.error] if job.error else []), media)
+    response.content_type = job.contentType
+    return job.result
+
+def jobLog(jobId):
+    """Log entries of a queued, running or finished job for *get* requests to */rest/xbrl/jobs/<jobId>/log*, as logged
+    so far, starting at entry number *start* (default 0), so that a running job's log may be followed by polling.
+    
+    :returns: text, json -- Log entries (as text lines, or json with the job state, start and entries), per media argument
+    """
+    media = request.query.media or 'text'
+    job = jobQueue.get(jobId) if jobQueue is not None else None
+    if job is None:
+        response.status = 404
+        return errorReport([_("Job {0} not found").format(jobId)], media)
+    try:
+        start = max(int(request.query.start or 0), 0)
+    except ValueError:
+        response.status = 400
+        return errorReport([_("Start {0} is not an entry number").format(request.query.start)], media)
+    state = job.state # before copying the entries, so that a completed job's entries are complete
+    entries = job.log[start:]
+    if media == "json":
+        import json
+        from collections import OrderedDict
+        response.content_type = 'application/json; charset=UTF-8'
+        return json.dumps(OrderedDict((("state", state), ("start", start), ("entries", entries))), indent=2)
+    response.content_type = 'text/plain; charset=UTF-8'
+    return '\n'.join(entries)
+
+def jobCancel(jobId):
+    """Cancel a job by *delete* to */rest/xbrl/jobs/<jobId>* (also removing the job) or *get* to */rest/xbrl/jobs/<jobId>/cancel*.
+    A running job's worker process is terminated.
+    
+    :returns: json -- Job status
+    """
+    job = jobQueue.cancel(jobId) if jobQueue is not None else None
+    if job is None:
+        response.status = 404
+        return errorReport([_("Job {0} not found").format(jobId)], request.query.media or 'html')
+    if request.method == DELETE:
+        jobQueue.remove(jobId)
+    import json
+    response.content_type = 'application/json; charset=UTF-8'
+    return json.dumps(job.status(), indent=2)
+
 def runOptionsAndGetResult(options, media, viewFile, sourceZipStream=None):
     """Execute request according to options, for result in media, with *post*ed file in sourceZipStream, if any.
+    The request is run by a worker process when the web server was started with --webserverWorkers.
     
     :returns: html, xml, csv, text -- Return per media type argument and request arguments
     """
+    if workerPool is not None:
+        try:
+            contentType, result = workerPool.run(options, media, viewFile, sourceZipStream, request.query.logFormat)
+        except CntlrWebWorkers.WorkerUnavailableError as err:
+            response.status = 503
+            return errorReport([_("URL: ") + (getattr(options, "entrypointFile", None) or '(no file)'), repr(err)], media)
+        except (CntlrWebWorkers.WorkerTimeoutError, CntlrWebWorkers.WorkerFailedError) as err:
+            return errorReport([_("URL: ") + (getattr(options, "entrypointFile", None) or '(no file)'), repr(err)], media)
+    else:
+        contentType, result = runOptions(options, media, viewFile, sourceZipStream, request.query.logFormat)
+    response.content_type = contentType
+    return result
+
+def runOptions(options, media, viewFile, sourceZipStream=None, logFormat=None):
+    """Execute request according to options with this process's controller (in the web server or in a worker process).
+    
+    :returns: (str, html, xml, csv, text) -- Content type and result per media type argument and request arguments
+    """
     addLogToZip = False
     if media == "zip" and not viewFile:
         responseZipStream = io.BytesIO()
@@ -326,17 +513,17 @@ def runOptionsAndGetResult(options, media, viewFile, sourceZipStream=None):
         responseZipStream = None
     successful = cntlr.run(options, sourceZipStream, responseZipStream)
     if media == "xml":
-        response.content_type = 'text/xml; charset=UTF-8'
+        contentType = 'text/xml; charset=UTF-8'
     elif media == "csv":
-        response.content_type = 'text/csv; charset=UTF-8'
+        contentType = 'text/csv; charset=UTF-8'
     elif media == "json":
-        response.content_type = 'application/json; charset=UTF-8'
+        contentType = 'application/json; charset=UTF-8'
     elif media == "text":
-        response.content_type = 'text/plain; charset=UTF-8'
+        contentType = 'text/plain; charset=UTF-8'
     elif media == "zip":
-        response.content_type = 'application/zip; charset=UTF-8'
+        contentType = 'application/zip; charset=UTF-8'
     else:
-        response.content_type = 'text/html; charset=UTF-8'
+        contentType = 'text/html; charset=UTF-8'
     if successful and viewFile:
         # defeat re-encoding
         result = viewFile.getvalue().replace("&nbsp;","\u00A0").replace("&shy;","\u00AD").replace("&amp;","&")
@@ -356,17 +543,16 @@ def runOptionsAndGetResult(options, media, viewFile, sourceZipStream=None):
     elif media == "json":
         result = cntlr.logHandler.getJson()
     elif media == "text":
-        _logFormat = request.query.logFormat
-        if _logFormat:
+        if logFormat:
             _stdLogFormatter = cntlr.logHandler.formatter
-            cntlr.logHandler.formatter = LogFormatter(_logFormat)
+            cntlr.logHandler.formatter = LogFormatter(logFormat)
         result = cntlr.logHandler.getText()
-        if _logFormat:
+        if logFormat:
             cntlr.logHandler.formatter = _stdLogFormatter
             del _stdLogFormatter # dereference
     else:
         result = htmlBody(tableRows(cntlr.logHandler.getLines(), header=_("Messages")))
-    return result
+    return contentType, result
 
 def diff():
     """Execute versioning diff request for *get* request to */rest/xbrl/diff*.
@@ -403,9 +589,64 @@ def configure():
     if 'environment' in request.query:
         setattr(options, "showEnvironment", True)
     cntlr.run(options)
+    if workerPool is not None: # restart workers with the saved plugins, packages and settings
+        workerPool.recycleAll()
     response.content_type = 'text/html; charset=UTF-8'
     return htmlBody(tableRows(cntlr.logHandler.getLines(), header=_("Configuration Request")))
 
+def dtsPoolStatus():
+    """Report DTS pool statistics for *get* requests to */rest/dtsPool*.
+    With worker processes, each worker has its own pool, as of its last completed request.
+    
+    :returns: html, json -- Pool hit and miss counts, memory used and pooled DTSes, per media argument
+    """
+    media = request.query.media or 'html'
+    if not optionsPrototype.get("webserverDtsPool"):
+        return errorReport([_("DTS pool is not enabled (start web server with --webserverDtsPool)")], media)
+    if workerPool is not None:
+        statuses = [dict(worker["dtsPool"], pid=worker["pid"])
+                    for worker in workerPool.status()["workers"]
+                    if worker["dtsPool"] is not None]
+    else:
+        statuses = [cntlr.modelManager.dtsPool.status()]
+    if media == "json":
+        import json
+        response.content_type = 'application/json; charset=UTF-8'
+        return json.dumps(statuses if workerPool is not None else statuses[0], indent=2)
+    response.content_type = 'text/html; charset=UTF-8'
+    return htmlBody("\n".join(tableRows(
+        [_("Hits: {0}, misses: {1}, evictions: {2}").format(status["hits"], status["misses"], status["evictions"]),
+         _("Memory: {0}K of {1}K").format(status["memoryKB"], status["maxMemoryKB"])] +
+        [_("{0}: {1} hits, {2} documents, {3}K, loaded in {4} secs, {5} attached").format(
+            ", ".join(entry["urls"]), entry["hits"], entry["documents"], entry["memoryKB"], entry["loadTime"], entry["attached"])
+         for entry in status["entries"]] +
+        [_("Not pooled (loading errors): {0}").format(", ".join(urls)) for urls in status["unpoolable"]],
+        header=_("DTS Pool of worker process {0}").format(status["pid"]) if "pid" in status else _("DTS Pool"))
+        for status in statuses))
+
+def workersStatus():
+    """Report worker processes for *get* requests to */rest/workers*.
+    
+    :returns: html, json -- Jobs, timeouts and recycled workers, and per worker jobs, memory and busy time, per media argument
+    """
+    media = request.query.media or 'html'
+    if workerPool is None:
+        return errorReport([_("Worker processes are not enabled (start web server with --webserverWorkers)")], media)
+    status = workerPool.status()
+    if media == "json":
+        import json
+        response.content_type = 'application/json; charset=UTF-8'
+        return json.dumps(status, indent=2)
+    response.content_type = 'text/html; charset=UTF-8'
+    return htmlBody(tableRows(
+        [_("Jobs: {0}, timeouts: {1}, recycled workers: {2}, idle workers: {3}").format(
+            status["jobs"], status["timeouts"], status["recycled"], status["idle"])] +
+        [_("Worker process {0}: {1} jobs, {2}K, up {3} secs{4}").format(
+            worker["pid"], worker["jobs"], worker["memoryKB"], worker["uptime"],
+            _(", busy {0} secs").format(worker["busy"]) if worker["busy"] is not None else "")
+         for worker in status["workers"]],
+        header=_("Worker Processes")))
+
 def stopWebServer():
     """Stop the web server by *get* requests to */rest/stopWebServer*.
     
@@ -735,6 +976,19 @@ Enter 'show' to view packages configuration, , or '|' separated package URLs:
 (Note that packages are transient on Google App Engine, specify with &amp;packages to other rest commands.) 
 </td></tr>
 <tr><td style="text-indent: 1em;">environment</td><td>Show host environment (config and cache directories).</td></tr>
+<tr><td>/rest/xbrl/jobs</td><td>Submit a validation or view as a background job by <em>post</em>, with the parameters (and any zip file) of 
+/rest/xbrl/validation or /rest/xbrl/view, returning (in json) the job id and its status, result, log and cancel URLs.  
+Jobs wait in a bounded queue for a worker process.  By <em>get</em> lists the jobs.</td></tr>
+<tr><td>/rest/xbrl/jobs/{id}</td><td>Show job state (queued, running, completed, failed or cancelled) and progress messages.  
+Parameter <code>media</code> may be <code>html</code> (default) or <code>json</code>.  By <em>delete</em> cancels and removes the job.</td></tr>
+<tr><td>/rest/xbrl/jobs/{id}/result</td><td>Result of a completed job, in the media requested when it was submitted.</td></tr>
+<tr><td>/rest/xbrl/jobs/{id}/log</td><td>Log entries of a job logged so far (streamed from its worker while running), from entry number <code>start</code> (default 0).  
+Parameter <code>media</code> may be <code>text</code> (default) or <code>json</code> (with the job state).</td></tr>
+<tr><td>/rest/xbrl/jobs/{id}/cancel</td><td>Cancel a queued or running job (terminating its worker process).</td></tr>
+<tr><td>/rest/dtsPool</td><td>Show DTS pool hit and miss counts, memory and pooled DTSes (when started with --webserverDtsPool).  
+Parameter <code>media</code> may be <code>html</code> (default) or <code>json</code>.</td></tr>
+<tr><td>/rest/workers</td><td>Show worker processes jobs, memory and busy time (when started with --webserverWorkers).  
+Parameter <code>media</code> may be <code>html</code> (default) or <code>json</code>.</td></tr>
 ''') +
 (_('''
 <tr><td>/rest/stopWebServer</td><td>Shut down (terminate process after 2.5 seconds delay).</td></tr>
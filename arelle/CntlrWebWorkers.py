@@ -0,0 +1,328 @@
+'''
+Created on Oct 18, 2026
+
+Pool of worker processes for web server (REST) requests, used by CntlrWebMain when the web server is
+started with --webserverWorkers.
+
+Each worker process has its own CntlrCmdLine, with the web server's plugins and packages already loaded, and
+its own log buffer.  The web server process dispatches each request's options to an idle worker (requests
+wait for an idle worker, up to the request time limit or MAX_IDLE_WAIT_SECONDS), returning the worker's result
+(view or log buffer in the requested media).  Log entries of a request may also be streamed, as the worker logs
+them, to a callback (such as for polling the log of a running job).  A worker which exceeds the request time
+limit is terminated and replaced, as is a worker whose process has exited, and workers are recycled (replaced
+by a new process) after a number of jobs or when their memory exceeds a limit.
+
+@author: Mark V Systems Limited
+(c) Copyright 2026 Mark V Systems Limited, All rights reserved.
+'''
+import io, logging, multiprocessing, os, queue, threading, time
+from socketserver import ThreadingMixIn
+from wsgiref.simple_server import WSGIServer
+
+POLL_INTERVAL = 0.5 # seconds between checks for cancellation while awaiting a worker's reply
+MAX_IDLE_WAIT_SECONDS = 600.0 # longest wait for an idle worker when there is no request time limit
+
+class ThreadingWSGIServer(ThreadingMixIn, WSGIServer):
+    """wsgiref server handling each request on a thread, so that requests may be dispatched concurrently to workers"""
+    daemon_threads = True
+
+class WorkerTimeoutError(Exception):
+    def __init__(self, timeout):
+        self.timeout = timeout
+    def __repr__(self):
+        return _("Request exceeded time limit of {0} seconds").format(self.timeout)
+
+class WorkerCancelledError(Exception):
+    def __repr__(self):
+        return _("Request was cancelled")
+
+class WorkerUnavailableError(Exception):
+    def __init__(self, timeout):
+        self.timeout = timeout
+    def __repr__(self):
+        return _("No worker became available within {0} seconds, please retry later").format(self.timeout)
+
+class WorkerFailedError(Exception):
+    def __init__(self, exitcode):
+        self.exitcode = exitcode
+    def __repr__(self):
+        return _("Worker process terminated unexpectedly (exit code {0})").format(self.exitcode)
+
+class ProgressLogHandler(logging.Handler):
+    """Forwards profileActivity log entries of a worker as progress messages"""
+    def __init__(self, sendProgress):
+        super(ProgressLogHandler, self).__init__()
+        self.sendProgress = sendProgress
+    def emit(self, logRecord):
+        if getattr(logRecord, "messageCode", None) == "info:profileActivity":
+            self.sendProgress(logRecord.getMessage().strip())
+
+class LogStreamHandler(logging.Handler):
+    """Forwards the log entries of a worker's job, formatted as by its log buffer, when the job streams its log"""
+    def __init__(self, sendLog, logHandler):
+        super(LogStreamHandler, self).__init__()
+        self.sendLog = sendLog
+        self.logHandler = logHandler
+        self.isStreaming = False
+    def emit(self, logRecord):
+        if self.isStreaming:
+            self.sendLog(self.logHandler.format(logRecord))
+
+def workerProcess(conn, optionsPrototype):
+    """Main loop of a worker process, receiving jobs on conn until it is closed or a None job is received.
+
+    Each job is a tuple (optionsDict, media, viewFileOption, sourceZipBytes, logFormat, streamLog).  While running
+    the job the worker sends ("progress", message) replies of status and profiled activity messages, and if
+    streamLog, ("log", text) replies of each log entry, followed by ("result", contentType, result, memoryUsedKB,
+    dtsPoolStatus).
+    """
+    from arelle.CntlrCmdLine import CntlrCmdLine
+    from arelle.FileSource import FileNamedStringIO
+    from arelle import CntlrWebMain
+    cntlr = CntlrCmdLine()
+    cntlr.startLogging(logFileName='logToBuffer',
+                       logTextMaxLength=optionsPrototype.get("logTextMaxLength"),
+                       logRefObjectProperties=optionsPrototype.get("logRefObjectProperties"))
+    if optionsPrototype.get("webserverDtsPool"):
+        from arelle.DtsPool import DtsPool
+        cntlr.modelManager.dtsPool = DtsPool(cntlr.modelManager, optionsPrototype["webserverDtsPool"])
+    CntlrWebMain.cntlr = cntlr
+    CntlrWebMain.optionsPrototype = optionsPrototype
+    if optionsPrototype.get("plugins") or optionsPrototype.get("packages"):
+        cntlr.run(CntlrWebMain.Options()) # preload plugins and packages before the first job
+    cntlr.logHandler.clearLogBuffer()
+    sendLock = threading.Lock() # status may be shown by other threads of the job (such as discovery read ahead)
+    def sendProgress(message):
+        with sendLock:
+            conn.send(("progress", message))
+    def showStatusOnConn(message, clearAfter=None):
+        if message:
+            sendProgress(message)
+    cntlr.showStatus = showStatusOnConn
+    cntlr.logger.addHandler(ProgressLogHandler(sendProgress))
+    def sendLog(text):
+        with sendLock:
+            conn.send(("log", text))
+    logStreamHandler = LogStreamHandler(sendLog, cntlr.logHandler)
+    cntlr.logger.addHandler(logStreamHandler)
+    while True:
+        try:
+            job = conn.recv()
+        except (EOFError, OSError): # web server process has gone away
+            break
+        if job is None:
+            break
+        optionsDict, media, viewFileOption, sourceZipBytes, logFormat, logStreamHandler.isStreaming = job
+        options = CntlrWebMain.Options()
+        options.__dict__.update(optionsDict)
+        if viewFileOption:
+            viewFile = FileNamedStringIO(media)
+            setattr(options, viewFileOption, viewFile)
+        else:
+            viewFile = None
+        sourceZipStream = io.BytesIO(sourceZipBytes) if sourceZipBytes is not None else None
+        try:
+            contentType, result = CntlrWebMain.runOptions(options, media, viewFile, sourceZipStream, logFormat)
+        finally:
+            logStreamHandler.isStreaming = False
+        dtsPool = cntlr.modelManager.dtsPool
+        with sendLock:
+            conn.send(("result", contentType, result, cntlr.memoryUsed, dtsPool.status() if dtsPool is not None else None))
+    conn.close()
+
+class Worker:
+    def __init__(self, pool):
+        self.pool = pool
+        self.conn, childConn = pool.mpContext.Pipe()
+        self.process = pool.mpContext.Process(target=workerProcess, args=(childConn, pool.optionsPrototype),
+                                              name="arelle-webserver-worker", daemon=True)
+        self.process.start()
+        childConn.close()
+        self.jobs = 0
+        self.memoryKB = 0
+        self.dtsPoolStatus = None
+        self.startedAt = time.time()
+        self.busySince = None
+        self.recycle = False
+
+    def stop(self, terminate=False):
+        if not terminate:
+            try:
+                self.conn.send(None)
+            except (OSError, ValueError):
+                terminate = True
+            else:
+                self.process.join(5.0)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join(5.0)
+        self.conn.close()
+
+class WorkerPool:
+    """
+    .. class:: WorkerPool(optionsPrototype, workers, timeout, maxJobs, maxMemoryMB)
+
+    WorkerPool starts and dispatches requests to worker processes.
+
+    :param optionsPrototype: Web server's default option values, used by workers for each request's options
+    :type optionsPrototype: dict
+    :param workers: Number of worker processes
+    :type workers: int
+    :param timeout: Seconds a request may run before its worker is terminated, or None for no limit
+    :type timeout: float
+    :param maxJobs: Jobs after which a worker is replaced by a new process, or None for no limit
+    :type maxJobs: int
+    :param maxMemoryMB: Worker memory (high water mark) above which a worker is replaced, or None for no limit
+    :type maxMemoryMB: int
+    """
+    def __init__(self, optionsPrototype, workers, timeout=None, maxJobs=None, maxMemoryMB=None):
+        # spawn (instead of fork) so that workers do not inherit the web server's threads and locks
+        self.mpContext = multiprocessing.get_context("spawn")
+        self.optionsPrototype = optionsPrototype
+        self.timeout = timeout or None
+        self.maxJobs = maxJobs or None
+        self.maxMemoryKB = maxMemoryMB * 1024 if maxMemoryMB else None
+        self.idleWorkers = queue.Queue()
+        self.workers = []
+        self.lock = threading.Lock()
+        self.jobs = self.timeouts = self.recycled = 0
+        for i in range(workers):
+            self.startWorker()
+
+    def startWorker(self):
+        worker = Worker(self)
+        with self.lock:
+            self.workers.append(worker)
+        self.idleWorkers.put(worker)
+
+    def replaceWorker(self, worker, terminate=False):
+        with self.lock:
+            if worker in self.workers:
+                self.workers.remove(worker)
+        worker.stop(terminate)
+        self.startWorker()
+
+    def idleWorker(self, isCancelled=None):
+        # waits for an idle worker whose process is alive, replacing any whose process has exited
+        waitTimeout = self.timeout or MAX_IDLE_WAIT_SECONDS
+        waitingSince = time.time()
+        while True:
+            if isCancelled is not None and isCancelled():
+                raise WorkerCancelledError()
+            remaining = waitTimeout - (time.time() - waitingSince)
+            if remaining <= 0:
+                raise WorkerUnavailableError(waitTimeout)
+            try:
+                worker = self.idleWorkers.get(timeout=min(remaining, POLL_INTERVAL))
+            except queue.Empty:
+                continue
+            if worker.process.is_alive():
+                return worker
+            self.replaceWorker(worker, terminate=True)
+
+    def run(self, options, media, viewFile, sourceZipStream=None, logFormat=None, progressCallback=None, isCancelled=None,
+            logCallback=None):
+        """Runs a request on an idle worker (waiting for one if all are busy).
+
+        :param progressCallback: Optional function called with each progress message of the worker
+        :type progressCallback: function(str)
+        :param isCancelled: Optional function returning True when the request is to be abandoned (terminating the worker)
+        :type isCancelled: function() -> bool
+        :param logCallback: Optional function called with each log entry (formatted as text) of the request, as logged
+        :type logCallback: function(str)
+        :returns: (contentType, result) -- as for CntlrWebMain.runOptions
+        :raises: WorkerTimeoutError, WorkerCancelledError, WorkerUnavailableError, WorkerFailedError
+        """
+        optionsDict = dict((key, value)
+                           for key, value in options.__dict__.items()
+                           if value is not viewFile)
+        viewFileOption = None
+        if viewFile is not None:
+            for key, value in options.__dict__.items():
+                if value is viewFile:
+                    viewFileOption = key
+        sourceZipBytes = sourceZipStream.read() if sourceZipStream is not None else None
+        worker = self.idleWorker(isCancelled)
+        worker.busySince = time.time()
+        with self.lock:
+            self.jobs += 1
+        try:
+            worker.conn.send((optionsDict, media, viewFileOption, sourceZipBytes, logFormat, logCallback is not None))
+            while True:
+                if isCancelled is not None and isCancelled():
+                    self.replaceWorker(worker, terminate=True)
+                    raise WorkerCancelledError()
+                remaining = self.timeout - (time.time() - worker.busySince) if self.timeout else POLL_INTERVAL
+                if remaining <= 0:
+                    with self.lock:
+                        self.timeouts += 1
+                    self.replaceWorker(worker, terminate=True)
+                    raise WorkerTimeoutError(self.timeout)
+                if worker.conn.poll(min(remaining, POLL_INTERVAL)):
+                    reply = worker.conn.recv()
+                    if reply[0] == "result":
+                        break
+                    if reply[0] == "log":
+                        if logCallback is not None:
+                            logCallback(reply[1])
+                    elif progressCallback is not None:
+                        progressCallback(reply[1])
+                elif not worker.process.is_alive(): # exited without closing its connection
+                    raise EOFError()
+            _replyType, contentType, result, worker.memoryKB, worker.dtsPoolStatus = reply
+        except (EOFError, OSError):
+            self.replaceWorker(worker, terminate=True) # joins the exited process
+            raise WorkerFailedError(worker.process.exitcode)
+        worker.jobs += 1
+        worker.busySince = None
+        if (worker.recycle or
+            (self.maxJobs and worker.jobs >= self.maxJobs) or
+            (self.maxMemoryKB and worker.memoryKB > self.maxMemoryKB)):
+            with self.lock:
+                self.recycled += 1
+            self.replaceWorker(worker)
+        else:
+            self.idleWorkers.put(worker)
+        return contentType, result
+
+    def recycleAll(self):
+        """Replaces all workers (busy workers after their current job), such as after configuration changes."""
+        with self.lock:
+            workers = list(self.workers)
+        for worker in workers:
+            worker.recycle = True
+        idleWorkers = []
+        while True:
+            try:
+                idleWorkers.append(self.idleWorkers.get_nowait())
+            except queue.Empty:
+                break
+        for worker in idleWorkers:
+            if worker.recycle:
+                self.replaceWorker(worker)
+            else: # started after recycle was requested
+                self.idleWorkers.put(worker)
+
+    def status(self):
+        """Returns dict of pool statistics and workers, for status reporting.
+        """
+        now = time.time()
+        with self.lock:
+            return {"jobs": self.jobs,
+                    "timeouts": self.timeouts,
+                    "recycled": self.recycled,
+                    "idle": self.idleWorkers.qsize(),
+                    "workers": [{"pid": worker.process.pid,
+                                 "jobs": worker.jobs,
+                                 "memoryKB": worker.memoryKB,
+                                 "uptime": round(now - worker.startedAt, 1),
+                                 "busy": round(now - worker.busySince, 1) if worker.busySince else None,
+                                 "dtsPool": worker.dtsPoolStatus}
+                                for worker in self.workers]}
+
+    def close(self):
+        with self.lock:
+            workers = list(self.workers)
+            del self.workers[:]
+        for worker in workers:
+            worker.stop(terminate=worker.busySince is not None)
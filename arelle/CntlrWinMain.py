@@ -166,6 +166,7 @@ class CntlrWinMain (Cntlr.Cntlr):
 
         formulaMenu = Menu(self.menubar, tearoff=0)
         formulaMenu.add_command(label=_("Parameters..."), underline=0, command=self.formulaParametersDialog)
+        formulaMenu.add_command(label=_("Re-validate changed facts"), underline=0, command=self.validateFormulaChanges)
 
         toolsMenu.add_cascade(label=_("Formula"), menu=formulaMenu, underline=0)
         self.modelManager.formulaOptions = FormulaOptions(self.config.get("formulaParameters"))
@@ -992,6 +993,31 @@ class CntlrWinMain (Cntlr.Cntlr):
             
         self.uiThreadQueue.put((self.logSelect, []))
 
+    def validateFormulaChanges(self):
+        modelXbrl = self.modelManager.modelXbrl
+        if modelXbrl:
+            if modelXbrl.formulaFactDependencies is None:
+                tkinter.messagebox.showwarning(_("arelle - Warning"),
+                                _("Formula re-validation of changed facts requires a prior validation with formula parameters Track Fact Dependencies."),
+                                parent=self.parent)
+            else: # facts edited in rendered tables are changed in the instance when it is saved
+                thread = threading.Thread(target=self.backgroundValidateFormulaChanges, daemon=True).start()
+            
+    def backgroundValidateFormulaChanges(self):
+        from arelle import Validate
+        startedAt = time.time()
+        modelXbrl = self.modelManager.modelXbrl
+        priorOutputInstance = modelXbrl.formulaOutputInstance
+        modelXbrl.formulaOutputInstance = None # prevent closing on background thread by validateFormula
+        Validate.Validate(modelXbrl).validateFormulaChanges(set(modelXbrl.formulaChangedFacts))
+        self.addToLog(format_string(self.modelManager.locale, 
+                                    _("re-validated formula changes in %.2f secs"), 
+                                    time.time() - startedAt))
+        if not modelXbrl.isClosed and (priorOutputInstance or modelXbrl.formulaOutputInstance):
+            self.uiThreadQueue.put((self.showFormulaOutputInstance, [priorOutputInstance, modelXbrl.formulaOutputInstance]))
+            
+        self.uiThreadQueue.put((self.logSelect, []))
+
     def compareDTSes(self):
         countLoadedDTSes = len(self.modelManager.loadedModelXbrls)
         if countLoadedDTSes != 2:
@@ -88,6 +88,7 @@ class DialogFormulaParameters(Toplevel):
         label(frame, 1, y + 8, "Testcase Results:")
         label(frame, 2, y, "Variable Set Trace:")
         label(frame, 3, y, "Variables Trace:")
+        label(frame, 3, y + 9, "Re-validation:")
         self.checkboxes = (
            checkbox(frame, 1, y + 1, 
                     "Expression Result", 
@@ -164,7 +165,10 @@ class DialogFormulaParameters(Toplevel):
                     "traceVariableFilterWinnowing"),
            checkbox(frame, 3, y + 8, 
                     "Filters Result", 
-                    "traceVariableFiltersResult")
+                    "traceVariableFiltersResult"),
+           checkbox(frame, 3, y + 10, 
+                    "Track Fact Dependencies", 
+                    "trackFactDependencies")
         
            # Note: if adding to this list keep ModelFormulaObject.FormulaOptions in sync
         
@@ -0,0 +1,195 @@
+'''
+Created on Oct 18, 2026
+
+Discovery read ahead retrieves and parses the documents referenced by a loaded document on a pool of
+threads, while ModelDocument.load continues discovery of the referencing document.
+
+When a document has been parsed, the urls of its schemaRefs, linkbaseRefs, locators and schema
+imports/includes are submitted to the read ahead threads, which get the web cache file (downloading
+it if needed, with the web cache's check times, cache file renaming and status serialized by its lock)
+and parse it (lxml releases the GIL while parsing).  Discovery itself is unchanged: it
+proceeds depth-first and in sequence, creating each ModelDocument from the read ahead file and parsed
+tree when loading it, so the model (urlDocs, modelObjects, base sets) is identical to sequential
+loading.  Documents which are in archives, need file text validation or plug-in loaders, or are not
+schemas or linkbases, are only retrieved ahead and then parsed when loaded.
+
+Without read ahead threads, prefetch (--prefetchThreads) retrieves the web documents referenced by each parsed
+document into the web cache in parallel (WebCache.prefetch) before its discovery loads them in sequence.
+
+@author: Mark V Systems Limited
+(c) Copyright 2026 Mark V Systems Limited, All rights reserved.
+'''
+import os, threading
+from concurrent.futures import ThreadPoolExecutor
+from lxml import etree
+from arelle.PluginManager import pluginClassMethods
+
+READ_AHEAD_TAGS = ("{http://www.w3.org/2001/XMLSchema}import",
+                   "{http://www.w3.org/2001/XMLSchema}include",
+                   "{http://www.w3.org/2001/XMLSchema}redefine",
+                   "{http://www.xbrl.org/2003/linkbase}schemaRef",
+                   "{http://www.xbrl.org/2003/linkbase}linkbaseRef",
+                   "{http://www.xbrl.org/2003/linkbase}loc")
+READ_AHEAD_ROOT_TAGS = {"{http://www.w3.org/2001/XMLSchema}schema",
+                        "{http://www.xbrl.org/2003/linkbase}linkbase"}
+
+class ReadAheadDocument:
+    def __init__(self, filepath, xmlDocument=None, encoding=None, parser=None):
+        self.filepath = filepath
+        self.xmlDocument = xmlDocument
+        self.encoding = encoding
+        self.parser = parser # (parser, parserLookupName, parserLookupClass) as from ModelObjectFactory.parser
+
+class DiscoveryReadAhead:
+    """
+    .. class:: DiscoveryReadAhead(modelXbrl, threads)
+
+    DiscoveryReadAhead retrieves and parses referenced documents ahead of their discovery by ModelDocument.load.
+
+    :param modelXbrl: ModelXbrl being loaded
+    :type modelXbrl: ModelXbrl
+    :param threads: Number of read ahead threads
+    :type threads: int
+    """
+    def __init__(self, modelXbrl, threads):
+        self.modelXbrl = modelXbrl
+        self.executor = ThreadPoolExecutor(threads)
+        self.futures = {} # by mapped url
+        self.lock = threading.Lock()
+        self.isClosed = False
+        # plug-in loaders and file text validation are given the file, not a read ahead parse
+        self.parseAhead = not any(True for pluginMethod in pluginClassMethods("ModelDocument.PullLoader")) and \
+                          not any(True for pluginMethod in pluginClassMethods("ModelDocument.CustomLoader")) and \
+                          not (modelXbrl.modelManager.validateDisclosureSystem and
+                               modelXbrl.modelManager.disclosureSystem.validateFileText)
+
+    def submit(self, xmlDocument, base, parserLookupClass):
+        """Submits the documents referenced by a parsed document, which is not yet discovered, for reading ahead.
+
+        :param xmlDocument: Parsed document
+        :type xmlDocument: lxml.etree._ElementTree
+        :param base: Normalized url of the document, against which its references are resolved
+        :type base: str
+        :param parserLookupClass: DiscoveringClassLookup of the document's parser
+        :type parserLookupClass: ModelObjectFactory.DiscoveringClassLookup
+        """
+        for mappedUri, normalizedUri in referencedUrls(self.modelXbrl, xmlDocument, base, parserLookupClass):
+            with self.lock:
+                if not self.isClosed and mappedUri not in self.futures:
+                    self.futures[mappedUri] = self.executor.submit(self.readAhead, normalizedUri, mappedUri)
+
+    def readAhead(self, normalizedUri, mappedUri):
+        # runs on a read ahead thread
+        from arelle.ModelObjectFactory import parser
+        modelXbrl = self.modelXbrl
+        try:
+            filepath = modelXbrl.modelManager.cntlr.webCache.getfilename(mappedUri)
+        except Exception:
+            return None # retried when loaded, reporting any error
+        if not filepath or not self.parseAhead or not os.path.isfile(filepath):
+            return ReadAheadDocument(filepath)
+        try:
+            file, _encoding = modelXbrl.fileSource.file(filepath, stripDeclaration=True)
+            try:
+                _parser, _parserLookupName, _parserLookupClass = parser(modelXbrl, filepath)
+                _parserLookupClass.deferDiscovery = True # schemas must only be loaded by the loading thread
+                xmlDocument = etree.parse(file, parser=_parser, base_url=filepath)
+            finally:
+                file.close()
+        except Exception:
+            return ReadAheadDocument(filepath) # parse errors are reported when loaded
+        rootElement = xmlDocument.getroot()
+        if rootElement is None or rootElement.tag not in READ_AHEAD_ROOT_TAGS:
+            return ReadAheadDocument(filepath) # other root elements may need the loaded DTS to resolve their class
+        try:
+            self.submit(xmlDocument, normalizedUri, _parserLookupClass)
+        except Exception:
+            pass # references are loaded when discovered
+        return ReadAheadDocument(filepath, xmlDocument, _encoding, (_parser, _parserLookupName, _parserLookupClass))
+
+    def get(self, mappedUri):
+        """Returns the ReadAheadDocument of mappedUri, waiting for it if being read, or None if it was not read ahead
+        (or can't be), in which case the document is retrieved and parsed by the caller.
+        """
+        with self.lock:
+            future = self.futures.pop(mappedUri, None)
+        if future is None or future.cancel(): # not yet started, faster to load it now
+            return None
+        readAheadDocument = future.result()
+        if readAheadDocument is not None and readAheadDocument.parser is not None:
+            _parserLookupClass = readAheadDocument.parser[2]
+            _parserLookupClass.deferDiscovery = False
+            # schemaLocation discovery for the root element, as when the loading thread parses the document
+            _parserLookupClass.lookup(readAheadDocument.xmlDocument, readAheadDocument.xmlDocument.getroot())
+        return readAheadDocument
+
+    def close(self):
+        """Cancels documents not yet read and waits for documents being read, such as when discovery has completed.
+        """
+        with self.lock:
+            self.isClosed = True
+            futures = list(self.futures.values())
+            self.futures.clear()
+        for future in futures:
+            future.cancel()
+        self.executor.shutdown(wait=True)
+
+def referencedUrls(modelXbrl, xmlDocument, base, parserLookupClass):
+    """Returns the (mapped, normalized) urls of the documents referenced by a parsed document, which is not yet
+    discovered, that would be loaded by its discovery and are not yet loaded or in an archive.
+    """
+    from arelle.ModelDocument import mappedUrl
+    modelManager = modelXbrl.modelManager
+    webCache = modelManager.cntlr.webCache
+    hrefs = set()
+    deferDiscovery = parserLookupClass.deferDiscovery
+    parserLookupClass.deferDiscovery = True # elements are looked up again (with schemaLocation discovery) when discovered
+    try:
+        for element in xmlDocument.iter(READ_AHEAD_TAGS):
+            if element.tag.startswith("{http://www.w3.org/2001/XMLSchema}"):
+                href = element.get("schemaLocation")
+            else:
+                href = element.get("{http://www.w3.org/1999/xlink}href")
+            if href and not element.get("{http://www.w3.org/XML/1998/namespace}base"):
+                hrefs.add(href.partition("#")[0])
+    finally:
+        parserLookupClass.deferDiscovery = deferDiscovery
+    urls = []
+    for href in sorted(hrefs):
+        normalizedUri = webCache.normalizeUrl(href, base)
+        if (not normalizedUri or normalizedUri in modelXbrl.urlDocs or normalizedUri in modelXbrl.urlUnloadableDocs or
+            (modelManager.skipLoading and modelManager.skipLoading.match(normalizedUri)) or
+            (modelManager.validateDisclosureSystem and
+             not normalizedUri.startswith(modelXbrl.uriDir) and
+             not modelManager.disclosureSystem.hrefValid(normalizedUri))):
+            continue
+        mappedUri = mappedUrl(modelXbrl, normalizedUri)
+        if not modelXbrl.fileSource.isInArchive(mappedUri): # else read directly from the archive when loaded
+            urls.append((mappedUri, normalizedUri))
+    return urls
+
+def prefetch(modelXbrl, xmlDocument, base, parserLookupClass):
+    """Retrieves the web documents referenced by a parsed document, which is not yet discovered, into the web
+    cache in parallel (WebCache.prefetch), when loading without read ahead threads, so that its discovery finds
+    them cached.  Prefetch retrieves without parsing, and only the direct references of each document.
+    """
+    webCache = modelXbrl.modelManager.cntlr.webCache
+    if not webCache.workOffline:
+        webCache.prefetch([mappedUri for mappedUri, normalizedUri in
+                           referencedUrls(modelXbrl, xmlDocument, base, parserLookupClass)],
+                          maxConcurrency=modelXbrl.modelManager.prefetchThreads)
+
+def start(modelXbrl):
+    """Starts discovery read ahead for loading modelXbrl, if the modelManager has discoveryThreads.
+    """
+    threads = modelXbrl.modelManager.discoveryThreads
+    if threads and threads > 0:
+        modelXbrl.discoveryReadAhead = DiscoveryReadAhead(modelXbrl, threads)
+
+def stop(modelXbrl):
+    """Stops discovery read ahead of modelXbrl, when discovery has completed.
+    """
+    discoveryReadAhead = getattr(modelXbrl, "discoveryReadAhead", None)
+    if discoveryReadAhead is not None:
+        modelXbrl.discoveryReadAhead = None
+        discoveryReadAhead.close()
@@ -0,0 +1,270 @@
+'''
+Created on Oct 18, 2026
+
+Pool of discovered, read-only DTSes shared by successive loads of instances (such as web server requests).
+
+An instance whose schemaRefs and linkbaseRefs are all web-hosted (or package-mapped) entry points
+is attached to a pooled DTS ModelXbrl: the instance's ModelXbrl receives the pooled documents and
+their concept, type, role and base set indices, so that discovery of the instance's references
+finds them already loaded instead of re-parsing the taxonomy files.
+
+A DTS is not pooled if it has loading errors, or if it has formula or table linkbase resources (or custom
+functions), whose compilation and evaluation report errors against the model of the objects.  Pooled objects
+remain owned by the pooled DTS ModelXbrl, so the messages of loading a pooled DTS are logged with each instance
+it is attached to, and the objects of an attached instance are numbered (objectIndex) after the pooled objects.
+
+An attached instance has its own indices, base sets, relationship sets and fact indexes, built from the pooled
+and its own objects.  Relationship sets requested through pooled objects (whose modelXbrl is the pooled DTS,
+such as for concept labels) are built from the pooled base sets only, which no instance changes, one at a time.
+DTSes are pooled by their entry points and by the settings affecting their loading: package remappings,
+disclosure system, enabled plug-ins and skipLoading patterns.
+
+@author: Mark V Systems Limited
+(c) Copyright 2026 Mark V Systems Limited, All rights reserved.
+'''
+import threading, time, logging
+from collections import OrderedDict
+from functools import partial
+from arelle import ModelXbrl, PackageManager, PluginManager, XmlValidateSchema
+from arelle.UrlUtil import isHttpUrl
+from arelle.PythonUtil import OrderedDefaultDict
+
+ESTIMATED_MODEL_OBJECT_KB = 1.5 # size estimate when the process memory high water mark did not move
+
+class DtsPoolEntry:
+    def __init__(self, key, modelXbrl, loadMessages, memoryKB, loadTime):
+        self.key = key
+        self.modelXbrl = modelXbrl
+        self.loadMessages = loadMessages # (level, codes, msg, args) of loading the DTS, logged with each attached instance
+        self.memoryKB = memoryKB
+        self.loadTime = loadTime
+        self.hits = 0
+        self.attachedModelXbrls = set()
+        self.lastUsed = time.time()
+        # relationship sets of the pooled DTS (such as of pooled concepts' labels) may be requested by attached instances' threads
+        self.lock = threading.RLock()
+
+class DtsPool:
+    """
+    .. class:: DtsPool(modelManager, maxMemoryMB)
+
+    DtsPool retains discovered DTSes, by entry point URLs and taxonomy package remappings, up to
+    a memory budget, evicting the least recently used DTS which is not attached to an open instance.
+
+    :param modelManager: The controller's modelManager object
+    :type modelManager: ModelManager
+    :param maxMemoryMB: Memory budget of pooled DTSes in megabytes
+    :type maxMemoryMB: int
+    """
+    def __init__(self, modelManager, maxMemoryMB):
+        self.modelManager = modelManager
+        self.maxMemoryKB = maxMemoryMB * 1024
+        self.entries = OrderedDict() # LRU order, most recently used last
+        self.unpoolableKeys = set() # DTSes which had loading errors or have formulae
+        self.hits = self.misses = self.evictions = 0
+        self.lock = threading.RLock()
+
+    def key(self, urls):
+        # entry points and the settings which affect loading them (skipDTS instances are not pooled)
+        modelManager = self.modelManager
+        return (tuple(sorted(set(urls))),
+                tuple(sorted(PackageManager.packagesConfig["remappings"].items())
+                      if PackageManager.packagesConfig else ()),
+                modelManager.disclosureSystem.name if modelManager.validateDisclosureSystem else None,
+                tuple(sorted(moduleName 
+                             for moduleName, moduleInfo in PluginManager.pluginConfig["modules"].items()
+                             if moduleInfo.get("status") == "enabled")
+                      if PluginManager.pluginConfig else ()),
+                modelManager.skipLoading.pattern if modelManager.skipLoading else None)
+
+    def isPoolable(self, modelXbrl, urls):
+        return (urls and
+                not modelXbrl.skipDTS and
+                not getattr(modelXbrl, "isStreamingMode", False) and
+                all(isHttpUrl(url) and not modelXbrl.fileSource.isInArchive(url) for url in urls))
+
+    def attach(self, modelXbrl, urls):
+        """Attaches the pooled DTS of the DTS entry point urls to modelXbrl, loading and pooling the DTS if not already pooled.
+
+        :param modelXbrl: Instance modelXbrl being loaded, which must not yet have any DTS documents
+        :type modelXbrl: ModelXbrl
+        :param urls: normalized urls of the instance's schemaRefs and linkbaseRefs
+        :type urls: [str]
+        :returns: bool -- True if attached, False if the DTS is to be discovered normally
+        """
+        if not self.isPoolable(modelXbrl, urls):
+            return False
+        key = self.key(urls)
+        with self.lock:
+            if key in self.unpoolableKeys:
+                return False
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                entry = self.loadEntry(key, urls)
+                if entry is None:
+                    return False
+                self.entries[key] = entry
+                self.evict()
+            else:
+                self.hits += 1
+                entry.hits += 1
+                self.entries.move_to_end(key)
+            entry.lastUsed = time.time()
+            entry.attachedModelXbrls.add(modelXbrl)
+            modelXbrl.dtsPoolEntry = entry
+            shareDts(entry.modelXbrl, modelXbrl)
+        for level, codes, msg, args in entry.loadMessages:
+            modelXbrl.log(level, codes, msg, **args)
+        return True
+
+    def detach(self, modelXbrl):
+        """Removes the pooled documents from a closing modelXbrl, so that closing its own documents does not close them.
+        """
+        entry = getattr(modelXbrl, "dtsPoolEntry", None)
+        if entry is not None:
+            with self.lock:
+                pooledDocs = entry.modelXbrl.urlDocs
+                for url, doc in pooledDocs.items():
+                    if modelXbrl.urlDocs.get(url) is doc:
+                        del modelXbrl.urlDocs[url]
+                for doc in modelXbrl.urlDocs.values():
+                    for pooledDoc in [d for d in doc.referencesDocument if d.uri in pooledDocs]:
+                        del doc.referencesDocument[pooledDoc]
+                entry.attachedModelXbrls.discard(modelXbrl)
+                del modelXbrl.dtsPoolEntry
+                self.evict()
+
+    def loadEntry(self, key, urls):
+        from arelle import DiscoveryReadAhead, ModelDocument
+        from arelle.ModelDocument import ModelDocumentReference
+        modelManager = self.modelManager
+        startedAt = time.time()
+        memoryBefore = modelManager.cntlr.memoryUsed
+        modelManager.showStatus(_("loading pooled DTS {0}").format(", ".join(urls)))
+        dtsModelXbrl = ModelXbrl.create(modelManager, ModelDocument.Type.DTSENTRIES,
+                                        urls[0] + "-pool.dts", isEntry=True)
+        dtsModelXbrl.isPooledDts = True
+        dtsDoc = dtsModelXbrl.modelDocument
+        dtsDoc.inDTS = True
+        loadMessages = [] # logged with the instances the DTS is attached to, instead of when loading
+        def logLoadMessage(level, codes, msg, **args):
+            loadMessages.append((level, codes, msg, args))
+        dtsModelXbrl.log = logLoadMessage
+        try:
+            DiscoveryReadAhead.start(dtsModelXbrl)
+            try:
+                for url in urls:
+                    doc = ModelDocument.load(dtsModelXbrl, url, isDiscovered=True)
+                    if doc is not None:
+                        dtsDoc.referencesDocument[doc] = ModelDocumentReference("href")
+            finally:
+                DiscoveryReadAhead.stop(dtsModelXbrl)
+            while dtsModelXbrl.schemaDocsToValidate:
+                doc = dtsModelXbrl.schemaDocsToValidate.pop()
+                XmlValidateSchema.validate(doc, doc.xmlRootElement, doc.targetNamespace)
+            schemaLocatedDocs = set()
+            while True: # each pass may add newly schemaLocated urlDocs
+                docs = set(dtsModelXbrl.urlDocs.values()) - schemaLocatedDocs
+                if not docs:
+                    break
+                for doc in docs:
+                    schemaLocatedDocs.add(doc)
+                    doc.loadSchemalocatedSchemas()
+        finally:
+            del dtsModelXbrl.log
+        dtsModelXbrl.baseSets = OrderedDefaultDict( # order by linkRole, arcRole of key, as for an entry document
+            dtsModelXbrl.baseSets.default_factory,
+            sorted(dtsModelXbrl.baseSets.items(), key=lambda i: (i[0][0] or "",i[0][1] or "")))
+        modelManager.cntlr.webCache.saveUrlCheckTimes()
+        if (any(logging._checkLevel(level) >= dtsModelXbrl.errorCaptureLevel for level, _codes, _msg, _args in loadMessages) or
+            any(url not in dtsModelXbrl.urlDocs for url in urls) or
+            dtsModelXbrl.hasFormulae or dtsModelXbrl.hasTableRendering or dtsModelXbrl.modelCustomFunctionSignatures):
+            # DTS with loading errors is discovered per instance so the errors are reported with the instance,
+            # as is a DTS with formulae or tables, whose objects report compilation and evaluation errors to their modelXbrl
+            self.unpoolableKeys.add(key)
+            dtsModelXbrl.close()
+            return None
+        memoryKB = modelManager.cntlr.memoryUsed - memoryBefore
+        if memoryKB <= 0: # memory high water mark didn't move, estimate from model objects
+            memoryKB = len(dtsModelXbrl.modelObjects) * ESTIMATED_MODEL_OBJECT_KB
+        entry = DtsPoolEntry(key, dtsModelXbrl, loadMessages, memoryKB, time.time() - startedAt)
+        dtsModelXbrl.relationshipSet = partial(pooledRelationshipSet, entry, dtsModelXbrl.relationshipSet)
+        return entry
+
+    def evict(self):
+        with self.lock:
+            for key in list(self.entries.keys()): # least recently used first
+                if self.memoryKB <= self.maxMemoryKB:
+                    break
+                entry = self.entries[key]
+                if not entry.attachedModelXbrls:
+                    del self.entries[key]
+                    entry.modelXbrl.close()
+                    self.evictions += 1
+
+    @property
+    def memoryKB(self):
+        return sum(entry.memoryKB for entry in self.entries.values())
+
+    def clear(self):
+        with self.lock:
+            for key, entry in list(self.entries.items()):
+                if not entry.attachedModelXbrls:
+                    del self.entries[key]
+                    entry.modelXbrl.close()
+            self.unpoolableKeys.clear()
+
+    def status(self):
+        """Returns dict of pool statistics and entries, for status reporting.
+        """
+        with self.lock:
+            return OrderedDict((
+                ("hits", self.hits),
+                ("misses", self.misses),
+                ("evictions", self.evictions),
+                ("memoryKB", int(self.memoryKB)),
+                ("maxMemoryKB", int(self.maxMemoryKB)),
+                ("entries", [OrderedDict((("urls", list(entry.key[0])),
+                                          ("hits", entry.hits),
+                                          ("documents", len(entry.modelXbrl.urlDocs)),
+                                          ("memoryKB", int(entry.memoryKB)),
+                                          ("loadTime", round(entry.loadTime, 3)),
+                                          ("attached", len(entry.attachedModelXbrls))))
+                             for entry in reversed(self.entries.values())]),
+                ("unpoolable", [list(key[0]) for key in self.unpoolableKeys])))
+
+def pooledRelationshipSet(entry, relationshipSet, *args, **kwargs):
+    # relationship sets of pooled objects (whose modelXbrl is the pooled DTS) are built one at a time, from the pooled
+    # base sets only, so they are the same for each attached instance
+    with entry.lock:
+        return relationshipSet(*args, **kwargs)
+
+def shareDts(dtsModelXbrl, modelXbrl):
+    """Adds pooled DTS documents and their indices to modelXbrl (pooled objects remain owned by dtsModelXbrl)"""
+    # objects of modelXbrl are renumbered after the pooled objects, so modelXbrl.modelObject() resolves either
+    ownModelObjects = modelXbrl.modelObjects
+    modelXbrl.modelObjects = dtsModelXbrl.modelObjects[:]
+    for modelObject in ownModelObjects:
+        modelObject.objectIndex = len(modelXbrl.modelObjects)
+        modelXbrl.modelObjects.append(modelObject)
+    dtsDoc = dtsModelXbrl.modelDocument
+    for url, doc in dtsModelXbrl.urlDocs.items():
+        if doc is not dtsDoc:
+            modelXbrl.urlDocs.setdefault(url, doc)
+    for ns, docs in dtsModelXbrl.namespaceDocs.items():
+        modelXbrl.namespaceDocs[ns].extend(doc for doc in docs if doc not in modelXbrl.namespaceDocs[ns])
+    for attr in ("arcroleTypes", "roleTypes", "nameConcepts"):
+        modelXbrlAttr = getattr(modelXbrl, attr)
+        for key, objs in getattr(dtsModelXbrl, attr).items():
+            modelXbrlAttr[key].extend(objs)
+    for attr in ("qnameConcepts", "qnameAttributes", "qnameAttributeGroups", "qnameGroupDefinitions", "qnameTypes",
+                 "qnameParameters", "modelCustomFunctionSignatures"):
+        getattr(modelXbrl, attr).update(getattr(dtsModelXbrl, attr))
+    for attr in ("modelVariableSets", "modelCustomFunctionImplementations", "modelRenderingTables", "langs", "labelroles"):
+        getattr(modelXbrl, attr).update(getattr(dtsModelXbrl, attr))
+    for baseSetKey, modelLinks in dtsModelXbrl.baseSets.items():
+        modelXbrl.baseSets[baseSetKey].extend(modelLinks)
+    for attr in ("hasXDT", "hasTableRendering", "hasTableIndexing", "hasFormulae"):
+        if getattr(dtsModelXbrl, attr):
+            setattr(modelXbrl, attr, True)
@@ -15,16 +15,19 @@ from arelle.ModelFormulaObject import (aspectModels, Aspect, aspectModelAspect,
 from arelle.PrototypeInstanceObject import DimValuePrototype
 from arelle.PythonUtil import OrderedSet
 from arelle.ModelValue import (QName)
+from arelle.ModelXbrl import aspectValueKey
+from arelle.FormulaProfiler import IMPLICIT_FILTER
 import datetime, time, logging, re
 from decimal import Decimal
 from math import log10, isnan, isinf, fabs
 from arelle.Locale import format_string
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
 ModelDimensionValue = None
 ModelFact = None
 
 expressionVariablesPattern = re.compile(r"([^$]*)([$]\w[\w:.-]*)([^$]*)")
 EMPTYSET = set()
+MAX_EVALUATION_PROJECTIONS = 16 # projections of completed evaluations retained by an EvaluationRegistry (least recently used are dropped)
 
 def init():
     global ModelDimensionValue, ModelFact # initialize objects that would cause recursive import
@@ -34,12 +37,14 @@ def init():
 def evaluate(xpCtx, varSet, variablesInScope=False, uncoveredAspectFacts=None):
     # for each dependent variable, find bindings
     if variablesInScope:
-        stackedEvaluations = (xpCtx.evaluations, xpCtx.evaluationHashDicts)
+        stackedEvaluations = xpCtx.evaluations
     else:
         xpCtx.varBindings = {}
         uncoveredAspectFacts = {}
-    xpCtx.evaluations = []  # list of evaluations 
-    xpCtx.evaluationHashDicts = {} # hash indexs of evaluations
+    xpCtx.evaluations = EvaluationRegistry()  # completed evaluations
+    profiler = xpCtx.formulaProfiler
+    if profiler is not None:
+        profiling = profiler.start(varSet)
     try:
         xpCtx.variableSet = varSet
         if isinstance(varSet, ModelExistenceAssertion):
@@ -107,11 +112,12 @@ def evaluate(xpCtx, varSet, variablesInScope=False, uncoveredAspectFacts=None):
                              _("Variable set %(xlinkLabel)s evaluations: %(evaluations)s x %(variables)s"),
                              modelObject=varSet, xlinkLabel=varSet.xlinkLabel,
                              evaluations=len(xpCtx.evaluations), 
-                             variables=max(len(e) for e in xpCtx.evaluations) if xpCtx.evaluations else 0)
-    del xpCtx.evaluations[:]  # dereference
-    xpCtx.evaluationHashDicts.clear()
+                             variables=len(xpCtx.evaluations.varQnames))
+    if profiler is not None:
+        profiler.stop(profiling, evaluations=len(xpCtx.evaluations))
+    xpCtx.evaluations.clear()  # dereference
     if variablesInScope:
-        xpCtx.evaluations, xpCtx.evaluationHashDicts = stackedEvaluations
+        xpCtx.evaluations = stackedEvaluations
     else:
         for vb in xpCtx.varBindings.values():
             vb.close()  # dereference
@@ -139,6 +145,8 @@ def evaluateVar(xpCtx, varSet, varIndex, cachedFilteredFacts, uncoveredAspectFac
         # thisEvaluation = tuple(vb.matchableBoundFact(fbVars) for vb in xpCtx.varBindings.values())
         thisEvaluation = dict((vbQn, vb.matchableBoundFact(fbVars)) for vbQn, vb in xpCtx.varBindings.items())
         if evaluationIsUnnecessary(thisEvaluation, xpCtx):
+            if xpCtx.formulaProfiler is not None:
+                xpCtx.formulaProfiler.skippedEvaluation()
             if xpCtx.formulaOptions.traceVariableSetExpressionResult:
                 xpCtx.modelXbrl.info("formula:trace",
                     _("Variable set %(xlinkLabel)s skipped non-different or fallback evaluation, duplicates another evaluation"),
@@ -155,11 +163,7 @@ def evaluateVar(xpCtx, varSet, varIndex, cachedFilteredFacts, uncoveredAspectFac
             xpCtx.modelXbrl.profileActivity("...   evaluation {0} (skipped)".format(varSet.evaluationNumber), minTimeToShow=10.0)
             return
         xpCtx.modelXbrl.profileActivity("...   evaluation {0}".format(varSet.evaluationNumber), minTimeToShow=10.0)
-        for vQn, vBoundFact in thisEvaluation.items(): # varQn, fact or tuple of facts bound to var
-            # while i >= len(xpCtx.evaluationHashDicts): xpCtx.evaluationHashDicts.append(defaultdict(set))
-            if vQn not in xpCtx.evaluationHashDicts: xpCtx.evaluationHashDicts[vQn] = defaultdict(set)
-            xpCtx.evaluationHashDicts[vQn][hash(vBoundFact)].add(len(xpCtx.evaluations))  # hash and eval index        
-        xpCtx.evaluations.append(thisEvaluation)  # complete evaluations tuple
+        xpCtx.evaluations.add(thisEvaluation)  # complete evaluation
         # evaluate preconditions
         for precondition in varSet.preconditions:
             result = precondition.evalTest(xpCtx)
@@ -296,8 +300,12 @@ def evaluateVar(xpCtx, varSet, varIndex, cachedFilteredFacts, uncoveredAspectFac
             vb.values = None
             varHasNoVariableDependencies = var.hasNoVariableDependencies
             varHasNilFacts = var.nils == "true"
+            profiler = xpCtx.formulaProfiler
             if varHasNoVariableDependencies and varQname in cachedFilteredFacts:
                 facts, vb.aspectsDefined, vb.aspectsCovered = cachedFilteredFacts[varQname]
+                if profiler is not None:
+                    profiling = profiler.start(varQname)
+                    factsIn = len(facts)
                 if xpCtx.formulaOptions.traceVariableFilterWinnowing:
                     xpCtx.modelXbrl.info("formula:trace",
                          _("Fact Variable %(variable)s: start with %(factCount)s facts previously cached after explicit filters"), 
@@ -329,8 +337,12 @@ def evaluateVar(xpCtx, varSet, varIndex, cachedFilteredFacts, uncoveredAspectFac
                     vb.aspectsCovered.clear()  # group boolean sub-filters may have covered aspects
                     cachedFilteredFacts[groupFilteredFactsKey] = facts
 
+                if profiler is not None:
+                    profiling = profiler.start(varQname)
+                    factsIn = len(facts)
                 checkVarFilterInfo(var)
-                facts = trialFilterFacts(xpCtx, vb, facts, var.filterRelationships, None, var=var) # also finds covered aspects (except aspect cover filter dims, not known until after this complete pass)
+                facts = trialFilterFacts(xpCtx, vb, facts, var.filterRelationships, None, var=var, # also finds covered aspects (except aspect cover filter dims, not known until after this complete pass)
+                                         cachedFilteredFacts=None if varHasNoVariableDependencies else cachedFilteredFacts)
                     
                 # adding dim aspects must be done after explicit filterin
                 for fact in facts:
@@ -339,11 +351,17 @@ def evaluateVar(xpCtx, varSet, varIndex, cachedFilteredFacts, uncoveredAspectFac
                 coverAspectCoverFilterDims(xpCtx, vb, var.filterRelationships) # filters need to know what dims are covered
                 if varHasNoVariableDependencies:
                     cachedFilteredFacts[varQname] = (facts, vb.aspectsDefined, vb.aspectsCovered)
+                    if xpCtx.factDependencies is not None and varSet in xpCtx.factDependencies:
+                        xpCtx.factDependencies[varSet][varQname] = facts
             considerFallback = bool(var.fallbackValueProg)
             if varSet.implicitFiltering == "true":
                 if any((_vb.isFactVar and not _vb.isFallback) for _vb in xpCtx.varBindings.values()):
                     factCount = len(facts)
+                    if profiler is not None:
+                        implicitProfiling = profiler.start(IMPLICIT_FILTER)
                     facts = implicitFilter(xpCtx, vb, facts, uncoveredAspectFacts)
+                    if profiler is not None:
+                        profiler.stop(implicitProfiling, factCount, len(facts))
                     
                     if (considerFallback and varHasNoVariableDependencies and 
                         factCount and
@@ -373,6 +391,8 @@ def evaluateVar(xpCtx, varSet, varIndex, cachedFilteredFacts, uncoveredAspectFac
                                 considerFallback = False
                         
             vb.facts = facts
+            if profiler is not None:
+                profiler.stop(profiling, factsIn, len(facts))
             if xpCtx.formulaOptions.traceVariableFiltersResult:
                 xpCtx.modelXbrl.info("formula:trace",
                      _("Fact Variable %(variable)s: filters result %(result)s"), 
@@ -495,7 +515,23 @@ def checkVarSetFilterInfo(varSet):
     else:
         varSet.filterInfo = False                
     
-def trialFilterFacts(xpCtx, vb, facts, filterRelationships, filterType, var=None, varSet=None):
+def trialFilterFacts(xpCtx, vb, facts, filterRelationships, filterType, var=None, varSet=None, cachedFilteredFacts=None):
+    if (cachedFilteredFacts is not None and filterType is None and var is not None and not var.filterInfo and
+        not xpCtx.formulaOptions.traceVariableFilterWinnowing):
+        # variable with variable-dependent filters, its leading filters without variable dependencies are applied once
+        # per variable set evaluation, the following filters for each binding of the variables they depend on
+        staticFilterRels, dependentFilterRels = partitionedFilterRelationships(xpCtx, var)
+        if staticFilterRels:
+            staticFilteredFactsKey = "static:" + str(vb.qname)
+            if staticFilteredFactsKey in cachedFilteredFacts:
+                facts = cachedFilteredFacts[staticFilteredFactsKey]
+                for varFilterRel in staticFilterRels:
+                    if varFilterRel.isCovered:
+                        vb.aspectsCovered |= varFilterRel.toModelObject.aspectsCovered(vb)
+            else:
+                facts = trialFilterFacts(xpCtx, vb, facts, staticFilterRels, None)
+                cachedFilteredFacts[staticFilteredFactsKey] = facts
+        return trialFilterFacts(xpCtx, vb, facts, dependentFilterRels, None)
     typeLbl = filterType + " " if filterType else ""
     orFilter = filterType == "or"
     groupFilter = filterType == "group"
@@ -537,7 +573,12 @@ def trialFilterFacts(xpCtx, vb, facts, filterRelationships, filterType, var=None
             if filterType is None and len(facts) == 0:
                 pass # still continue to do the aspects covered thing
             else:
+                profiler = xpCtx.formulaProfiler
+                if profiler is not None:
+                    profiling = profiler.start(_filter)
                 result = _filter.filter(xpCtx, vb, facts, varFilterRel.isComplemented)
+                if profiler is not None:
+                    profiler.stop(profiling, len(facts), len(result))
                            
                 if xpCtx.formulaOptions.traceVariableFilterWinnowing:
                     allFacts = ""
@@ -574,6 +615,50 @@ def trialFilterFacts(xpCtx, vb, facts, filterRelationships, filterType, var=None
             facts = outFacts
     return facts
         
+def partitionedFilterRelationships(xpCtx, var):
+    # filter relationships of var preceding its first filter with variable dependencies, and the following ones
+    try:
+        return var.partitionedFilterRels
+    except AttributeError:
+        filterRels = var.filterRelationships
+        for i, varFilterRel in enumerate(filterRels):
+            _filter = varFilterRel.toModelObject
+            if isinstance(_filter, ModelFilter) and not _filter.hasNoFilterVariableDependencies(xpCtx):
+                break
+        else:
+            i = len(filterRels)
+        var.partitionedFilterRels = (filterRels[:i], filterRels[i:])
+        return var.partitionedFilterRels
+
+def factsMayBindVariableSet(xpCtx, varSet, facts):
+    """True if any of facts (such as edited, created or removed facts) may be bound by a fact variable of varSet,
+    passing its group and variable filters.  Fact variables with filters depending on other variables, and general
+    variables, are presumed to bind any fact.
+    """
+    for varRel in varSet.orderedVariableRelationships:
+        var = varRel.toModelObject
+        if isinstance(var, ModelGeneralVariable):
+            return True
+        if isinstance(var, ModelFactVariable):
+            if not var.hasNoVariableDependencies:
+                return True
+            vb = VariableBinding(xpCtx, varRel)
+            try:
+                varFacts = set(fact 
+                               for fact in facts 
+                               if fact.modelXbrl in vb.instances and (var.nils == "true" or not fact.isNil))
+                if varFacts:
+                    checkVarSetFilterInfo(varSet)
+                    varFacts = trialFilterFacts(xpCtx, vb, varFacts, varSet.groupFilterRelationships, "group", varSet=varSet)
+                    checkVarFilterInfo(var)
+                    if varFacts and trialFilterFacts(xpCtx, vb, varFacts, var.filterRelationships, None, var=var):
+                        return True
+            except Exception: # filters which can't be evaluated on the facts (e.g., removed facts) may bind them
+                return True
+            finally:
+                vb.close()
+    return False
+
 def filterFacts(xpCtx, vb, facts, filterRelationships, filterType):
     typeLbl = filterType + " " if filterType else ""
     orFilter = filterType == "or"
@@ -583,7 +668,12 @@ def filterFacts(xpCtx, vb, facts, filterRelationships, filterType):
     for varFilterRel in filterRelationships:
         _filter = varFilterRel.toModelObject
         if isinstance(_filter,ModelFilter):  # relationship not constrained to real filters
+            profiler = xpCtx.formulaProfiler
+            if profiler is not None:
+                profiling = profiler.start(_filter)
             result = _filter.filter(xpCtx, vb, facts, varFilterRel.isComplemented)
+            if profiler is not None:
+                profiler.stop(profiling, len(facts), len(result))
             if xpCtx.formulaOptions.traceVariableFilterWinnowing:
                 xpCtx.modelXbrl.info("formula:trace",
                     _("Fact Variable %(variable)s %(filterType)s %(filter)s filter %(xlinkLabel)s passes %(factCount)s facts"), 
@@ -655,11 +745,35 @@ def implicitFilter(xpCtx, vb, facts, uncoveredAspectFacts):
         #                       for aspect, fact in uncoveredAspectFacts.items()
         #                       if not vb.hasAspectValueCovered(aspect)]
         if testableAspectFacts:
-            # not tracing, do bulk aspect filtering
-            _facts = [fact
-                      for fact in facts
-                      if all(aspectMatches(xpCtx, uncoveredAspectFact, fact, aspect)
-                             for (aspect, uncoveredAspectFact) in testableAspectFacts)]
+            # not tracing, do bulk aspect filtering, intersecting the instance's aspect value indexes for indexed aspects
+            indexedAspectFacts = []
+            unindexedAspectFacts = []
+            for aspect, uncoveredAspectFact in testableAspectFacts:
+                aspectValue = None
+                if (isinstance(uncoveredAspectFact, ModelFact) and 
+                    len(vb.instances) == 1 and vb.instances[0] is uncoveredAspectFact.modelXbrl): # not multi-instance
+                    aspectValue = aspectValueKey(uncoveredAspectFact, aspect)
+                if aspectValue is None:
+                    unindexedAspectFacts.append((aspect, uncoveredAspectFact))
+                else:
+                    indexedAspectFacts.append(uncoveredAspectFact.modelXbrl.factsByAspectValue(aspect, aspectValue))
+            _facts = facts
+            if indexedAspectFacts:
+                indexedAspectFacts.sort(key=len)
+                if len(indexedAspectFacts[0]) < len(facts):
+                    factsSet = facts if isinstance(facts, (set, frozenset)) else set(facts)
+                    _facts = [fact
+                              for fact in indexedAspectFacts[0]
+                              if fact in factsSet and all(fact in aspectFacts for aspectFacts in indexedAspectFacts[1:])]
+                else:
+                    _facts = [fact
+                              for fact in facts
+                              if all(fact in aspectFacts for aspectFacts in indexedAspectFacts)]
+            if unindexedAspectFacts:
+                _facts = [fact
+                          for fact in _facts
+                          if all(aspectMatches(xpCtx, uncoveredAspectFact, fact, aspect)
+                                 for (aspect, uncoveredAspectFact) in unindexedAspectFacts)]
         else:
             _facts = facts
             
@@ -785,59 +899,188 @@ def aspectMatches(xpCtx, fact1, fact2, aspect):
 
 def factsPartitions(xpCtx, facts, aspects):
     factsPartitions = []
+    if not isSingleInstance(facts): # aspect value keys only compare within an instance
+        for fact in facts:
+            matched = False
+            for partition in factsPartitions:
+                if aspectsMatch(xpCtx, fact, partition[0], aspects):
+                    partition.append(fact)
+                    matched = True
+                    break
+            if not matched:
+                factsPartitions.append([fact,])
+        return factsPartitions
+    # bucket facts by signature of their aspect value keys (and hashes of aspects without keys), facts with 
+    # different signatures never match, within a bucket only aspects without keys (typed dimensions, segment 
+    # and scenario) need comparing
+    aspects = tuple(aspects)
+    signaturePartitions = defaultdict(list)
     for fact in facts:
-        matched = False
-        for partition in factsPartitions:
-            if aspectsMatch(xpCtx, fact, partition[0], aspects):
-                partition.append(fact)
-                matched = True
-                break
-        if not matched:
-            factsPartitions.append([fact,])
+        signature = aspectsSignature(xpCtx, fact, aspects)
+        partitions = signaturePartitions[signature]
+        if partitions:
+            unindexedAspects = [aspect for aspect, key in zip(aspects, signature[0]) if key is None]
+            for partition in partitions:
+                if aspectsMatch(xpCtx, fact, partition[0], unindexedAspects):
+                    partition.append(fact)
+                    break
+            else:
+                partitions.append([fact,])
+                factsPartitions.append(partitions[-1])
+        else:
+            partitions.append([fact,])
+            factsPartitions.append(partitions[-1])
     return factsPartitions
 
+def aspectsSignature(xpCtx, fact, aspects):
+    # aspect value keys of the fact (None for aspects which are not indexed), and hashes of the unindexed aspects
+    keys = tuple(aspectValueKey(fact, aspect) for aspect in aspects)
+    return (keys, 
+            tuple(aspectHash(xpCtx, fact, aspect) for aspect, key in zip(aspects, keys) if key is None))
+
+def aspectHash(xpCtx, fact, aspect):
+    # hash of an unindexed aspect, equal for facts which match on the aspect (as by aspectMatches), else None
+    if fact.isTuple or fact.context is None:
+        return None
+    context = fact.context
+    if isinstance(aspect, QName):
+        dimValue = context.dimValue(aspect)
+        if (isinstance(dimValue, ModelDimensionValue) and dimValue.isTyped and 
+            dimValue.dimension.typedDomainElement not in getattr(xpCtx.modelXbrl, "modelFormulaEqualityDefinitions", {})):
+            return XbrlUtil.correspondenceHash(dimValue.typedMember)
+    elif aspect == 6: # Aspect.COMPLETE_SEGMENT
+        return XbrlUtil.correspondenceHash(context.segment)
+    elif aspect == 7: # Aspect.COMPLETE_SCENARIO
+        return XbrlUtil.correspondenceHash(context.scenario)
+    elif aspect == 8 or aspect == 9: # aspect in (Aspect.NON_XDT_SEGMENT, Aspect.NON_XDT_SCENARIO)
+        return hash(tuple(XbrlUtil.correspondenceHash(elt) for elt in context.nonDimValues(aspect)))
+    return None
+
+def isSingleInstance(facts):
+    modelXbrl = None
+    for fact in facts:
+        if modelXbrl is None:
+            modelXbrl = fact.modelXbrl
+        elif fact.modelXbrl is not modelXbrl:
+            return False
+    return True
+
 def evaluationIsUnnecessary(thisEval, xpCtx):
-    otherEvals = xpCtx.evaluations
-    if otherEvals:
-        otherEvalHashDicts = xpCtx.evaluationHashDicts
-        # HF try
-        # if all(e is None for e in thisEval):
-        if all(e is None for e in thisEval.values()):
-            return True  # evaluation not necessary, all fallen back
-        # hash check if any hashes merit further look for equality
-        otherEvalSets = [otherEvalHashDicts[vQn][hash(vBoundFact)]
-                         for vQn, vBoundFact in thisEval.items()
-                         if vBoundFact is not None
-                         if vQn in otherEvalHashDicts
-                         if hash(vBoundFact) in otherEvalHashDicts[vQn]]
-        if otherEvalSets:
-            matchingEvals = [otherEvals[i] for i in  set.intersection(*otherEvalSets)]
+    return xpCtx.evaluations.isUnnecessary(thisEval, xpCtx.varBindings)
+
+class EvaluationRegistry:
+    """
+    .. class:: EvaluationRegistry()
+
+    Completed evaluations of a variable set, to detect evaluations which are unnecessary, because they duplicate
+    a completed evaluation, in its facts bound to variables which are not fallen back.
+
+    Each evaluation is a tuple of the matchable bound facts of the variables (None if fallen back, for parameters and
+    general variables).  A variable's bound fact which no completed evaluation bound to that variable must be
+    bound to a variable which depends on a variable fallen back in this evaluation (but bound in a completed
+    evaluation duplicating this one), otherwise the evaluation is necessary.  The other bound facts are looked up,
+    as a tuple, in a hash index of the completed evaluations projected on those variables, which is built when a
+    set of variables is first looked up and maintained as evaluations are added, with the variables bound by any
+    of its evaluations, so that each lookup is a constant number of hash operations instead of a scan of the
+    completed evaluations.
+
+    Each projection has up to an entry per completed evaluation, and there may be a projection for each distinct
+    set of variables whose bound facts were previously bound, so at most MAX_EVALUATION_PROJECTIONS projections
+    are retained, the least recently used being dropped (and rebuilt, by one scan of the completed evaluations,
+    if looked up again).  Typically few sets of variables are looked up (once each variable's facts have been
+    bound, evaluations are looked up by the same variables), so that projections are rarely rebuilt, and a
+    rebuild costs no more than the scan of the completed evaluations which each lookup would otherwise be.
+    """
+    def __init__(self):
+        self.varQnames = () # variable qnames, in order of evaluation tuples
+        self.evaluations = [] # completed evaluation tuples
+        self.boundFacts = [] # by variable index: set of facts bound in completed evaluations
+        # by tuple of variable indices, least recently used first: {projected evaluation: bit mask of variables bound in such evaluations}
+        self.projections = OrderedDict()
+        self.projectionsBuilt = 0 # including rebuilds of dropped projections
+
+    def __len__(self):
+        return len(self.evaluations)
+
+    def add(self, thisEval):
+        """Adds a completed evaluation
+
+        :param thisEval: Matchable bound fact (or None) by variable qname
+        :type thisEval: dict
+        """
+        if not self.evaluations: # all evaluations of a variable set have the same variables
+            self.varQnames = tuple(thisEval.keys())
+            self.boundFacts = [set() for vQn in self.varQnames]
+        evaluation = tuple(thisEval[vQn] for vQn in self.varQnames)
+        self.evaluations.append(evaluation)
+        boundMask = 0
+        for i, vBoundFact in enumerate(evaluation):
+            if vBoundFact is not None:
+                self.boundFacts[i].add(vBoundFact)
+                boundMask |= 1 << i
+        for varIndices, projection in self.projections.items():
+            key = tuple(evaluation[i] for i in varIndices)
+            projection[key] = projection.get(key, 0) | boundMask
+
+    def projection(self, varIndices):
+        projection = self.projections.pop(varIndices, None)
+        if projection is not None:
+            self.projections[varIndices] = projection # most recently used
         else:
-            matchingEvals = otherEvals
-        # find set of vQn whose dependencies are fallen back in this eval but not others that match
-        varBindings = xpCtx.varBindings
-        vQnDependentOnOtherVarFallenBackButBoundInOtherEval = set(
-            vQn
-            for vQn, vBoundFact in thisEval.items()
-            if vBoundFact is not None and
-               any(varBindings[varRefQn].isFallback and 
-                   any(m[varRefQn] is not None for m in matchingEvals)
-                   for varRefQn in varBindings[vQn].var.variableRefs()))
-        # detects evaluations which are not different (duplicate) and extra fallback evaluations
-        # vBoundFact may be single fact or tuple of facts
-        return any(all([vBoundFact == matchingEval[vQn] 
-                        for vQn, vBoundFact in thisEval.items() 
-                        if vBoundFact is not None
-                        and vQn not in vQnDependentOnOtherVarFallenBackButBoundInOtherEval])
-                   for matchingEval in matchingEvals)
-    return False
-    '''
-    r = range(len(thisEval))
-    for otherEval in otherEvals:
-        if all([thisEval[i] is None or thisEval[i] == otherEval[i] for i in r]):
-            return True
-    return False
-    '''
+            if len(self.projections) >= MAX_EVALUATION_PROJECTIONS:
+                self.projections.popitem(last=False) # drop least recently used
+            projection = self.projections[varIndices] = {}
+            self.projectionsBuilt += 1
+            for evaluation in self.evaluations:
+                key = tuple(evaluation[i] for i in varIndices)
+                boundMask = projection.get(key, 0)
+                for i, vBoundFact in enumerate(evaluation):
+                    if vBoundFact is not None:
+                        boundMask |= 1 << i
+                projection[key] = boundMask
+        return projection
+
+    def isUnnecessary(self, thisEval, varBindings):
+        """True if thisEval duplicates a completed evaluation or is an extra fallback evaluation
+
+        :param thisEval: Matchable bound fact (or None) by variable qname
+        :type thisEval: dict
+        :param varBindings: VariableBinding of this evaluation by variable qname
+        :type varBindings: dict
+        """
+        if not self.evaluations:
+            return False
+        boundFacts = self.boundFacts
+        matchedIndices = []
+        matchedFacts = []
+        unmatchedQnames = []
+        for i, vQn in enumerate(self.varQnames):
+            vBoundFact = thisEval[vQn]
+            if vBoundFact is not None:
+                if vBoundFact in boundFacts[i]:
+                    matchedIndices.append(i)
+                    matchedFacts.append(vBoundFact)
+                else:
+                    unmatchedQnames.append(vQn)
+        if not matchedIndices and not unmatchedQnames:
+            return True  # evaluation not necessary, all fallen back
+        # variables bound in the completed evaluations matching this evaluation's previously bound facts
+        boundMask = self.projection(tuple(matchedIndices)).get(tuple(matchedFacts))
+        if boundMask is None:
+            return False
+        # other bound facts are only disregarded for variables depending on a variable fallen back in this evaluation
+        # but bound in a matching evaluation
+        varQnameIndex = dict((vQn, i) for i, vQn in enumerate(self.varQnames)) if unmatchedQnames else None
+        for vQn in unmatchedQnames:
+            if not any(varBindings[varRefQn].isFallback and boundMask & (1 << varQnameIndex[varRefQn])
+                       for varRefQn in varBindings[vQn].var.variableRefs()):
+                return False
+        return True
+
+    def clear(self):
+        del self.evaluations[:] # dereference
+        self.boundFacts = []
+        self.projections.clear()
 
 def produceOutputFact(xpCtx, formula, result):
     priorErrorCount = len(xpCtx.modelXbrl.errors)
@@ -1270,15 +1513,34 @@ class VariableBinding:
         subpartition0 = []
         subpartitions = [subpartition0]
         matches = defaultdict(list) # position: [matching facts]
-        for fact in partition:
-            matched = False
-            for i, fact2 in enumerate(subpartition0):
-                if aspectsMatch(self.xpCtx, fact, fact2, aspects):
-                    matches[i].append(fact)
-                    matched = True
-                    break
-            if not matched:
-                subpartition0.append(fact)
+        if isSingleInstance(partition):
+            # compare only facts with the same signature of aspect value keys and hashes, on their unindexed aspects
+            aspects = tuple(aspects)
+            signaturePositions = defaultdict(list)
+            for fact in partition:
+                signature = aspectsSignature(self.xpCtx, fact, aspects)
+                positions = signaturePositions[signature]
+                matched = False
+                if positions:
+                    unindexedAspects = [aspect for aspect, key in zip(aspects, signature[0]) if key is None]
+                    for i in positions:
+                        if aspectsMatch(self.xpCtx, fact, subpartition0[i], unindexedAspects):
+                            matches[i].append(fact)
+                            matched = True
+                            break
+                if not matched:
+                    positions.append(len(subpartition0))
+                    subpartition0.append(fact)
+        else:
+            for fact in partition:
+                matched = False
+                for i, fact2 in enumerate(subpartition0):
+                    if aspectsMatch(self.xpCtx, fact, fact2, aspects):
+                        matches[i].append(fact)
+                        matched = True
+                        break
+                if not matched:
+                    subpartition0.append(fact)
         if matches:
             matchIndices = sorted(matches.keys())
             matchIndicesLen = len(matchIndices)
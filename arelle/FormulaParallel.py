@@ -0,0 +1,148 @@
+'''
+Created on Oct 18, 2026
+
+Parallel evaluation of formula assertions (--formulaProcesses), evaluating the value and existence assertions
+which are independent of other variable sets in a pool of processes, forked from this process so that they
+share its loaded DTS, instances and compiled formula linkbases.
+
+An assertion is independent, and evaluated by the pool, if it has no variables-scope relationships and its
+fact variables bind facts of the standard input instance (not of instances produced by formulas or provided
+by instance parameters).  Formulas, consistency assertions and other variable sets are evaluated by this
+process, in their usual order.  The satisfied and not satisfied counts, messages and error codes of each
+assertion evaluated by the pool are merged back in that same order, as if evaluated by this process.
+
+Requires the fork process start method (not available on Windows), otherwise variable sets are evaluated
+by this process.
+
+@author: Mark V Systems Limited
+(c) Copyright 2026 Mark V Systems Limited, All rights reserved.
+'''
+import logging, multiprocessing, sys
+from arelle import XbrlConst, XPathContext
+from arelle.ModelFormulaObject import ModelVariableSetAssertion
+
+_evaluation = None # (val, xpathContext, variableSets) of the parent process, inherited by pool processes
+
+class LogRecorder:
+    # replaces the modelXbrl logger in a pool process, recording (dereferenced) log records for the parent process
+    def __init__(self, logger):
+        self.logger = logger
+        self.messageCodeFilter = logger.messageCodeFilter
+        self.messageLevelFilter = logger.messageLevelFilter
+        self.records = []
+    def log(self, level, *logArgs, exc_info=None, extra=None):
+        if exc_info: # traceback objects don't pickle, format it into the message for the parent process
+            if not isinstance(exc_info, tuple):
+                exc_info = sys.exc_info()
+            if exc_info[0] is not None and logArgs and isinstance(logArgs[0], str):
+                formattedException = logging.Formatter().formatException(exc_info)
+                if len(logArgs) > 1: # message is %-formatted with its args
+                    formattedException = formattedException.replace("%", "%%")
+                logArgs = (logArgs[0] + "\n" + formattedException,) + logArgs[1:]
+        self.records.append((level, logArgs, extra))
+
+def isIndependentAssertion(modelXbrl, modelVariableSet):
+    """True if modelVariableSet is a value or existence assertion which may be evaluated by a pool process
+    """
+    if not isinstance(modelVariableSet, ModelVariableSetAssertion):
+        return False
+    variablesScope = modelXbrl.relationshipSet(XbrlConst.variablesScope)
+    if variablesScope.fromModelObject(modelVariableSet) or variablesScope.toModelObject(modelVariableSet):
+        return False
+    return not any(getattr(varRel.toModelObject, "fromInstanceQnames", None)
+                   for varRel in modelXbrl.relationshipSet(XbrlConst.variableSet).fromModelObject(modelVariableSet))
+
+def evaluateInProcess(index):
+    # evaluates a variable set in a pool process, returning its results for the parent process
+    from arelle.ValidateFormula import evaluateVariableSet
+    val, xpathContext, variableSets = _evaluation
+    modelVariableSet = variableSets[index]
+    modelXbrl = val.modelXbrl
+    logRecorder = LogRecorder(modelXbrl.logger)
+    errorsCount = len(modelXbrl.errors)
+    logCount = modelXbrl.logCount.copy()
+    profiler = xpathContext.formulaProfiler
+    if profiler is not None: # entries of this variable set only, profiler was forked with the parent's entries
+        profiler.entries.clear()
+        profiler.path = ()
+    modelXbrl.logger = logRecorder
+    try:
+        evaluateVariableSet(val, xpathContext, modelVariableSet)
+    except Exception as err:
+        modelXbrl.error("formula:parallelEvaluationException",
+                        _("Variable set %(xlinkLabel)s evaluation exception: %(error)s"),
+                        modelObject=modelVariableSet, xlinkLabel=modelVariableSet.xlinkLabel, error=err,
+                        exc_info=True)
+    finally:
+        modelXbrl.logger = logRecorder.logger
+    if xpathContext.factDependencies is not None and modelVariableSet in xpathContext.factDependencies:
+        variableFacts = dict((varQname, [fact.objectIndex for fact in facts]) # facts by their index in the parent process
+                             for varQname, facts in xpathContext.factDependencies[modelVariableSet].items())
+    else:
+        variableFacts = None
+    return (modelVariableSet.countSatisfied, modelVariableSet.countNotSatisfied, variableFacts,
+            profiler.exportEntries() if profiler is not None else None,
+            logRecorder.records,
+            modelXbrl.errors[errorsCount:],
+            dict((level, count - logCount.get(level, 0))
+                 for level, count in modelXbrl.logCount.items()
+                 if count != logCount.get(level, 0)))
+
+def mergeResults(modelXbrl, xpathContext, modelVariableSet, results):
+    countSatisfied, countNotSatisfied, variableFacts, profileEntries, records, errors, logCounts = results
+    modelVariableSet.countSatisfied = countSatisfied
+    modelVariableSet.countNotSatisfied = countNotSatisfied
+    if variableFacts is not None:
+        xpathContext.factDependencies[modelVariableSet] = dict(
+            (varQname, set(modelXbrl.modelObjects[objectIndex] for objectIndex in objectIndices))
+            for varQname, objectIndices in variableFacts.items())
+    if profileEntries is not None:
+        xpathContext.formulaProfiler.mergeEntries(modelXbrl, profileEntries)
+    for level, logArgs, extra in records:
+        modelXbrl.logger.log(level, *logArgs, extra=extra)
+    modelXbrl.errors.extend(errors)
+    for level, count in logCounts.items():
+        modelXbrl.logCount[level] = modelXbrl.logCount.get(level, 0) + count
+
+def evaluateVariableSets(val, xpathContext, variableSets, processes):
+    """Evaluates variableSets, in order, the independent assertions by a pool of processes
+
+    :param variableSets: Variable sets to evaluate, in evaluation order
+    :type variableSets: [ModelVariableSet]
+    :param processes: Number of pool processes
+    :type processes: int
+    """
+    global _evaluation
+    from arelle.ValidateFormula import evaluateVariableSet
+    modelXbrl = val.modelXbrl
+    pooledIndices = [i
+                     for i, modelVariableSet in enumerate(variableSets)
+                     if isIndependentAssertion(modelXbrl, modelVariableSet)]
+    if len(pooledIndices) < 2 or "fork" not in multiprocessing.get_all_start_methods():
+        if len(pooledIndices) >= 2:
+            modelXbrl.warning("formula:parallelProcesses",
+                              _("Formula assertions are evaluated by one process, processes can not be forked on this platform"),
+                              modelObject=modelXbrl)
+        for modelVariableSet in variableSets:
+            evaluateVariableSet(val, xpathContext, modelVariableSet)
+        return
+    _evaluation = (val, xpathContext, variableSets)
+    pool = multiprocessing.get_context("fork").Pool(processes)
+    try:
+        asyncResults = dict((i, pool.apply_async(evaluateInProcess, (i,))) for i in pooledIndices)
+        for i, modelVariableSet in enumerate(variableSets):
+            if i in asyncResults:
+                while True:
+                    try:
+                        results = asyncResults[i].get(1.0)
+                        break
+                    except multiprocessing.TimeoutError:
+                        if xpathContext.isRunTimeExceeded:
+                            raise XPathContext.RunTimeExceededException()
+                mergeResults(modelXbrl, xpathContext, modelVariableSet, results)
+            else:
+                evaluateVariableSet(val, xpathContext, modelVariableSet)
+    finally:
+        pool.terminate()
+        pool.join()
+        _evaluation = None
@@ -0,0 +1,182 @@
+'''
+Created on Oct 18, 2026
+
+Formula profiler (--formulaProfile), recording the cost of evaluating each variable set (assertion or formula),
+each of its fact variables and each of their filters, to find the rules of a formula linkbase which take most of
+its run time.
+
+Profile entries are kept by path: variable set, then variable qname, then filter (and the sub-filters of boolean
+filters), with group filters directly under the variable set and variable sets evaluated in the scope of another
+variable set under that variable set.  Each entry has its call count, the facts in and out of its filtering (for
+the winnowing ratio), the completed evaluations and evaluations skipped as duplicates (of variable sets), and its
+cumulative time.  The time of a variable entry is of finding its facts (its filters and implicit filtering), not of
+evaluating the variables which follow it.
+
+Profiles are saved as JSON (.json), CSV (.csv), or otherwise as folded stacks (one line per path, with its own
+time in microseconds), for flame graph tools such as flamegraph.pl or speedscope.
+
+@author: Mark V Systems Limited
+(c) Copyright 2026 Mark V Systems Limited, All rights reserved.
+'''
+import csv, io, json, time
+from collections import OrderedDict
+from arelle.ModelObject import ModelObject
+from arelle.ModelValue import QName
+
+CALLS, FACTS_IN, FACTS_OUT, EVALUATIONS, SKIPPED, TIME = range(6) # profile entry values
+IMPLICIT_FILTER = "implicit filter" # path item of the implicit filtering of a variable
+
+class FormulaProfiler:
+    """
+    .. class:: FormulaProfiler()
+
+    FormulaProfiler records profile entries of the variable sets, variables and filters evaluated by an XPathContext.
+    """
+    def __init__(self):
+        self.entries = OrderedDict() # by path (tuple of variable set, variable qname, filters): [values]
+        self.path = ()
+
+    def start(self, pathItem):
+        """Starts profiling pathItem (variable set, variable qname or filter) under the current path.
+
+        :returns: tuple -- prior path and start time, for stop()
+        """
+        priorPath = self.path
+        self.path = path = priorPath + (pathItem,)
+        if path not in self.entries: # entries are in order of first evaluation
+            self.entries[path] = [0, 0, 0, 0, 0, 0.0]
+        return priorPath, time.time()
+
+    def stop(self, started, factsIn=0, factsOut=0, evaluations=0, skipped=0):
+        """Stops profiling the path item of started (returned by start), restoring the prior path.
+        """
+        priorPath, startedAt = started
+        elapsed = time.time() - startedAt
+        path = self.path[:len(priorPath) + 1] # path items started (but not stopped) since, such as by an exception, are discarded
+        entry = self.entries.get(path)
+        if entry is None:
+            entry = self.entries[path] = [0, 0, 0, 0, 0, 0.0]
+        entry[CALLS] += 1
+        entry[FACTS_IN] += factsIn
+        entry[FACTS_OUT] += factsOut
+        entry[EVALUATIONS] += evaluations
+        entry[SKIPPED] += skipped
+        entry[TIME] += elapsed
+        self.path = priorPath
+
+    def skippedEvaluation(self):
+        # counts a duplicate evaluation skipped by the current variable set
+        entry = self.entries.get(self.path)
+        if entry is None:
+            entry = self.entries[self.path] = [0, 0, 0, 0, 0, 0.0]
+        entry[SKIPPED] += 1
+
+    def exportEntries(self):
+        """Entries of this (pool) process, with model objects of paths by their object index, for mergeEntries.
+        """
+        return [(tuple(("objectIndex", pathItem.objectIndex) if isinstance(pathItem, ModelObject) else pathItem
+                       for pathItem in path),
+                 values)
+                for path, values in self.entries.items()]
+
+    def mergeEntries(self, modelXbrl, exportedEntries):
+        """Adds entries exported by a pool process (FormulaParallel) to the entries of this process, under the
+        current path.
+        """
+        for exportedPath, values in exportedEntries:
+            path = self.path + tuple(modelXbrl.modelObjects[pathItem[1]]
+                                     if isinstance(pathItem, tuple) and pathItem[0] == "objectIndex" else pathItem
+                                     for pathItem in exportedPath)
+            entry = self.entries.get(path)
+            if entry is None:
+                entry = self.entries[path] = [0, 0, 0, 0, 0, 0.0]
+            for i, value in enumerate(values):
+                entry[i] += value
+
+    def profileRows(self):
+        # rows of the profile entries, with own time (excluding the time of sub-entries) and share of total time
+        childTime = {}
+        for path, values in self.entries.items():
+            if len(path) > 1:
+                childTime[path[:-1]] = childTime.get(path[:-1], 0.0) + values[TIME]
+        totalTime = sum(values[TIME] for path, values in self.entries.items() if len(path) == 1)
+        rows = []
+        for path, values in self.entries.items():
+            calls, factsIn, factsOut, evaluations, skipped, cumulativeTime = values
+            rows.append(OrderedDict((
+                ("path", [pathItemLabel(pathItem) for pathItem in path]),
+                ("type", pathItemType(path[-1])),
+                ("calls", calls),
+                ("factsIn", factsIn),
+                ("factsOut", factsOut),
+                ("winnowing", round(factsOut / factsIn, 6) if factsIn else None),
+                ("evaluations", evaluations),
+                ("skippedDuplicates", skipped),
+                ("time", round(cumulativeTime, 6)),
+                ("ownTime", round(max(cumulativeTime - childTime.get(path, 0.0), 0.0), 6)),
+                ("timeShare", round(cumulativeTime / totalTime, 6) if totalTime else None))))
+        return rows, totalTime
+
+    def save(self, profileFile):
+        """Saves the profile as JSON (.json), CSV (.csv) or folded stacks (other file extensions).
+        """
+        rows, totalTime = self.profileRows()
+        if profileFile.endswith(".json"):
+            with io.open(profileFile, "wt", encoding="utf-8") as fh:
+                json.dump(OrderedDict((("totalTime", round(totalTime, 6)),
+                                       ("entries", rows))),
+                          fh, ensure_ascii=False, indent=1)
+        elif profileFile.endswith(".csv"):
+            with io.open(profileFile, "wt", encoding="utf-8-sig", newline="") as fh:
+                writer = csv.writer(fh)
+                columns = list(rows[0].keys()) if rows else ["path"]
+                writer.writerow(columns)
+                for row in rows:
+                    writer.writerow(" / ".join(row[column]) if column == "path" else
+                                    ("" if row[column] is None else row[column])
+                                    for column in columns)
+        else: # folded stacks
+            with io.open(profileFile, "wt", encoding="utf-8") as fh:
+                for row in rows:
+                    ownMicroseconds = int(row["ownTime"] * 1000000)
+                    if ownMicroseconds > 0:
+                        fh.write("{} {}\n".format(";".join(label.replace(";", ",") for label in row["path"]),
+                                                  ownMicroseconds))
+
+    def report(self, modelXbrl, profileFiles):
+        """Saves the profile in each of the '|' separated profileFiles and logs the variable sets taking most time.
+        """
+        for profileFile in profileFiles.split("|"):
+            try:
+                self.save(profileFile)
+            except (IOError, OSError) as err:
+                modelXbrl.error("formula:profileSaveError",
+                                _("Formula profile could not be saved in %(file)s: %(error)s"),
+                                modelObject=modelXbrl, file=profileFile, error=err)
+        rows, totalTime = self.profileRows()
+        variableSetRows = sorted((row for row in rows if len(row["path"]) == 1), key=lambda row: -row["time"])
+        modelXbrl.info("formula:profile",
+                       _("Formula profile of %(count)s variable sets, %(time)s secs, saved in %(files)s, most time taken by %(variableSets)s"),
+                       modelObject=modelXbrl, count=len(variableSetRows), time="{:.3f}".format(totalTime),
+                       files=profileFiles,
+                       variableSets=", ".join("{} {:.1%}".format(row["path"][0], row["timeShare"] or 0.0)
+                                              for row in variableSetRows[:5]))
+
+def pathItemLabel(pathItem):
+    if isinstance(pathItem, QName):
+        return "$" + str(pathItem)
+    if isinstance(pathItem, ModelObject):
+        return "{} {}".format(pathItem.localName, pathItem.id or pathItem.get("{http://www.w3.org/1999/xlink}label") or "")
+    return str(pathItem)
+
+def pathItemType(pathItem):
+    from arelle.ModelFormulaObject import ModelVariableSet, ModelFilter
+    if isinstance(pathItem, QName):
+        return "variable"
+    if pathItem == IMPLICIT_FILTER:
+        return "implicitFilter"
+    if isinstance(pathItem, ModelVariableSet):
+        return "variableSet"
+    if isinstance(pathItem, ModelFilter):
+        return "filter"
+    return "other"
@@ -9,11 +9,12 @@ from collections import defaultdict
 from decimal import Decimal
 from lxml import etree
 from xml.sax import SAXParseException
-from arelle import (PackageManager, XbrlConst, XmlUtil, UrlUtil, ValidateFilingText, 
+from arelle import (DiscoveryReadAhead, PackageManager, XbrlConst, XmlUtil, UrlUtil, ValidateFilingText, 
                     XhtmlValidate, XmlValidateSchema)
 from arelle.ModelObject import ModelObject, ModelComment
 from arelle.ModelValue import qname
-from arelle.ModelDtsObject import ModelLink, ModelResource, ModelRelationship
+from arelle.ModelDtsObject import (ModelLink, ModelResource, ModelRelationship,
+                                   nonDeferredLinkChildren)
 from arelle.ModelInstanceObject import ModelFact, ModelInlineFact
 from arelle.ModelObjectFactory import parser
 from arelle.PrototypeDtsObject import LinkPrototype, LocPrototype, ArcPrototype, DocumentPrototype
@@ -24,6 +25,14 @@ from arelle.XmlValidate import VALID, validate as xmlValidate
 
 creationSoftwareNames = None
 
+def mappedUrl(modelXbrl, normalizedUri):
+    """Returns the url or file path to load normalizedUri from, by archive, taxonomy package and disclosure system mappings."""
+    if modelXbrl.fileSource.isMappedUrl(normalizedUri):
+        return modelXbrl.fileSource.mappedUrl(normalizedUri)
+    elif PackageManager.isMappedUrl(normalizedUri):
+        return PackageManager.mappedUrl(normalizedUri)
+    return modelXbrl.modelManager.disclosureSystem.mappedUrl(normalizedUri)
+
 def load(modelXbrl, uri, base=None, referringElement=None, isEntry=False, isDiscovered=False, isIncluded=None, namespace=None, reloadCache=False, **kwargs):
     """Returns a new modelDocument, performing DTS discovery for instance, inline XBRL, schema, 
     linkbase, and versioning report entry urls.
@@ -83,22 +92,23 @@ def load(modelXbrl, uri, base=None, referringElement=None, isEntry=False, isDisc
     if modelXbrl.modelManager.skipLoading and modelXbrl.modelManager.skipLoading.match(normalizedUri):
         return None
     
-    if modelXbrl.fileSource.isMappedUrl(normalizedUri):
-        mappedUri = modelXbrl.fileSource.mappedUrl(normalizedUri)
-    elif PackageManager.isMappedUrl(normalizedUri):
-        mappedUri = PackageManager.mappedUrl(normalizedUri)
-    else:
-        mappedUri = modelXbrl.modelManager.disclosureSystem.mappedUrl(normalizedUri)
+    mappedUri = mappedUrl(modelXbrl, normalizedUri)
         
     if isEntry:
         modelXbrl.entryLoadingUrl = mappedUri   # for error loggiong during loading
         
     # don't try reloading if not loadable
     
+    readAheadDocument = None
     if modelXbrl.fileSource.isInArchive(mappedUri):
         filepath = mappedUri
     else:
-        filepath = modelXbrl.modelManager.cntlr.webCache.getfilename(mappedUri, reload=reloadCache, checkModifiedTime=kwargs.get("checkModifiedTime",False))
+        if modelXbrl.discoveryReadAhead is not None and not reloadCache:
+            readAheadDocument = modelXbrl.discoveryReadAhead.get(mappedUri)
+        if readAheadDocument is not None:
+            filepath = readAheadDocument.filepath
+        else:
+            filepath = modelXbrl.modelManager.cntlr.webCache.getfilename(mappedUri, reload=reloadCache, checkModifiedTime=kwargs.get("checkModifiedTime",False))
         if filepath:
             uri = modelXbrl.modelManager.cntlr.webCache.normalizeUrl(filepath)
     if filepath is None: # error such as HTTPerror is already logged
@@ -140,27 +150,37 @@ def load(modelXbrl, uri, base=None, referringElement=None, isEntry=False, isDisc
                 return None
             if modelDocument is not None:
                 return modelDocument
-        if (modelXbrl.modelManager.validateDisclosureSystem and 
-            modelXbrl.modelManager.disclosureSystem.validateFileText and
-            not normalizedUri in modelXbrl.modelManager.disclosureSystem.standardTaxonomiesDict):
-            file, _encoding = ValidateFilingText.checkfile(modelXbrl,filepath)
+        if readAheadDocument is not None and readAheadDocument.xmlDocument is not None:
+            # parsed by a discovery read ahead thread, which already submitted its references
+            xmlDocument = readAheadDocument.xmlDocument
+            _encoding = readAheadDocument.encoding
+            _parser, _parserLookupName, _parserLookupClass = readAheadDocument.parser
         else:
-            file, _encoding = modelXbrl.fileSource.file(filepath, stripDeclaration=True)
-        xmlDocument = None
-        isPluginParserDocument = False
-        for pluginMethod in pluginClassMethods("ModelDocument.CustomLoader"):
-            modelDocument = pluginMethod(modelXbrl, file, mappedUri, filepath)
-            if modelDocument is not None:
-                file.close()
-                return modelDocument
-        _parser, _parserLookupName, _parserLookupClass = parser(modelXbrl,filepath)
-        xmlDocument = etree.parse(file,parser=_parser,base_url=filepath)
+            if (modelXbrl.modelManager.validateDisclosureSystem and 
+                modelXbrl.modelManager.disclosureSystem.validateFileText and
+                not normalizedUri in modelXbrl.modelManager.disclosureSystem.standardTaxonomiesDict):
+                file, _encoding = ValidateFilingText.checkfile(modelXbrl,filepath)
+            else:
+                file, _encoding = modelXbrl.fileSource.file(filepath, stripDeclaration=True)
+            xmlDocument = None
+            isPluginParserDocument = False
+            for pluginMethod in pluginClassMethods("ModelDocument.CustomLoader"):
+                modelDocument = pluginMethod(modelXbrl, file, mappedUri, filepath)
+                if modelDocument is not None:
+                    file.close()
+                    return modelDocument
+            _parser, _parserLookupName, _parserLookupClass = parser(modelXbrl,filepath)
+            xmlDocument = etree.parse(file,parser=_parser,base_url=filepath)
+            file.close()
+            if modelXbrl.discoveryReadAhead is not None:
+                modelXbrl.discoveryReadAhead.submit(xmlDocument, normalizedUri, _parserLookupClass)
+            elif modelXbrl.modelManager.prefetchThreads:
+                DiscoveryReadAhead.prefetch(modelXbrl, xmlDocument, normalizedUri, _parserLookupClass)
         for error in _parser.error_log:
             modelXbrl.error("xmlSchema:syntax",
                     _("%(error)s, %(fileName)s, line %(line)s, column %(column)s, %(sourceAction)s source element"),
                     modelObject=referringElement, fileName=os.path.basename(uri), 
                     error=error.message, line=error.line, column=error.column, sourceAction=("including" if isIncluded else "importing"))
-        file.close()
     except (EnvironmentError, KeyError) as err:  # missing zip file raises KeyError
         if file:
             file.close()
@@ -999,6 +1019,18 @@ class ModelDocument:
                         ns = None
                         
     def schemaLinkbaseRefsDiscover(self, tree):
+        dtsPool = self.modelXbrl.modelManager.dtsPool
+        if (dtsPool is not None and self.type in (Type.INSTANCE, Type.INLINEXBRL) and
+            not hasattr(self.modelXbrl, "dtsPoolEntry") and
+            all(doc.type in (Type.INSTANCE, Type.INLINEXBRL) for doc in self.modelXbrl.urlDocs.values())):
+            # attach a shared DTS from the pool when no DTS documents are loaded yet
+            refUrls = [self.modelXbrl.modelManager.cntlr.webCache.normalizeUrl(
+                            UrlUtil.splitDecodeFragment(element.get("{http://www.w3.org/1999/xlink}href"))[0], 
+                            self.baseForElement(element))
+                       for refln in ("{http://www.xbrl.org/2003/linkbase}schemaRef", "{http://www.xbrl.org/2003/linkbase}linkbaseRef")
+                       for element in tree.iterdescendants(tag=refln)
+                       if isinstance(element,ModelObject) and element.get("{http://www.w3.org/1999/xlink}href")]
+            dtsPool.attach(self.modelXbrl, refUrls)
         for refln in ("{http://www.xbrl.org/2003/linkbase}schemaRef", "{http://www.xbrl.org/2003/linkbase}linkbaseRef"):
             for element in tree.iterdescendants(tag=refln):
                 if isinstance(element,ModelObject):
@@ -1013,6 +1045,10 @@ class ModelDocument:
                 self.linkbaseDiscover(self, linkbaseElement)
 
     def linkbaseDiscover(self, linkbaseElement, inInstance=False):
+        # label and reference resources of DTS linkbases may be left unproxied until accessed
+        # (but not of a pooled DTS, whose objects must all be proxied before instances share it)
+        deferResources = (self.modelXbrl.modelManager.lazyLinkbases and not inInstance and
+                          not getattr(self.modelXbrl, "isPooledDts", False))
         # sequence linkbase elements for elementPointer efficiency
         lbElementSequence = 0
         for lbElement in linkbaseElement:
@@ -1045,11 +1081,17 @@ class ModelDocument:
                                            ("XBRL-footnotes",linkrole,None,None))
                             for baseSetKey in baseSetKeys:
                                 self.modelXbrl.baseSets[baseSetKey].append(lbElement)
+                        if deferResources:
+                            # deferred resources are not proxied, so sequences of the other children are unknown
+                            linkChildren = nonDeferredLinkChildren(lbElement)
+                        else:
+                            linkChildren = lbElement.iterchildren()
                         linkElementSequence = 0
-                        for linkElement in lbElement.iterchildren():
+                        for linkElement in linkChildren:
                             if isinstance(linkElement,ModelObject):
-                                linkElementSequence += 1
-                                linkElement._elementSequence = linkElementSequence
+                                if not deferResources:
+                                    linkElementSequence += 1
+                                    linkElement._elementSequence = linkElementSequence
                                 self.schemalocateElementNamespace(linkElement)
                                 xlinkType = linkElement.get("{http://www.w3.org/1999/xlink}type")
                                 modelResource = None
@@ -1105,6 +1147,14 @@ class ModelDocument:
                                 if modelResource is not None:
                                     lbElement.labeledResources[linkElement.get("{http://www.w3.org/1999/xlink}label")] \
                                         .append(modelResource)
+                        if deferResources:
+                            # proxy one element of each unknown namespace (as of deferred resources), for its schema's discovery
+                            for ns in set(lbElement.nsmap.values()):
+                                if ns not in self.modelXbrl.namespaceDocs:
+                                    for resourceElt in lbElement.iterdescendants("{{{}}}*".format(ns)):
+                                        self.schemalocateElementNamespace(resourceElt)
+                                        break
+                            lbElement.deferResources()
                     else:
                         self.modelXbrl.error("xbrl:schemaDefinitionMissing",
                                 _("Linkbase extended link %(element)s missing schema definition"),
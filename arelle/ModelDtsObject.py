@@ -1555,6 +1555,83 @@ class ModelLink(ModelObject):
     def role(self):
         return self.get("{http://www.w3.org/1999/xlink}role")
 
+    def deferResources(self):
+        """For lazy linkbase loading (modelManager.lazyLinkbases), when this link's locators and arcs have been discovered:
+        leaves its label and reference resources (of deferredResourcePredicate) unproxied, so that their element class lookup,
+        initialization and PSVI happen on first access.  labeledResources proxies the deferred resources when any of
+        their labels is first accessed (such as when a relationship set of the link is built).  The xml:lang and label
+        role of deferred resources are noted now, as their init would have.
+        """
+        resourceLabels = set(deferredResourceLabels(self))
+        if not resourceLabels:
+            return
+        modelXbrl = self.modelXbrl
+        modelXbrl.langs.update(lang for lang in deferredResourceLangs(self) if lang)
+        if deferredResourcesWithoutLang(self):
+            lang = XmlUtil.ancestorOrSelfAttr(self, "{http://www.w3.org/XML/1998/namespace}lang")
+            if lang:
+                modelXbrl.langs.add(lang)
+        modelXbrl.labelroles.update(deferredLabelRoles(self))
+        if deferredLabelsWithoutRole(self):
+            modelXbrl.labelroles.add(None)
+        self.labeledResources = DeferredLabeledResources(self, resourceLabels)
+
+# label and reference resources whose model object class, ModelResource, initializes nothing needed before they are accessed
+deferredResourcePredicate = ("@xlink:type='resource' and "
+                             "(self::link:label or self::link:reference or self::label:label or self::reference:reference)")
+deferredResourceNamespaces = {"xlink": XbrlConst.xlink, "link": XbrlConst.link,
+                              "label": XbrlConst.genLabel, "reference": XbrlConst.genReference}
+nonDeferredLinkChildren = etree.XPath("*[not({})]".format(deferredResourcePredicate),
+                                      namespaces=deferredResourceNamespaces)
+deferredResourceLabels = etree.XPath("*[{}]/@xlink:label".format(deferredResourcePredicate),
+                                     namespaces=deferredResourceNamespaces, smart_strings=False)
+deferredResourceLangs = etree.XPath("*[{}]/@xml:lang".format(deferredResourcePredicate),
+                                    namespaces=deferredResourceNamespaces, smart_strings=False)
+deferredResourcesWithoutLang = etree.XPath("boolean(*[{}][not(@xml:lang)])".format(deferredResourcePredicate),
+                                           namespaces=deferredResourceNamespaces)
+deferredLabelRoles = etree.XPath("*[{}][local-name()='label']/@xlink:role".format(deferredResourcePredicate),
+                                 namespaces=deferredResourceNamespaces, smart_strings=False)
+deferredLabelsWithoutRole = etree.XPath("boolean(*[{}][local-name()='label'][not(@xlink:role)])".format(deferredResourcePredicate),
+                                        namespaces=deferredResourceNamespaces)
+labeledLinkChildren = etree.XPath("*[@xlink:type='locator' or @xlink:type='resource']",
+                                  namespaces=deferredResourceNamespaces)
+
+class DeferredLabeledResources(defaultdict):
+    """
+    .. class:: DeferredLabeledResources(modelLink, deferredLabels)
+
+    labeledResources of a ModelLink with deferred resources, which proxies the deferred resources, in document order
+    with the locators of their labels, when any deferred label is first accessed.  (Building a relationship set of
+    the link visits all of its children, so resources are proxied per link, in one pass, rather than per label.)
+
+    :param modelLink: extended link of the resources
+    :type modelLink: ModelLink
+    :param deferredLabels: xlink:labels of deferred resources
+    :type deferredLabels: set
+    """
+    def __init__(self, modelLink, deferredLabels):
+        super(DeferredLabeledResources, self).__init__(list, modelLink.labeledResources)
+        self.modelLink = modelLink
+        self.deferredLabels = deferredLabels
+
+    def __getitem__(self, label):
+        if label in self.deferredLabels:
+            deferredLabels = self.deferredLabels
+            self.deferredLabels = set()
+            discovered = set(id(linkElement)
+                             for deferredLabel in deferredLabels
+                             for linkElement in self.get(deferredLabel, ()))
+            labeledResources = defaultdict(list)
+            for linkElement in labeledLinkChildren(self.modelLink):
+                if isinstance(linkElement, ModelObject):
+                    xlinkLabel = linkElement.get("{http://www.w3.org/1999/xlink}label")
+                    if xlinkLabel in deferredLabels and (
+                        id(linkElement) in discovered or
+                        linkElement.get("{http://www.w3.org/1999/xlink}type") == "resource"):
+                        labeledResources[xlinkLabel].append(linkElement)
+            self.update(labeledResources)
+        return super(DeferredLabeledResources, self).__getitem__(label)
+
 class ModelResource(ModelObject):
     """
     .. class:: ModelResource(modelDocument)
@@ -0,0 +1,379 @@
+'''
+Created on Oct 18, 2026
+
+Columnar fact table, keeping the facts of large (streamed) instances without their lxml elements.
+
+Each fact is a row of typed arrays: concept QName, contextRef, unitRef, decimals, precision and xml:lang (indexes
+of interned QNames and strings), nil flag, parent tuple row and source line, with the fact values in one UTF-8
+buffer (by offset).  Ids are kept only for facts which have them.  The streamingExtensions plug-in appends each
+fact to the table (modelXbrl.factTable, when the modelManager's loadFactTable is set) as it is streamed, and
+drops its element, so facts take a few tens of bytes each instead of their element, proxy object and
+attributes.  Contexts and units remain model objects (of modelXbrl.contexts and modelXbrl.units), so streaming
+keeps them when loading a fact table.
+
+FactViews, created on demand, have the (read only) ModelFact properties used by fact indexes and validations
+(concept, context, unit, decimals, precision, value, xValue, isNil, modelTupleFacts...).  Streaming validates
+calculations over the view of each fact (ValidateXbrlCalcs.ValidateStreamingCalcs), and modelXbrl.factsByQname
+indexes the views of the table.  They are not XML nodes, so they are not navigated by XPath (formula).
+
+@author: Mark V Systems Limited
+(c) Copyright 2026 Mark V Systems Limited, All rights reserved.
+'''
+from array import array
+from collections import defaultdict
+from decimal import Decimal, InvalidOperation
+from arelle import XmlUtil
+from arelle.XmlValidate import INVALID
+
+XML_LANG = "{http://www.w3.org/XML/1998/namespace}lang"
+XSI_NIL = "{http://www.w3.org/2001/XMLSchema-instance}nil"
+DECIMAL_TYPES = {"decimal", "XBRLI_NONZERODECIMAL"}
+FLOAT_TYPES = {"float", "double"}
+INTEGER_TYPES = {"integer", "nonPositiveInteger", "negativeInteger", "long", "int", "short", "byte",
+                 "nonNegativeInteger", "unsignedLong", "unsignedInt", "unsignedShort", "unsignedByte", "positiveInteger"}
+
+class FactTable:
+    """
+    .. class:: FactTable(modelXbrl)
+
+    FactTable keeps the facts of modelXbrl's instance as rows of typed arrays, with FactViews of rows
+    created on demand.
+
+    :param modelXbrl: Owning modelXbrl (of the facts' concepts, contexts and units)
+    :type modelXbrl: ModelXbrl
+    """
+    def __init__(self, modelXbrl):
+        self.modelXbrl = modelXbrl
+        self.qnames = [] # interned fact QNames
+        self.qnameIndexes = {}
+        self.strings = [None] # interned contextRef, unitRef, decimals, precision and xml:lang strings, 0 is None
+        self.stringIndexes = {None: 0}
+        self.qnameCol = array('i')
+        self.contextCol = array('i')
+        self.unitCol = array('i')
+        self.decimalsCol = array('i')
+        self.precisionCol = array('i')
+        self.langCol = array('i')
+        self.parentCol = array('i') # row of parent tuple, -1 for root facts
+        self.lineCol = array('i')
+        self.nilCol = bytearray()
+        self.validCol = bytearray() # xValid of the fact element when appended
+        self.valueOffsets = array('Q', (0,)) # value of row i is valueBuffer[valueOffsets[i]:valueOffsets[i+1]]
+        self.valueBuffer = bytearray()
+        self.idRows = {} # by id: row, only of facts with ids
+        self.rowIds = {} # by row: id
+        self._factsByQname = None
+        self._tupleRows = None
+
+    def __len__(self):
+        return len(self.qnameCol)
+
+    def __iter__(self):
+        for row in range(len(self.qnameCol)):
+            yield FactView(self, row)
+
+    def intern(self, s):
+        # index of interned string s (or None)
+        i = self.stringIndexes.get(s)
+        if i is None:
+            i = self.stringIndexes[s] = len(self.strings)
+            self.strings.append(s)
+        return i
+
+    def appendFact(self, fact, parentRow=-1):
+        """Appends fact (ModelFact), and the facts of its tuple, as rows of the table.
+
+        :returns: int -- row of fact
+        """
+        qn = fact.qname
+        i = self.qnameIndexes.get(qn)
+        if i is None:
+            i = self.qnameIndexes[qn] = len(self.qnames)
+            self.qnames.append(qn)
+        row = len(self.qnameCol)
+        self.qnameCol.append(i)
+        self.contextCol.append(self.intern(fact.get("contextRef")))
+        self.unitCol.append(self.intern(fact.getStripped("unitRef")))
+        self.decimalsCol.append(self.intern(fact.get("decimals")))
+        self.precisionCol.append(self.intern(fact.get("precision")))
+        self.langCol.append(self.intern(fact.get(XML_LANG)))
+        self.parentCol.append(parentRow)
+        self.lineCol.append(fact.sourceline or 0)
+        self.nilCol.append(fact.get(XSI_NIL, "false") in ("true", "1"))
+        self.validCol.append(getattr(fact, "xValid", 0))
+        tupleFacts = fact.modelTupleFacts
+        if not tupleFacts:
+            self.valueBuffer.extend(fact.textValue.encode("utf-8"))
+        self.valueOffsets.append(len(self.valueBuffer))
+        id = fact.id
+        if id:
+            self.idRows[id] = row
+            self.rowIds[row] = id
+        for tupleFact in tupleFacts:
+            self.appendFact(tupleFact, row)
+        self._factsByQname = self._tupleRows = None
+        return row
+
+    def fact(self, row):
+        """FactView of row
+        """
+        return FactView(self, row)
+
+    def factById(self, id):
+        """FactView of the fact with id, or None
+        """
+        row = self.idRows.get(id)
+        if row is None:
+            return None
+        return FactView(self, row)
+
+    @property
+    def rootFacts(self):
+        """Views of the facts not in tuples, in document order
+        """
+        return [FactView(self, row) for row, parentRow in enumerate(self.parentCol) if parentRow < 0]
+
+    @property
+    def factsByQname(self):
+        """Views of the facts indexed by their QName, cached, as ModelXbrl.factsByQname
+
+        :returns: dict -- indexes are QNames, values are sets of FactViews
+        """
+        if self._factsByQname is None:
+            self._factsByQname = fbqn = defaultdict(set)
+            qnames = self.qnames
+            for row, i in enumerate(self.qnameCol):
+                fbqn[qnames[i]].add(FactView(self, row))
+        return self._factsByQname
+
+    def tupleFactRows(self, row):
+        # rows of the facts of tuple row, in document order
+        if self._tupleRows is None:
+            self._tupleRows = tupleRows = defaultdict(list)
+            for childRow, parentRow in enumerate(self.parentCol):
+                if parentRow >= 0:
+                    tupleRows[parentRow].append(childRow)
+        return self._tupleRows.get(row, ())
+
+    @property
+    def nbytes(self):
+        """Bytes of the table's arrays and value buffer (not of its interned QNames and strings, or ids)
+        """
+        return (sum(col.itemsize * len(col)
+                    for col in (self.qnameCol, self.contextCol, self.unitCol, self.decimalsCol, self.precisionCol,
+                                self.langCol, self.parentCol, self.lineCol, self.valueOffsets)) +
+                len(self.nilCol) + len(self.validCol) + len(self.valueBuffer))
+
+class FactView:
+    """
+    .. class:: FactView(factTable, row)
+
+    FactView has the ModelFact properties of a row of a FactTable.  Views of the same row are equal.
+    """
+    __slots__ = ("factTable", "row")
+
+    def __init__(self, factTable, row):
+        self.factTable = factTable
+        self.row = row
+
+    def __eq__(self, other):
+        return isinstance(other, FactView) and self.row == other.row and self.factTable is other.factTable
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash((id(self.factTable), self.row))
+
+    @property
+    def modelXbrl(self):
+        return self.factTable.modelXbrl
+
+    @property
+    def modelDocument(self):
+        return self.factTable.modelXbrl.modelDocument
+
+    @property
+    def objectIndex(self):
+        """(int) -- negative index of the view's row, distinct from indexes of model objects"""
+        return -1 - self.row
+
+    @property
+    def qname(self):
+        return self.factTable.qnames[self.factTable.qnameCol[self.row]]
+
+    @property
+    def elementQname(self):
+        return self.qname
+
+    @property
+    def localName(self):
+        return self.qname.localName
+
+    @property
+    def namespaceURI(self):
+        return self.qname.namespaceURI
+
+    @property
+    def concept(self):
+        return self.factTable.modelXbrl.qnameConcepts.get(self.qname)
+
+    @property
+    def id(self):
+        return self.factTable.rowIds.get(self.row)
+
+    @property
+    def sourceline(self):
+        return self.factTable.lineCol[self.row] or None
+
+    @property
+    def contextID(self):
+        return self.factTable.strings[self.factTable.contextCol[self.row]]
+
+    @property
+    def context(self):
+        return self.factTable.modelXbrl.contexts.get(self.contextID)
+
+    @property
+    def unitID(self):
+        return self.factTable.strings[self.factTable.unitCol[self.row]]
+
+    @property
+    def unit(self):
+        return self.factTable.modelXbrl.units.get(self.unitID)
+
+    @property
+    def isItem(self):
+        concept = self.concept
+        return concept is not None and concept.isItem
+
+    @property
+    def isTuple(self):
+        concept = self.concept
+        return concept is not None and concept.isTuple
+
+    @property
+    def isNumeric(self):
+        concept = self.concept
+        return concept is not None and concept.isNumeric
+
+    @property
+    def isInteger(self):
+        concept = self.concept
+        return concept is not None and concept.isInteger
+
+    @property
+    def isFraction(self):
+        concept = self.concept
+        return concept is not None and concept.isFraction
+
+    @property
+    def parentElement(self):
+        """(FactView or ModelObject) -- view of the parent tuple, or the instance's xbrli:xbrl element"""
+        parentRow = self.factTable.parentCol[self.row]
+        if parentRow < 0:
+            return self.factTable.modelXbrl.modelDocument.xmlRootElement
+        return FactView(self.factTable, parentRow)
+
+    @property
+    def modelTupleFacts(self):
+        """([FactView]) -- views of the facts of a tuple, in document order"""
+        return [FactView(self.factTable, row) for row in self.factTable.tupleFactRows(self.row)]
+
+    def typeAttrValue(self, attrName):
+        # fixed or default attribute value on the concept's type, as ModelFact.decimals and precision
+        concept = self.concept
+        if concept is not None and concept.type is not None:
+            return concept.type.fixedOrDefaultAttrValue(attrName)
+        return None
+
+    @property
+    def decimals(self):
+        decimals = self.factTable.strings[self.factTable.decimalsCol[self.row]]
+        if decimals:
+            return decimals
+        return self.typeAttrValue("decimals")
+
+    @property
+    def precision(self):
+        precision = self.factTable.strings[self.factTable.precisionCol[self.row]]
+        if precision:
+            return precision
+        return self.typeAttrValue("precision")
+
+    @property
+    def xmlLang(self):
+        lang = self.factTable.strings[self.factTable.langCol[self.row]]
+        if lang is None:
+            parentElement = self.parentElement
+            if isinstance(parentElement, FactView):
+                return parentElement.xmlLang
+            return XmlUtil.ancestorOrSelfAttr(parentElement, XML_LANG)
+        return lang
+
+    @property
+    def isNil(self):
+        return bool(self.factTable.nilCol[self.row])
+
+    @property
+    def xsiNil(self):
+        return "true" if self.isNil else "false"
+
+    @property
+    def xValid(self):
+        return self.factTable.validCol[self.row]
+
+    @property
+    def textValue(self):
+        offsets = self.factTable.valueOffsets
+        return self.factTable.valueBuffer[offsets[self.row]:offsets[self.row + 1]].decode("utf-8")
+
+    @property
+    def stringValue(self):
+        return self.textValue
+
+    @property
+    def value(self):
+        """(str) -- Text value of fact or default or fixed if any, otherwise None"""
+        v = self.textValue
+        if not v:
+            concept = self.concept
+            if concept is not None:
+                if concept.default is not None:
+                    v = concept.default
+                elif concept.fixed is not None:
+                    v = concept.fixed
+        return v
+
+    @property
+    def xValue(self):
+        """Typed value of numeric and boolean facts (as by XmlValidate), otherwise the whitespace collapsed value,
+        None if nil or invalid"""
+        if self.isNil or self.xValid == INVALID:
+            return None
+        concept = self.concept
+        value = self.value
+        baseXsdType = concept.baseXsdType if concept is not None else None
+        try:
+            if baseXsdType in DECIMAL_TYPES:
+                return Decimal(value.strip())
+            if baseXsdType in FLOAT_TYPES:
+                return float(value)
+            if baseXsdType in INTEGER_TYPES:
+                return int(value)
+            if baseXsdType == "boolean":
+                return value.strip() in ("true", "1")
+        except (ValueError, InvalidOperation):
+            return None
+        if baseXsdType == "string":
+            return value
+        return " ".join(value.split())
+
+    @property
+    def sValue(self):
+        return self.xValue
+
+    def __repr__(self):
+        return ("factView[{0}, qname: {1}, contextRef: {2}, unitRef: {3}, value: {4}, row: {5}]"
+                .format(self.id or "", self.qname, self.contextID, self.unitID,
+                        "(nil)" if self.isNil else self.textValue[:40], self.row))
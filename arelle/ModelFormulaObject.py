@@ -126,6 +126,13 @@ class FormulaOptions():
         self.parameterValues = {} # index is QName, value is typed value
         self.runIDs = None # formula and assertion/assertionset IDs to execute
         self.compileOnly = False # compile but don't execute formulas
+        self.interpretXPath = False # interpret expression stacks instead of evaluating compiled expressions
+        self.xpathParser = "pyparsing" # or "descent" (XPathDescentParser), or "compare" to parse with both and log differences
+        self.parallelProcesses = 0 # processes evaluating independent assertions in parallel (FormulaParallel), if more than 1
+        self.trackFactDependencies = False # record facts bound by assertion variables, for Validate.validateFormulaChanges
+        self.functionMemoSize = 16384 # results of pure built-in XPath functions memoized (XPathFunctionMemo), 0 for none
+        self.traceFunctionMemoStatistics = False # log function memo hit rates by function
+        self.profileFile = None # FormulaProfiler output file(s), '|' separated, .json, .csv or folded stacks
         self.traceParameterExpressionResult = False
         self.traceParameterInputValue = False
         self.traceCallExpressionSource = False
@@ -891,6 +898,18 @@ class ModelFilter(ModelFormulaResource):
             self._hasNoVariableDependencies = len(self.variableRefs() - xpCtx.parameterQnames) == 0
             return self._hasNoVariableDependencies
         
+    def instanceFacts(self, xpCtx, varBinding, factsOfInstance):
+        # union of factsOfInstance(instance) of the variable binding's instances, computed once for the input instance
+        # (which is not changed by formula evaluation) and cached in the XPath context
+        instances = varBinding.instances
+        if len(instances) == 1 and instances[0] is xpCtx.modelXbrl:
+            try:
+                return xpCtx.cachedFilterResults[self]
+            except KeyError:
+                xpCtx.cachedFilterResults[self] = qualifyingFacts = factsOfInstance(instances[0])
+                return qualifyingFacts
+        return set.union(*[factsOfInstance(inst) for inst in instances])
+        
     @property
     def isFilterShared(self):
         try:
@@ -1143,9 +1162,8 @@ class ModelConceptName(ModelFilter):
     
     def filter(self, xpCtx, varBinding, facts, cmplmt):
         if not self.qnameExpressionProgs: # optimize if simple
-            qnamedFacts = set.union(*[inst.factsByQname[qn]
-                                      for inst in varBinding.instances
-                                      for qn in self.conceptQnames])
+            qnamedFacts = self.instanceFacts(xpCtx, varBinding, 
+                                             lambda inst: set.union(*[inst.factsByQname[qn] for qn in self.conceptQnames]))
             return (facts - qnamedFacts) if cmplmt else (facts & qnamedFacts)            
         return set(fact for fact in facts 
                    if cmplmt ^ (fact.qname in self.conceptQnames | self.evalQnames(xpCtx,fact))) 
@@ -1174,8 +1192,8 @@ class ModelConceptPeriodType(ModelFilter):
         return self.get("periodType")
     
     def filter(self, xpCtx, varBinding, facts, cmplmt):
-        factsOfPeriodType = set.union(*[inst.factsByPeriodType(self.periodType)
-                                        for inst in varBinding.instances])
+        factsOfPeriodType = self.instanceFacts(xpCtx, varBinding, 
+                                               lambda inst: inst.factsByPeriodType(self.periodType))
         return (facts - factsOfPeriodType) if cmplmt else (facts & factsOfPeriodType)
         
     @property
@@ -1318,8 +1336,8 @@ class ModelConceptDataType(ModelConceptFilterWithQnameExpression):
     def filter(self, xpCtx, varBinding, facts, cmplmt):
         notStrict = self.strict != "true"
         if self.filterQname: # optimize if simple without a formula
-            factsOfType = set.union(*[inst.factsByDatatype(notStrict, self.filterQname)
-                                      for inst in varBinding.instances])
+            factsOfType = self.instanceFacts(xpCtx, varBinding, 
+                                             lambda inst: inst.factsByDatatype(notStrict, self.filterQname))
             return (facts - factsOfType) if cmplmt else (facts & factsOfType)            
         return set(fact for fact in facts 
                    for qn in (self.evalQname(xpCtx,fact),)
@@ -1803,6 +1821,16 @@ class ModelMatchFilter(ModelFilter):
                 otherFact = firstFact
         if not isinstance(otherFact,(ModelFact,tuple,list)):
             return set()
+        otherFacts = (otherFact,) if matchAll else otherFact
+        instances = varBinding.instances
+        if (isinstance(otherFacts,(tuple,list)) and len(instances) == 1 and 
+            all(anotherFact.modelXbrl is instances[0] for anotherFact in otherFacts)):
+            # facts matching in the aspect are those with the same aspect value key in the instance's aspect value index
+            aspectValues = [aspectValueKey(anotherFact, aspect) for anotherFact in otherFacts]
+            if aspectValues and all(aspectValue is not None for aspectValue in aspectValues):
+                matchedFacts = set.union(*[instances[0].factsByAspectValue(aspect, aspectValue)
+                                           for aspectValue in aspectValues])
+                return (facts - matchedFacts) if cmplmt else (facts & matchedFacts)
         if matchAll:
             return set(fact for fact in facts 
                        if cmplmt ^ (aspectMatches(xpCtx, fact, otherFact, aspect))) 
@@ -1835,6 +1863,24 @@ class ModelPeriod(ModelTestFilter):
         return {Aspect.PERIOD}
         
     def filter(self, xpCtx, varBinding, facts, cmplmt):
+        if self.hasNoFilterVariableDependencies(xpCtx): # test is evaluated once per context
+            try:
+                contextResults = xpCtx.cachedFilterResults[self]
+            except KeyError:
+                xpCtx.cachedFilterResults[self] = contextResults = {}
+            outFacts = set()
+            for fact in facts:
+                if fact.isItem:
+                    context = fact.context
+                    try:
+                        result = contextResults[context]
+                    except KeyError:
+                        contextResults[context] = result = self.evalTest(xpCtx, context.period)
+                else:
+                    result = False
+                if cmplmt ^ result:
+                    outFacts.add(fact)
+            return outFacts
         return set(fact for fact in facts 
                    if cmplmt ^ (fact.isItem and 
                                 self.evalTest(xpCtx, fact.context.period))) 
@@ -2041,6 +2087,11 @@ class ModelExplicitDimension(ModelFilter):
             super(ModelExplicitDimension, self).compile()
             self.isFilterStatic = (self.dimQname and not self.dimQnameExpressionProg and 
                                    all(mp.isMemberStatic for mp in self.memberProgs))
+            # member qnames and variables (without axes) are resolved once for all facts being filtered
+            self.isMemberVariableDependent = bool(not self.isFilterStatic and self.dimQname and not self.dimQnameExpressionProg and 
+                                                  self.memberProgs and
+                                                  all((mp.qname or mp.variable) and not mp.qnameExprProg and not mp.axis 
+                                                      for mp in self.memberProgs))
             if self.isFilterStatic:
                 self.staticMemberQnames = set(mp.qname for mp in self.memberProgs)
                 dimConcept = self.modelXbrl.qnameConcepts.get(self.dimQname)
@@ -2067,19 +2118,61 @@ class ModelExplicitDimension(ModelFilter):
         except:
             return None
     
+    def filterByMemberQnames(self, xpCtx, varBinding, facts, cmplmt):
+        # same results as the general filter (below) for a dimension qname with member qnames and variables
+        if not facts:
+            return set()
+        dimQname = self.dimQname
+        dimConcept = xpCtx.modelXbrl.qnameConcepts.get(dimQname)
+        if dimConcept is None or not dimConcept.isExplicitDimension:
+            self.modelXbrl.error("xfie:invalidExplicitDimensionQName",
+                                 _("%(dimension)s is not an explicit dimension concept QName."),
+                                 modelObject=self, dimension=dimQname)
+            return set()
+        matchMemQnames = set() # members preceding any member which is not a concept
+        hasNonConceptMember = False
+        for memberModel in self.memberProgs:
+            if memberModel.qname:
+                matchMemQname = memberModel.qname
+            else:
+                otherFact = xpCtx.inScopeVars.get(memberModel.variable)
+                if otherFact is not None and isinstance(otherFact,ModelFact) and otherFact.isItem:
+                    matchMemQname = otherFact.context.dimMemberQname(dimQname)
+                else:
+                    matchMemQname = None
+            if xpCtx.modelXbrl.qnameConcepts.get(matchMemQname) is None:
+                hasNonConceptMember = True
+                break
+            matchMemQnames.add(matchMemQname)
+        outFacts = set()
+        for fact in facts:
+            if fact.isItem:
+                memQname = fact.context.dimMemberQname(dimQname)
+                factOk = memQname in matchMemQnames
+                if memQname and not factOk and hasNonConceptMember:
+                    return set() # member which is not a concept reached
+            else:
+                factOk = True # don't filter facts which are tuples
+            if cmplmt ^ (factOk):
+                outFacts.add(fact)
+        return outFacts
+    
     def filter(self, xpCtx, varBinding, facts, cmplmt):
         if self.isFilterStatic:
             dimQname = self.dimQname
             memQnames = self.staticMemberQnames
             if memQnames:
-                dimedFacts = set.union(*[inst.factsByDimMemQname(dimQname, memQname)
-                                         for inst in varBinding.instances
-                                         for memQname in memQnames])
+                dimedFacts = self.instanceFacts(xpCtx, varBinding, 
+                                                lambda inst: set.union(*[inst.factsByDimMemQname(dimQname, memQname)
+                                                                         for memQname in memQnames]))
             else:
-                dimedFacts = set.union(*[inst.factsByDimMemQname(dimQname)
-                                         for inst in varBinding.instances])
+                dimedFacts = self.instanceFacts(xpCtx, varBinding, 
+                                                lambda inst: inst.factsByDimMemQname(dimQname))
             return (facts - dimedFacts) if cmplmt else (facts & dimedFacts)            
 
+        elif self.isMemberVariableDependent:
+            return self.filterByMemberQnames(xpCtx, varBinding, facts, cmplmt)
+
         else:
             outFacts = set()
             for fact in facts:
@@ -2225,7 +2318,7 @@ class ModelTypedDimension(ModelTestFilter):
             super(ModelTypedDimension, self).compile()
 
     def variableRefs(self, progs=[], varRefSet=None):
-        return super(ModelTypedDimension, self).variableRefs(self.dimQnameExpression, varRefSet)
+        return super(ModelTypedDimension, self).variableRefs(self.dimQnameExpressionProg, varRefSet)
         
     def evalDimQname(self, xpCtx, fact):
         try:
@@ -2918,5 +3011,6 @@ elementSubstitutionModelClass.update((
 
 # import after other modules resolved to prevent circular references
 from arelle.FormulaEvaluator import filterFacts, aspectsMatch, aspectMatches
+from arelle.ModelXbrl import aspectValueKey
 from arelle.FunctionXfi import concept_relationships
 from arelle.ValidateXbrlCalcs import inferredPrecision
@@ -50,6 +50,26 @@ POSINF = float("inf")
 NEGINF = float("-inf")
 DECIMALONE = Decimal(1)
 
+def internValue(modelXbrl, value):
+    # value deduplicated by the modelXbrl's valueInterner, if interning values
+    valueInterner = modelXbrl.valueInterner
+    return value if valueInterner is None else valueInterner.intern(value)
+
+def periodMatchKey(periodType, periodStart=None, periodEndInstant=None):
+    # key of period, equal for periods matched by ModelXbrl.matchContext (dates compared by dateUnionEqual)
+    if periodType == "instant":
+        return (periodType, ModelValue.dateUnionNormalized(periodEndInstant, instantEndDate=True))
+    elif periodType == "duration":
+        return (periodType, ModelValue.dateUnionNormalized(periodStart),
+                ModelValue.dateUnionNormalized(periodEndInstant, instantEndDate=True))
+    return (periodType,)
+
+def dimsMatchKey(dims):
+    # key of dims (by dimension QName, of ModelDimensionValues, DimValuePrototypes, explicit member QNames or typed member nodes)
+    # equal for dims matched by ModelXbrl.matchContext, typed members are matched individually
+    return frozenset((dimQname, dimValue if isinstance(dimValue, ModelValue.QName) else getattr(dimValue, "memberQname", None))
+                     for dimQname, dimValue in dims.items())
+
 class NewFactItemOptions():
     """
     .. class:: NewFactItemOptions(savedOptions=None, xbrlInstance=None)
@@ -279,7 +299,7 @@ class ModelFact(ModelObject):
         except AttributeError:
             decimals = self.get("decimals")
             if decimals:
-                self._decimals = decimals
+                self._decimals = internValue(self.modelXbrl, decimals)
             else:   #check for fixed decimals on type
                 concept = self.concept
                 if concept is not None:
@@ -302,7 +322,7 @@ class ModelFact(ModelObject):
         except AttributeError:
             precision = self.get("precision")
             if precision:
-                self._precision = precision
+                self._precision = internValue(self.modelXbrl, precision)
             else:   #check for fixed decimals on type
                 concept = self.concept
                 if concept is not None:
@@ -454,6 +474,9 @@ class ModelFact(ModelObject):
                             return True
                         elif deemP0inf: # for test cases deem P0 as INF comparison
                             return self.xValue == other.xValue
+                if (self.xValue is other.xValue and isinstance(self.xValue, Decimal) and self.xValue.is_finite() and
+                    p != 0 and not isnan(d if p is None else p)): # same interned value rounds the same
+                    return True
                 return roundValue(self.value,precision=p,decimals=d) == roundValue(other.value,precision=p,decimals=d)
             else:
                 return False
@@ -462,7 +485,7 @@ class ModelFact(ModelObject):
                     self.unit is not None and self.unit.isEqualTo(other.unit) and 
                     self.xValue == other.xValue)
         elif type(self.xValue) == ModelValue.DateTime == type(other.xValue):
-            return self.xValue == other.xValue # required to handle date/time with 24 hrs.
+            return self.xValue is other.xValue or self.xValue == other.xValue # required to handle date/time with 24 hrs.
         selfValue = self.value
         otherValue = other.value
         if normalizeSpace and isinstance(selfValue,str) and isinstance(otherValue,str): # normalized space comparison
@@ -896,7 +919,7 @@ class ModelContext(ModelObject):
         try:
             return self._startDatetime
         except AttributeError:
-            self._startDatetime = XmlUtil.datetimeValue(XmlUtil.child(self.period, XbrlConst.xbrli, "startDate"))
+            self._startDatetime = internValue(self.modelXbrl, XmlUtil.datetimeValue(XmlUtil.child(self.period, XbrlConst.xbrli, "startDate")))
             return self._startDatetime
 
     @property
@@ -905,7 +928,7 @@ class ModelContext(ModelObject):
         try:
             return self._endDatetime
         except AttributeError:
-            self._endDatetime = XmlUtil.datetimeValue(XmlUtil.child(self.period, XbrlConst.xbrli, ("endDate","instant")), addOneDay=True)
+            self._endDatetime = internValue(self.modelXbrl, XmlUtil.datetimeValue(XmlUtil.child(self.period, XbrlConst.xbrli, ("endDate","instant")), addOneDay=True))
             return self._endDatetime
         
     @property
@@ -914,7 +937,7 @@ class ModelContext(ModelObject):
         try:
             return self._instantDatetime
         except AttributeError:
-            self._instantDatetime = XmlUtil.datetimeValue(XmlUtil.child(self.period, XbrlConst.xbrli, "instant"), addOneDay=True)
+            self._instantDatetime = internValue(self.modelXbrl, XmlUtil.datetimeValue(XmlUtil.child(self.period, XbrlConst.xbrli, "instant"), addOneDay=True))
             return self._instantDatetime
     
     @property
@@ -961,7 +984,8 @@ class ModelContext(ModelObject):
         except AttributeError:
             eiElt = self.entityIdentifierElement
             if eiElt is not None:
-                self._entityIdentifier = (eiElt.get("scheme"), eiElt.xValue or eiElt.textValue) # no xValue if --skipDTS
+                self._entityIdentifier = (internValue(self.modelXbrl, eiElt.get("scheme")),
+                                          internValue(self.modelXbrl, eiElt.xValue or eiElt.textValue)) # no xValue if --skipDTS
             else:
                 self._entityIdentifier = ("(Error)", "(Error)")
             return self._entityIdentifier
@@ -1120,6 +1144,18 @@ class ModelContext(ModelObject):
             self._contextNonDimAwareHash = hash( (self.periodHash, self.entityIdentifierHash, self.segmentHash, self.scenarioHash) )
             return self._contextNonDimAwareHash
         
+    @property
+    def periodMatchKeys(self):
+        """([tuple]) -- Keys of the period for the index of contexts by aspects of modelXbrl.matchContext (one unless period is invalid)"""
+        keys = []
+        if self.isInstantPeriod:
+            keys.append(periodMatchKey("instant", None, self.instantDatetime))
+        if self.isStartEndPeriod:
+            keys.append(periodMatchKey("duration", self.startDatetime, self.endDatetime))
+        if self.isForeverPeriod:
+            keys.append(periodMatchKey("forever"))
+        return keys
+        
     @property
     def md5sum(self):
         try:
@@ -1145,11 +1181,12 @@ class ModelContext(ModelObject):
         elif self.isStartEndPeriod:
             if not cntx2.isStartEndPeriod:
                 return False
-            return self.startDatetime == cntx2.startDatetime and self.endDatetime == cntx2.endDatetime
+            return ((self.startDatetime is cntx2.startDatetime or self.startDatetime == cntx2.startDatetime) and
+                    (self.endDatetime is cntx2.endDatetime or self.endDatetime == cntx2.endDatetime)) # same if interned
         elif self.isInstantPeriod:
             if not cntx2.isInstantPeriod:
                 return False
-            return self.instantDatetime == cntx2.instantDatetime
+            return self.instantDatetime is cntx2.instantDatetime or self.instantDatetime == cntx2.instantDatetime
         else:
             return False
         
@@ -48,6 +48,34 @@ class ModelManager:
         .. attribute:: defaultLang
         
         The default language code for labels selection and views (e.g. 'en-US'), set from the operating system defaults on startup.
+        
+        .. attribute:: dtsPool
+        
+        DtsPool of discovered DTSes shared by instance loads (e.g., web server requests), or None if DTSes are not pooled.
+        
+        .. attribute:: discoveryThreads
+        
+        Number of threads retrieving and parsing discovered documents ahead of their discovery, or None to load them sequentially.
+        
+        .. attribute:: prefetchThreads
+        
+        Without discoveryThreads, number of parallel retrievals of the web documents referenced by each parsed document into the web cache (WebCache.prefetch), or None to retrieve them when discovered.
+        
+        .. attribute:: xpathParseCache
+        
+        XPathParseCache of formula XPath expressions parsed by prior runs, or None if expressions are always parsed.
+        
+        .. attribute:: loadFactTable
+        
+        True for streamed instances (streamingExtensions plug-in) to keep their facts in a columnar fact table (modelXbrl.factTable) instead of fact elements.
+        
+        .. attribute:: internValues
+        
+        True to intern (deduplicate) the QName, date, Decimal and short string values of each modelXbrl (modelXbrl.valueInterner).
+        
+        .. attribute:: lazyLinkbases
+        
+        True to leave the label and reference resources of DTS linkbases unproxied when loaded, so that their element class lookup, initialization and PSVI happen on first access (ModelLink.deferResources).
     """
     
     def __init__(self, cntlr):
@@ -63,6 +91,13 @@ class ModelManager:
         self.skipLoading = None
         self.abortOnMajorError = False
         self.collectProfileStats = False
+        self.dtsPool = None
+        self.discoveryThreads = None
+        self.prefetchThreads = None
+        self.xpathParseCache = None
+        self.loadFactTable = False
+        self.internValues = False
+        self.lazyLinkbases = False
         self.loadedModelXbrls = []
         from arelle import Locale
         self.locale = Locale.getUserLocale(cntlr.config.get("userInterfaceLocaleOverride",""))
@@ -127,6 +127,7 @@ class DiscoveringClassLookup(etree.PythonElementClassLookup):
         self.streamingOrSkipDTS = modelXbrl.skipDTS or getattr(modelXbrl, "isStreamingMode", False)
         self.baseUrl = baseUrl
         self.discoveryAttempts = set()
+        self.deferDiscovery = False # True while proxies are created by a discovery read ahead thread, which must not load schemas
         global ModelFact, ModelDocument
         if ModelDocument is None:
             from arelle import ModelDocument
@@ -142,6 +143,7 @@ class DiscoveringClassLookup(etree.PythonElementClassLookup):
             ln = ns
             ns = None
         if (ns and 
+            not self.deferDiscovery and
             ns not in self.discoveryAttempts and 
             ns not in self.modelXbrl.namespaceDocs):
             # is schema loadable?  requires a schemaLocation
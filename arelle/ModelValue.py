@@ -5,7 +5,7 @@ Created on Jan 4, 2011
 (c) Copyright 2011 Mark V Systems Limited, All rights reserved.
 '''
 from arelle import PythonUtil # define 2.x or 3.x string types
-import copy, datetime, isodate
+import copy, datetime, isodate, sys
 from decimal import Decimal
 try:
     import regex as re
@@ -129,6 +129,8 @@ class QName:
         self.namespaceURI = namespaceURI
         self.localName = localName
         self.qnameValueHash = hash( (namespaceURI, localName) )
+    def __reduce__(self): # unpickled with the qnameValueHash of the unpickling process's string hashes
+        return (QName, (self.prefix, self.namespaceURI, self.localName))
     def __hash__(self):
         return self.qnameValueHash
     @property
@@ -146,8 +148,8 @@ class QName:
             return self.localName
     def __eq__(self,other):
         try:
-            return (self.qnameValueHash == other.qnameValueHash and 
-                    self.localName == other.localName and self.namespaceURI == other.namespaceURI)
+            return self is other or (self.qnameValueHash == other.qnameValueHash and 
+                                     self.localName == other.localName and self.namespaceURI == other.namespaceURI)
         except AttributeError:
             return False
         ''' don't think this is used any longer
@@ -318,17 +320,16 @@ class DateTime(datetime.datetime):
                 return DateTime(dt.year, dt.month, dt.day, dt.hour, dt.minute, dt.second, dt.microsecond, dt.tzinfo, self.dateOnly)
     
 def dateUnionEqual(dateUnion1, dateUnion2, instantEndDate=False):
-    if isinstance(dateUnion1,DateTime):
-        if instantEndDate and dateUnion1.dateOnly:
-            dateUnion1 += datetime.timedelta(1)
-    elif isinstance(dateUnion1,datetime.date):
-        dateUnion1 = dateTime(dateUnion1, addOneDay=instantEndDate)
-    if isinstance(dateUnion2,DateTime):
-        if instantEndDate and dateUnion2.dateOnly:
-            dateUnion2 += datetime.timedelta(1)
-    elif isinstance(dateUnion2,datetime.date):
-        dateUnion2 = dateTime(dateUnion2, addOneDay=instantEndDate)
-    return dateUnion1 == dateUnion2
+    return dateUnionNormalized(dateUnion1, instantEndDate) == dateUnionNormalized(dateUnion2, instantEndDate)
+        
+def dateUnionNormalized(dateUnion, instantEndDate=False):
+    # datetime of dateUnion as compared by dateUnionEqual (and hashable for equal dateUnions)
+    if isinstance(dateUnion,DateTime):
+        if instantEndDate and dateUnion.dateOnly:
+            dateUnion += datetime.timedelta(1)
+    elif isinstance(dateUnion,datetime.date):
+        dateUnion = dateTime(dateUnion, addOneDay=instantEndDate)
+    return dateUnion
         
 def dateunionDate(datetimeValue, subtractOneDay=False):
     isDate = (hasattr(datetimeValue,'dateOnly') and datetimeValue.dateOnly) or not hasattr(datetimeValue, 'hour')
@@ -704,4 +705,74 @@ class InvalidValue(str):
 
 INVALIDixVALUE = InvalidValue("(ixTransformValueError)")
 
-    
\ No newline at end of file
+    
+MAX_INTERNED_STR_LEN = 64 # longer strings (e.g., text block values) are rarely repeated
+
+class ValueInterner:
+    """Interns (deduplicates) equal values of a modelXbrl, QNames, dates and datetimes, Decimals and short strings,
+    so that each value repeated in contexts, units and facts is one object, which is smaller and lets equality
+    comparisons succeed by identity.
+    
+    Values are equal for interning if their representations are also equal (e.g., QNames with the same prefix,
+    Decimals with the same digits and dates which are both date-only or not), so interning never changes a
+    string value.  Other values are returned as they are.  Interned values are shared, so a QName is copied, or
+    discarded from interning, before its prefix is changed in place.
+    """
+    def __init__(self):
+        self.values = {}
+        self.duplicates = {} # count of duplicates by value class
+        
+    def internKey(self, value):
+        # key of an internable value (equal only for equal representations), or None
+        cls = value.__class__
+        if cls is str:
+            return value if len(value) <= MAX_INTERNED_STR_LEN else None
+        elif cls is QName:
+            return (cls, value.prefix, value.namespaceURI, value.localName)
+        elif cls is DateTime or cls is datetime.datetime:
+            return (cls, value, value.tzinfo, getattr(value, "dateOnly", None))
+        elif cls is Decimal:
+            return (cls, str(value))
+        return None
+        
+    def intern(self, value):
+        """Returns the interned value equal to value, interning value if it is the first such value"""
+        key = self.internKey(value)
+        if key is None:
+            return value
+        internedValue = self.values.setdefault(key, value)
+        if internedValue is not value:
+            cls = value.__class__
+            self.duplicates[cls] = self.duplicates.get(cls, 0) + 1
+        return internedValue
+    
+    def discard(self, value):
+        """Stops interning value (if interned), such as before changing a QName's prefix in place, so that
+        values with its prior prefix are no longer interned to it"""
+        key = self.internKey(value)
+        if key is not None and self.values.get(key) is value:
+            del self.values[key]
+    
+    @property
+    def memorySaved(self):
+        """(int) -- Estimated memory (in KB, as Cntlr.memoryUsed) of duplicate values which were not kept, less the interning dict"""
+        sizes = {}
+        keysSize = sys.getsizeof(self.values)
+        for key, value in self.values.items():
+            cls = value.__class__
+            size, count = sizes.get(cls, (0, 0))
+            sizes[cls] = (size + sys.getsizeof(value), count + 1)
+            if cls is Decimal:
+                keysSize += sys.getsizeof(key) + sys.getsizeof(key[1])
+            elif cls is not str:
+                keysSize += sys.getsizeof(key)
+        saved = sum(sizes[cls][0] * duplicates // sizes[cls][1]
+                    for cls, duplicates in self.duplicates.items())
+        return (saved - keysSize) // 1024
+    
+    @property
+    def statistics(self):
+        """(dict) -- Count of interned and of duplicate values, and estimated memory saved in KB"""
+        return {"interned": len(self.values),
+                "duplicates": sum(self.duplicates.values()),
+                "memorySaved": self.memorySaved}
@@ -13,6 +13,7 @@ from arelle.FileSource import FileNamedStringIO
 from arelle.ModelObject import ModelObject, ObjectPropertyViewWrapper
 from arelle.Locale import format_string
 from arelle.PluginManager import pluginClassMethods
+from arelle.PythonUtil import ChangeTrackingDict
 from arelle.PrototypeInstanceObject import FactPrototype, DimValuePrototype
 from arelle.PythonUtil import flattenSequence
 from arelle.UrlUtil import isHttpUrl
@@ -26,6 +27,11 @@ AUTO_LOCATE_ELEMENT = '771407c0-1d0c-11e1-be5e-028037ec0200' # singleton meaning
 DEFAULT = sys.intern(_STR_8BIT("default"))
 NONDEFAULT = sys.intern(_STR_8BIT("non-default"))
 DEFAULTorNONDEFAULT = sys.intern(_STR_8BIT("default-or-non-default"))
+# aspect value keys (of factsByAspectValue) other than QNames, datetimes and measures
+TUPLE = sys.intern(_STR_8BIT("tuple"))
+NOUNIT = sys.intern(_STR_8BIT("no-unit"))
+NODIMENSION = sys.intern(_STR_8BIT("no-dimension"))
+FOREVER = sys.intern(_STR_8BIT("forever"))
     
 
 def load(modelManager, url, nextaction=None, base=None, useFileSource=None, errorCaptureLevel=None, **kwargs):
@@ -45,7 +51,7 @@ def load(modelManager, url, nextaction=None, base=None, useFileSource=None, erro
     :returns: ModelXbrl -- a new modelXbrl, performing DTS discovery for instance, inline XBRL, schema, linkbase, and versioning report entry urls
    """
     if nextaction is None: nextaction = _("loading")
-    from arelle import (ModelDocument, FileSource)
+    from arelle import (ModelDocument, FileSource, DiscoveryReadAhead)
     modelXbrl = create(modelManager, errorCaptureLevel=errorCaptureLevel)
     supplementalUrls = None
     if useFileSource is not None:
@@ -64,10 +70,14 @@ def load(modelManager, url, nextaction=None, base=None, useFileSource=None, erro
     else:
         modelXbrl.fileSource = FileSource.FileSource(url, modelManager.cntlr)
         modelXbrl.closeFileSource= True
-    modelXbrl.modelDocument = ModelDocument.load(modelXbrl, url, base, isEntry=True, **kwargs)
-    if supplementalUrls:
-        for url in supplementalUrls:
-            ModelDocument.load(modelXbrl, url, base, isEntry=False, isDiscovered=True, **kwargs)
+    DiscoveryReadAhead.start(modelXbrl)
+    try:
+        modelXbrl.modelDocument = ModelDocument.load(modelXbrl, url, base, isEntry=True, **kwargs)
+        if supplementalUrls:
+            for url in supplementalUrls:
+                ModelDocument.load(modelXbrl, url, base, isEntry=False, isDiscovered=True, **kwargs)
+    finally:
+        DiscoveryReadAhead.stop(modelXbrl)
     del modelXbrl.entryLoadingUrl
     loadSchemalocatedSchemas(modelXbrl)
     
@@ -105,6 +115,48 @@ def loadSchemalocatedSchemas(modelXbrl):
             modelDocumentsSchemaLocated.add(modelDocument)
             modelDocument.loadSchemalocatedSchemas()
         
+def aspectValueKey(fact, aspect):
+    """Key of a fact's aspect value, for factsByAspectValue, such that facts of the same instance match on the aspect
+    (as by FormulaEvaluator.aspectMatches) when their keys are equal.
+    
+    :returns: object -- hashable aspect value key, or None if the aspect value is not indexed (segment and scenario 
+    aspects, typed dimensions, items without a context), which matching must compare fact by fact
+    """
+    if aspect == 1: # Aspect.LOCATION
+        return fact.parentElement
+    if aspect == 2: # Aspect.CONCEPT
+        return fact.qname
+    if fact.isTuple:
+        return TUPLE # tuples only match tuples on other aspects
+    if aspect == 5: # Aspect.UNIT
+        unit = fact.unit
+        if unit is None:
+            return NOUNIT
+        return unit.measures
+    context = fact.context
+    if context is None:
+        return None
+    if isinstance(aspect, ModelValue.QName):
+        dimValue = context.dimValue(aspect)
+        if dimValue is None:
+            return NODIMENSION
+        if isinstance(dimValue, ModelValue.QName): # explicit dimension default value
+            return dimValue
+        if dimValue.isExplicit:
+            return dimValue.memberQname
+        return None # typed dimension
+    if aspect == 4: # Aspect.PERIOD
+        if context.isForeverPeriod:
+            return FOREVER
+        if context.isStartEndPeriod:
+            return (context.startDatetime, context.endDatetime)
+        if context.isInstantPeriod:
+            return context.instantDatetime
+        return context # invalid period only matches its own context
+    if aspect == 3: # Aspect.ENTITY_IDENTIFIER
+        return context.entityIdentifierHash
+    return None
+
 class ModelXbrl:
     """
     .. class:: ModelXbrl(modelManager)
@@ -176,6 +228,14 @@ class ModelXbrl:
 
         List of all facts in instance (including nested in tuples), document order
 
+        .. attribute:: factTable
+
+        ModelFactTable.FactTable of the facts of a streamed instance, if loaded with the modelManager's loadFactTable, else None
+
+        .. attribute:: valueInterner
+
+        ModelValue.ValueInterner of the values of contexts, units and facts, if the modelManager's internValues, else None
+
         .. attribute:: contexts
 
         Dict of contexts by id
@@ -184,6 +244,14 @@ class ModelXbrl:
 
         Dict of units by id
 
+        .. attribute:: contextCanonicalIds
+
+        Dict by context id of the id of its canonical context, the first discovered context which is equal to it (itself if none), shared by validations of equal contexts
+
+        .. attribute:: unitCanonicalIds
+
+        Dict by unit id of the id of its canonical unit, the first discovered unit with the same measures (itself if none)
+
         .. attribute:: modelObjects
 
         Model objects in loaded order, allowing object access by ordinal index (for situations, such as tkinter, where a reference to an object would create a memory freeing difficulty).
@@ -236,6 +304,14 @@ class ModelXbrl:
 
         Standard output instance if formulae produce one. 
 
+        .. attribute:: formulaFactDependencies
+
+        Facts which passed the filters of each fact variable of each assertion, with its satisfied and not satisfied counts, by assertion, if tracked by formula validation (for incremental re-validation after facts are changed). 
+
+        .. attribute:: formulaChangedFacts
+
+        Facts edited or created (such as by GUI table entry) since the formula validation which tracked formulaFactDependencies, re-validated by Validate.validateFormulaChanges. 
+
         .. attribute:: hasRendering
 
         True if rendering tables are discovered
@@ -272,9 +348,19 @@ class ModelXbrl:
         self.qnameDimensionDefaults = {} # contains qname of dimension (index) and default member(value)
         self.facts = []
         self.factsInInstance = set()
+        self.factTable = None
+        self.valueInterner = ModelValue.ValueInterner() if self.modelManager.internValues else None
+        self.valueValidators = {} # compiled XmlValidate value validators by (baseXsdType, id(facets))
         self.undefinedFacts = [] # elements presumed to be facts but not defined
-        self.contexts = {}
-        self.units = {}
+        self.contexts = ChangeTrackingDict() # contexts and units are indexed when next matched, by their changed ids
+        self.units = ChangeTrackingDict()
+        self.indexedContexts = {} # contexts in the contexts index, by id
+        self.indexedUnits = {}
+        self._contextCanonicalIds = {}
+        self._unitCanonicalIds = {}
+        self.canonicalContexts = {} # first context by contextDimAwareHash
+        self.contextsByAspects = defaultdict(list) # contexts by entity identifier, period and (if dimensional) dims match keys
+        self.unitsByMeasures = {} # first (canonical) unit by measures
         self.modelObjects = []
         self.qnameParameters = {}
         self.modelVariableSets = set()
@@ -291,12 +377,15 @@ class ModelXbrl:
         self.hasTableIndexing = False
         self.hasFormulae = False
         self.formulaOutputInstance = None
+        self.formulaFactDependencies = None
+        self.formulaChangedFacts = set()
         self.logger = logging.getLogger("arelle")
         self.logRefObjectProperties = getattr(self.logger, "logRefObjectProperties", False)
         self.logRefHasPluginAttrs = any(True for m in pluginClassMethods("Logging.Ref.Attributes"))
         self.logRefHasPluginProperties = any(True for m in pluginClassMethods("Logging.Ref.Properties"))
         self.profileStats = {}
         self.schemaDocsToValidate = set()
+        self.discoveryReadAhead = None # DiscoveryReadAhead while discovering, if modelManager.discoveryThreads
         self.modelXbrl = self # for consistency in addressing modelXbrl
         self.arelleUnitTests = {} # unit test entries (usually from processing instructions
         for pluginXbrlMethod in pluginClassMethods("ModelXbrl.Init"):
@@ -312,6 +401,10 @@ class ModelXbrl:
                 self.formulaOutputInstance.close()
             if hasattr(self,"fileSource") and self.closeFileSource:
                 self.fileSource.close()
+            if hasattr(self, "dtsPoolEntry"): # don't close documents shared with the DTS pool
+                self.modelManager.dtsPool.detach(self)
+            if self.discoveryReadAhead is not None:
+                self.discoveryReadAhead.close()
             modelDocument = getattr(self,"modelDocument",None)
             urlDocs = getattr(self,"urlDocs",None)
             for relSet in self.relationshipSets.values():
@@ -336,6 +429,8 @@ class ModelXbrl:
         :param reloadCache: bool
         """
         from arelle import ModelDocument
+        if hasattr(self, "dtsPoolEntry"):
+            self.modelManager.dtsPool.detach(self)
         self.init(keepViews=True)
         self.modelDocument = ModelDocument.load(self, self.fileSource.url, isEntry=True, reloadCache=reloadCache)
         self.modelManager.showStatus(_("xbrl loading finished, {0}...").format(nextaction),5000)
@@ -518,12 +613,19 @@ class ModelXbrl:
         :returns: ModelContext -- Matching context or None
         """
         from arelle.ModelFormulaObject import Aspect
+        from arelle.ModelInstanceObject import periodMatchKey, dimsMatchKey
         from arelle.ModelValue import dateUnionEqual
         from arelle.XbrlUtil import sEqual
         if dims: segAspect, scenAspect = (Aspect.NON_XDT_SEGMENT, Aspect.NON_XDT_SCENARIO)
         else: segAspect, scenAspect = (Aspect.COMPLETE_SEGMENT, Aspect.COMPLETE_SCENARIO)
-        for c in self.contexts.values():
-            if (c.entityIdentifier == (entityIdentScheme, entityIdentValue) and
+        # candidates have equal entity identifier, period and explicit dimension members, by the contexts index 
+        aspectsKey = ((entityIdentScheme, entityIdentValue), periodMatchKey(periodType, periodStart, periodEndInstant))
+        if dims is not None:
+            aspectsKey += (dimsMatchKey(dims),)
+        self.indexContexts()
+        for c in self.contextsByAspects.get(aspectsKey, ()):
+            if (self.contexts.get(c.id) is c and # not since replaced or dropped
+                c.entityIdentifier == (entityIdentScheme, entityIdentValue) and
                 ((c.isInstantPeriod and periodType == "instant" and dateUnionEqual(c.instantDatetime, periodEndInstant, instantEndDate=True)) or
                  (c.isStartEndPeriod and periodType == "duration" and dateUnionEqual(c.startDatetime, periodStart) and dateUnionEqual(c.endDatetime, periodEndInstant, instantEndDate=True)) or
                  (c.isForeverPeriod and periodType == "forever")) and
@@ -666,10 +768,144 @@ class ModelXbrl:
         """
         _multiplyBy = tuple(sorted(multiplyBy))
         _divideBy = tuple(sorted(divideBy))
-        for u in self.units.values():
-            if u.measures == (_multiplyBy,_divideBy):
-                return u
+        self.indexUnits()
+        u = self.unitsByMeasures.get((_multiplyBy,_divideBy))
+        if u is not None and self.units.get(u.id) is u:
+            return u
         return None
+    
+    @property
+    def contextCanonicalIds(self):
+        """Ids of the canonical (first equal) context of each context, by context id
+        
+        :returns: dict -- canonical context ids by context id
+        """
+        self.indexContexts()
+        return self._contextCanonicalIds
+    
+    @property
+    def unitCanonicalIds(self):
+        """Ids of the canonical (first equal) unit of each unit, by unit id
+        
+        :returns: dict -- canonical unit ids by unit id
+        """
+        self.indexUnits()
+        return self._unitCanonicalIds
+    
+    def indexContexts(self):
+        """Brings the contexts index up to date with contexts, indexing contexts added (by discovery, by a plugin 
+        or otherwise) and unindexing contexts dropped or replaced since it was last used
+        """
+        changedIds = getattr(self.contexts, "changedKeys", None)
+        if changedIds is None: # contexts is not a ChangeTrackingDict, compare all ids
+            changedIds = dict.fromkeys(list(self.contexts.keys()) + list(self.indexedContexts.keys()))
+        if changedIds:
+            for id in list(changedIds.keys()):
+                indexedContext = self.indexedContexts.get(id)
+                modelContext = self.contexts.get(id)
+                if indexedContext is not modelContext:
+                    if indexedContext is not None:
+                        self.unindexContext(indexedContext)
+                    if modelContext is not None:
+                        self.indexContext(modelContext)
+            changedIds.clear()
+    
+    def indexUnits(self):
+        """Brings the units index up to date with units, indexing units added (by discovery, by a plugin 
+        or otherwise) and unindexing units dropped or replaced since it was last used
+        """
+        changedIds = getattr(self.units, "changedKeys", None)
+        if changedIds is None: # units is not a ChangeTrackingDict, compare all ids
+            changedIds = dict.fromkeys(list(self.units.keys()) + list(self.indexedUnits.keys()))
+        if changedIds:
+            for id in list(changedIds.keys()):
+                indexedUnit = self.indexedUnits.get(id)
+                modelUnit = self.units.get(id)
+                if indexedUnit is not modelUnit:
+                    if indexedUnit is not None:
+                        self.unindexUnit(indexedUnit)
+                    if modelUnit is not None:
+                        self.indexUnit(modelUnit)
+            changedIds.clear()
+    
+    def indexContext(self, modelContext):
+        """Indexes a context, by its canonical context and by aspects for matchContext
+        
+        :param modelContext: Context, with its content discovered
+        :type modelContext: ModelContext
+        """
+        self.indexedContexts[modelContext.id] = modelContext
+        canonicalContext = self.canonicalContexts.setdefault(modelContext.contextDimAwareHash, modelContext)
+        if canonicalContext is not modelContext and modelContext.isEqualTo(canonicalContext):
+            self._contextCanonicalIds[modelContext.id] = canonicalContext.id
+        else:
+            self._contextCanonicalIds[modelContext.id] = modelContext.id
+        from arelle.ModelInstanceObject import dimsMatchKey
+        entityIdentifier = modelContext.entityIdentifier
+        dimsKey = dimsMatchKey(modelContext.qnameDims)
+        for periodKey in modelContext.periodMatchKeys:
+            self.contextsByAspects[entityIdentifier, periodKey].append(modelContext)
+            self.contextsByAspects[entityIdentifier, periodKey, dimsKey].append(modelContext)
+            
+    def unindexContext(self, modelContext):
+        """Removes a context, which has been dropped or replaced, from the contexts index, if indexed
+        
+        :param modelContext: Context
+        :type modelContext: ModelContext
+        """
+        if self.indexedContexts.get(modelContext.id) is not modelContext:
+            return
+        del self.indexedContexts[modelContext.id]
+        from arelle.ModelInstanceObject import dimsMatchKey
+        entityIdentifier = modelContext.entityIdentifier
+        dimsKey = dimsMatchKey(modelContext.qnameDims)
+        periodKeys = modelContext.periodMatchKeys
+        if self.canonicalContexts.get(modelContext.contextDimAwareHash) is modelContext:
+            del self.canonicalContexts[modelContext.contextDimAwareHash]
+            # next indexed context equal to it becomes canonical (equal contexts have the same aspects keys)
+            canonicalContext = None
+            for c in (self.contextsByAspects.get((entityIdentifier, periodKeys[0], dimsKey), ()) if periodKeys
+                      else list(self.indexedContexts.values())):
+                if c is not modelContext and self._contextCanonicalIds.get(c.id) == modelContext.id:
+                    if canonicalContext is None:
+                        canonicalContext = self.canonicalContexts[modelContext.contextDimAwareHash] = c
+                    self._contextCanonicalIds[c.id] = canonicalContext.id
+        self._contextCanonicalIds.pop(modelContext.id, None)
+        for periodKey in periodKeys:
+            for aspectsKey in ((entityIdentifier, periodKey), (entityIdentifier, periodKey, dimsKey)):
+                contexts = self.contextsByAspects.get(aspectsKey)
+                if contexts is not None:
+                    contexts[:] = [c for c in contexts if c is not modelContext]
+                    if not contexts:
+                        del self.contextsByAspects[aspectsKey]
+                
+    def indexUnit(self, modelUnit):
+        """Indexes a unit, by its canonical unit, which is also the unit of its measures for matchUnit
+        
+        :param modelUnit: Unit, with its content discovered
+        :type modelUnit: ModelUnit
+        """
+        self.indexedUnits[modelUnit.id] = modelUnit
+        self._unitCanonicalIds[modelUnit.id] = self.unitsByMeasures.setdefault(modelUnit.measures, modelUnit).id
+            
+    def unindexUnit(self, modelUnit):
+        """Removes a unit, which has been dropped or replaced, from the units index, if indexed
+        
+        :param modelUnit: Unit
+        :type modelUnit: ModelUnit
+        """
+        if self.indexedUnits.get(modelUnit.id) is not modelUnit:
+            return
+        del self.indexedUnits[modelUnit.id]
+        if self.unitsByMeasures.get(modelUnit.measures) is modelUnit:
+            del self.unitsByMeasures[modelUnit.measures]
+            canonicalUnit = None
+            for u in self.indexedUnits.values(): # next indexed unit with the same measures becomes canonical
+                if u.measures == modelUnit.measures:
+                    if canonicalUnit is None:
+                        canonicalUnit = self.unitsByMeasures[u.measures] = u
+                    self._unitCanonicalIds[u.id] = canonicalUnit.id
+        self._unitCanonicalIds.pop(modelUnit.id, None)
 
     def createUnit(self, multiplyBy, divideBy, afterSibling=None, beforeSibling=None, id=None):
         """Creates new unit, by measures, as in formula usage, if any
@@ -721,10 +957,12 @@ class ModelXbrl:
         
     @property
     def factsByQname(self): # indexed by fact (concept) qname
-        """Facts in the instance indexed by their QName, cached
+        """Facts in the instance indexed by their QName, cached (FactViews of the factTable, if loaded as a fact table)
         
         :returns: dict -- indexes are QNames, values are ModelFacts
         """
+        if self.factTable is not None:
+            return self.factTable.factsByQname
         try:
             return self._factsByQname
         except AttributeError:
@@ -821,6 +1059,26 @@ class ModelXbrl:
                         fbdq[DEFAULT].add(fact)
             return fbdq[memQname]
         
+    def factsByAspectValue(self, aspect, aspectValue):
+        """Facts in the instance indexed by their aspect value key (of aspectValueKey), cached as aspects are requested
+        
+        :param aspect: Aspect (Aspect.LOCATION, CONCEPT, ENTITY_IDENTIFIER, PERIOD or UNIT, or dimension QName)
+        :param aspectValue: Aspect value key of a fact of this instance, as returned by aspectValueKey
+        :returns: set -- ModelFacts of this instance which have the same aspect value (as by formula aspect matching)
+        """
+        try:
+            fbav = self._factsByAspectValue[aspect]
+        except AttributeError:
+            self._factsByAspectValue = {}
+            return self.factsByAspectValue(aspect, aspectValue)
+        except KeyError:
+            self._factsByAspectValue[aspect] = fbav = defaultdict(set)
+            for fact in self.factsInInstance:
+                key = aspectValueKey(fact, aspect)
+                if key is not None:
+                    fbav[key].add(fact)
+        return fbav.get(aspectValue, set())
+        
     def matchFact(self, otherFact, unmatchedFactsStack=None, deemP0inf=False, matchId=False, matchLang=True):
         """Finds matching fact, by XBRL 2.1 duplicate definition (if tuple), or by
         QName and VEquality (if an item), lang and accuracy equality, as in formula and test case usage
@@ -891,6 +1149,8 @@ class ModelXbrl:
                 self._factsByPeriodType[newFact.concept.periodType].add(newFact)
             if hasattr(self, "_factsByDimQname"):
                 del self._factsByDimQname
+            if hasattr(self, "_factsByAspectValue"):
+                del self._factsByAspectValue
         self.setIsModified()
         return newFact    
         
@@ -172,6 +172,46 @@ class OrderedDefaultDict(OrderedDict):
         self[key] = _missingValue
         return _missingValue
 
+class ChangeTrackingDict(dict):
+    """ dict which notes the keys assigned or deleted since changedKeys was last cleared (in order of change),
+        e.g., for an index of its values which is brought up to date when next used
+    """
+    def __init__(self, *args, **kwargs):
+        dict.__init__(self)
+        self.changedKeys = OrderedDict()
+        self.update(*args, **kwargs)
+        
+    def __setitem__(self, key, value):
+        self.changedKeys[key] = None
+        dict.__setitem__(self, key, value)
+        
+    def __delitem__(self, key):
+        self.changedKeys[key] = None
+        dict.__delitem__(self, key)
+        
+    def pop(self, key, *default):
+        self.changedKeys[key] = None
+        return dict.pop(self, key, *default)
+    
+    def popitem(self):
+        key, value = dict.popitem(self)
+        self.changedKeys[key] = None
+        return key, value
+    
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return dict.__getitem__(self, key)
+    
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+            
+    def clear(self):
+        for key in self:
+            self.changedKeys[key] = None
+        dict.clear(self)
+
 class OrderedSet(MutableSet):
 
     def __init__(self, iterable=None):
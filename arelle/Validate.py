@@ -120,7 +120,28 @@ class Validate:
                     # traceback=traceback.format_tb(sys.exc_info()[2]),
                     exc_info=(type(err) is not AssertionError))
         self.close()
-        
+
+    def validateFormulaChanges(self, changedFacts):
+        """Re-validates the formula linkbase after facts of the instance were edited, created (such as by
+        ModelXbrl.createFact) or removed, evaluating only the assertions whose prior evaluation bound any of
+        changedFacts, or whose fact variables' filters may bind them.  Other assertions keep their prior satisfied
+        and not satisfied counts (and messages are not repeated for them).  All assertions are evaluated if
+        fact dependencies were not tracked by the prior formula validation (FormulaOptions.trackFactDependencies).
+
+        :param changedFacts: Facts edited, created or removed since the prior formula validation
+        :type changedFacts: set
+        """
+        modelXbrl = self.modelXbrl
+        try:
+            modelXbrl.parameters = modelXbrl.modelManager.formulaOptions.typedParameters(modelXbrl.prefixedNamespaces)
+            ValidateFormula.validate(modelXbrl, statusMsg=_("compiling formulae"), changedFacts=changedFacts)
+        except Exception as err:
+            modelXbrl.error("exception:" + type(err).__name__,
+                _("Formula re-validation exception: %(error)s, instance: %(instance)s"),
+                modelXbrl=modelXbrl, instance=modelXbrl.modelDocument.basename, error=err,
+                exc_info=(type(err) is not AssertionError))
+        self.close()
+
     def validateRssFeed(self):
         self.modelXbrl.info("info", "RSS Feed", modelDocument=self.modelXbrl)
         from arelle.FileSource import openFileSource
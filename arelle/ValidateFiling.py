@@ -207,20 +207,16 @@ class ValidateFiling(ValidateXbrl.ValidateXbrl):
             #6.5.7 duplicated contexts
             contexts = modelXbrl.contexts.values()
             contextIDs = set()
-            uniqueContextHashes = {}
             contextsWithDisallowedOCEs = []
             contextsWithDisallowedOCEcontent = []
             for context in contexts:
                 contextID = context.id
                 contextIDs.add(contextID)
-                h = context.contextDimAwareHash
-                if h in uniqueContextHashes:
-                    if context.isEqualTo(uniqueContextHashes[h]):
-                        modelXbrl.error(("EFM.6.05.07", "GFM.1.02.07"),
-                            _("Context ID %(context)s is equivalent to context ID %(context2)s"),
-                            modelObject=(context, uniqueContextHashes[h]), context=contextID, context2=uniqueContextHashes[h].id)
-                else:
-                    uniqueContextHashes[h] = context
+                canonicalContext = modelXbrl.contexts.get(modelXbrl.contextCanonicalIds.get(contextID))
+                if canonicalContext is not None and canonicalContext is not context:
+                    modelXbrl.error(("EFM.6.05.07", "GFM.1.02.07"),
+                        _("Context ID %(context)s is equivalent to context ID %(context2)s"),
+                        modelObject=(context, canonicalContext), context=contextID, context2=canonicalContext.id)
                     
                 #GFM no time in contexts
                 if self.validateGFM:
@@ -287,7 +283,7 @@ class ValidateFiling(ValidateXbrl.ValidateXbrl):
                         _("%(count)s contexts contain disallowed %(elementName)s content: %(context)s"),
                         modelObject=contextsWithDisallowedOCEcontent, elementName=disclosureSystem.contextElement, 
                         count=len(contextsWithDisallowedOCEcontent), context=', '.join(c.id for c in contextsWithDisallowedOCEcontent))
-            del uniqueContextHashes, contextsWithDisallowedOCEs, contextsWithDisallowedOCEcontent
+            del contextsWithDisallowedOCEs, contextsWithDisallowedOCEcontent
             self.modelXbrl.profileActivity("... filer context checks", minTimeToShow=1.0)
     
     
@@ -567,16 +563,12 @@ class ValidateFiling(ValidateXbrl.ValidateXbrl):
                     modelObject=documentTypeFact, documentType=documentType)
                 
             #6.5.11 equivalent units
-            uniqueUnitHashes = {}
             for unit in self.modelXbrl.units.values():
-                h = unit.hash
-                if h in uniqueUnitHashes:
-                    if unit.isEqualTo(uniqueUnitHashes[h]):
-                        modelXbrl.error(("EFM.6.05.11", "GFM.1.02.10"),
-                            _("Units %(unitID)s and %(unitID2)s are equivalent."),
-                            modelObject=(unit, uniqueUnitHashes[h]), unitID=unit.id, unitID2=uniqueUnitHashes[h].id)
-                else:
-                    uniqueUnitHashes[h] = unit
+                canonicalUnit = modelXbrl.units.get(modelXbrl.unitCanonicalIds.get(unit.id))
+                if canonicalUnit is not None and canonicalUnit is not unit:
+                    modelXbrl.error(("EFM.6.05.11", "GFM.1.02.10"),
+                        _("Units %(unitID)s and %(unitID2)s are equivalent."),
+                        modelObject=(unit, canonicalUnit), unitID=unit.id, unitID2=canonicalUnit.id)
                 if self.validateEFM:  # 6.5.38
                     for measureElt in unit.iterdescendants(tag="{http://www.xbrl.org/2003/instance}measure"):
                         if isinstance(measureElt.xValue, ModelValue.QName) and len(measureElt.xValue.localName) > 65:
@@ -585,7 +577,6 @@ class ValidateFiling(ValidateXbrl.ValidateXbrl):
                                 modelXbrl.error("EFM.6.05.36",
                                     _("Unit has a measure  with localName length (%(length)s) over 200 bytes long in utf-8, %(measure)s."),
                                     modelObject=measureElt, unitID=unit.id, measure=measureElt.xValue.localName, length=l)
-            del uniqueUnitHashes
             self.modelXbrl.profileActivity("... filer unit checks", minTimeToShow=1.0)
    
     
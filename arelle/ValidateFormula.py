@@ -276,7 +276,7 @@ def executeCallTest(val, name, callTuple, testTuple):
 
         val.modelXbrl.modelManager.showStatus(_("ready"), 2000)
                 
-def validate(val, xpathContext=None, parametersOnly=False, statusMsg='', compileOnly=False):
+def validate(val, xpathContext=None, parametersOnly=False, statusMsg='', compileOnly=False, changedFacts=None):
     for e in ("xbrl.5.1.4.3:cycles", "xbrlgene:violatedCyclesConstraint"):
         if e in val.modelXbrl.errors:
             val.modelXbrl.info("info", _("Formula validation skipped due to %(error)s error"),
@@ -378,6 +378,12 @@ def validate(val, xpathContext=None, parametersOnly=False, statusMsg='', compile
     
     if xpathContext is None:
         xpathContext = XPathContext.create(val.modelXbrl) 
+        if formulaOptions.functionMemoSize > 0:
+            from arelle.XPathFunctionMemo import FunctionMemo
+            xpathContext.functionMemo = FunctionMemo(formulaOptions.functionMemoSize)
+        if formulaOptions.profileFile:
+            from arelle.FormulaProfiler import FormulaProfiler
+            xpathContext.formulaProfiler = FormulaProfiler()
     xpathContext.parameterQnames = parameterQnames  # needed for formula filters to determine variable dependencies
     for paramQname in orderedParameters:
         modelParameter = val.modelXbrl.qnameParameters[paramQname]
@@ -468,6 +474,11 @@ def validate(val, xpathContext=None, parametersOnly=False, statusMsg='', compile
             val.modelXbrl.modelFormulaEqualityDefinitions[typedDomainElt] = modelEqualityDefinition
             
     if parametersOnly:
+        if val.modelXbrl.modelManager.xpathParseCache is not None:
+            val.modelXbrl.modelManager.xpathParseCache.report(val.modelXbrl)
+        if formulaOptions.xpathParser == "compare":
+            from arelle import XPathDescentParser
+            XPathDescentParser.compareReport(val.modelXbrl)
         return
 
     for modelVariableSet in val.modelXbrl.modelVariableSets:
@@ -829,6 +840,11 @@ def validate(val, xpathContext=None, parametersOnly=False, statusMsg='', compile
                             xlinkLabel2=modelVariableSet.xlinkLabel, aspectModel2=modelVariableSet.aspectModel)
     val.modelXbrl.profileActivity("... instances scopes and setup", minTimeToShow=1.0)
 
+    if val.modelXbrl.modelManager.xpathParseCache is not None: # expressions have been parsed
+        val.modelXbrl.modelManager.xpathParseCache.report(val.modelXbrl)
+    if formulaOptions.xpathParser == "compare":
+        from arelle import XPathDescentParser
+        XPathDescentParser.compareReport(val.modelXbrl)
     val.modelXbrl.profileStat(_("formulaValidation"))
     if (initialErrorCount < val.modelXbrl.logCount.get(logging._checkLevel('ERROR'), 0) or
         compileOnly or 
@@ -885,9 +901,10 @@ def validate(val, xpathContext=None, parametersOnly=False, statusMsg='', compile
         else:
             maxFormulaRunTimeTimer = None
         # evaluate variable sets not in consistency assertions
-        from arelle.FormulaEvaluator import init as formulaEvaluatorInit, evaluate
+        from arelle.FormulaEvaluator import init as formulaEvaluatorInit
         formulaEvaluatorInit() # one-time module initialization
         val.modelXbrl.profileActivity("... evaluations", minTimeToShow=1.0)
+        evaluatedVariableSets = []
         for instanceQname in orderedInstancesList:
             for modelVariableSet in instanceProducingVariableSets[instanceQname]:
                 # produce variable evaluations if no dependent variables-scope relationships
@@ -898,17 +915,42 @@ def validate(val, xpathContext=None, parametersOnly=False, statusMsg='', compile
                          any(modelRel.fromModelObject.id in runIDs
                              for modelRel in val.modelXbrl.relationshipSet(XbrlConst.consistencyAssertionFormula).toModelObject(modelVariableSet)
                              if isinstance(modelRel.fromModelObject, ModelConsistencyAssertion)))):
-                        try:
-                            varSetId = (modelVariableSet.id or modelVariableSet.xlinkLabel)
-                            val.modelXbrl.profileActivity("... evaluating " + varSetId, minTimeToShow=10.0)
-                            val.modelXbrl.modelManager.showStatus(_("evaluating {0}").format(varSetId))
-                            val.modelXbrl.profileActivity("... evaluating " + varSetId, minTimeToShow=1.0)
-                            evaluate(xpathContext, modelVariableSet)
-                            val.modelXbrl.profileStat(modelVariableSet.localName + "_" + varSetId)
-                        except XPathContext.XPathException as err:
-                            val.modelXbrl.error(err.code,
-                                _("Variable set \n%(variableSet)s \nException: \n%(error)s"), 
-                                modelObject=modelVariableSet, variableSet=str(modelVariableSet), error=err.message)
+                        evaluatedVariableSets.append(modelVariableSet)
+        isTrackingFactDependencies = formulaOptions.trackFactDependencies or changedFacts is not None
+        if isTrackingFactDependencies:
+            # facts passing the filters of the fact variables of independent assertions are recorded by FormulaEvaluator
+            from arelle.FormulaParallel import isIndependentAssertion
+            xpathContext.factDependencies = dict((modelVariableSet, {})
+                                                 for modelVariableSet in evaluatedVariableSets
+                                                 if isIndependentAssertion(val.modelXbrl, modelVariableSet))
+            priorFactDependencies = val.modelXbrl.formulaFactDependencies or {}
+            val.modelXbrl.formulaFactDependencies = None # until this evaluation completes
+            if changedFacts is not None and priorFactDependencies:
+                changedFacts = set(changedFacts)
+                unaffectedVariableSets = unaffectedAssertions(xpathContext, evaluatedVariableSets, priorFactDependencies, changedFacts)
+                val.modelXbrl.info("info",
+                                   _("Formula re-validation of %(changedCount)s changed facts evaluates %(evaluatedCount)s of %(count)s variable sets"),
+                                   modelObject=val.modelXbrl, changedCount=len(changedFacts),
+                                   evaluatedCount=len(evaluatedVariableSets) - len(unaffectedVariableSets), 
+                                   count=len(evaluatedVariableSets))
+                for modelVariableSet in unaffectedVariableSets:
+                    variableFacts, modelVariableSet.countSatisfied, modelVariableSet.countNotSatisfied = priorFactDependencies[modelVariableSet]
+                    xpathContext.factDependencies[modelVariableSet] = variableFacts
+                evaluatedVariableSets = [modelVariableSet 
+                                         for modelVariableSet in evaluatedVariableSets 
+                                         if modelVariableSet not in unaffectedVariableSets]
+        if formulaOptions.parallelProcesses > 1:
+            from arelle.FormulaParallel import evaluateVariableSets
+            evaluateVariableSets(val, xpathContext, evaluatedVariableSets, formulaOptions.parallelProcesses)
+        else:
+            for modelVariableSet in evaluatedVariableSets:
+                evaluateVariableSet(val, xpathContext, modelVariableSet)
+        if isTrackingFactDependencies:
+            val.modelXbrl.formulaFactDependencies = dict((modelVariableSet, (variableFacts, 
+                                                                             modelVariableSet.countSatisfied, 
+                                                                             modelVariableSet.countNotSatisfied))
+                                                         for modelVariableSet, variableFacts in xpathContext.factDependencies.items())
+            val.modelXbrl.formulaChangedFacts.clear() # changes are reflected by these dependencies
         if maxFormulaRunTimeTimer:
             maxFormulaRunTimeTimer.cancel()
     except XPathContext.RunTimeExceededException:
@@ -961,9 +1003,38 @@ def validate(val, xpathContext=None, parametersOnly=False, statusMsg='', compile
     dependencyResolvedParameters.clear()
     orderedInstancesSet.clear()
     del orderedParameters, orderedInstances, orderedInstancesList
+    if xpathContext.functionMemo is not None and formulaOptions.traceFunctionMemoStatistics:
+        xpathContext.functionMemo.report(val.modelXbrl)
+    if xpathContext.formulaProfiler is not None:
+        xpathContext.formulaProfiler.report(val.modelXbrl, formulaOptions.profileFile)
     xpathContext.close()  # dereference everything
     val.modelXbrl.profileStat(_("formulaExecutionTotal"), time.time() - timeFormulasStarted)
 
+def evaluateVariableSet(val, xpathContext, modelVariableSet):
+    from arelle.FormulaEvaluator import evaluate
+    try:
+        varSetId = (modelVariableSet.id or modelVariableSet.xlinkLabel)
+        val.modelXbrl.profileActivity("... evaluating " + varSetId, minTimeToShow=10.0)
+        val.modelXbrl.modelManager.showStatus(_("evaluating {0}").format(varSetId))
+        val.modelXbrl.profileActivity("... evaluating " + varSetId, minTimeToShow=1.0)
+        evaluate(xpathContext, modelVariableSet)
+        val.modelXbrl.profileStat(modelVariableSet.localName + "_" + varSetId)
+    except XPathContext.XPathException as err:
+        val.modelXbrl.error(err.code,
+            _("Variable set \n%(variableSet)s \nException: \n%(error)s"), 
+            modelObject=modelVariableSet, variableSet=str(modelVariableSet), error=err.message)
+
+def unaffectedAssertions(xpathContext, variableSets, factDependencies, changedFacts):
+    # assertions whose prior evaluation bound none of changedFacts and whose fact variables can not bind them
+    from arelle.FormulaEvaluator import factsMayBindVariableSet
+    unaffected = set()
+    for modelVariableSet in variableSets:
+        if (modelVariableSet in factDependencies and modelVariableSet in xpathContext.factDependencies and
+            all(changedFacts.isdisjoint(facts) for facts in factDependencies[modelVariableSet][0].values()) and
+            not factsMayBindVariableSet(xpathContext, modelVariableSet, changedFacts)):
+            unaffected.add(modelVariableSet)
+    return unaffected
+
 def checkVariablesScopeVisibleQnames(val, nameVariables, definedNamesSet, modelVariableSet):
     for visibleVarSetRel in val.modelXbrl.relationshipSet(XbrlConst.variablesScope).toModelObject(modelVariableSet):
         varqname = visibleVarSetRel.variableQname # name (if any) of the formula result
@@ -39,6 +39,8 @@ class ValidateXbrlCalcs:
         self.sumConceptBindKeys = defaultdict(set)
         self.itemFacts = defaultdict(list)
         self.itemConceptBindKeys = defaultdict(set)
+        self.itemConceptBindKeyFacts = defaultdict(dict) # item facts by concept and bind key, for summing by concept
+        self.roundedValues = {} # rounded value of each fact, and its scaled integer coefficient and exponent
         self.duplicateKeyFacts = {}
         self.duplicatedFacts = set()
         self.consistentDupFacts = set() # when deDuplicatig, holds the less-precise of v-equal dups
@@ -55,30 +57,15 @@ class ValidateXbrlCalcs:
         if not self.inferDecimals: # infering precision is now contrary to XBRL REC section 5.2.5.2
             self.modelXbrl.info("xbrl.5.2.5.2:inferringPrecision","Validating calculations inferring precision.")
             
-        # identify equal contexts
+        # identify equal contexts and units, by their canonical contexts and units indexed at discovery
         self.modelXbrl.profileActivity()
-        uniqueContextHashes = {}
-        for context in self.modelXbrl.contexts.values():
-            h = context.contextDimAwareHash
-            if h in uniqueContextHashes:
-                if context.isEqualTo(uniqueContextHashes[h]):
-                    self.mapContext[context] = uniqueContextHashes[h]
-            else:
-                uniqueContextHashes[h] = context
-        del uniqueContextHashes
-        self.modelXbrl.profileActivity("... identify equal contexts", minTimeToShow=1.0)
-
-        # identify equal units
-        uniqueUnitHashes = {}
-        for unit in self.modelXbrl.units.values():
-            h = unit.hash
-            if h in uniqueUnitHashes:
-                if unit.isEqualTo(uniqueUnitHashes[h]):
-                    self.mapUnit[unit] = uniqueUnitHashes[h]
-            else:
-                uniqueUnitHashes[h] = unit
-        del uniqueUnitHashes
-        self.modelXbrl.profileActivity("... identify equal units", minTimeToShow=1.0)
+        for mapObject, objects, canonicalIds in ((self.mapContext, self.modelXbrl.contexts, self.modelXbrl.contextCanonicalIds),
+                                                 (self.mapUnit, self.modelXbrl.units, self.modelXbrl.unitCanonicalIds)):
+            for objId, obj in objects.items():
+                canonicalObject = objects.get(canonicalIds.get(objId))
+                if canonicalObject is not None and canonicalObject is not obj:
+                    mapObject[obj] = canonicalObject
+        self.modelXbrl.profileActivity("... identify equal contexts and units", minTimeToShow=1.0)
                     
         # identify concepts participating in essence-alias relationships
         # identify calcluation & essence-alias base sets (by key)
@@ -95,6 +82,8 @@ class ValidateXbrlCalcs:
         self.modelXbrl.profileActivity("... identify requires-element and esseance-aliased concepts", minTimeToShow=1.0)
 
         self.bindFacts(self.modelXbrl.facts,[self.modelXbrl.modelDocument.xmlRootElement])
+        for (concept, ancestor, contextHash, unit), facts in self.itemFacts.items():
+            self.itemConceptBindKeyFacts[concept][(ancestor, contextHash, unit)] = facts
         self.modelXbrl.profileActivity("... bind facts", minTimeToShow=1.0)
         
         # identify calcluation & essence-alias base sets (by key)
@@ -116,23 +105,7 @@ class ValidateXbrlCalcs:
                                     itemBindingKeys = self.itemConceptBindKeys[itemConcept]
                                     boundSumKeys |= sumBindingKeys & itemBindingKeys
                             # add up rounded items
-                            boundSums = defaultdict(decimal.Decimal) # sum of facts meeting factKey
-                            boundSummationItems = defaultdict(list) # corresponding fact refs for messages
-                            for modelRel in modelRels:
-                                weight = modelRel.weightDecimal
-                                itemConcept = modelRel.toModelObject
-                                if itemConcept is not None:
-                                    for itemBindKey in boundSumKeys:
-                                        ancestor, contextHash, unit = itemBindKey
-                                        factKey = (itemConcept, ancestor, contextHash, unit)
-                                        if factKey in self.itemFacts:
-                                            for fact in self.itemFacts[factKey]:
-                                                if fact in self.duplicatedFacts:
-                                                    dupBindingKeys.add(itemBindKey)
-                                                elif fact not in self.consistentDupFacts:
-                                                    roundedValue = roundFact(fact, self.inferDecimals)
-                                                    boundSums[itemBindKey] += roundedValue * weight
-                                                    boundSummationItems[itemBindKey].append(wrappedFactWithWeight(fact,weight,roundedValue))
+                            boundSums = self.boundSums(modelRels, boundSumKeys, dupBindingKeys) # sum of facts meeting factKey
                             for sumBindKey in boundSumKeys:
                                 ancestor, contextHash, unit = sumBindKey
                                 factKey = (sumConcept, ancestor, contextHash, unit)
@@ -142,12 +115,12 @@ class ValidateXbrlCalcs:
                                         if fact in self.duplicatedFacts:
                                             dupBindingKeys.add(sumBindKey)
                                         elif sumBindKey not in dupBindingKeys and fact not in self.consistentDupFacts:
-                                            roundedSum = roundFact(fact, self.inferDecimals)
-                                            roundedItemsSum = roundFact(fact, self.inferDecimals, vDecimal=boundSums[sumBindKey])
-                                            if roundedItemsSum  != roundFact(fact, self.inferDecimals):
+                                            roundedSum = self.roundedValue(fact)
+                                            roundedItemsSum = roundFact(fact, self.inferDecimals, vDecimal=boundSums.get(sumBindKey, ZERO))
+                                            if roundedItemsSum  != roundedSum:
                                                 d = inferredDecimals(fact)
                                                 if isnan(d) or isinf(d): d = 4
-                                                _boundSummationItems = boundSummationItems[sumBindKey]
+                                                _boundSummationItems = self.boundSummationItems(modelRels, sumBindKey)
                                                 unreportedContribingItemQnames = [] # list the missing/unreported contributors in relationship order
                                                 for modelRel in modelRels:
                                                     itemConcept = modelRel.toModelObject
@@ -164,7 +137,6 @@ class ValidateXbrlCalcs:
                                                     contextID=fact.context.id, unitID=fact.unit.id,
                                                     unreportedContributors=", ".join(unreportedContribingItemQnames) or "none")
                                                 del unreportedContribingItemQnames[:]
-                            boundSummationItems.clear() # dereference facts in list
                     elif arcrole == XbrlConst.essenceAlias:
                         for modelRel in relsSet.modelRelationships:
                             essenceConcept = modelRel.fromModelObject
@@ -211,24 +183,119 @@ class ValidateXbrlCalcs:
         self.modelXbrl.profileActivity("... find inconsistencies", minTimeToShow=1.0)
         self.modelXbrl.profileActivity() # reset
     
+    def roundedValue(self, fact):
+        try:
+            return self.roundedValues[fact][0]
+        except KeyError:
+            return self.roundedScaledValue(fact)[0]
+
+    def roundedScaledValue(self, fact):
+        # rounded value of fact, computed once per fact, with its integer coefficient and exponent (None if not finite)
+        try:
+            return self.roundedValues[fact]
+        except KeyError:
+            roundedValue = roundFact(fact, self.inferDecimals)
+            coefficient, exponent = scaledDecimal(roundedValue)
+            self.roundedValues[fact] = roundedScaledValue = (roundedValue, coefficient, exponent)
+            return roundedScaledValue
+
+    def boundSums(self, modelRels, boundSumKeys, dupBindingKeys):
+        """Weighted sums of the rounded item facts of the summation relationships modelRels, by bind key.
+        
+        Each bind key's sum is accumulated as an integer coefficient at the least exponent of its terms (and of
+        Decimal zero, as summed by Decimal arithmetic).  Sums of terms which are not finite, or which may not be
+        exact in the decimal context's precision, are summed by Decimal arithmetic, so that every sum is the
+        Decimal (of the same value and exponent) which Decimal arithmetic sums.
+        """
+        scaledSums = {} # by bind key: [exponent, coefficient, sum of absolute term coefficients]
+        decimalSumKeys = set()
+        duplicatedFacts = self.duplicatedFacts
+        consistentDupFacts = self.consistentDupFacts
+        for modelRel in modelRels:
+            itemConcept = modelRel.toModelObject
+            if itemConcept is not None:
+                weightCoefficient, weightExponent = scaledDecimal(modelRel.weightDecimal)
+                bindKeyFacts = self.itemConceptBindKeyFacts.get(itemConcept)
+                if not bindKeyFacts:
+                    continue
+                if len(bindKeyFacts) <= len(boundSumKeys):
+                    itemBindKeyFacts = [(itemBindKey, facts)
+                                        for itemBindKey, facts in bindKeyFacts.items()
+                                        if itemBindKey in boundSumKeys]
+                else:
+                    itemBindKeyFacts = [(itemBindKey, bindKeyFacts[itemBindKey])
+                                        for itemBindKey in boundSumKeys
+                                        if itemBindKey in bindKeyFacts]
+                for itemBindKey, facts in itemBindKeyFacts:
+                    for fact in facts:
+                        if fact in duplicatedFacts:
+                            dupBindingKeys.add(itemBindKey)
+                        elif fact not in consistentDupFacts:
+                            roundedValue, coefficient, exponent = self.roundedScaledValue(fact)
+                            if coefficient is None or weightCoefficient is None:
+                                decimalSumKeys.add(itemBindKey)
+                                continue
+                            coefficient *= weightCoefficient
+                            exponent += weightExponent
+                            scaledSum = scaledSums.get(itemBindKey)
+                            if scaledSum is None:
+                                scaledSum = scaledSums[itemBindKey] = [0, 0, 0]
+                            if exponent < scaledSum[0]:
+                                scale = 10 ** (scaledSum[0] - exponent)
+                                scaledSum[0] = exponent
+                                scaledSum[1] *= scale
+                                scaledSum[2] *= scale
+                            elif exponent > scaledSum[0]:
+                                coefficient *= 10 ** (exponent - scaledSum[0])
+                            scaledSum[1] += coefficient
+                            scaledSum[2] += abs(coefficient)
+        exactLimit = 10 ** decimal.getcontext().prec
+        boundSums = {}
+        for itemBindKey, (exponent, coefficient, absoluteSum) in scaledSums.items():
+            if absoluteSum < exactLimit and itemBindKey not in decimalSumKeys:
+                boundSums[itemBindKey] = decimal.Decimal(coefficient).scaleb(exponent)
+            else:
+                decimalSumKeys.add(itemBindKey)
+        for itemBindKey in decimalSumKeys:
+            boundSum = ZERO
+            for fact, weight, roundedValue in self.boundSummationTerms(modelRels, itemBindKey):
+                boundSum += roundedValue * weight
+            boundSums[itemBindKey] = boundSum
+        return boundSums
+
+    def boundSummationTerms(self, modelRels, bindKey):
+        # item facts, weights and rounded values summed for bindKey, in relationship order
+        for modelRel in modelRels:
+            itemConcept = modelRel.toModelObject
+            if itemConcept is not None:
+                for fact in self.itemConceptBindKeyFacts.get(itemConcept, {}).get(bindKey, ()):
+                    if fact not in self.duplicatedFacts and fact not in self.consistentDupFacts:
+                        yield fact, modelRel.weightDecimal, self.roundedValue(fact)
+
+    def boundSummationItems(self, modelRels, bindKey):
+        # corresponding fact refs for messages
+        return [wrappedFactWithWeight(fact, weight, roundedValue)
+                for fact, weight, roundedValue in self.boundSummationTerms(modelRels, bindKey)]
+
     def bindFacts(self, facts, ancestors):
         for f in facts:
             concept = f.concept
             if concept is not None:
                 # index facts by their calc relationship set
                 if concept.isNumeric:
+                    # tbd: uniqify context and unit
+                    context = self.mapContext.get(f.context,f.context)
+                    # must use nonDimAwareHash to achieve s-equal comparison of contexts
+                    contextHash = context.contextNonDimAwareHash if context is not None else hash(None)
+                    unit = self.mapUnit.get(f.unit,f.unit)
+                    isNil = f.isNil
                     for ancestor in ancestors:
-                        # tbd: uniqify context and unit
-                        context = self.mapContext.get(f.context,f.context)
-                        # must use nonDimAwareHash to achieve s-equal comparison of contexts
-                        contextHash = context.contextNonDimAwareHash if context is not None else hash(None)
-                        unit = self.mapUnit.get(f.unit,f.unit)
                         calcKey = (concept, ancestor, contextHash, unit)
-                        if not f.isNil:
+                        if not isNil:
                             self.itemFacts[calcKey].append(f)
                             bindKey = (ancestor, contextHash, unit)
                             self.itemConceptBindKeys[concept].add(bindKey)
-                    if not f.isNil:
+                    if not isNil:
                         self.sumFacts[calcKey].append(f) # sum only for immediate parent
                         self.sumConceptBindKeys[concept].add(bindKey)
                     # calcKey is the last ancestor added (immediate parent of fact)
@@ -278,6 +345,254 @@ class ValidateXbrlCalcs:
                 if concept in self.conceptsInRequiresElement:
                     self.requiresElementFacts[concept].append(f)
 
+INCLUDED, CONSISTENT_DUPLICATE, DUPLICATED = range(3) # status of streamed facts
+
+class StreamedFact:
+    """
+    .. class:: StreamedFact(fact, inferDecimals)
+    
+    StreamedFact keeps the properties of a numeric fact needed for calculation validation, after the fact has been
+    dropped by streaming, with its rounded value (and its scaled integer coefficient and exponent).
+    """
+    __slots__ = ("qname", "value", "decimals", "precision", "isNil", "contextID", "unitID", "sequence",
+                 "roundedValue", "coefficient", "exponent", "status", "bindKeys")
+    def __init__(self, fact, inferDecimals, sequence):
+        self.qname = fact.qname
+        self.value = fact.value
+        self.decimals = fact.decimals
+        self.precision = fact.precision
+        self.isNil = fact.isNil
+        self.contextID = fact.contextID
+        self.unitID = fact.unitID
+        self.sequence = sequence # document order
+        if self.isNil:
+            self.roundedValue = self.coefficient = self.exponent = None
+        else:
+            try:
+                self.roundedValue = roundFact(self, inferDecimals)
+            except (ValueError, decimal.InvalidOperation): # such as precision of a NaN value, schema error reported earlier
+                self.roundedValue = NaN
+            self.coefficient, self.exponent = scaledDecimal(self.roundedValue)
+        self.status = INCLUDED
+        self.bindKeys = () # item bind keys of the fact, one for each ancestor
+
+class ValidateStreamingCalcs:
+    """
+    .. class:: ValidateStreamingCalcs(modelXbrl, inferDecimals, deDuplicate)
+    
+    ValidateStreamingCalcs validates summation-item calculations of a streamed instance (streamingExtensions
+    plug-in), as facts arrive, so that facts need not be kept until the end of the instance.
+    
+    Facts of concepts in summation-item relationships are kept only as StreamedFacts, which are kept as
+    duplicate checking holders (for each concept, ancestor, context and unit) and as summation facts.  The rounded
+    weighted items of each summation are added, as they arrive, to a partial sum (integer coefficient at a common
+    exponent, with counts of non-finite terms) by bind key (ancestor, context and unit), and subtracted if the
+    item is later found to be a duplicate.  Bind keys of a tuple (all of whose facts arrive with the tuple) are
+    checked and discarded after the tuple, bind keys of the instance root are checked by finish().
+    
+    Inconsistencies are reported as by ValidateXbrlCalcs, except that they refer to the instance (the facts
+    having been dropped) and sums are exact, not rounded at each step to the decimal context's precision.
+    Essence-alias and requires-element relationships are not checked in streaming mode.
+    """
+    def __init__(self, modelXbrl, inferDecimals=False, deDuplicate=False):
+        self.modelXbrl = modelXbrl
+        self.inferDecimals = inferDecimals
+        self.deDuplicate = deDuplicate
+        self.summations = [] # (ELR, sum concept, relationships) of each summation
+        self.itemSummations = defaultdict(list) # by item concept: (summation index, scaled weight)
+        self.sumSummations = defaultdict(list) # by sum concept: summation indices
+        for baseSetKey in modelXbrl.baseSets.keys():
+            arcrole, ELR, linkqname, arcqname = baseSetKey
+            if arcrole == XbrlConst.summationItem and ELR and linkqname and arcqname:
+                relsSet = modelXbrl.relationshipSet(arcrole,ELR,linkqname,arcqname)
+                for sumConcept, modelRels in relsSet.fromModelObjects().items():
+                    summationIndex = len(self.summations)
+                    self.summations.append((ELR, sumConcept, modelRels))
+                    self.sumSummations[sumConcept].append(summationIndex)
+                    for modelRel in modelRels:
+                        itemConcept = modelRel.toModelObject
+                        if itemConcept is not None:
+                            self.itemSummations[itemConcept].append((summationIndex, scaledDecimal(modelRel.weightDecimal)))
+        self.duplicateKeyFacts = defaultdict(dict) # by ancestor, calc key: streamed fact
+        self.partialSums = defaultdict(dict) # by bind key, summation index: [exponent, coefficient, NaN terms, +INF terms, -INF terms, items, has duplicates, item concepts reported]
+        self.sumFacts = defaultdict(lambda: defaultdict(list)) # by bind key, sum concept: streamed facts
+        self.ancestorBindKeys = defaultdict(set) # bind keys by ancestor, to check and discard
+        self.rootAncestor = None # ancestor of root facts in bind keys, tuples by objectIndex
+        self.numStreamedFacts = 0
+        
+    def streamFacts(self, facts):
+        """Binds facts (root facts, with their tuple facts) as they are streamed, checks summations within tuples.
+        """
+        tupleAncestors = []
+        self.bindFacts(facts, (self.rootAncestor,), tupleAncestors)
+        for ancestor in tupleAncestors: # tuple bind keys are complete
+            self.checkSummations(ancestor)
+            
+    def finish(self):
+        """Checks summations of root facts, at the end of the streamed instance.
+        """
+        self.checkSummations(self.rootAncestor)
+            
+    def bindFacts(self, facts, ancestors, tupleAncestors):
+        for f in facts:
+            concept = f.concept
+            if concept is not None:
+                if concept.isNumeric:
+                    if concept in self.itemSummations or concept in self.sumSummations:
+                        self.bindFact(f, concept, ancestors)
+                elif concept.isTuple:
+                    tupleAncestors.append(f.objectIndex)
+                    self.bindFacts(f.modelTupleFacts, ancestors + (f.objectIndex,), tupleAncestors)
+                    
+    def bindFact(self, f, concept, ancestors):
+        self.numStreamedFacts += 1
+        sf = StreamedFact(f, self.inferDecimals, self.numStreamedFacts)
+        context = f.context
+        # must use nonDimAwareHash to achieve s-equal comparison of contexts
+        contextHash = context.contextNonDimAwareHash if context is not None else hash(None)
+        unit = f.unit
+        unitKey = unit.measures if unit is not None else None
+        parentBindKey = (ancestors[-1], contextHash, unitKey)
+        calcKey = (concept, contextHash, unitKey)
+        if not sf.isNil:
+            sf.bindKeys = [(ancestor, contextHash, unitKey) for ancestor in ancestors]
+            for bindKey in sf.bindKeys:
+                if concept in self.itemSummations:
+                    self.ancestorBindKeys[bindKey[0]].add(bindKey)
+                    partialSums = self.partialSums[bindKey]
+                    for summationIndex, scaledWeight in self.itemSummations[concept]:
+                        partialSum = partialSums.get(summationIndex)
+                        if partialSum is None:
+                            partialSum = partialSums[summationIndex] = [0, 0, 0, 0, 0, 0, False, set()]
+                        partialSum[7].add(concept)
+                        addPartialSumTerm(partialSum, sf, scaledWeight, 1)
+            if concept in self.sumSummations:
+                self.ancestorBindKeys[parentBindKey[0]].add(parentBindKey)
+                self.sumFacts[parentBindKey][concept].append(sf) # sum only for immediate parent
+        # duplicates, as ValidateXbrlCalcs.bindFacts
+        duplicateKeyFacts = self.duplicateKeyFacts[ancestors[-1]]
+        if calcKey in duplicateKeyFacts:
+            fDup = duplicateKeyFacts[calcKey]
+            if self.deDuplicate: # add lesser precision fact to consistent duplicates
+                if self.inferDecimals:
+                    d = inferredDecimals(sf); dDup = inferredDecimals(fDup)
+                    dMin = min((d, dDup)); pMin = None
+                    hasAccuracy = (not isnan(d) and not isnan(dDup))
+                    fIsMorePrecise = (d > dDup)
+                else:
+                    p = inferredPrecision(sf); pDup = inferredPrecision(fDup)
+                    dMin = None; pMin = min((p, pDup))
+                    hasAccuracy = (p != 0)
+                    fIsMorePrecise = (p > pDup)
+                try:
+                    isConsistent = (hasAccuracy and
+                                    roundValue(sf.value,precision=pMin,decimals=dMin) == 
+                                    roundValue(fDup.value,precision=pMin,decimals=dMin))
+                except (ValueError, decimal.InvalidOperation): # such as precision of a NaN value
+                    isConsistent = False
+                if isConsistent:
+                    # consistent duplicate, sf more precise than fDup, replace fDup with sf
+                    if fIsMorePrecise: # works for inf and integer mixtures
+                        duplicateKeyFacts[calcKey] = sf
+                        self.excludeFact(fDup, concept, CONSISTENT_DUPLICATE)
+                    else: # fDup is more precise or equally precise
+                        self.excludeFact(sf, concept, CONSISTENT_DUPLICATE)
+                else: # invalid accuracy or inconsistent duplicates
+                    self.excludeFact(sf, concept, DUPLICATED)
+                    self.excludeFact(fDup, concept, DUPLICATED)
+            else: # both this fact and matching calcKey'ed fact are duplicated
+                self.excludeFact(sf, concept, DUPLICATED)
+                self.excludeFact(fDup, concept, DUPLICATED)
+        else:
+            duplicateKeyFacts[calcKey] = sf
+            
+    def excludeFact(self, sf, concept, status):
+        # subtracts an included item from its partial sums, marks partial sums of duplicated items
+        for bindKey in sf.bindKeys:
+            for summationIndex, scaledWeight in self.itemSummations.get(concept, ()):
+                partialSum = self.partialSums[bindKey][summationIndex]
+                if sf.status == INCLUDED:
+                    addPartialSumTerm(partialSum, sf, scaledWeight, -1)
+                if status == DUPLICATED:
+                    partialSum[6] = True
+        if sf.status != DUPLICATED:
+            sf.status = status
+            
+    def checkSummations(self, ancestor):
+        # reports inconsistent summations of the bind keys of ancestor, and discards their partial sums
+        inconsistencies = []
+        for bindKey in self.ancestorBindKeys.pop(ancestor, ()):
+            partialSums = self.partialSums.pop(bindKey, {})
+            for sumConcept, sumFacts in self.sumFacts.pop(bindKey, {}).items():
+                if any(sf.status == DUPLICATED for sf in sumFacts):
+                    continue
+                for summationIndex in self.sumSummations[sumConcept]:
+                    partialSum = partialSums.get(summationIndex)
+                    if partialSum is None or partialSum[6]: # no item facts, or duplicated items
+                        continue
+                    boundSum = partialSumValue(partialSum)
+                    for sf in sumFacts:
+                        if sf.status == INCLUDED:
+                            roundedItemsSum = roundFact(sf, self.inferDecimals, vDecimal=boundSum)
+                            if roundedItemsSum != sf.roundedValue:
+                                inconsistencies.append((summationIndex, sf.sequence, sf, roundedItemsSum, partialSum[7]))
+        self.duplicateKeyFacts.pop(ancestor, None)
+        for summationIndex, sequence, sf, roundedItemsSum, reportedItemConcepts in sorted(inconsistencies, key=lambda i: i[:2]):
+            ELR, sumConcept, modelRels = self.summations[summationIndex]
+            d = inferredDecimals(sf)
+            if isnan(d) or isinf(d): d = 4
+            unreportedContribingItemQnames = [str(modelRel.toModelObject.qname) # the missing/unreported contributors in relationship order
+                                              for modelRel in modelRels
+                                              if modelRel.toModelObject is not None and
+                                                 modelRel.toModelObject not in reportedItemConcepts]
+            self.modelXbrl.log('INCONSISTENCY', "xbrl.5.2.5.2:calcInconsistency",
+                _("Calculation inconsistent from %(concept)s in link role %(linkrole)s reported sum %(reportedSum)s computed sum %(computedSum)s context %(contextID)s unit %(unitID)s unreportedContributingItems %(unreportedContributors)s"),
+                modelObject=self.modelXbrl,
+                concept=sumConcept.qname, linkrole=ELR, 
+                linkroleDefinition=self.modelXbrl.roleTypeDefinition(ELR),
+                reportedSum=Locale.format_decimal(self.modelXbrl.locale, sf.roundedValue, 1, max(d,0)),
+                computedSum=Locale.format_decimal(self.modelXbrl.locale, roundedItemsSum, 1, max(d,0)), 
+                contextID=sf.contextID, unitID=sf.unitID,
+                unreportedContributors=", ".join(unreportedContribingItemQnames) or "none")
+
+def addPartialSumTerm(partialSum, sf, scaledWeight, sign):
+    # adds (sign 1) or subtracts (sign -1) the weighted rounded value of included streamed fact sf
+    if sf.status != INCLUDED:
+        return
+    partialSum[5] += sign
+    weightCoefficient, weightExponent = scaledWeight
+    if sf.coefficient is None or weightCoefficient is None:
+        value = sf.roundedValue
+        if weightCoefficient is not None and value.is_infinite():
+            if value.is_signed() ^ (weightCoefficient < 0):
+                partialSum[4] += sign
+            elif weightCoefficient != 0:
+                partialSum[3] += sign
+            else:
+                partialSum[2] += sign
+        else:
+            partialSum[2] += sign
+        return
+    coefficient = sign * sf.coefficient * weightCoefficient
+    exponent = sf.exponent + weightExponent
+    if exponent < partialSum[0]:
+        partialSum[1] *= 10 ** (partialSum[0] - exponent)
+        partialSum[0] = exponent
+    elif exponent > partialSum[0]:
+        coefficient *= 10 ** (exponent - partialSum[0])
+    partialSum[1] += coefficient
+    
+def partialSumValue(partialSum):
+    # Decimal value of a partial sum
+    exponent, coefficient, nanTerms, posInfTerms, negInfTerms = partialSum[:5]
+    if nanTerms or (posInfTerms and negInfTerms):
+        return NaN
+    if posInfTerms:
+        return decimal.Decimal("Infinity")
+    if negInfTerms:
+        return decimal.Decimal("-Infinity")
+    return decimal.Decimal(coefficient).scaleb(exponent)
+
 def roundFact(fact, inferDecimals=False, vDecimal=None):
     if vDecimal is None:
         vStr = fact.value
@@ -344,9 +659,8 @@ def roundFact(fact, inferDecimals=False, vDecimal=None):
             vRounded = vDecimal
         elif p is not None:  # round per 4.6.7.1, half-up
             vAbs = vDecimal.copy_abs()
-            log = vAbs.log10()
             # defeat rounding to nearest even
-            d = p - int(log) - (1 if vAbs >= 1 else 0)
+            d = p - truncatedLog10(vAbs) - (1 if vAbs >= 1 else 0)
             #if trunc(fmod(vFloat * (10 ** d),2)) != 0:
             #    vFloat += 10 ** (-d - 1) * (1.0 if vFloat > 0 else -1.0)
             #vRounded = round(vFloat, d)
@@ -355,6 +669,24 @@ def roundFact(fact, inferDecimals=False, vDecimal=None):
             vRounded = vDecimal
     return vRounded
     
+def scaledDecimal(x):
+    # integer coefficient and exponent of Decimal x, (None, None) if x is not finite (or not a Decimal)
+    if not isinstance(x, decimal.Decimal) or not x.is_finite():
+        return None, None
+    sign, digits, exponent = x.as_tuple()
+    return int(decimal.Decimal((sign, digits, 0))), exponent
+
+def truncatedLog10(x):
+    # int(x.log10()) of finite positive Decimal x, from its adjusted exponent unless its coefficient has so many
+    # digits that x may be within log10's rounding of a power of ten
+    sign, digits, exponent = x.as_tuple()
+    if len(digits) <= 15 and x.is_finite():
+        adjusted = x.adjusted() # floor of log10
+        if adjusted >= 0 or (digits[0] == 1 and not any(digits[1:])): # log10 is adjusted or exact power of ten
+            return adjusted
+        return adjusted + 1 # truncated toward zero
+    return int(x.log10())
+
 def decimalRound(x, d, rounding):
     if x.is_normal() and -28 <= d <= 28: # prevent exception with excessive quantization digits
         if d >= 0:
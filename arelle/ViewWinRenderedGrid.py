@@ -996,8 +996,7 @@ class ViewRenderedGrid(ViewWinTkTable.ViewTkTable):
                                 # new context
                                 if concept.isNumeric:
                                     if concept.isMonetary:
-                                        unitMeasure = qname(XbrlConst.iso4217, self.newFactItemOptions.monetaryUnit)
-                                        unitMeasure.prefix = "iso4217" # want to save with a recommended prefix
+                                        unitMeasure = qname(XbrlConst.iso4217, "iso4217:" + self.newFactItemOptions.monetaryUnit) # saved with a recommended prefix
                                         decimals = self.newFactItemOptions.monetaryDecimals
                                     elif concept.isShares:
                                         unitMeasure = XbrlConst.qnXbrliShares
@@ -1017,6 +1016,8 @@ class ViewRenderedGrid(ViewWinTkTable.ViewTkTable):
                                     attrs.append(("decimals", decimals))
                                     value = Locale.atof(self.modelXbrl.locale, value, str.strip)
                                 newFact = instance.createFact(concept.qname, attributes=attrs, text=value)
+                                if instance.formulaFactDependencies is not None: # for re-validating formula changes
+                                    instance.formulaChangedFacts.add(newFact)
                                 tbl.setObjectId(modifiedCell,
                                                 newFact.objectId()) # switch cell to now use fact ID
                                 if self.factPrototypes[factPrototypeIndex] is not None:
@@ -1028,8 +1029,7 @@ class ViewRenderedGrid(ViewWinTkTable.ViewTkTable):
                                     if fact.concept.isNumeric:
                                         value = Locale.atof(self.modelXbrl.locale, value, str.strip)
                                         if fact.concept.isMonetary:
-                                            unitMeasure = qname(XbrlConst.iso4217, self.newFactItemOptions.monetaryUnit)
-                                            unitMeasure.prefix = "iso4217" # want to save with a recommended prefix
+                                            unitMeasure = qname(XbrlConst.iso4217, "iso4217:" + self.newFactItemOptions.monetaryUnit) # saved with a recommended prefix
                                             decimals = self.newFactItemOptions.monetaryDecimals
                                         elif fact.concept.isShares:
                                             unitMeasure = XbrlConst.qnXbrliShares
@@ -1056,6 +1056,8 @@ class ViewRenderedGrid(ViewWinTkTable.ViewTkTable):
                                         instance.setIsModified()
                                         fact.xValid = UNVALIDATED
                                         xmlValidate(instance, fact)
+                                        if instance.formulaFactDependencies is not None: # for re-validating formula changes
+                                            instance.formulaChangedFacts.add(fact)
             tbl.clearModificationStatus()
 
     def saveInstance(self, newFilename=None, onSaved=None):
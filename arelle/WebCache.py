@@ -4,17 +4,20 @@ Created on Oct 5, 2010
 @author: Mark V Systems Limited
 (c) Copyright 2010 Mark V Systems Limited, All rights reserved.
 '''
-import os, posixpath, sys, re, shutil, time, calendar, io, json, logging, shutil, cgi
+import os, posixpath, sys, re, shutil, time, calendar, io, json, logging, shutil, cgi, threading
+from functools import partial
 if sys.version[0] >= '3':
     from urllib.parse import quote, unquote
     from urllib.error import URLError, HTTPError, ContentTooShortError
     from http.client import IncompleteRead
+    from http import client as httpclient
     from urllib import request
     from urllib import request as proxyhandlers
 else: # python 2.7.2
     from urllib import quote, unquote
     from urllib import ContentTooShortError
     from httplib import IncompleteRead
+    import httplib as httpclient
     from urllib2 import URLError, HTTPError
     import urllib2 as proxyhandlers
 try:
@@ -28,6 +31,8 @@ addServerWebCache = None
     
 DIRECTORY_INDEX_FILE = "!~DirectoryIndex~!"
 INF = float("inf")
+MAX_IDLE_CONNECTIONS_PER_HOST = 8 # kept-alive connections retained for reuse by each host
+DEFAULT_PREFETCH_CONCURRENCY = 8 # parallel downloads of prefetch
 
 def proxyDirFmt(httpProxyTuple):
     if isinstance(httpProxyTuple,(tuple,list)) and len(httpProxyTuple) == 5:
@@ -71,6 +76,103 @@ def lastModifiedTime(headers):
     return None
     
 
+class PooledHTTPResponse(httpclient.HTTPResponse):
+    """HTTP response which returns its connection to the pool when closed after the body was completely read"""
+    pool = connection = None
+    
+    def close(self):
+        isCompletelyRead = self.fp is None # http.client releases fp at the end of the body
+        super(PooledHTTPResponse, self).close()
+        connection, self.connection = self.connection, None
+        if connection is not None:
+            self.pool.release(connection, isCompletelyRead and not self.will_close)
+
+class HTTPConnectionPool:
+    """
+    .. class:: HTTPConnectionPool()
+    
+    Kept-alive http and https connections, by host (or proxy), reused by successive (and concurrent) retrievals 
+    instead of opening a new connection (and TLS session) for each file.
+    """
+    def __init__(self):
+        self.idleConnections = {} # list of idle connections by (connection class, host)
+        self.lock = threading.Lock()
+        
+    def open(self, handler, connectionClass, req, **connectionArgs):
+        host = req.host
+        if not host:
+            raise URLError('no host given')
+        headers = dict(req.unredirected_hdrs)
+        headers.update((k, v) for k, v in req.headers.items() if k not in headers)
+        headers["Connection"] = "keep-alive"
+        headers = dict((name.title(), val) for name, val in headers.items())
+        key = (connectionClass, host)
+        while True:
+            with self.lock:
+                idleConnections = self.idleConnections.get(key)
+                connection = idleConnections.pop() if idleConnections else None
+            isReused = connection is not None
+            if not isReused:
+                connection = connectionClass(host, timeout=req.timeout, **connectionArgs)
+                connection.set_debuglevel(handler._debuglevel)
+                connection.response_class = PooledHTTPResponse
+                connection.poolKey = key
+            try:
+                try:
+                    connection.request(req.get_method(), req.selector, req.data, headers)
+                    response = connection.getresponse()
+                except (httpclient.BadStatusLine, httpclient.CannotSendRequest, ConnectionError) as err:
+                    # kept-alive connection may have been closed by the server, retry on a new connection
+                    if isReused:
+                        connection.close()
+                        continue
+                    raise URLError(err)
+                except OSError as err: # timeout error
+                    raise URLError(err)
+            except:
+                connection.close()
+                raise
+            break
+        response.pool = self
+        response.connection = connection
+        response.url = req.get_full_url()
+        response.msg = response.reason # urllib clients expect the reason in msg
+        return response
+    
+    def release(self, connection, isReusable):
+        if isReusable and connection.sock is not None:
+            with self.lock:
+                idleConnections = self.idleConnections.setdefault(connection.poolKey, [])
+                if len(idleConnections) < MAX_IDLE_CONNECTIONS_PER_HOST:
+                    idleConnections.append(connection)
+                    return
+        connection.close()
+        
+    def close(self):
+        with self.lock:
+            connections = [connection for idleConnections in self.idleConnections.values() for connection in idleConnections]
+            self.idleConnections.clear()
+        for connection in connections:
+            connection.close()
+
+class KeepAliveHTTPHandler(proxyhandlers.HTTPHandler):
+    def __init__(self, connectionPool):
+        proxyhandlers.HTTPHandler.__init__(self)
+        self.connectionPool = connectionPool
+        
+    def http_open(self, req):
+        return self.connectionPool.open(self, httpclient.HTTPConnection, req)
+
+class KeepAliveHTTPSHandler(proxyhandlers.HTTPSHandler):
+    def __init__(self, connectionPool, context=None):
+        proxyhandlers.HTTPSHandler.__init__(self, context=context)
+        self.connectionPool = connectionPool
+        
+    def https_open(self, req):
+        if req._tunnel_host: # https through a proxy is tunneled by a connection per request
+            return self.do_open(httpclient.HTTPSConnection, req, context=self._context, check_hostname=self._check_hostname)
+        return self.connectionPool.open(self, httpclient.HTTPSConnection, req, context=self._context, check_hostname=self._check_hostname)
+
 class WebCache:
     
     default_timeout = None
@@ -82,6 +184,7 @@ class WebCache:
         self._timeout = None        
         
         self._noCertificateCheck = False
+        self.connectionPool = None
         self.resetProxies(httpProxyTuple)
         
         #self.opener.addheaders = [('User-agent', 'Mozilla/5.0')]
@@ -115,6 +218,9 @@ class WebCache:
         else:
             self.cachedUrlCheckTimes = {}
         self.cachedUrlCheckTimesModified = False
+        self.store = None
+        # check times, cache file renaming and status of retrievals by discovery read ahead and prefetch threads, serialized by lock
+        self.lock = threading.RLock()
             
     @property
     def timeout(self):
@@ -152,12 +258,45 @@ class WebCache:
         self._logDownloads = _logDownloads
 
     def saveUrlCheckTimes(self):
-        if self.cachedUrlCheckTimesModified:
-            with io.open(self.urlCheckJsonFile, 'wt', encoding='utf-8') as f:
-                jsonStr = _STR_UNICODE(json.dumps(self.cachedUrlCheckTimes, ensure_ascii=False, indent=0)) # might not be unicode in 2.7
-                f.write(jsonStr)  # 2.7 gets unicode this way
+        with self.lock:
+            if self.cachedUrlCheckTimesModified and self.store is None: # store saves each check time when set
+                with io.open(self.urlCheckJsonFile, 'wt', encoding='utf-8') as f:
+                    jsonStr = _STR_UNICODE(json.dumps(self.cachedUrlCheckTimes, ensure_ascii=False, indent=0)) # might not be unicode in 2.7
+                    f.write(jsonStr)  # 2.7 gets unicode this way
+            self.cachedUrlCheckTimesModified = False
+        
+    def useStore(self, storeFile):
+        """Uses a WebCacheStore database (instead of the cache directory) for cached files and their check times.
+        Stored files are expanded into the store's files directory (shared by processes using the store) when used.
+        A store on a network file system, where SQLite locking is unreliable, is reported by a warning.
+        
+        :param storeFile: File path of the store database
+        :type storeFile: str
+        """
+        from arelle.WebCacheStore import WebCacheStore, networkFileSystemType
+        self.saveUrlCheckTimes()
+        self.store = WebCacheStore(storeFile)
+        fsType = networkFileSystemType(storeFile)
+        if fsType:
+            self.cntlr.addToLog(_("Web cache store %(store)s is on a network file system (%(fsType)s), where database locking is unreliable, "
+                                  "please use a store on a local disk for each host"),
+                                messageCode="webCache:storeOnNetworkFileSystem",
+                                messageArgs={"store": storeFile, "fsType": fsType},
+                                level=logging.WARNING)
+        # cache directory and check times replaced by the store (and available for migration to the store)
+        self.directoryCacheDir = self.cacheDir
+        self.directoryUrlCheckTimes = self.cachedUrlCheckTimes
+        self.cacheDir = self.store.filesDir
+        self.cachedUrlCheckTimes = self.store.checkTimes
         self.cachedUrlCheckTimesModified = False
         
+    def migrateToStore(self):
+        """Stores the files and check times of the cache directory in the store.
+        
+        :returns: int -- number of files stored
+        """
+        return self.store.migrate(self, self.directoryCacheDir, self.directoryUrlCheckTimes)
+        
     @property
     def noCertificateCheck(self):
         return self._noCertificateCheck
@@ -196,15 +335,26 @@ class WebCache:
                 self.http_auth_handler = proxyhandlers.HTTPBasicAuthHandler(pwrdmgr)
                 self.ntlm_auth_handler = HTTPNtlmAuthHandler.HTTPNtlmAuthHandler(pwrdmgr)
                 proxyHandlers = [self.proxy_handler, self.ntlm_auth_handler, self.proxy_auth_handler, self.http_auth_handler]          
+        if self.connectionPool is not None:
+            self.connectionPool.close()
+        self.connectionPool = None
+        if ssl and self.noCertificateCheck:
+            context = ssl.create_default_context()
+            context.check_hostname = False
+            context.verify_mode = ssl.CERT_NONE
+        else:
+            context = None
         if not self.hasNTLM:
             self.proxy_handler = proxyhandlers.ProxyHandler(proxyDirFmt(httpProxyTuple))
             self.proxy_auth_handler = proxyhandlers.ProxyBasicAuthHandler()
             self.http_auth_handler = proxyhandlers.HTTPBasicAuthHandler()
             proxyHandlers = [self.proxy_handler, self.proxy_auth_handler, self.http_auth_handler]
-        if ssl and self.noCertificateCheck:
-            context = ssl.create_default_context()
-            context.check_hostname = False
-            context.verify_mode = ssl.CERT_NONE
+            # keep-alive connections (ntlm authentication handles its own connections)
+            self.connectionPool = HTTPConnectionPool()
+            proxyHandlers.append(KeepAliveHTTPHandler(self.connectionPool))
+            if ssl:
+                proxyHandlers.append(KeepAliveHTTPSHandler(self.connectionPool, context=context))
+        elif context is not None:
             proxyHandlers.append(proxyhandlers.HTTPSHandler(context=context))
         self.opener = proxyhandlers.build_opener(*proxyHandlers)
 
@@ -306,38 +456,50 @@ class WebCache:
                 filepath += DIRECTORY_INDEX_FILE
             if os.sep == '\\':
                 filepath = filepath.replace('/', '\\')
+            if self.store is not None and not reload:
+                self.store.expand(url, filepath) # stored file (if any) into the store's files directory
             if self.workOffline or filenameOnly:
                 return filepath
-            filepathtmp = filepath + ".tmp"
+            filepathtmp = "{}.{}-{}.tmp".format(filepath, os.getpid(), threading.get_ident()) # other threads and processes may be retrieving url
             fileExt = os.path.splitext(filepath)[1]
             timeNow = time.time()
             timeNowStr = time.strftime('%Y-%m-%dT%H:%M:%S UTC', time.gmtime(timeNow))
             retrievingDueToRecheckInterval = False
             if not reload and os.path.exists(filepath):
-                if url in self.cachedUrlCheckTimes and not checkModifiedTime:
-                    cachedTime = calendar.timegm(time.strptime(self.cachedUrlCheckTimes[url], '%Y-%m-%dT%H:%M:%S UTC'))
+                with self.lock:
+                    cachedTimeStr = self.cachedUrlCheckTimes.get(url)
+                if cachedTimeStr and not checkModifiedTime:
+                    cachedTime = calendar.timegm(time.strptime(cachedTimeStr, '%Y-%m-%dT%H:%M:%S UTC'))
                 else:
                     cachedTime = 0
                 if timeNow - cachedTime > self.maxAgeSeconds:
                     # weekly check if newer file exists
                     newerOnWeb = False
                     try: # no provision here for proxy authentication!!!
-                        remoteFileTime = lastModifiedTime( self.getheaders(quotedUrl) )
+                        remoteHeaders = self.getheaders(quotedUrl)
+                        remoteFileTime = lastModifiedTime( remoteHeaders )
                         if remoteFileTime and remoteFileTime > os.path.getmtime(filepath):
                             newerOnWeb = True
+                        elif self.store is not None and self.store.isChanged(url, remoteHeaders):
+                            newerOnWeb = True
                     except:
                         pass # for now, forget about authentication here
                     if not newerOnWeb:
                         # update ctime by copying file and return old file
-                        self.cachedUrlCheckTimes[url] = timeNowStr
-                        self.cachedUrlCheckTimesModified = True
+                        with self.lock:
+                            self.cachedUrlCheckTimes[url] = timeNowStr
+                            self.cachedUrlCheckTimesModified = True
                         return filepath
                     retrievingDueToRecheckInterval = True
                 else:
                     return filepath
             filedir = os.path.dirname(filepath)
             if not os.path.exists(filedir):
-                os.makedirs(filedir)
+                try:
+                    os.makedirs(filedir)
+                except OSError: # may have been created by another thread (such as discovery read ahead)
+                    if not os.path.isdir(filedir):
+                        raise
             # Retrieve over HTTP and cache, using rename to avoid collisions
             # self.modelManager.addToLog('web caching: {0}'.format(url))
             
@@ -345,12 +507,11 @@ class WebCache:
             retryCount = 5
             while retryCount > 0:
                 try:
-                    self.progressUrl = url
                     savedfile, headers, initialBytes = self.retrieve(
                     #savedfile, headers = self.opener.retrieve(
                                       quotedUrl,
                                       filename=filepathtmp,
-                                      reporthook=self.reportProgress)
+                                      reporthook=partial(self.reportProgress, url))
                     
                     # check if this is a real file or a wifi or web logon screen
                     if fileExt in {".xsd", ".xml", ".xbrl"}:
@@ -490,34 +651,46 @@ class WebCache:
                         return None
                 
                 # rename temporarily named downloaded file to desired name                
-                if os.path.exists(filepath):
+                with self.lock: # another thread may be renaming a retrieval of url
+                    if os.path.exists(filepath) and (self.store is None or not os.path.isfile(filepath)):
+                        try: # store files directory is shared by processes, prior file is atomically replaced by renaming
+                            if os.path.isfile(filepath) or os.path.islink(filepath):
+                                os.remove(filepath)
+                            elif os.path.isdir(filepath):
+                                shutil.rmtree(filepath)
+                        except Exception as err:
+                            self.cntlr.addToLog(_("%(error)s \nUnsuccessful removal of prior file %(filepath)s \nPlease remove with file manager."),
+                                                messageCode="webCache:cachedPriorFileLocked",
+                                                messageArgs={"error": err, "filepath": filepath},
+                                                level=logging.ERROR)
                     try:
-                        if os.path.isfile(filepath) or os.path.islink(filepath):
-                            os.remove(filepath)
-                        elif os.path.isdir(filepath):
-                            shutil.rmtree(filepath)
+                        if self.store is not None:
+                            os.replace(filepathtmp, filepath)
+                        else:
+                            os.rename(filepathtmp, filepath)
+                        if self._logDownloads:
+                            self.cntlr.addToLog(_("Downloaded %(URL)s"),
+                                                messageCode="webCache:download",
+                                                messageArgs={"URL": url, "filepath": filepath},
+                                                level=logging.INFO)
                     except Exception as err:
-                        self.cntlr.addToLog(_("%(error)s \nUnsuccessful removal of prior file %(filepath)s \nPlease remove with file manager."),
-                                            messageCode="webCache:cachedPriorFileLocked",
+                        self.cntlr.addToLog(_("%(error)s \nUnsuccessful renaming of downloaded file to active file %(filepath)s \nPlease remove with file manager."),
+                                            messageCode="webCache:cacheDownloadRenamingError",
                                             messageArgs={"error": err, "filepath": filepath},
                                             level=logging.ERROR)
-                try:
-                    os.rename(filepathtmp, filepath)
-                    if self._logDownloads:
-                        self.cntlr.addToLog(_("Downloaded %(URL)s"),
-                                            messageCode="webCache:download",
-                                            messageArgs={"URL": url, "filepath": filepath},
-                                            level=logging.INFO)
-                except Exception as err:
-                    self.cntlr.addToLog(_("%(error)s \nUnsuccessful renaming of downloaded file to active file %(filepath)s \nPlease remove with file manager."),
-                                        messageCode="webCache:cacheDownloadRenamingError",
-                                        messageArgs={"error": err, "filepath": filepath},
-                                        level=logging.ERROR)
-                webFileTime = lastModifiedTime(headers)
-                if webFileTime: # set mtime to web mtime
-                    os.utime(filepath,(webFileTime,webFileTime))
-                self.cachedUrlCheckTimes[url] = timeNowStr
-                self.cachedUrlCheckTimesModified = True
+                    webFileTime = lastModifiedTime(headers)
+                    if webFileTime: # set mtime to web mtime
+                        os.utime(filepath,(webFileTime,webFileTime))
+                    if self.store is not None:
+                        try:
+                            self.store.store(url, filepath, headers.get("etag") if headers else None, webFileTime, timeNowStr)
+                        except Exception as err:
+                            self.cntlr.addToLog(_("%(error)s \nUnsuccessful storing of downloaded file %(URL)s in web cache store %(store)s"),
+                                                messageCode="webCache:storeError",
+                                                messageArgs={"error": err, "URL": url, "store": self.store.storeFile},
+                                                level=logging.ERROR)
+                    self.cachedUrlCheckTimes[url] = timeNowStr
+                    self.cachedUrlCheckTimesModified = True
                 return filepath
         
         if url.startswith("file://"): url = url[7:]
@@ -526,32 +699,68 @@ class WebCache:
             url = url.replace('/', '\\')
         return url
     
+    def prefetch(self, urls, base=None, reload=False, maxConcurrency=None):
+        """Retrieves web files into the cache in parallel, such as the schemaRefs and linkbaseRefs of a document,
+        so that later getfilename calls find them cached (as by discovery with modelManager.prefetchThreads, see
+        DiscoveryReadAhead.prefetch).  Cache files and recheck intervals are as for getfilename.
+        
+        :param urls: Urls to retrieve (non-web urls are ignored)
+        :type urls: [str]
+        :param base: Base url of relative urls
+        :type base: str
+        :param maxConcurrency: Maximum number of parallel retrievals (default DEFAULT_PREFETCH_CONCURRENCY)
+        :type maxConcurrency: int
+        :returns: dict -- cache file path (or None if not retrievable) by normalized url
+        """
+        normalizedUrls = []
+        for url in urls:
+            if url:
+                url = self.normalizeUrl(url, base)
+                if isHttpUrl(url) and url not in normalizedUrls:
+                    normalizedUrls.append(url)
+        if not normalizedUrls:
+            return {}
+        def getfilename(url):
+            try:
+                return self.getfilename(url, reload=reload)
+            except Exception: # retrieval errors are logged by getfilename, others are reported when the file is loaded
+                return None
+        if self.workOffline or self.cacheDir == SERVER_WEB_CACHE or len(normalizedUrls) == 1:
+            return dict((url, getfilename(url)) for url in normalizedUrls)
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(min(maxConcurrency or DEFAULT_PREFETCH_CONCURRENCY, len(normalizedUrls))) as executor:
+            return dict(zip(normalizedUrls, executor.map(getfilename, normalizedUrls)))
+    
     def internetRecheckFailedRecovery(self, filepath, url, err, timeNowStr):
         self.cntlr.addToLog(_("During refresh of web file ignoring error: %(error)s for %(URL)s"),
                             messageCode="webCache:unableToRefreshFile",
                             messageArgs={"URL": url, "error": err},
                             level=logging.INFO)
         # skip this checking cycle, act as if retrieval was ok
-        self.cachedUrlCheckTimes[url] = timeNowStr
-        self.cachedUrlCheckTimesModified = True
+        with self.lock:
+            self.cachedUrlCheckTimes[url] = timeNowStr
+            self.cachedUrlCheckTimesModified = True
         return filepath
     
-    def reportProgress(self, blockCount, blockSize, totalSize):
-        if totalSize > 0:
-            self.cntlr.showStatus(_("web caching {0}: {1:.0f} of {2:.0f} KB").format(
-                    self.progressUrl,
-                    blockCount * blockSize / 1024,
-                    totalSize / 1024))
-        else:
-            self.cntlr.showStatus(_("web caching {0}: {1:.0f} KB").format(
-                    self.progressUrl,
-                    blockCount * blockSize / 1024))
+    def reportProgress(self, url, blockCount, blockSize, totalSize):
+        with self.lock: # status of concurrent retrievals is shown one at a time
+            if totalSize > 0:
+                self.cntlr.showStatus(_("web caching {0}: {1:.0f} of {2:.0f} KB").format(
+                        url,
+                        blockCount * blockSize / 1024,
+                        totalSize / 1024))
+            else:
+                self.cntlr.showStatus(_("web caching {0}: {1:.0f} KB").format(
+                        url,
+                        blockCount * blockSize / 1024))
 
     def clear(self):
         for cachedProtocol in ("http", "https"):
             cachedProtocolDir = os.path.join(self.cacheDir, cachedProtocol)
             if os.path.exists(cachedProtocolDir):
                 shutil.rmtree(cachedProtocolDir, True)
+        if self.store is not None:
+            self.store.clear()
         
     def getheaders(self, url):
         if url and isHttpUrl(url):
@@ -0,0 +1,241 @@
+'''
+Created on Oct 18, 2026
+
+Web cache store, an optional backend of WebCache (--webCacheStore) which keeps the cached web files
+in a single SQLite database, instead of one file per url in the cache directory and a json file of
+url check times rewritten in full on each save.
+
+File contents are stored once per content (zlib compressed blobs keyed by their sha256 hash), and
+an index of urls has the blob, ETag, Last-Modified and check time of each url.  Files are expanded
+from the store into its files directory (the store file path with a .files suffix, in the usual url to
+file path layout) when first used, so that cached files remain ordinary files to their users.  The files
+directory is shared by the processes using the store, each file being expanded (or retrieved) to a
+temporary file which is atomically renamed, and not expanded again if already expanded with the size and
+modification time of the stored file.
+
+The store is meant to be shared by concurrent processes of one host, on a local file system.  SQLite's
+locking is unreliable on network file systems (such as NFS or SMB), where concurrent writers may corrupt
+the database, so a store on a network file system is reported (on Linux) when used, and hosts sharing a
+network volume should each use a store on their own local disk.
+
+An existing cache directory and its check times may be migrated into a store (--webCacheStoreMigrate).
+
+@author: Mark V Systems Limited
+(c) Copyright 2026 Mark V Systems Limited, All rights reserved.
+'''
+import os, hashlib, sqlite3, sys, threading, time, zlib
+try:
+    from collections.abc import MutableMapping
+except ImportError:
+    from collections import MutableMapping
+
+CHECK_TIME_FORMAT = '%Y-%m-%dT%H:%M:%S UTC' # as in WebCache cachedUrlCheckTimes
+COMPRESSION_LEVEL = 6
+NETWORK_FILE_SYSTEM_TYPES = {"nfs", "nfs4", "cifs", "smbfs", "smb3", "afs", "9p", "ceph", "glusterfs", "lustre",
+                             "fuse.sshfs", "fuse.glusterfs", "fuse.cephfs"}
+
+class WebCacheStore:
+    """
+    .. class:: WebCacheStore(storeFile)
+
+    WebCacheStore is a SQLite database of compressed, content-addressed web cache files and an index of their urls.
+
+    :param storeFile: File path of the store database (created if it doesn't exist)
+    :type storeFile: str
+    """
+    def __init__(self, storeFile):
+        self.storeFile = storeFile
+        self.filesDir = os.path.abspath(storeFile) + ".files" # expanded files, shared by processes using the store
+        if not os.path.exists(self.filesDir):
+            os.makedirs(self.filesDir)
+        # used by discovery read ahead and prefetch threads, serialized by lock
+        self.conn = sqlite3.connect(storeFile, timeout=60.0, check_same_thread=False)
+        self.lock = threading.RLock()
+        with self.lock, self.conn:
+            self.conn.execute("CREATE TABLE IF NOT EXISTS blob (hash TEXT PRIMARY KEY, size INTEGER, data BLOB)")
+            self.conn.execute("CREATE TABLE IF NOT EXISTS url (url TEXT PRIMARY KEY, hash TEXT, etag TEXT, "
+                              "lastModified REAL, checked TEXT)")
+        self.expandedUrls = set() # urls expanded (or found expanded) into the files directory by this process
+        self.checkTimes = WebCacheStoreCheckTimes(self)
+
+    def entry(self, url):
+        """Returns the index entry of url, as (hash, etag, lastModified, checked), or None if not stored."""
+        with self.lock:
+            return self.conn.execute("SELECT hash, etag, lastModified, checked FROM url WHERE url = ?", (url,)).fetchone()
+
+    def read(self, hash):
+        """Returns the (uncompressed) contents of a stored blob."""
+        with self.lock:
+            row = self.conn.execute("SELECT data FROM blob WHERE hash = ?", (hash,)).fetchone()
+        if row is None:
+            raise KeyError(hash)
+        return zlib.decompress(row[0])
+
+    def store(self, url, filepath, etag=None, lastModified=None, checked=None, isExpanded=True):
+        """Stores the file of url (such as just retrieved into the files directory) and its index entry.
+        isExpanded is False when filepath is not in the files directory (such as when migrating).
+
+        :returns: str -- hash of the stored contents
+        """
+        with open(filepath, "rb") as f:
+            contents = f.read()
+        hash = hashlib.sha256(contents).hexdigest()
+        with self.lock, self.conn:
+            if self.conn.execute("SELECT 1 FROM blob WHERE hash = ?", (hash,)).fetchone() is None:
+                self.conn.execute("INSERT INTO blob (hash, size, data) VALUES (?, ?, ?)",
+                                  (hash, len(contents), sqlite3.Binary(zlib.compress(contents, COMPRESSION_LEVEL))))
+            self.conn.execute("INSERT OR REPLACE INTO url (url, hash, etag, lastModified, checked) VALUES (?, ?, ?, ?, ?)",
+                              (url, hash, etag, lastModified if lastModified is not None else os.path.getmtime(filepath),
+                               checked or time.strftime(CHECK_TIME_FORMAT, time.gmtime())))
+        if isExpanded:
+            self.expandedUrls.add(url)
+        return hash
+
+    def expand(self, url, filepath):
+        """Expands the stored file of url (if stored) to filepath in the files directory, with the modification
+        time of its Last-Modified time, unless already expanded (by this or another process).
+
+        :returns: bool -- True if url is stored
+        """
+        if url in self.expandedUrls:
+            return True
+        with self.lock:
+            row = self.conn.execute("SELECT url.hash, url.lastModified, blob.size FROM url JOIN blob ON url.hash = blob.hash "
+                                    "WHERE url = ?", (url,)).fetchone()
+        if row is None:
+            return False
+        hash, lastModified, size = row
+        try:
+            fileStat = os.stat(filepath)
+            if fileStat.st_size == size and (not lastModified or abs(fileStat.st_mtime - lastModified) < 1.0):
+                self.expandedUrls.add(url) # expanded by another process (or a prior run)
+                return True
+        except OSError: # not yet expanded
+            pass
+        try:
+            contents = self.read(hash)
+        except KeyError: # blob removed by another process
+            return False
+        fileDir = os.path.dirname(filepath)
+        if not os.path.exists(fileDir):
+            try:
+                os.makedirs(fileDir)
+            except OSError: # may have been created by another thread
+                if not os.path.isdir(fileDir):
+                    raise
+        filepathtmp = "{}.{}-{}.tmp".format(filepath, os.getpid(), threading.get_ident()) # other processes may be expanding url
+        with open(filepathtmp, "wb") as f:
+            f.write(contents)
+        if lastModified:
+            os.utime(filepathtmp, (lastModified, lastModified))
+        os.replace(filepathtmp, filepath) # atomic, other processes see either the prior or the expanded file
+        self.expandedUrls.add(url)
+        return True
+
+    def isChanged(self, url, headers):
+        """Returns True if response headers of url have a different ETag than the stored file."""
+        entry = self.entry(url)
+        etag = headers.get("etag") if headers else None
+        return bool(entry is not None and entry[1] and etag and etag != entry[1])
+
+    def remove(self, url):
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM url WHERE url = ?", (url,))
+            self.conn.execute("DELETE FROM blob WHERE hash NOT IN (SELECT hash FROM url)")
+        self.expandedUrls.discard(url)
+
+    def clear(self):
+        with self.lock:
+            with self.conn:
+                self.conn.execute("DELETE FROM url")
+                self.conn.execute("DELETE FROM blob")
+            self.conn.execute("VACUUM")
+        self.expandedUrls.clear()
+
+    def migrate(self, webCache, cacheDir, checkTimes):
+        """Stores the files of a cache directory (in the usual url to file path layout), with their url check times.
+
+        :param webCache: WebCache, for the url of each cache file path
+        :type webCache: WebCache
+        :param cacheDir: Cache directory to migrate
+        :type cacheDir: str
+        :param checkTimes: url check times of the cache directory files
+        :type checkTimes: dict
+
+        :returns: int -- number of files stored
+        """
+        numFiles = 0
+        workingCacheDir = webCache.cacheDir
+        webCache.cacheDir = cacheDir # for cacheFilepathToUrl of files in the cache directory being migrated
+        try:
+            for scheme in ("http", "https"):
+                for dirpath, dirnames, filenames in os.walk(os.path.join(cacheDir, scheme)):
+                    for filename in filenames:
+                        if filename.endswith(".tmp"): # incomplete retrieval
+                            continue
+                        filepath = os.path.join(dirpath, filename)
+                        url = webCache.cacheFilepathToUrl(filepath)
+                        self.store(url, filepath, checked=checkTimes.get(url), isExpanded=False)
+                        numFiles += 1
+        finally:
+            webCache.cacheDir = workingCacheDir
+        return numFiles
+
+    def status(self):
+        with self.lock:
+            urls = self.conn.execute("SELECT COUNT(*) FROM url").fetchone()[0]
+            blobs, size, storedSize = self.conn.execute(
+                "SELECT COUNT(*), TOTAL(size), TOTAL(LENGTH(data)) FROM blob").fetchone()
+        return {"urls": urls, "blobs": blobs, "size": int(size), "storedSize": int(storedSize)}
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+def networkFileSystemType(path):
+    """Returns the file system type of path if it is a network file system, as listed by /proc/mounts (on Linux),
+    else None (also when the file system type can't be determined)."""
+    if not sys.platform.startswith("linux"):
+        return None
+    path = os.path.realpath(path)
+    mountPoint = fsType = None
+    try:
+        with open("/proc/mounts") as f:
+            for line in f:
+                fields = line.split()
+                if len(fields) >= 3:
+                    mountDir = fields[1].replace("\\040", " ")
+                    if ((path == mountDir or path.startswith(mountDir.rstrip("/") + "/")) and
+                        (mountPoint is None or len(mountDir) > len(mountPoint))):
+                        mountPoint, fsType = mountDir, fields[2]
+    except (IOError, OSError):
+        return None
+    return fsType if fsType in NETWORK_FILE_SYSTEM_TYPES else None
+
+class WebCacheStoreCheckTimes(MutableMapping):
+    """url check times of a WebCacheStore, replacing WebCache's cachedUrlCheckTimes dict (saved by the json file),
+    each check time being saved when set."""
+    def __init__(self, store):
+        self.store = store
+
+    def __getitem__(self, url):
+        entry = self.store.entry(url)
+        if entry is None or not entry[3]:
+            raise KeyError(url)
+        return entry[3]
+
+    def __setitem__(self, url, checked):
+        with self.store.lock, self.store.conn:
+            self.store.conn.execute("UPDATE url SET checked = ? WHERE url = ?", (checked, url))
+
+    def __delitem__(self, url):
+        self.store.remove(url)
+
+    def __iter__(self):
+        with self.store.lock:
+            urls = [row[0] for row in self.store.conn.execute("SELECT url FROM url")]
+        return iter(urls)
+
+    def __len__(self):
+        with self.store.lock:
+            return self.store.conn.execute("SELECT COUNT(*) FROM url").fetchone()[0]
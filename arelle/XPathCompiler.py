@@ -0,0 +1,521 @@
+'''
+Created on Oct 18, 2026
+
+XPath compiler, compiling the expression stack of a parsed XPath 2.0 expression (XPathParser.parse) into
+a tree of Python closures, which XPathContext.evaluate calls instead of interpreting the expression stack.
+
+Each closure evaluates one production of the expression stack, as the corresponding branch of
+XPathContext.evaluate does, so results, XPathExceptions (codes, messages, source positions), focus
+(context item, progHeader and traceType) and trace behavior are those of the interpreter.  What is done
+once, when compiling, instead of on each evaluation, is dispatching each production to its operation
+(type tests and operator/function name lookups), resolving the function module of function calls,
+and determining the parent path operation of path steps.
+
+The interpreter remains available (formula option interpretXPath, --formulaInterpretXPath).
+
+@author: Mark V Systems Limited
+(c) Copyright 2026 Mark V Systems Limited, All rights reserved.
+'''
+import operator
+from decimal import Decimal
+from arelle import XbrlConst, XmlUtil
+from arelle.ModelObject import ModelObject
+from arelle.ModelValue import qname, QName, AnyURI, DateTime
+from arelle.XPathFunctionMemo import isMemoizable, functionName
+from arelle.XPathParser import VariableRef, QNameDef, OperationDef, RangeDecl, Expr, ProgHeader
+from arelle.XPathContext import (XPathContext, XPathException, FunctionNumArgs, FunctionArgType, FunctionNotAvailable,
+                                 VALUE_OPS, GENERALCOMPARISON_OPS, NODECOMPARISON_OPS, COMBINING_OPS, LOGICAL_OPS,
+                                 UNARY_OPS, FORSOMEEVERY_OPS, PATH_OPS, SEQUENCE_TYPES)
+
+flattenSequence = XPathContext.flattenSequence # called as flattenSequence(xc, x)
+
+NODE_TEST_FUNCTIONS = {'attribute', 'comment', 'document-node', 'element', 'item', 'node',
+                       'processing-instruction', 'schema-attribute', 'schema-element', 'text'}
+ARITHMETIC_OPS = {'+': operator.add, '-': operator.sub, '*': operator.mul,
+                  'div': operator.truediv, 'idiv': operator.floordiv, 'mod': operator.mod}
+DIVISION_OPS = {'div', 'idiv', 'mod'}
+VALUE_COMPARISON_OPS = {'ge': operator.ge, 'gt': operator.gt, 'le': operator.le, 'lt': operator.lt,
+                        'eq': operator.eq, 'ne': operator.ne}
+GENERAL_COMPARISON_OPS = {'>=': operator.ge, '>': operator.gt, '<=': operator.le, '<': operator.lt,
+                          '=': operator.eq, '!=': operator.ne}
+INSTANCE_OF_XSD_TYPES = {"integer": _INT_TYPES,
+                         "string": _STR_BASE,
+                         "decimal": Decimal,
+                         "double": float,
+                         "float": float,
+                         "boolean": bool,
+                         "QName": QName,
+                         "anyURI": AnyURI,
+                         "date": DateTime,
+                         "dateTime": DateTime}
+
+# deferred imports (modules importing XPathContext)
+testTypeCompatiblity = None
+Trace = None
+
+def compile(exprStack):
+    """Compiles the expression stack of a parsed XPath expression.
+
+    :param exprStack: Expression stack of XPathParser.parse
+    :type exprStack: list
+    :returns: function(xc, contextItem, resultStack) -- evaluating exprStack as XPathContext.evaluate(exprStack, contextItem, resultStack)
+    """
+    global testTypeCompatiblity, Trace
+    if Trace is None:
+        from arelle.FunctionUtil import testTypeCompatiblity
+        from arelle.ModelFormulaObject import Trace
+    return compileSequence(exprStack, None)
+
+def compileSequence(exprStack, parentOp):
+    # evaluation of an expression stack (or operation arguments), parentOp as passed to XPathContext.evaluate
+    steps = tuple(step
+                  for step in (compileStep(p, parentOp) for p in exprStack)
+                  if step is not None) # steps which the interpreter ignores
+    hasProgHeader = any(isinstance(p, ProgHeader) for p in exprStack)
+    if hasProgHeader:
+        def evaluateSequence(xc, contextItem, resultStack):
+            for step in steps:
+                step(xc, contextItem, resultStack)
+            xc.progHeader = None
+            return resultStack
+    elif len(steps) == 1:
+        step = steps[0]
+        def evaluateSequence(xc, contextItem, resultStack):
+            step(xc, contextItem, resultStack)
+            return resultStack
+    else:
+        def evaluateSequence(xc, contextItem, resultStack):
+            for step in steps:
+                step(xc, contextItem, resultStack)
+            return resultStack
+    return evaluateSequence
+
+def compileStep(p, parentOp):
+    # each step appends its result (if any) to resultStack, as flattened sequence
+    if isinstance(p, QNameDef) or (p == '*' and parentOp in ('/', '//')): # path step QName or wildcard
+        return compilePathStep(p, parentOp)
+    elif isinstance(p, _STR_NUM_TYPES):
+        def constant(xc, contextItem, resultStack):
+            resultStack.append([p])
+        return constant
+    elif isinstance(p, VariableRef):
+        name = p.name
+        def variableRef(xc, contextItem, resultStack):
+            inScopeVars = xc.inScopeVars
+            if name in inScopeVars: # None atomic result is XPath empty sequence
+                resultStack.append(flattenSequence(xc, inScopeVars[name]))
+        return variableRef
+    elif isinstance(p, OperationDef):
+        return compileOperation(p, parentOp)
+    elif isinstance(p, ProgHeader):
+        traceType = p.traceType
+        setsTraceType = traceType not in (Trace.MESSAGE, Trace.CUSTOM_FUNCTION)
+        def progHeader(xc, contextItem, resultStack):
+            xc.progHeader = p
+            if setsTraceType:
+                xc.traceType = traceType
+        return progHeader
+    return None
+
+def compilePathStep(p, parentOp):
+    def pathStep(xc, contextItem, resultStack):
+        if resultStack and xc.isNodeSequence(resultStack[-1]):
+            sourceSequence = resultStack.pop()
+        else:
+            sourceSequence = [contextItem]
+        resultStack.append(flattenSequence(xc, xc.stepAxis(parentOp, p, sourceSequence)))
+    return pathStep
+
+def compileOperation(p, parentOp):
+    op = p.name
+    if isinstance(op, QNameDef): # function call
+        return compileFunctionCall(p, parentOp)
+    elif op in VALUE_OPS:
+        return compileValueOperation(p)
+    elif op in GENERALCOMPARISON_OPS:
+        return compileGeneralComparison(p)
+    elif op in NODECOMPARISON_OPS:
+        return compileNodeComparison(p)
+    elif op in COMBINING_OPS:
+        return compileCombiningOperation(p)
+    elif op in LOGICAL_OPS:
+        return compileLogicalOperation(p)
+    elif op in UNARY_OPS:
+        return compileUnaryOperation(p)
+    elif op == 'instance':
+        return compileInstanceOf(p)
+    elif op == 'sequence':
+        evaluateArgs = compileSequence(p.args, None)
+        def sequence(xc, contextItem, resultStack):
+            resultStack.append(flattenSequence(xc, evaluateArgs(xc, contextItem, [])))
+        return sequence
+    elif op == 'predicate':
+        return compilePredicate(p)
+    elif op in FORSOMEEVERY_OPS: # for, some, every
+        evaluateRangeVars = compileRangeVars(op, p.args)
+        def forSomeEvery(xc, contextItem, resultStack):
+            result = []
+            evaluateRangeVars(xc, contextItem, result)
+            resultStack.append(flattenSequence(xc, result))
+        return forSomeEvery
+    elif op == 'if':
+        evaluateTest = compileSequence(p.args[0].expr[0], None)
+        evaluateThen = compileSequence(p.args[1].args, None)
+        evaluateElse = compileSequence(p.args[2].args, None)
+        def ifThenElse(xc, contextItem, resultStack):
+            test = xc.effectiveBooleanValue(p, evaluateTest(xc, contextItem, []))
+            resultStack.append(flattenSequence(xc, (evaluateThen if test else evaluateElse)(xc, contextItem, [])))
+        return ifThenElse
+    elif op == '.':
+        def contextItemStep(xc, contextItem, resultStack):
+            if contextItem is not None:
+                resultStack.append(flattenSequence(xc, contextItem))
+        return contextItemStep
+    elif op == '..':
+        def parentStep(xc, contextItem, resultStack):
+            result = XmlUtil.parent(contextItem)
+            if result is not None:
+                resultStack.append(flattenSequence(xc, result))
+        return parentStep
+    elif op in PATH_OPS:
+        return compilePath(p)
+    return None # operation not evaluated by the interpreter
+
+def compileFunctionCall(p, parentOp):
+    from arelle import FunctionXs, FunctionFn, FunctionXfi, FunctionIxt, FunctionCustom
+    op = p.name
+    ns = op.namespaceURI; localname = op.localName
+    evaluateArgs = compileSequence(p.args, None)
+    # functions other than custom function signatures and plug-in custom functions (which are checked first when called)
+    if op.unprefixed and localname in NODE_TEST_FUNCTIONS:
+        def builtInCall(xc, contextItem, args, resultStack):
+            # step axis operation
+            if len(resultStack) == 0 or not xc.isNodeSequence(resultStack[-1]):
+                if isinstance(contextItem, (tuple,list)):
+                    resultStack.append( contextItem )
+                else:
+                    resultStack.append( [ contextItem, ] )
+            return xc.stepAxis(parentOp, p, resultStack.pop() )
+    elif op.unprefixed or ns == XbrlConst.fn:
+        fnCall = FunctionFn.call
+        def builtInCall(xc, contextItem, args, resultStack):
+            return fnCall(xc, p, localname, contextItem, args)
+    elif ns == XbrlConst.xfi or ns == XbrlConst.xff:
+        xfiCall = FunctionXfi.call
+        def builtInCall(xc, contextItem, args, resultStack):
+            return xfiCall(xc, p, localname, args)
+    elif ns == XbrlConst.xsd:
+        xsCall = FunctionXs.call
+        def builtInCall(xc, contextItem, args, resultStack):
+            return xsCall(xc, p, localname, args)
+    elif ns in FunctionIxt.ixtNamespaceFunctions:
+        ixtCall = FunctionIxt.call
+        def builtInCall(xc, contextItem, args, resultStack):
+            return ixtCall(xc, p, op, args)
+    else:
+        def builtInCall(xc, contextItem, args, resultStack):
+            customTransforms = xc.modelXbrl.modelManager.customTransforms
+            if op in customTransforms:
+                return customTransforms[op](args[0][0])
+            raise XPathException(p, 'err:XPST0017', _('Function call not identified: {0}.').format(op))
+    if isMemoizable(op): # results are memoized by the function memo of xc, if any
+        name = functionName(op)
+        evaluateCall = builtInCall
+        def builtInCall(xc, contextItem, args, resultStack):
+            functionMemo = xc.functionMemo
+            if functionMemo is None:
+                return evaluateCall(xc, contextItem, args, resultStack)
+            return functionMemo.call(name, args, lambda: evaluateCall(xc, contextItem, args, resultStack))
+    customCall = FunctionCustom.call
+    def functionCall(xc, contextItem, resultStack):
+        args = evaluateArgs(xc, contextItem, [])
+        try:
+            if op in xc.modelXbrl.modelCustomFunctionSignatures:
+                result = customCall(xc, p, op, contextItem, args)
+            elif op in xc.customFunctions: # plug in method custom functions
+                result = xc.customFunctions[op](xc, p, contextItem, args) # use plug-in's method
+            else:
+                result = builtInCall(xc, contextItem, args, resultStack)
+        except FunctionNumArgs as err:
+            raise XPathException(p, err.errCode, "{}: {}".format(err.errText, op))
+        except FunctionArgType as err:
+            raise XPathException(p, err.errCode, _('Argument {0} does not match expected type {1} for {2} {3}.')
+                                 .format(err.argNum, err.expectedType, op, err.foundObject))
+        except FunctionNotAvailable:
+            raise XPathException(p, 'err:XPST0017', _('Function named {0} does not have a custom or built-in implementation.').format(op))
+        if result is not None:
+            resultStack.append(flattenSequence(xc, result))
+    return functionCall
+
+def compileValueOperation(p):
+    # binary arithmetic operations and value comparisons
+    op = p.name
+    evaluateArgs = compileSequence(p.args, None)
+    isArithmetic = op in ARITHMETIC_OPS
+    isDivision = op in DIVISION_OPS
+    if op == 'to':
+        pyOp = lambda op1, op2: _RANGE( _INT(op1), _INT(op2) + 1 )
+    else:
+        pyOp = ARITHMETIC_OPS.get(op) or VALUE_COMPARISON_OPS[op]
+    def valueOperation(xc, contextItem, resultStack):
+        s1 = xc.atomize( p, resultStack.pop() ) if len(resultStack) > 0 else []
+        s2 = xc.atomize( p, evaluateArgs(xc, contextItem, []) )
+        if len(s1) > 1 or len(s2) > 1:
+            raise XPathException(p, 'err:XPTY0004', _("Value operation '{0}' sequence length error").format(op))
+        if len(s1) == 0 or len(s2) == 0:
+            resultStack.append([])
+            return
+        op1 = s1[0]
+        op2 = s2[0]
+        testTypeCompatiblity( xc, p, op, op1, op2 )
+        if isArithmetic and type(op1) != type(op2):
+            # check if type promotion needed (Decimal-float, not needed for integer-Decimal)
+            if isinstance(op1,Decimal) and isinstance(op2,float):
+                op1 = float(op1) # per http://http://www.w3.org/TR/xpath20/#dt-type-promotion 1b
+            elif isinstance(op2,Decimal) and isinstance(op1,float):
+                op2 = float(op2)
+        if isDivision:
+            try:
+                result = pyOp(op1, op2)
+            except ZeroDivisionError:
+                raise XPathException(p, 'err:FOAR0001', _('Attempt to divide by zero: {0} {1} {2}.')
+                                     .format(op1, op, op2))
+        else:
+            result = pyOp(op1, op2)
+        resultStack.append(flattenSequence(xc, result))
+    return valueOperation
+
+def compileGeneralComparison(p):
+    op = p.name
+    evaluateArgs = compileSequence(p.args, None)
+    pyOp = GENERAL_COMPARISON_OPS[op]
+    def generalComparison(xc, contextItem, resultStack):
+        s1 = xc.atomize( p, resultStack.pop() ) if len(resultStack) > 0 else []
+        s2 = xc.atomize( p, evaluateArgs(xc, contextItem, []) )
+        result = []
+        for op1 in s1:
+            for op2 in s2:
+                testTypeCompatiblity( xc, p, op, op1, op2 )
+                result = pyOp(op1, op2)
+                if result:
+                    break
+            if result:
+                break
+        resultStack.append(flattenSequence(xc, result))
+    return generalComparison
+
+def compileNodeComparison(p):
+    op = p.name
+    evaluateArgs = compileSequence(p.args, None)
+    def nodeComparison(xc, contextItem, resultStack):
+        s1 = resultStack.pop() if len(resultStack) > 0 else []
+        s2 = evaluateArgs(xc, contextItem, [])
+        if len(s1) > 1 or len(s2) > 1 or not xc.isNodeSequence(s1) or not xc.isNodeSequence(s2[0]):
+            raise XPathException(p, 'err:XPTY0004', _('Node comparison sequence error'))
+        if len(s1) == 0 or len(s2[0]) == 0:
+            result = []
+        else:
+            n1 = s1[0]
+            n2 = s2[0][0]
+            result = False;
+            for op1 in s1:
+                for op2 in s2:
+                    if op == 'is':
+                        result = n1 == n2
+                    elif op == '>>':
+                        result = op1 > op2
+                    elif op == '<<':
+                        result = op1 <= op2
+                if result:
+                    break
+        resultStack.append(flattenSequence(xc, result))
+    return nodeComparison
+
+def compileCombiningOperation(p):
+    op = p.name
+    evaluateArgs = compileSequence(p.args, None)
+    def combiningOperation(xc, contextItem, resultStack):
+        s1 = resultStack.pop() if len(resultStack) > 0 else []
+        s2 = flattenSequence(xc, evaluateArgs(xc, contextItem, []))
+        if not xc.isNodeSequence(s1) or not xc.isNodeSequence(s2):
+            raise XPathException(p, 'err:XPTY0004', _('Node operation sequence error'))
+        set1 = set(s1)
+        set2 = set(s2)
+        if op == 'intersect':
+            resultset = set1 & set2
+        elif op == 'except':
+            resultset = set1 - set2
+        else: # op == 'union' or op == '|'
+            resultset = set1 | set2
+        # convert to a list in document order
+        resultStack.append(flattenSequence(xc, xc.documentOrderedNodes(resultset)))
+    return combiningOperation
+
+def compileLogicalOperation(p):
+    isAnd = p.name == 'and'
+    evaluateArgs = compileSequence(p.args, None)
+    def logicalOperation(xc, contextItem, resultStack):
+        if len(resultStack) == 0:
+            result = []
+        else:
+            op1 = xc.effectiveBooleanValue( p, resultStack.pop() )
+            # consider short circuit possibilities
+            if not isAnd and op1:
+                result = True
+            elif isAnd and not op1:
+                result = False
+            else: # must evaluate other operand
+                result = xc.effectiveBooleanValue( p, evaluateArgs(xc, contextItem, []) )
+        resultStack.append(flattenSequence(xc, result))
+    return logicalOperation
+
+def compileUnaryOperation(p):
+    isMinus = p.name == 'u-'
+    evaluateArgs = compileSequence(p.args, None)
+    def unaryOperation(xc, contextItem, resultStack):
+        s1 = xc.atomize( p, evaluateArgs(xc, contextItem, []) )
+        if len(s1) > 1:
+            raise XPathException(p, 'err:XPTY0004', _('Unary expression sequence length error'))
+        if len(s1) == 0:
+            result = []
+        elif isMinus:
+            result = -s1[0]
+        else:
+            result = s1[0]
+        resultStack.append(flattenSequence(xc, result))
+    return unaryOperation
+
+def compileInstanceOf(p):
+    hasOccurenceIndicator = len(p.args) > 1
+    occurenceIndicator = p.args[1] if hasOccurenceIndicator else None
+    hasType = len(p.args) > 0
+    t = p.args[0] if hasType else None
+    def instanceOf(xc, contextItem, resultStack):
+        result = False
+        s1 = flattenSequence( xc, resultStack.pop() ) if len(resultStack) > 0 else []
+        arity = len(s1)
+        if hasOccurenceIndicator:
+            if (occurenceIndicator == '?' and arity in (0,1) ) or \
+               (occurenceIndicator == '+' and arity >= 1) or \
+               (occurenceIndicator == '*'):
+                result = True
+        elif arity == 1:
+            result = True
+        if result and hasType:
+            for x in s1:
+                if isinstance(t, QNameDef):
+                    if t.namespaceURI == XbrlConst.xsd:
+                        tType = INSTANCE_OF_XSD_TYPES.get(t.localName)
+                        if tType:
+                            result = isinstance(x, tType)
+                            if result and tType == DateTime:
+                                result = x.dateOnly == (t.localName == "date")
+                elif isinstance(t, OperationDef):
+                    if t.name == "element":
+                        if isinstance(x,ModelObject):
+                            if len(t.args) >= 1:
+                                qn = t.args[0]
+                                if qn== '*' or (isinstance(qn,QNameDef) and qn == x):
+                                    result = True
+                                    if len(t.args) >= 2 and isinstance(t.args[1],QNameDef):
+                                        modelXbrl = x.modelDocument.modelXbrl
+                                        modelConcept = modelXbrl.qnameConcepts.get(qname(x))
+                                        if not modelConcept.instanceOfType(t.args[1]):
+                                            result = False
+                        else:
+                            result = False
+                    # elif t.name == "item" comes here and result stays True
+                if not result:
+                    break
+        resultStack.append(flattenSequence(xc, result))
+    return instanceOf
+
+def compilePredicate(p):
+    evaluateArgs = compileSequence(p.args, None)
+    def predicate(xc, contextItem, resultStack):
+        targetSequence = []
+        if len(resultStack) > 0:
+            sourcePosition = 0
+            for item in resultStack.pop():
+                sourcePosition += 1
+                predicateResult = evaluateArgs(xc, item, [])
+                if len(predicateResult) == 1: predicateResult = predicateResult[0] # first result
+                if len(predicateResult) == 1 and isinstance(predicateResult[0],_NUM_TYPES):
+                    result = predicateResult[0]
+                    if isinstance(result, bool):  # note that bool is subclass of int
+                        if result:
+                            targetSequence.append(item)
+                    elif sourcePosition == result:
+                        targetSequence.append(item)
+                elif xc.effectiveBooleanValue(p, predicateResult):
+                        targetSequence.append(item)
+        resultStack.append(flattenSequence(xc, targetSequence))
+    return predicate
+
+def compileRangeVars(op, args):
+    # evaluation of range variable declarations and return/satisfies expression, as XPathContext.evaluateRangeVars
+    if not args:
+        return None
+    p = args[0]
+    if isinstance(p, RangeDecl):
+        evaluateBindingSeq = compileSequence(p.bindingSeq, None)
+        evaluateNext = compileRangeVars(op, args[1:])
+        rvQname = p.rangeVar.name
+        isFor = op == 'for'
+        isEvery = op == 'every'
+        def rangeVar(xc, contextItem, result):
+            r = evaluateBindingSeq(xc, contextItem, [])
+            if len(r) == 1: # should be an expr single
+                r = r[0]
+                if isinstance(r, SEQUENCE_TYPES):
+                    if len(r) == 1 and isinstance(r[0],_RANGE):
+                        r = r[0]
+                    inScopeVars = xc.inScopeVars
+                    hasPrevValue = rvQname in inScopeVars
+                    if hasPrevValue:
+                        prevValue = inScopeVars[rvQname]
+                    for rv in r:
+                        inScopeVars[rvQname] = rv
+                        evaluateNext(xc, contextItem, result)
+                        if not isFor and len(result) > 0:
+                            break # short circuit evaluation
+                    if isEvery and len(result) == 0:
+                        result.append( True )   # true if no false result returned during iteration
+                    if hasPrevValue:
+                        inScopeVars[rvQname] = prevValue
+        return rangeVar
+    elif isinstance(p, Expr):
+        evaluateExpr = compileSequence(p.expr, None)
+        if p.name == 'return':
+            def returnExpr(xc, contextItem, result):
+                result.append( evaluateExpr(xc, contextItem, []) )
+            return returnExpr
+        elif p.name == 'satisfies':
+            isEvery = op == 'every'
+            def satisfiesExpr(xc, contextItem, result):
+                boolresult = xc.effectiveBooleanValue(p, evaluateExpr(xc, contextItem, []))
+                if isEvery != boolresult:
+                    # stop short circuit eval
+                    result.append( boolresult )
+            return satisfiesExpr
+    return lambda xc, contextItem, result: None
+
+def compilePath(p):
+    op = p.name
+    isRootStep = op in ('rootChild', 'rootDescendant')
+    if isRootStep: # fix up for multi-instance
+        op = '/' if op == 'rootChild' else '//'
+    # contains QNameDefs and predicates
+    evaluateSteps = compileSequence(p.args, op)
+    def path(xc, contextItem, resultStack):
+        if isRootStep:
+            innerFocusNodes = [xc.inputXbrlInstance.xmlDocument,]
+        elif len(resultStack) > 0:
+            innerFocusNodes = resultStack.pop()
+        else:
+            innerFocusNodes = contextItem
+        navSequence = []
+        for innerFocusNode in flattenSequence(xc, innerFocusNodes):
+            navSequence += evaluateSteps(xc, innerFocusNode, [])
+        resultStack.append(flattenSequence(xc, xc.documentOrderedNodes(flattenSequence(xc, navSequence))))
+    return path
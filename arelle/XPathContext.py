@@ -5,7 +5,7 @@ Created on Dec 30, 2010
 (c) Copyright 2010 Mark V Systems Limited, All rights reserved.
 '''
 from __future__ import division  # expect 3.2 integer division even in 2.7
-from arelle.XPathParser import (VariableRef, QNameDef, OperationDef, RangeDecl, Expr, ProgHeader,
+from arelle.XPathParser import (VariableRef, QNameDef, OperationDef, RangeDecl, Expr, ProgHeader, XPathProg,
                           exceptionErrorIndication)
 from arelle import (ModelXbrl, XbrlConst, XmlUtil)
 from arelle.ModelObject import ModelObject, ModelAttribute
@@ -13,6 +13,7 @@ from arelle.ModelInstanceObject import ModelFact, ModelInlineFact
 from arelle.ModelValue import (qname,QName,dateTime, DateTime, DATEUNION, DATE, DATETIME, anyURI, AnyURI, gYearMonth, gYear, gMonthDay, gDay, gMonth)
 from arelle.XmlValidate import UNKNOWN, VALID, VALID_NO_CONTENT, validate as xmlValidate
 from arelle.PluginManager import pluginClassMethods
+from arelle.XPathFunctionMemo import isMemoizable, functionName
 from decimal import Decimal, InvalidOperation
 from lxml import etree
 from types import LambdaType
@@ -21,6 +22,7 @@ from types import LambdaType
 boolean = None
 testTypeCompatiblity = None
 Trace = None
+XPathCompiler = None
 
 class XPathException(Exception):
     def __init__(self, progStep, code, message):
@@ -80,11 +82,12 @@ class RunTimeExceededException(Exception):
 
    
 def create(modelXbrl, inputXbrlInstance=None, sourceElement=None):
-    global boolean, testTypeCompatiblity, Trace
+    global boolean, testTypeCompatiblity, Trace, XPathCompiler
     if boolean is None:
         from arelle.FunctionUtil import testTypeCompatiblity
         from arelle.ModelFormulaObject import Trace
         from arelle.FunctionFn import boolean
+        from arelle import XPathCompiler
 
     return XPathContext(modelXbrl, 
                         inputXbrlInstance if inputXbrlInstance else modelXbrl.modelDocument,
@@ -118,11 +121,16 @@ class XPathContext:
         self.variableSet = None
         self.inScopeVars = {} if inScopeVars is None else inScopeVars
         self.cachedFilterResults = {}
+        self.factDependencies = None # by assertion, facts passing the filters of each fact variable, when tracked
         if inputXbrlInstance: 
             self.inScopeVars[XbrlConst.qnStandardInputInstance] = inputXbrlInstance.modelXbrl
         self.customFunctions = {}
         for pluginXbrlMethod in pluginClassMethods("Formula.CustomFunctions"):
             self.customFunctions.update(pluginXbrlMethod())
+        # parsed expressions are compiled (when first evaluated) unless interpretation is specified
+        self.compileXPath = not getattr(getattr(modelXbrl.modelManager, "formulaOptions", None), "interpretXPath", False)
+        self.functionMemo = None # FunctionMemo of built-in function results, of formula validation
+        self.formulaProfiler = None # FormulaProfiler of formula validation, when profiling
         
     def copy(self):  # shallow copy (for such as for Table LB table processiong
         xpCtxCpy = XPathContext(self.modelXbrl, self.inputXbrlInstance, self.sourceElement, 
@@ -137,6 +145,8 @@ class XPathContext:
         self.outputFirstFact.clear()
         self.inScopeVars.clear()
         self.cachedFilterResults.clear()
+        if self.functionMemo is not None:
+            self.functionMemo.clear()
         self.__dict__.clear() # dereference everything
         
     def runTimeExceededCallback(self):
@@ -149,6 +159,11 @@ class XPathContext:
     def evaluate(self, exprStack, contextItem=None, resultStack=None, parentOp=None):
         if resultStack is None: resultStack =  []
         if contextItem is None: contextItem = self.contextItem
+        if exprStack.__class__ is XPathProg and parentOp is None and self.compileXPath:
+            compiled = exprStack.compiled
+            if compiled is None:
+                compiled = exprStack.compiled = XPathCompiler.compile(exprStack)
+            return compiled(self, contextItem, resultStack)
         setProgHeader = False
         for p in exprStack:
             result = None
@@ -187,6 +202,13 @@ class XPathContext:
                                 else:
                                     resultStack.append( [ contextItem, ] )
                             result = self.stepAxis(parentOp, p, resultStack.pop() )
+                        elif self.functionMemo is not None and isMemoizable(op):
+                            if op.unprefixed or ns == XbrlConst.fn:
+                                result = self.functionMemo.call(functionName(op), args,
+                                                                lambda: FunctionFn.call(self, p, localname, contextItem, args))
+                            else:
+                                result = self.functionMemo.call(functionName(op), args,
+                                                                lambda: FunctionXfi.call(self, p, localname, args))
                         elif op.unprefixed or ns == XbrlConst.fn:
                             result = FunctionFn.call(self, p, localname, contextItem, args)
                         elif ns == XbrlConst.xfi or ns == XbrlConst.xff:
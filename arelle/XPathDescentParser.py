@@ -0,0 +1,829 @@
+'''
+Created on Oct 18, 2026
+
+Recursive descent XPath 2.0 parser, an alternative to the pyparsing grammar of XPathParser
+(--formulaXPathParser descent) which parses expressions many times faster.
+
+The parser follows the pyparsing grammar production by production, including its order of
+alternatives, whitespace and keyword rules and fatal (error stop) points, and builds the expression
+stack with the same XPathParser parse actions (pushQName, pushOperation, ...) called with the same
+tokens, so that the expression stacks (and errors reported by parse actions) are the same as those
+of the pyparsing grammar.  This includes pyparsing behaviors which the expression stacks depend on,
+such as parse actions of alternatives that subsequently fail not being undone, and the qName of a
+function call alternative being pushed again by the qName alternative when not followed by
+arguments.  Syntax errors are reported at the location the pyparsing grammar reports them in most
+cases, but the error text is not that of pyparsing.
+
+With --formulaXPathParser compare, expressions are parsed by both parsers, differences in their
+expression stacks, logged errors or syntax errors are logged (formula:xpathParserDifference), and
+the pyparsing expression stack is used.
+
+@author: Mark V Systems Limited
+(c) Copyright 2026 Mark V Systems Limited, All rights reserved.
+'''
+import re, time
+from arelle import XPathParser
+from arelle.XPathParser import (pushFloat, pushInt, pushDecimal, pushQuotedString, pushQName, pushAttr, pushOp,
+                                pushOperation, pushUnaryOperation, pushFunction, pushSequence, pushPredicate,
+                                pushRootStep, pushVarRef, pushRangeVar, pushExpr, XPathSyntaxError,
+                                QNameDef, OpDef, OperationDef, VariableRef, RangeDecl, Expr, ProgHeader)
+from arelle.pyparsing.pyparsing_py3 import ParseResults
+
+WHITESPACE = " \n\t\r"
+IDENT_CHARS = frozenset("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_$") # of pyparsing Keyword
+
+# token regular expressions of the pyparsing grammar elements
+qNamePattern = XPathParser.qName.re
+variableRefPattern = XPathParser.variableRef.re
+quotedStringPattern = XPathParser.quotedString.re
+pathRootPattern = XPathParser.pathRootOp.re
+floatPattern = re.compile(r"[+-]?[0-9]+(?:\.[0-9]*[eE][+-]?[0-9]+|[eE][+-]?[0-9]+)|[+-]?\.[0-9]+[eE][+-]?[0-9]+|[+-]?INF|NaN")
+decimalPattern = re.compile(r"[+-]?[0-9]+\.[0-9]*|[+-]?\.[0-9]+")
+integerPattern = re.compile(r"[+-]?[0-9]+")
+ncNamePattern = re.compile(r"[A-Za-z_][A-Za-z0-9_\-.]*")
+wildcardPattern = re.compile(r"[A-Za-z_][A-Za-z0-9_\-.]*:\*|\*:[A-Za-z_][A-Za-z0-9_\-.]*|\*")
+
+COMPARISON_KEYWORDS = ("is",)
+COMPARISON_LITERALS = ("<<", ">>")
+VALUE_COMPARISON_KEYWORDS = ("eq", "ne", "lt", "le", "gt", "ge")
+GENERAL_COMPARISON_LITERALS = ("!=", "<=", "<", ">=", ">", "=")
+FORWARD_AXES = ("child", "descendant", "attribute", "self", "descendant-or-self", "following-sibling",
+                "following", "namespace")
+REVERSE_AXES = ("parent", "ancestor", "preceding-sibling", "preceding", "ancestor-or-self")
+
+class Tokens(list):
+    """Tokens of a production, as the pyparsing ParseResults given to the parse actions."""
+    def asList(self):
+        return [tok.asList() if isinstance(tok, Tokens) else tok for tok in self]
+
+class Parser:
+    def __init__(self, sourceStr):
+        self.s = sourceStr
+        self.n = len(sourceStr)
+
+    def skip(self, loc):
+        s = self.s
+        n = self.n
+        while loc < n and s[loc] in WHITESPACE:
+            loc += 1
+        return loc
+
+    def keyword(self, loc, keyword):
+        # returns loc after keyword at (whitespace skipped) loc, or None
+        s = self.s
+        end = loc + len(keyword)
+        if (s.startswith(keyword, loc) and (end >= self.n or s[end] not in IDENT_CHARS) and
+            (loc == 0 or s[loc-1] not in IDENT_CHARS)):
+            return end
+        return None
+
+    def fatal(self, loc, expected):
+        raise XPathSyntaxError(self.s, loc, "Expected " + expected)
+
+    def expected(self, loc, literal):
+        # loc after literal required past an error stop (pyparsing '-')
+        loc = self.skip(loc)
+        if not self.s.startswith(literal, loc):
+            self.fatal(loc, '"{}"'.format(literal))
+        return loc + len(literal)
+
+    def requiredExpr(self, loc):
+        result = self.expr(loc)
+        if result is None:
+            self.fatal(self.skip(loc), "expression")
+        return result
+
+    # binary operator productions, by increasing precedence
+    def expr(self, loc):
+        return self.orExpr(loc)
+
+    def binaryExpr(self, loc, operand, operator, isPushOp):
+        result = operand(loc)
+        if result is None:
+            return None
+        loc, toks = result
+        while True:
+            opLoc = self.skip(loc)
+            opMatch = operator(opLoc)
+            if opMatch is None:
+                break
+            opEnd, op = opMatch
+            if isPushOp:
+                op = pushOp(self.s, opLoc, Tokens((op,)))
+            result = operand(opEnd)
+            if result is None:
+                break
+            loc, operandToks = result
+            operandToks.insert(0, op)
+            toks.append(pushOperation(self.s, opLoc, operandToks))
+        return loc, toks
+
+    def keywordOperator(self, loc, keywords):
+        for keyword in keywords:
+            end = self.keyword(loc, keyword)
+            if end is not None:
+                return end, keyword
+        return None
+
+    def orExpr(self, loc):
+        return self.binaryExpr(loc, self.andExpr, self.orOperator, False)
+
+    def orOperator(self, loc):
+        return self.keywordOperator(loc, ("or",))
+
+    def andExpr(self, loc):
+        return self.binaryExpr(loc, self.comparisonExpr, self.andOperator, False)
+
+    def andOperator(self, loc):
+        return self.keywordOperator(loc, ("and",))
+
+    def comparisonExpr(self, loc):
+        return self.binaryExpr(loc, self.rangeExpr, self.comparisonOperator, True)
+
+    def comparisonOperator(self, loc):
+        s = self.s
+        result = self.keywordOperator(loc, COMPARISON_KEYWORDS)
+        if result is not None:
+            return result
+        for literal in COMPARISON_LITERALS:
+            if s.startswith(literal, loc):
+                return loc + 2, literal
+        for keyword in VALUE_COMPARISON_KEYWORDS:
+            end = self.keyword(loc, keyword)
+            if end is not None:
+                return end, keyword
+        for literal in GENERAL_COMPARISON_LITERALS:
+            if s.startswith(literal, loc):
+                return loc + len(literal), literal
+        return None
+
+    def rangeExpr(self, loc):
+        return self.binaryExpr(loc, self.additiveExpr, self.toOperator, True)
+
+    def toOperator(self, loc):
+        return self.keywordOperator(loc, ("to",))
+
+    def additiveExpr(self, loc):
+        return self.binaryExpr(loc, self.multiplicativeExpr, self.additiveOperator, True)
+
+    def additiveOperator(self, loc):
+        c = self.s[loc:loc+1]
+        if c and c in "+-":
+            return loc + 1, c
+        return None
+
+    def multiplicativeExpr(self, loc):
+        return self.binaryExpr(loc, self.unionExpr, self.multiplicativeOperator, True)
+
+    def multiplicativeOperator(self, loc):
+        if self.s.startswith("*", loc):
+            return loc + 1, "*"
+        return self.keywordOperator(loc, ("div", "idiv", "mod"))
+
+    def unionExpr(self, loc):
+        return self.binaryExpr(loc, self.intersectExceptExpr, self.unionOperator, False)
+
+    def unionOperator(self, loc):
+        end = self.keyword(loc, "union")
+        if end is not None:
+            return end, "union"
+        if self.s.startswith("|", loc):
+            return loc + 1, "|"
+        return None
+
+    def intersectExceptExpr(self, loc):
+        return self.binaryExpr(loc, self.instanceOfExpr, self.intersectExceptOperator, False)
+
+    def intersectExceptOperator(self, loc):
+        return self.keywordOperator(loc, ("intersect", "except"))
+
+    # type operator productions (instance of, treat as, castable as, cast as)
+    def typeOperatorExpr(self, loc, operand, keyword1, keyword2, isKeyword2Suppressed, typeProduction):
+        result = operand(loc)
+        if result is None:
+            return None
+        loc, toks = result
+        while True:
+            opLoc = self.skip(loc)
+            end = self.keyword(opLoc, keyword1)
+            if end is None:
+                break
+            end = self.keyword(self.skip(end), keyword2)
+            if end is None:
+                break
+            result = typeProduction(end)
+            if result is None:
+                break
+            loc, typeToks = result
+            opToks = Tokens((keyword1,) if isKeyword2Suppressed else (keyword1, keyword2))
+            opToks.extend(typeToks)
+            toks.append(pushOperation(self.s, opLoc, opToks))
+        return loc, toks
+
+    def instanceOfExpr(self, loc):
+        return self.typeOperatorExpr(loc, self.treatExpr, "instance", "of", True, self.sequenceType)
+
+    def treatExpr(self, loc):
+        return self.typeOperatorExpr(loc, self.castableExpr, "treat", "as", False, self.sequenceType)
+
+    def castableExpr(self, loc):
+        return self.typeOperatorExpr(loc, self.castExpr, "castable", "as", False, self.singleType)
+
+    def castExpr(self, loc):
+        return self.typeOperatorExpr(loc, self.unaryExpr, "cast", "as", False, self.singleType)
+
+    def unaryExpr(self, loc):
+        loc = self.skip(loc)
+        c = self.s[loc:loc+1]
+        if c and c in "+-":
+            op = pushOp(self.s, loc, Tokens((c,)))
+            result = self.pathExpr(loc + 1)
+            if result is not None:
+                end, toks = result
+                toks.insert(0, op)
+                return end, Tokens((pushUnaryOperation(self.s, loc, toks),))
+        return self.pathExpr(loc)
+
+    # path productions
+    def pathExpr(self, loc):
+        s = self.s
+        loc = self.skip(loc)
+        for pathOp in ("//", "/"):
+            if s.startswith(pathOp, loc):
+                result = self.relativePathExpr(loc + len(pathOp))
+                if result is not None:
+                    end, toks = result
+                    toks.insert(0, pathOp)
+                    return end, self.rootStep(loc, toks)
+        result = self.relativePathExpr(loc)
+        if result is not None:
+            return result
+        m = pathRootPattern.match(s, loc)
+        if m is not None:
+            return m.end(), self.rootStep(loc, Tokens((m.group(),)))
+        return None
+
+    def rootStep(self, loc, toks):
+        rootStep = pushRootStep(self.s, loc, toks)
+        if rootStep is None:
+            return toks
+        return Tokens((rootStep,))
+
+    def relativePathExpr(self, loc):
+        s = self.s
+        result = self.stepExpr(loc)
+        if result is None:
+            return None
+        loc, toks = result
+        while True:
+            opLoc = self.skip(loc)
+            if s.startswith("//", opLoc):
+                pathOp = "//"
+            elif s.startswith("/", opLoc):
+                pathOp = "/"
+            else:
+                break
+            result = self.stepExpr(opLoc + len(pathOp))
+            if result is None:
+                break
+            loc, stepToks = result
+            stepToks.insert(0, pathOp)
+            toks.append(pushOperation(s, opLoc, stepToks))
+        return loc, toks
+
+    def stepExpr(self, loc):
+        s = self.s
+        result = self.atom(loc)
+        if result is None:
+            result = self.step(loc)
+            if result is None:
+                return None
+        loc, toks = result
+        while True:
+            predicateLoc = self.skip(loc)
+            if not s.startswith("[", predicateLoc):
+                break
+            predicateToks = Tokens((pushOp(s, predicateLoc, Tokens(("[",))),))
+            end, exprToks = self.requiredExpr(predicateLoc + 1)
+            predicateToks.extend(exprToks)
+            loc = self.expected(end, "]")
+            toks.append(pushPredicate(s, predicateLoc, predicateToks))
+        return loc, toks
+
+    def atom(self, loc):
+        s = self.s
+        loc = self.skip(loc)
+        if loc >= self.n:
+            return None
+        c = s[loc]
+        if c == "f":
+            end = self.keyword(loc, "for")
+            if end is not None:
+                return self.forExpr(loc, end, "for", "return")
+        elif c == "s" or c == "e":
+            for keyword in ("some", "every"):
+                end = self.keyword(loc, keyword)
+                if end is not None:
+                    return self.forExpr(loc, end, keyword, "satisfies")
+        elif c == "i":
+            end = self.keyword(loc, "if")
+            if end is not None:
+                return self.ifExpr(loc, end)
+        qNameMatch = qNamePattern.match(s, loc)
+        if qNameMatch is not None: # function call
+            fnToks = Tokens((self.pushQName(loc, qNameMatch.group()),))
+            argsLoc = self.skip(qNameMatch.end())
+            if s.startswith("(", argsLoc):
+                end, argToks = self.functionArgs(argsLoc + 1)
+                end = self.skip(end)
+                if s.startswith(")", end):
+                    fnToks.extend(argToks)
+                    return end + 1, Tokens((pushFunction(s, loc, fnToks),))
+        m = floatPattern.match(s, loc)
+        if m is not None:
+            return m.end(), Tokens((pushFloat(s, loc, Tokens((m.group(),))),))
+        m = decimalPattern.match(s, loc)
+        if m is not None:
+            return m.end(), Tokens((pushDecimal(s, loc, Tokens((m.group(),))),))
+        m = integerPattern.match(s, loc)
+        if m is not None:
+            return m.end(), Tokens((pushInt(s, loc, Tokens((m.group(),))),))
+        if c == '"' or c == "'":
+            m = quotedStringPattern.match(s, loc)
+            if m is not None:
+                return m.end(), Tokens((pushQuotedString(s, loc, Tokens((m.group(),))),))
+        elif c == "$":
+            m = variableRefPattern.match(s, loc)
+            if m is not None:
+                return m.end(), Tokens((pushVarRef(s, loc, Tokens((m.group(),))),))
+        elif c == ".":
+            contextItem = ".." if s.startswith("..", loc) else "."
+            return loc + len(contextItem), Tokens((pushOperation(s, loc, Tokens((contextItem,))),))
+        if qNameMatch is not None: # qName alternative parses (and pushes) the qName again
+            return qNameMatch.end(), Tokens((self.pushQName(loc, qNameMatch.group()),))
+        if c == "(": # sequence
+            toks = Tokens()
+            result = self.expr(loc + 1)
+            if result is not None:
+                end, toks = result
+            else:
+                end = loc + 1
+            while True:
+                commaLoc = self.skip(end)
+                if not s.startswith(",", commaLoc):
+                    break
+                toks.append(pushOp(s, commaLoc, Tokens((",",))))
+                end, exprToks = self.requiredExpr(commaLoc + 1)
+                toks.extend(exprToks)
+            end = self.expected(end, ")")
+            return end, Tokens((pushSequence(s, loc, toks),))
+        return None
+
+    def pushQName(self, loc, qname):
+        q = pushQName(self.s, loc, Tokens((qname,)))
+        return qname if q is None else q
+
+    def functionArgs(self, loc):
+        result = self.expr(loc)
+        if result is None:
+            return loc, Tokens()
+        loc, toks = result
+        while True:
+            commaLoc = self.skip(loc)
+            if not self.s.startswith(",", commaLoc):
+                break
+            result = self.expr(commaLoc + 1)
+            if result is None:
+                break
+            loc, argToks = result
+            toks.extend(argToks)
+        return loc, toks
+
+    def forExpr(self, loc, end, keyword, returnKeyword):
+        # for and quantified (some, every) expressions, everything after the keyword is fatal
+        s = self.s
+        toks = Tokens((pushOp(s, loc, Tokens((keyword,))),))
+        end, rangeDecl = self.rangeClause(end, True)
+        toks.append(rangeDecl)
+        while True:
+            commaLoc = self.skip(end)
+            if not s.startswith(",", commaLoc):
+                break
+            pushOp(s, commaLoc, Tokens((",",))) # suppressed comma token is pushed
+            result = self.rangeClause(commaLoc + 1, False)
+            if result is None:
+                break
+            end, rangeDecl = result
+            toks.append(rangeDecl)
+        returnLoc = self.skip(end)
+        end = self.keyword(returnLoc, returnKeyword)
+        if end is None:
+            self.fatal(returnLoc, '"{}"'.format(returnKeyword))
+        returnToks = Tokens((pushOp(s, returnLoc, Tokens((returnKeyword,))),))
+        end, exprToks = self.requiredExpr(end)
+        returnToks.extend(exprToks)
+        toks.append(pushExpr(s, returnLoc, returnToks))
+        return end, Tokens((pushOperation(s, loc, toks),))
+
+    def rangeClause(self, loc, isFatal):
+        s = self.s
+        loc = self.skip(loc)
+        m = variableRefPattern.match(s, loc)
+        if m is None:
+            if isFatal:
+                self.fatal(loc, "variable reference")
+            return None
+        toks = Tokens((pushVarRef(s, loc, Tokens((m.group(),))),))
+        inLoc = self.skip(m.end())
+        end = self.keyword(inLoc, "in")
+        if end is None:
+            if isFatal:
+                self.fatal(inLoc, '"in"')
+            return None
+        toks.append("in")
+        result = self.requiredExpr(end) if isFatal else self.expr(end)
+        if result is None:
+            return None
+        end, exprToks = result
+        toks.extend(exprToks)
+        return end, pushRangeVar(s, loc, toks)
+
+    def ifExpr(self, loc, end):
+        # everything after the if keyword is fatal
+        s = self.s
+        ifToks = Tokens((pushOp(s, loc, Tokens(("if",))),))
+        end, exprToks = self.requiredExpr(self.expected(end, "("))
+        ifToks.append(exprToks) # grouped
+        end = self.expected(end, ")")
+        toks = Tokens((pushExpr(s, loc, ifToks),))
+        for keyword in ("then", "else"):
+            keywordLoc = self.skip(end)
+            end = self.keyword(keywordLoc, keyword)
+            if end is None:
+                self.fatal(keywordLoc, '"{}"'.format(keyword))
+            keywordToks = Tokens((pushOp(s, keywordLoc, Tokens((keyword,))),))
+            end, exprToks = self.requiredExpr(end)
+            keywordToks.extend(exprToks)
+            toks.append(pushOperation(s, keywordLoc, keywordToks))
+        return end, Tokens((pushOperation(s, loc, toks),))
+
+    # step productions
+    def step(self, loc):
+        s = self.s
+        loc = self.skip(loc)
+        # forward step
+        axisEnd = self.axis(loc, FORWARD_AXES)
+        if axisEnd is not None:
+            end, axis = axisEnd
+            result = self.nodeTest(end)
+            if result is not None:
+                end, toks = result
+                toks[0:0] = (axis, "::")
+                return end, toks
+        if s.startswith("@", loc):
+            result = self.nodeTest(loc + 1)
+            if result is not None:
+                end, toks = result
+                toks.insert(0, "@")
+                return end, Tokens((pushAttr(s, loc, toks),))
+        result = self.nodeTest(loc)
+        if result is not None:
+            return result
+        # reverse step
+        axisEnd = self.axis(loc, REVERSE_AXES)
+        if axisEnd is not None:
+            end, axis = axisEnd
+            result = self.nodeTest(end)
+            if result is not None:
+                end, toks = result
+                toks[0:0] = (axis, "::")
+                return end, toks
+        if s.startswith("..", loc):
+            return loc + 2, Tokens((pushOperation(s, loc, Tokens(("..",))),))
+        return None
+
+    def axis(self, loc, axes):
+        for axis in axes:
+            end = self.keyword(loc, axis)
+            if end is not None:
+                end = self.skip(end)
+                if self.s.startswith("::", end):
+                    return end + 2, axis
+        return None
+
+    def nodeTest(self, loc):
+        result = self.kindTest(loc)
+        if result is not None:
+            return result
+        result = self.qNameToken(loc)
+        if result is None: # wildcard
+            loc = self.skip(loc)
+            m = wildcardPattern.match(self.s, loc)
+            if m is None:
+                return None
+            result = m.end(), m.group()
+        return result[0], Tokens((result[1],))
+
+    def qNameToken(self, loc):
+        loc = self.skip(loc)
+        m = qNamePattern.match(self.s, loc)
+        if m is None:
+            return None
+        return m.end(), self.pushQName(loc, m.group())
+
+    def openParen(self, loc, keyword):
+        # loc after keyword and its "(", or None
+        end = self.keyword(loc, keyword)
+        if end is not None:
+            end = self.skip(end)
+            if self.s.startswith("(", end):
+                return end + 1
+        return None
+
+    def closeParen(self, loc, toks):
+        loc = self.skip(loc)
+        if self.s.startswith(")", loc):
+            return loc + 1, toks
+        return None
+
+    def kindTest(self, loc):
+        loc = self.skip(loc)
+        c = self.s[loc:loc+1]
+        if not c or c not in "deaspctn":
+            return None
+        for kindTest in (self.documentTest, self.elementTest, self.attributeTest, self.schemaElementTest,
+                         self.schemaAttributeTest, self.piTest, self.commentTest, self.textTest, self.anyKindTest):
+            result = kindTest(loc)
+            if result is not None:
+                end, toks = result
+                return end, Tokens((pushOperation(self.s, loc, toks),))
+        return None
+
+    def documentTest(self, loc):
+        end = self.openParen(loc, "document-node")
+        if end is None:
+            return None
+        toks = Tokens(("document-node",))
+        elementLoc = self.skip(end)
+        result = self.elementTest(elementLoc) or self.schemaElementTest(elementLoc)
+        if result is not None:
+            end, elementToks = result
+            toks.append(pushOperation(self.s, elementLoc, elementToks))
+        return self.closeParen(end, toks)
+
+    def elementTest(self, loc, keyword="element"):
+        end = self.openParen(loc, keyword)
+        if end is None:
+            return None
+        s = self.s
+        toks = Tokens((keyword,))
+        result = self.qNameToken(end)
+        if result is None:
+            wildLoc = self.skip(end)
+            if s.startswith("*", wildLoc):
+                result = wildLoc + 1, "*"
+        if result is not None:
+            end, nameTok = result
+            toks.append(nameTok)
+            commaLoc = self.skip(end)
+            if s.startswith(",", commaLoc):
+                commaTok = pushOp(s, commaLoc, Tokens((",",)))
+                result = self.qNameToken(commaLoc + 1)
+                if result is not None:
+                    end, typeTok = result
+                    if keyword == "attribute": # attribute test comma isn't suppressed
+                        toks.append(commaTok)
+                    toks.append(typeTok)
+                    if keyword == "element":
+                        optionalLoc = self.skip(end)
+                        if s.startswith("?", optionalLoc):
+                            toks.append("?")
+                            end = optionalLoc + 1
+        return self.closeParen(end, toks)
+
+    def attributeTest(self, loc):
+        return self.elementTest(loc, "attribute")
+
+    def schemaElementTest(self, loc, keyword="schema-element"):
+        end = self.openParen(loc, keyword)
+        if end is None:
+            return None
+        result = self.qNameToken(end)
+        if result is None:
+            return None
+        end, nameTok = result
+        return self.closeParen(end, Tokens((keyword, nameTok)))
+
+    def schemaAttributeTest(self, loc):
+        return self.schemaElementTest(loc, "schema-attribute")
+
+    def piTest(self, loc):
+        end = self.openParen(loc, "processing-instruction")
+        if end is None:
+            return None
+        s = self.s
+        toks = Tokens(("processing-instruction",))
+        nameLoc = self.skip(end)
+        m = ncNamePattern.match(s, nameLoc)
+        if m is not None:
+            toks.append(m.group())
+            end = m.end()
+        else:
+            m = quotedStringPattern.match(s, nameLoc)
+            if m is not None:
+                toks.append(pushQuotedString(s, nameLoc, Tokens((m.group(),))))
+                end = m.end()
+        return self.closeParen(end, toks)
+
+    def emptyKindTest(self, loc, keyword):
+        end = self.openParen(loc, keyword)
+        if end is None:
+            return None
+        return self.closeParen(end, Tokens((keyword,)))
+
+    def commentTest(self, loc):
+        return self.emptyKindTest(loc, "comment")
+
+    def textTest(self, loc):
+        return self.emptyKindTest(loc, "text")
+
+    def anyKindTest(self, loc):
+        return self.emptyKindTest(loc, "node")
+
+    # type productions
+    def sequenceType(self, loc):
+        s = self.s
+        loc = self.skip(loc)
+        end = self.openParen(loc, "empty-sequence")
+        if end is not None:
+            end = self.skip(end)
+            if s.startswith(")", end):
+                return end + 1, Tokens(("empty-sequence", "(", ")"))
+        result = self.kindTest(loc)
+        if result is None:
+            end = self.openParen(loc, "item")
+            if end is not None:
+                result = self.closeParen(end, Tokens(("item", "(", ")")))
+            if result is None:
+                result = self.qNameToken(loc)
+                if result is None:
+                    return None
+                result = result[0], Tokens((result[1],))
+        end, toks = result
+        occurrenceLoc = self.skip(end)
+        c = s[occurrenceLoc:occurrenceLoc+1]
+        if c and c in "?*+":
+            toks.append(c)
+            end = occurrenceLoc + 1
+        return end, toks
+
+    def singleType(self, loc):
+        result = self.qNameToken(loc)
+        if result is None:
+            return None
+        end, typeTok = result
+        toks = Tokens((typeTok,))
+        optionalLoc = self.skip(end)
+        if self.s.startswith("?", optionalLoc):
+            toks.append("?")
+            end = optionalLoc + 1
+        return end, toks
+
+def parse(sourceStr):
+    """Parses sourceStr (a normalized XPath expression) onto the XPathParser expression stack, as does
+    the pyparsing grammar (XPathParser.xpathExpr), raising XPathSyntaxError for syntax errors.
+    """
+    sourceStr = sourceStr.expandtabs() # as pyparsing parseString, for the same locs
+    parser = Parser(sourceStr)
+    result = parser.expr(0)
+    if result is None:
+        parser.fatal(parser.skip(0), "expression")
+    end = parser.skip(result[0])
+    if end < parser.n:
+        parser.fatal(end, "end of text")
+    return result[1]
+
+# comparison of the parsers (--formulaXPathParser compare)
+comparedExpressions = differences = 0
+pyparsingTime = descentTime = 0.0
+
+class LogRecorder:
+    # records the messages logged by parse actions, for comparison and to replay the pyparsing parse messages
+    def __init__(self, modelXbrl):
+        self.modelXbrl = modelXbrl
+        self.messages = []
+    def __getattr__(self, name):
+        return getattr(self.modelXbrl, name)
+    def error(self, codes, msg, **args):
+        self.messages.append(("error", codes, msg, args))
+    def warning(self, codes, msg, **args):
+        self.messages.append(("warning", codes, msg, args))
+    def info(self, codes, msg, **args):
+        self.messages.append(("info", codes, msg, args))
+    def codes(self):
+        return [(level, codes) for level, codes, msg, args in self.messages]
+    def replay(self):
+        for level, codes, msg, args in self.messages:
+            getattr(self.modelXbrl, level)(codes, msg, **args)
+
+def compare(sourceStr, name):
+    """Parses sourceStr with both the descent parser and the pyparsing grammar, logging any difference 
+    of their expression stacks, logged messages or syntax errors.  The XPathParser expression stack is 
+    left as parsed by pyparsing, whose messages are logged and syntax error, if any, is raised.
+    """
+    global comparedExpressions, differences, pyparsingTime, descentTime
+    modelXbrl = XPathParser.modelXbrl
+    pyparsingStack = XPathParser.exprStack # has the ProgHeader
+    descentStack = pyparsingStack[:]
+    pyparsingLog = LogRecorder(modelXbrl)
+    descentLog = LogRecorder(modelXbrl)
+    descentError = pyparsingError = None
+    try:
+        XPathParser.exprStack = descentStack
+        XPathParser.modelXbrl = descentLog
+        startedAt = time.time()
+        try:
+            parse(sourceStr)
+        except Exception as err:
+            descentError = err
+        descentTime += time.time() - startedAt
+        XPathParser.exprStack = pyparsingStack
+        XPathParser.modelXbrl = pyparsingLog
+        startedAt = time.time()
+        try:
+            XPathParser.xpathExpr.parseString(sourceStr, parseAll=True)
+        except Exception as err:
+            pyparsingError = err
+        pyparsingTime += time.time() - startedAt
+    finally:
+        XPathParser.exprStack = pyparsingStack
+        XPathParser.modelXbrl = modelXbrl
+    comparedExpressions += 1
+    if (pyparsingError is None) != (descentError is None):
+        difference = "syntax error {} (pyparsing) vs {} (descent)".format(pyparsingError, descentError)
+    elif pyparsingLog.codes() != descentLog.codes():
+        difference = "messages {} (pyparsing) vs {} (descent)".format(pyparsingLog.codes(), descentLog.codes())
+    elif pyparsingError is None:
+        difference = stackDifference(pyparsingStack, descentStack, "exprStack")
+    else:
+        difference = None # partial expression stacks of syntax errors aren't compared
+    if difference:
+        differences += 1
+        modelXbrl.warning("formula:xpathParserDifference",
+            _("XPath parsers differ in %(name)s at %(difference)s, expression: %(expression)s"),
+            modelObject=XPathParser.xmlElement, name=name, difference=difference, expression=sourceStr)
+    pyparsingLog.replay()
+    if pyparsingError is not None:
+        raise pyparsingError
+
+def stackDifference(pyparsingItem, descentItem, path):
+    # description of the first structural difference of the expression stack items, or None
+    if isinstance(pyparsingItem, (list, ParseResults)):
+        if not isinstance(descentItem, (list, ParseResults)):
+            return "{} {!r} vs {!r}".format(path, pyparsingItem, descentItem)
+        if len(pyparsingItem) != len(descentItem):
+            return "{} length {} vs {}: {!r} vs {!r}".format(path, len(pyparsingItem), len(descentItem), 
+                                                           pyparsingItem, descentItem)
+        for i, (pyparsingSubItem, descentSubItem) in enumerate(zip(pyparsingItem, descentItem)):
+            difference = stackDifference(pyparsingSubItem, descentSubItem, "{}[{}]".format(path, i))
+            if difference:
+                return difference
+        return None
+    if type(pyparsingItem) != type(descentItem):
+        return "{} {!r} vs {!r}".format(path, pyparsingItem, descentItem)
+    if isinstance(pyparsingItem, ProgHeader):
+        return None
+    if isinstance(pyparsingItem, OperationDef):
+        attrs = ("name", "loc", "args")
+    elif isinstance(pyparsingItem, QNameDef):
+        attrs = ("prefix", "namespaceURI", "localName", "loc", "axis", "isAttribute", "unprefixed")
+    elif isinstance(pyparsingItem, (VariableRef, OpDef)):
+        attrs = ("name", "loc")
+    elif isinstance(pyparsingItem, RangeDecl):
+        attrs = ("rangeVar", "bindingSeq", "loc")
+    elif isinstance(pyparsingItem, Expr):
+        attrs = ("name", "expr", "loc")
+    elif isinstance(pyparsingItem, float):
+        return None if repr(pyparsingItem) == repr(descentItem) else "{} {!r} vs {!r}".format(path, pyparsingItem, descentItem)
+    elif pyparsingItem == descentItem:
+        return None
+    else:
+        return "{} {!r} vs {!r}".format(path, pyparsingItem, descentItem)
+    for attr in attrs:
+        difference = stackDifference(getattr(pyparsingItem, attr), getattr(descentItem, attr), path + "." + attr)
+        if difference:
+            return difference
+    return None
+
+def compareReport(modelXbrl):
+    """Logs (and resets) the counts and parse times of expressions compared since the prior report.
+    """
+    global comparedExpressions, differences, pyparsingTime, descentTime
+    if comparedExpressions:
+        modelXbrl.info("formula:xpathParserComparison",
+            _("XPath parsers compared on %(expressions)s expressions, %(differences)s differences, "
+              "pyparsing %(pyparsingTime)s secs, descent %(descentTime)s secs"),
+            modelObject=modelXbrl, expressions=comparedExpressions, differences=differences,
+            pyparsingTime="{:.3f}".format(pyparsingTime), descentTime="{:.3f}".format(descentTime))
+    comparedExpressions = differences = 0
+    pyparsingTime = descentTime = 0.0
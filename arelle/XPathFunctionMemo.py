@@ -0,0 +1,150 @@
+'''
+Created on Oct 18, 2026
+
+Memo of XPath function results, per XPathContext, for built-in functions whose results depend only on their
+arguments (and the DTS), such as xfi accessors of fact contexts, units and periods, the xfi equality functions
+and concept property functions, which formulas call for the same facts, contexts and units very many times.
+
+Only the functions of the allow-list below are memoized.  Functions depending on the evaluation state (such as
+xff:uncovered-aspect and xff:has-fallback-value, on the variable bindings, or functions defaulting to the context
+item) are not, nor are custom functions (of custom function signatures, FunctionCustom, or plug-in custom
+functions), which are called before built-in functions are considered.
+
+Results are keyed by function and argument identity: model objects (facts, contexts, units, their elements) and
+instances by identity, which are not modified by formula evaluation, and atomic values by type and value.  Calls
+with other arguments (such as decimal, float or date values) are not memoized.  Exceptions are not memoized, so
+they are raised (with the position of the calling expression) on each call.  The memo is bounded by size, least
+recently used results are discarded.
+
+@author: Mark V Systems Limited
+(c) Copyright 2026 Mark V Systems Limited, All rights reserved.
+'''
+from collections import OrderedDict
+from arelle import XbrlConst
+from arelle.ModelObject import ModelObject
+from arelle.ModelXbrl import ModelXbrl
+from arelle.ModelValue import QName
+
+MEMOIZABLE_XFI_FUNCTIONS = {
+    'context', 'unit', 'unit-numerator', 'unit-denominator', 'measure-name',
+    'period', 'context-period', 'is-start-end-period', 'is-forever-period', 'is-duration-period', 'is-instant-period',
+    'period-start', 'period-end', 'period-instant',
+    'entity', 'context-entity', 'identifier', 'context-identifier', 'entity-identifier', 'identifier-value',
+    'identifier-scheme', 'segment', 'entity-segment', 'context-segment', 'scenario', 'context-scenario',
+    'fact-identifier-value', 'fact-identifier-scheme',
+    'is-non-numeric', 'is-numeric', 'is-fraction', 'precision', 'decimals',
+    'identical-nodes', 's-equal', 'u-equal', 'v-equal', 'c-equal', 'identical-node-set', 's-equal-set',
+    'v-equal-set', 'c-equal-set', 'u-equal-set', 'x-equal', 'duplicate-item', 'duplicate-tuple',
+    'p-equal', 'cu-equal', 'pc-equal', 'pcu-equal', 'start-equal', 'end-equal', 'nodes-correspond',
+    'concept-balance', 'concept-period-type', 'concept-custom-attribute', 'concept-data-type',
+    'concept-data-type-derived-from', 'concept-substitutions', 'dimension-default',
+    'fact-segment-remainder', 'fact-scenario-remainder', 'fact-has-explicit-dimension', 'fact-has-typed-dimension',
+    'fact-has-explicit-dimension-value', 'fact-explicit-dimension-value', 'fact-typed-dimension-value',
+    'fact-explicit-dimensions', 'fact-typed-dimensions', 'fact-dimension-s-equal2'}
+
+MEMOIZABLE_FN_FUNCTIONS = {
+    'matches', 'replace', 'QName', 'distinct-values'}
+
+ATOMIC_KEY_TYPES = {str, bool, int}
+
+def isMemoizable(op):
+    """True if the built-in function of function call qname op is memoizable
+
+    :param op: Function qname (QNameDef of the function call)
+    :type op: QName
+    """
+    if op.unprefixed or op.namespaceURI == XbrlConst.fn:
+        return op.localName in MEMOIZABLE_FN_FUNCTIONS
+    if op.namespaceURI == XbrlConst.xfi:
+        return op.localName in MEMOIZABLE_XFI_FUNCTIONS
+    return False
+
+def functionName(op):
+    if op.unprefixed or op.namespaceURI == XbrlConst.fn:
+        return "fn:" + op.localName
+    return "xfi:" + op.localName
+
+def argumentKey(arg):
+    # key of an argument sequence, or None if it has an item which is not keyed
+    key = []
+    for item in arg:
+        if isinstance(item, (ModelObject, ModelXbrl)):
+            key.append(id(item))
+        elif item.__class__ in ATOMIC_KEY_TYPES:
+            key.append((item.__class__, item))
+        elif item.__class__ is QName: # prefix distinguishes results such as of fn:prefix-from-QName
+            key.append((QName, item.prefix, item))
+        else:
+            return None
+    return tuple(key)
+
+class FunctionMemo:
+    """
+    .. class:: FunctionMemo(size)
+
+    FunctionMemo keeps up to size results of memoizable built-in function calls, with hit counts by function.
+
+    :param size: Maximum number of results kept
+    :type size: int
+    """
+    def __init__(self, size):
+        self.size = size
+        self.results = OrderedDict() # by (function name, argument keys): (argument sequences, result, result is a list)
+        self.statistics = {} # by function name: [hits, misses, not memoizable calls]
+
+    def call(self, name, args, evaluateCall):
+        """Returns the result of evaluateCall() (the function call of args), memoized under function name and args.
+
+        :param name: Function name (functionName of the function call qname)
+        :type name: str
+        :param args: Argument sequences of the function call
+        :type args: list
+        :param evaluateCall: Function evaluating the function call
+        :type evaluateCall: function()
+        """
+        statistics = self.statistics.get(name)
+        if statistics is None:
+            statistics = self.statistics[name] = [0, 0, 0]
+        argKeys = []
+        for arg in args:
+            argKey = argumentKey(arg) if isinstance(arg, (list, tuple)) else argumentKey((arg,))
+            if argKey is None:
+                statistics[2] += 1
+                return evaluateCall()
+            argKeys.append(argKey)
+        key = (name, tuple(argKeys))
+        results = self.results
+        entry = results.get(key)
+        if entry is not None:
+            results.move_to_end(key)
+            statistics[0] += 1
+            if entry[2]: # list result, each caller gets its own list
+                return list(entry[1])
+            return entry[1]
+        statistics[1] += 1
+        result = evaluateCall()
+        if isinstance(result, (set, dict)): # not memoized, callers may modify them
+            return result
+        # argument sequences are kept with the result so their objects (keyed by id) are not reused
+        isList = result.__class__ is list
+        results[key] = (args, tuple(result) if isList else result, isList)
+        if len(results) > self.size:
+            results.popitem(last=False)
+        return result
+
+    def clear(self):
+        self.results.clear()
+
+    def report(self, modelXbrl):
+        """Logs (and resets) the hit counts, by function, since the prior report.
+        """
+        for name, (hits, misses, notMemoized) in sorted(self.statistics.items(),
+                                                        key=lambda item: (-sum(item[1]), item[0])):
+            lookups = hits + misses
+            modelXbrl.info("formula:functionMemo",
+                           _("XPath function %(function)s memo %(hits)s hits, %(misses)s misses, hit rate %(hitRate)s, "
+                             "%(notMemoized)s calls not memoizable"),
+                           modelObject=modelXbrl, function=name, hits=hits, misses=misses,
+                           hitRate="{:.1%}".format(hits / lookups if lookups else 0.0),
+                           notMemoized=notMemoized)
+        self.statistics.clear()
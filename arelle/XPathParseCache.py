@@ -0,0 +1,164 @@
+'''
+Created on Oct 18, 2026
+
+XPath parse cache, keeping the expression stacks of parsed XPath expressions (XPathParser.parse) in
+cache files, so that later runs (such as of EBA or EIOPA taxonomy formula linkbases, with tens of
+thousands of expressions) reuse them instead of parsing the expressions with pyparsing again.
+
+Expression stacks are cached per source document (linkbase) of the expressions, and keyed by the
+normalized expression text, the name of the expression's element and its in-scope namespace bindings.
+A document's cached expressions are invalidated when the document's file (or the archive file
+containing it) has changed, by modification time and size.  Custom functions referenced by a cached
+expression are checked (by XPathParser.parse) to still be declared, otherwise the expression is parsed
+again to report them.  Expressions whose parsing reports errors are not cached.
+
+@author: Mark V Systems Limited
+(c) Copyright 2026 Mark V Systems Limited, All rights reserved.
+'''
+import os, io, pickle, hashlib
+from arelle.pyparsing.pyparsing_py3 import ParseResults
+
+PARSE_CACHE_VERSION = 1 # of the cache files and of the XPathParser classes of their expression stacks
+
+class CachedDocument:
+    def __init__(self, uri, sourceStat):
+        self.uri = uri
+        self.sourceStat = sourceStat # (file, modification time, size) of the document or its archive
+        self.entries = {} # by (expression, element name, namespaces): (pickled exprStack, function qnames)
+        self.isModified = False
+
+class XPathParseCache:
+    """
+    .. class:: XPathParseCache(cacheDir)
+
+    XPathParseCache keeps the expression stacks of parsed XPath expressions, by source document, in cacheDir.
+
+    :param cacheDir: Directory of the cache files
+    :type cacheDir: str
+    """
+    def __init__(self, cacheDir):
+        self.cacheDir = cacheDir
+        self.documents = {} # CachedDocument by source document url
+        self.hits = self.misses = self.uncached = self.invalidated = 0
+
+    def cacheFile(self, uri):
+        return os.path.join(self.cacheDir, hashlib.sha256(uri.encode("utf-8")).hexdigest()[:32] + ".pickle")
+
+    def cachedDocument(self, modelDocument):
+        uri = modelDocument.uri
+        cachedDocument = self.documents.get(uri)
+        if cachedDocument is None:
+            cachedDocument = CachedDocument(uri, sourceFileStat(modelDocument.filepath))
+            cacheFile = self.cacheFile(uri)
+            if cachedDocument.sourceStat is not None and os.path.exists(cacheFile):
+                try:
+                    with open(cacheFile, "rb") as f:
+                        cached = pickle.load(f)
+                    if cached.get("version") == PARSE_CACHE_VERSION and cached.get("uri") == uri:
+                        if cached.get("sourceStat") == cachedDocument.sourceStat:
+                            cachedDocument.entries = cached["entries"]
+                        else: # document changed since its expressions were cached
+                            self.invalidated += 1
+                            cachedDocument.isModified = True
+                except Exception:
+                    cachedDocument.isModified = True # replace unreadable cache file
+            self.documents[uri] = cachedDocument
+        return cachedDocument
+
+    def key(self, element, normalizedExpr):
+        modelDocument = getattr(element, "modelDocument", None)
+        if modelDocument is None or not modelDocument.filepath:
+            return None, None
+        cachedDocument = self.cachedDocument(modelDocument)
+        if cachedDocument.sourceStat is None:
+            return None, None
+        return cachedDocument, (normalizedExpr,
+                                element.localName,
+                                tuple(sorted((prefix or "", ns) for prefix, ns in element.nsmap.items())))
+
+    def get(self, element, normalizedExpr, isUndeclaredFunction):
+        """Returns the cached expression stack (without its ProgHeader) of normalizedExpr of element, or None.
+
+        :param isUndeclaredFunction: Function of a function qname, True if it is a custom function which is not declared
+        :type isUndeclaredFunction: function
+        """
+        cachedDocument, key = self.key(element, normalizedExpr)
+        if key is None:
+            self.uncached += 1
+            return None
+        entry = cachedDocument.entries.get(key)
+        if entry is None or any(isUndeclaredFunction(fnQname) for fnQname in entry[1]):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return pickle.loads(entry[0]) # each parse has its own expression stack objects
+
+    def put(self, element, normalizedExpr, exprStack, functionQnames):
+        """Caches the expression stack (without its ProgHeader) of normalizedExpr of element.
+
+        :param functionQnames: Qnames of the (possibly custom) functions called by the expression
+        :type functionQnames: set
+        """
+        cachedDocument, key = self.key(element, normalizedExpr)
+        if key is not None:
+            try:
+                cachedDocument.entries[key] = (pickleExprStack(exprStack), tuple(functionQnames))
+                cachedDocument.isModified = True
+            except (pickle.PicklingError, TypeError, AttributeError, RecursionError):
+                self.uncached += 1
+
+    def save(self):
+        """Saves the cache files of documents with newly cached (or invalidated) expressions.
+        """
+        for cachedDocument in self.documents.values():
+            if cachedDocument.isModified:
+                cacheFile = self.cacheFile(cachedDocument.uri)
+                if not os.path.exists(self.cacheDir):
+                    os.makedirs(self.cacheDir)
+                cacheFileTmp = "{}.{}.tmp".format(cacheFile, os.getpid())
+                with open(cacheFileTmp, "wb") as f:
+                    pickle.dump({"version": PARSE_CACHE_VERSION,
+                                 "uri": cachedDocument.uri,
+                                 "sourceStat": cachedDocument.sourceStat,
+                                 "entries": cachedDocument.entries},
+                                f, pickle.HIGHEST_PROTOCOL)
+                os.replace(cacheFileTmp, cacheFile)
+                cachedDocument.isModified = False
+
+    def report(self, modelXbrl):
+        """Saves the cache and logs (and resets) the hit counts since the prior report.
+        """
+        try:
+            self.save()
+        except Exception as err:
+            modelXbrl.warning("arelle:parseCacheSaveError",
+                              _("XPath parse cache could not be saved in %(cacheDir)s: %(error)s"),
+                              modelObject=modelXbrl, cacheDir=self.cacheDir, error=err)
+        lookups = self.hits + self.misses
+        if lookups or self.uncached:
+            modelXbrl.info("formula:parseCache",
+                           _("XPath parse cache %(hits)s hits, %(misses)s misses, hit rate %(hitRate)s, "
+                             "%(uncached)s expressions not cacheable, %(invalidated)s documents invalidated"),
+                           modelObject=modelXbrl, hits=self.hits, misses=self.misses,
+                           hitRate="{:.1%}".format(self.hits / lookups if lookups else 0.0),
+                           uncached=self.uncached, invalidated=self.invalidated)
+        self.hits = self.misses = self.uncached = self.invalidated = 0
+
+def pickleExprStack(exprStack):
+    # parse results (such as OperationDef args) are pickled as lists, which is how the stack is evaluated
+    f = io.BytesIO()
+    pickler = pickle.Pickler(f, pickle.HIGHEST_PROTOCOL)
+    pickler.dispatch_table = {ParseResults: lambda parseResults: (list, (parseResults.asList(),))}
+    pickler.dump(exprStack)
+    return f.getvalue()
+
+def sourceFileStat(filepath):
+    # modification time and size of the file, or of the archive file containing filepath
+    path = filepath
+    while not os.path.isfile(path):
+        parentPath = os.path.dirname(path)
+        if not parentPath or parentPath == path:
+            return None
+        path = parentPath
+    fileStat = os.stat(path)
+    return (path, fileStat.st_mtime, fileStat.st_size)
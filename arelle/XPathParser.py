@@ -22,7 +22,7 @@ else:
                  Combine, Optional, nums, Or, Forward, Group, ZeroOrMore, StringEnd, alphanums,
                  ParserElement, quotedString, delimitedList, Suppress, Regex)
 from arelle.Locale import format_string
-import time, xml.dom, traceback
+import time, xml.dom, traceback, logging
 from decimal import Decimal
 from arelle import (XmlUtil, ModelValue, XbrlConst)
 FunctionIxt = None
@@ -90,6 +90,12 @@ def pushQuotedString( sourceStr, loc, toks ):
     exprStack.append( dequotedStr )
     return dequotedStr
 
+class XPathProg(list):
+    """Expression stack of a parsed XPath expression (as returned by parse), 
+    with its evaluation function when compiled by XPathCompiler.
+    """
+    compiled = None
+
 class QNameDef(ModelValue.QName):
     def __init__(self, loc, prefix, namespaceURI, localName, isAttribute=False, axis=None):
         super(QNameDef, self).__init__(prefix, namespaceURI, localName)
@@ -108,6 +114,8 @@ class QNameDef(ModelValue.QName):
             return super(QNameDef, self).__eq__(other)
     def __ne__(self,other):
         return not self.__eq__(other)
+    def __reduce__(self): # as QName.__reduce__, recomputing qnameValueHash when unpickled
+        return (QNameDef, (self.loc, self.prefix, self.namespaceURI, self.localName, self.isAttribute, self.axis))
 
 defaultNsmap = {
     "fn":"http://www.w3.org/2005/xpath-functions",
@@ -263,19 +271,21 @@ def pushFunction( sourceStr, loc, toks ):
     name = toks[0]
     operation = OperationDef(sourceStr, loc, name, toks, True)
     exprStack[exprStack.index(toks[0]):] = [operation]  # replace tokens with production
-    if isinstance(name, QNameDef): # function call
-        ns = name.namespaceURI
-        if (not name.unprefixed and 
+    if isinstance(name, QNameDef) and isUndeclaredFunction(name): # function call
+        modelXbrl.error("xbrlve:noCustomFunctionSignature",
+            _("No custom function signature for %(custFunction)s in %(resource)s"),
+            modelObject=xmlElement,
+            resource=xmlElement.localName,
+            custFunction=name)
+    return operation
+
+def isUndeclaredFunction(name):
+    ns = name.namespaceURI
+    return (not name.unprefixed and 
             ns not in {XbrlConst.fn, XbrlConst.xfi, XbrlConst.xff, XbrlConst.xsd} and
             ns not in FunctionIxt.ixtNamespaceFunctions and
-            name not in modelXbrl.modelManager.customTransforms):
-            if name not in modelXbrl.modelCustomFunctionSignatures and name not in pluginCustomFunctions: # indexed by both [qname] and [qname,arity]
-                modelXbrl.error("xbrlve:noCustomFunctionSignature",
-                    _("No custom function signature for %(custFunction)s in %(resource)s"),
-                    modelObject=xmlElement,
-                    resource=xmlElement.localName,
-                    custFunction=name)
-    return operation
+            name not in modelXbrl.modelManager.customTransforms and
+            name not in modelXbrl.modelCustomFunctionSignatures and name not in pluginCustomFunctions) # indexed by both [qname] and [qname,arity]
 
 def pushSequence( sourceStr, loc, toks ):
     operation = OperationDef(sourceStr, loc, 'sequence', toks, False)
@@ -667,12 +677,24 @@ def normalizeExpr(expr):
 isInitialized = False
 
 def initializeParser(modelManager):
-    global isInitialized, FunctionIxt
-    if not isInitialized:
+    global FunctionIxt
+    if FunctionIxt is None:
         from arelle import FunctionIxt
+    if getattr(modelManager, "xpathParseCache", None) is not None:
+        return False # grammar is initialized by parse when an expression isn't in the parse cache
+    if getattr(getattr(modelManager, "formulaOptions", None), "xpathParser", None) == "descent":
+        return False # pyparsing grammar isn't used
+    return initializeGrammar(modelManager)
+
+def initializeGrammar(modelManager):
+    global isInitialized, exprStack
+    if not isInitialized:
         modelManager.showStatus(_("initializing formula xpath2 grammar"))
         startedAt = time.time()
+        _exprStack = exprStack # may be initializing while parsing an expression
+        exprStack = []
         xpathExpr.parseString( "0", parseAll=True )
+        exprStack = _exprStack
         modelManager.addToLog(format_string(modelManager.locale, 
                                     _("Formula xpath2 grammar initialized in %.2f secs"), 
                                     time.time() - startedAt))
@@ -681,6 +703,22 @@ def initializeParser(modelManager):
         return True # was initialized on this call
     return False # had already been initialized
 
+class XPathSyntaxError(Exception):
+    """Syntax error of the recursive descent parser (XPathDescentParser), with the location 
+    attributes of a pyparsing ParseException (for exceptionErrorIndication).
+    """
+    def __init__(self, sourceStr, loc, msg):
+        self.sourceStr = sourceStr
+        self.loc = loc
+        self.msg = msg
+        self.lineno = sourceStr.count("\n", 0, loc) + 1
+        self.column = 1 if loc < len(sourceStr) and sourceStr[loc] == '\n' else loc - sourceStr.rfind("\n", 0, loc)
+        nextCR = sourceStr.find("\n", loc)
+        self.line = sourceStr[sourceStr.rfind("\n", 0, loc) + 1 : nextCR if nextCR >= 0 else len(sourceStr)]
+        super(XPathSyntaxError, self).__init__(msg)
+    def __str__(self):
+        return "%s (at char %d), (line:%d, col:%d)" % (self.msg, self.loc, self.lineno, self.column)
+
 def exceptionErrorIndication(exception):
     errorAt = exception.column
     source = ''
@@ -748,7 +786,24 @@ def parse(modelObject, xpathExpression, element, name, traceType):
                 source=normalizedExpr)
             exprStack.append( ProgHeader(modelObject,name,element,normalizedExpr,traceType) )
 
-            L = xpathExpr.parseString( normalizedExpr, parseAll=True )
+            parseCache = modelXbrl.modelManager.xpathParseCache
+            cachedExprStack = parseCache.get(element, normalizedExpr, isUndeclaredFunction) if parseCache is not None else None
+            if cachedExprStack is not None:
+                exprStack.extend(cachedExprStack)
+            else:
+                priorErrorCount = modelXbrl.logCount.get(logging._checkLevel('ERROR'), 0)
+                if formulaOptions.xpathParser == "descent":
+                    from arelle import XPathDescentParser
+                    XPathDescentParser.parse(normalizedExpr)
+                elif formulaOptions.xpathParser == "compare":
+                    from arelle import XPathDescentParser
+                    initializeGrammar(modelXbrl.modelManager)
+                    XPathDescentParser.compare(normalizedExpr, name) # leaves the pyparsing expression stack
+                else:
+                    initializeGrammar(modelXbrl.modelManager)
+                    L = xpathExpr.parseString( normalizedExpr, parseAll=True )
+                if parseCache is not None and modelXbrl.logCount.get(logging._checkLevel('ERROR'), 0) == priorErrorCount:
+                    parseCache.put(element, normalizedExpr, exprStack[1:], functionReferences(exprStack))
             
             #modelXbrl.error( _("AST {0} {1}").format(name, L),
             #    "info", "formula:trace")
@@ -762,7 +817,7 @@ def parse(modelObject, xpathExpression, element, name, traceType):
                 name=name,
                 source=exprStack)
                 
-        except (ParseException, ParseSyntaxException) as err:
+        except (ParseException, ParseSyntaxException, XPathSyntaxError) as err:
             modelXbrl.error("err:XPST0003",
                 _("Parse error in %(name)s error: %(error)s \n%(source)s"),
                 modelObject=element,
@@ -796,7 +851,7 @@ def parse(modelObject, xpathExpression, element, name, traceType):
             "info", "formula:trace")
         return pyCode
         '''
-        returnProg = exprStack
+        returnProg = XPathProg(exprStack)
     exprStack = [] # dereference
     xmlElement = None
     modelXbrl = None
@@ -834,6 +889,22 @@ def variableReferences(exprStack, varRefSet, element, rangeVars=None):
         if localRangeVar in rangeVars:
             rangeVars.remove(localRangeVar)
             
+def functionReferences(exprStack, fnQnames=None):
+    # qnames of prefixed function calls, checked by isUndeclaredFunction when reusing a cached expression stack
+    if fnQnames is None: fnQnames = set()
+    for p in exprStack:
+        if isinstance(p,OperationDef):
+            if isinstance(p.name, QNameDef) and not p.name.unprefixed:
+                fnQnames.add(p.name)
+            functionReferences(p.args, fnQnames)
+        elif isinstance(p,Expr):
+            functionReferences(p.expr, fnQnames)
+        elif isinstance(p,RangeDecl):
+            functionReferences(p.bindingSeq, fnQnames)
+        elif hasattr(p, '__iter__') and not isinstance(p, _STR_BASE):
+            functionReferences(p, fnQnames)
+    return fnQnames
+
 def prefixDeclarations(exprStack, xmlnsDict, element):
     from arelle.ModelValue import qname
     for p in exprStack:
@@ -865,6 +936,8 @@ def clearProg(exprStack):
                 p.element = None
                 break
         del exprStack[:]
+        if isinstance(exprStack, XPathProg):
+            exprStack.compiled = None
     
 def clearNamedProg(ownerObject, progName):
     clearProg(ownerObject.getattr(progName, []))
@@ -69,6 +69,21 @@ def equalityHash(elt, equalMode=S_EQUAL, excludeIDs=NO_IDs_EXCLUDED):
     else:
         return hash(None)
 
+def correspondenceHash(elt):
+    """Hash of element names, XPath-equality values and child structure, equal for elements which correspond 
+    (nodesCorrespond with XPATH_EQ), for bucketing elements before comparing them by nodesCorrespond.
+    Attributes are not hashed, so elements of equal hashes need not correspond."""
+    if elt is None:
+        return hash(None)
+    if not hasattr(elt,"xValid"):
+        xmlValidate(elt.modelXbrl, elt)
+    try:
+        valueHash = hash(getattr(elt, "xValue", None))
+    except TypeError: # unhashable value (such as a list)
+        valueHash = None
+    return hash((elt.localName, elt.namespaceURI, valueHash, 
+                 tuple(correspondenceHash(child) for child in childElements(elt))))
+
 def sEqual(dts1, elt1, elt2, equalMode=S_EQUAL, excludeIDs=NO_IDs_EXCLUDED, dts2=None, ns2ns1Tbl=None):
     if dts2 is None: dts2 = dts1
     if elt1.localName != elt2.localName:
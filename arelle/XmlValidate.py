@@ -313,221 +313,12 @@ def validate(modelXbrl, elt, recurse=True, attrQname=None, ixFacts=False):
 
 def validateValue(modelXbrl, elt, attrTag, baseXsdType, value, isNillable=False, isNil=False, facets=None):
     if baseXsdType:
+        validator = valueValidator(modelXbrl, baseXsdType, facets)
         try:
-            '''
-            if (len(value) == 0 and attrTag is None and not isNillable and 
-                baseXsdType not in ("anyType", "string", "normalizedString", "token", "NMTOKEN", "anyURI", "noContent")):
-                raise ValueError("missing value for not nillable element")
-            '''
-            xValid = VALID
-            whitespaceReplace = (baseXsdType == "normalizedString")
-            whitespaceCollapse = (not whitespaceReplace and baseXsdType != "string")
-            isList = baseXsdType in {"IDREFS", "ENTITIES", "NMTOKENS"}
-            if isList:
-                baseXsdType = baseXsdType[:-1] # remove plural
-                if facets:
-                    if "minLength" not in facets:
-                        facets = facets.copy()
-                        facets["minLength"] = 1
-                else:
-                    facets = {"minLength": 1}
-            pattern = baseXsdTypePatterns.get(baseXsdType)
-            if facets:
-                if "pattern" in facets:
-                    pattern = facets["pattern"]
-                    # note multiple patterns are or'ed togetner, which isn't yet implemented!
-                if "whiteSpace" in facets:
-                    whitespaceReplace, whitespaceCollapse = {"preserve":(False,False), "replace":(True,False), "collapse":(False,True)}[facets["whiteSpace"]]
-            if whitespaceReplace:
-                value = normalizeWhitespacePattern.sub(' ', value) # replace tab, line feed, return with space
-            elif whitespaceCollapse:
-                value = collapseWhitespacePattern.sub(' ', value).strip(' ') # collapse multiple spaces, tabs, line feeds and returns to single space
-            if baseXsdType == "noContent":
-                if len(value) > 0 and not value.isspace():
-                    raise ValueError("value content not permitted")
-                # note that sValue and xValue are not innerText but only text elements on specific element (or attribute)
-                xValue = sValue = None
-                xValid = VALID_NO_CONTENT # notify others that element may contain subelements (for stringValue needs)
-            elif not value and isNil and isNillable: # rest of types get None if nil/empty value
-                xValue = sValue = None
-            else:
-                if pattern is not None:
-                    if ((isList and any(pattern.match(v) is None for v in value.split())) or
-                        (not isList and pattern.match(value) is None)):
-                        raise ValueError("pattern facet " + facets["pattern"].pattern if facets and "pattern" in facets else "pattern mismatch")
-                if facets:
-                    if "enumeration" in facets and value not in facets["enumeration"]:
-                        raise ValueError("{0} is not in {1}".format(value, facets["enumeration"].keys()))
-                    if "length" in facets and len(value) != facets["length"]:
-                        raise ValueError("length {0}, expected {1}".format(len(value), facets["length"]))
-                    if "minLength" in facets and len(value) < facets["minLength"]:
-                        raise ValueError("length {0}, minLength {1}".format(len(value), facets["minLength"]))
-                    if "maxLength" in facets and len(value) > facets["maxLength"]:
-                        raise ValueError("length {0}, maxLength {1}".format(len(value), facets["maxLength"]))
-                if baseXsdType in {"string", "normalizedString", "language", "token", "NMTOKEN","Name","NCName","IDREF","ENTITY"}:
-                    xValue = sValue = value
-                elif baseXsdType == "ID":
-                    xValue = sValue = value
-                    xValid = VALID_ID
-                elif baseXsdType == "anyURI":
-                    if value:  # allow empty strings to be valid anyURIs
-                        if UrlUtil.relativeUrlPattern.match(value) is None:
-                            raise ValueError("IETF RFC 2396 4.3 syntax")
-                    # encode PSVI xValue similarly to Xerces and other implementations
-                    xValue = anyURI(UrlUtil.anyUriQuoteForPSVI(value))
-                    sValue = value
-                elif baseXsdType in ("decimal", "float", "double", "XBRLI_NONZERODECIMAL"):
-                    if baseXsdType in ("decimal", "XBRLI_NONZERODECIMAL"):
-                        if decimalPattern.match(value) is None:
-                            raise ValueError("lexical pattern mismatch")
-                        xValue = Decimal(value)
-                        sValue = float(value) # s-value uses Number (float) representation
-                        if sValue == 0 and baseXsdType == "XBRLI_NONZERODECIMAL":
-                            raise ValueError("zero is not allowed")
-                    else:
-                        if floatPattern.match(value) is None:
-                            raise ValueError("lexical pattern mismatch")
-                        xValue = sValue = float(value)
-                    if facets:
-                        if "totalDigits" in facets and len(value.replace(".","")) > facets["totalDigits"]:
-                            raise ValueError("totalDigits facet {0}".format(facets["totalDigits"]))
-                        if "fractionDigits" in facets and ( '.' in value and
-                            len(value[value.index('.') + 1:]) > facets["fractionDigits"]):
-                            raise ValueError("fraction digits facet {0}".format(facets["fractionDigits"]))
-                        if "maxInclusive" in facets and xValue > facets["maxInclusive"]:
-                            raise ValueError(" > maxInclusive {0}".format(facets["maxInclusive"]))
-                        if "maxExclusive" in facets and xValue >= facets["maxExclusive"]:
-                            raise ValueError(" >= maxInclusive {0}".format(facets["maxExclusive"]))
-                        if "minInclusive" in facets and xValue < facets["minInclusive"]:
-                            raise ValueError(" < minInclusive {0}".format(facets["minInclusive"]))
-                        if "minExclusive" in facets and xValue <= facets["minExclusive"]:
-                            raise ValueError(" <= minExclusive {0}".format(facets["minExclusive"]))
-                elif baseXsdType in {"integer",
-                                     "nonPositiveInteger","negativeInteger","nonNegativeInteger","positiveInteger",
-                                     "long","unsignedLong",
-                                     "int","unsignedInt",
-                                     "short","unsignedShort",
-                                     "byte","unsignedByte"}:
-                    xValue = sValue = _INT(value)
-                    if ((baseXsdType in {"nonNegativeInteger","unsignedLong","unsignedInt"} 
-                         and xValue < 0) or
-                        (baseXsdType == "nonPositiveInteger" and xValue > 0) or
-                        (baseXsdType == "positiveInteger" and xValue <= 0) or
-                        (baseXsdType == "byte" and not -128 <= xValue < 127) or
-                        (baseXsdType == "unsignedByte" and not 0 <= xValue < 255) or
-                        (baseXsdType == "short" and not -32768 <= xValue < 32767) or
-                        (baseXsdType == "unsignedShort" and not 0 <= xValue < 65535) or
-                        (baseXsdType == "positiveInteger" and xValue <= 0)):
-                        raise ValueError("{0} is not {1}".format(value, baseXsdType))
-                    if facets:
-                        if "totalDigits" in facets and len(value.replace(".","")) > facets["totalDigits"]:
-                            raise ValueError("totalDigits facet {0}".format(facets["totalDigits"]))
-                        if "fractionDigits" in facets and ( '.' in value and
-                            len(value[value.index('.') + 1:]) > facets["fractionDigits"]):
-                            raise ValueError("fraction digits facet {0}".format(facets["fractionDigits"]))
-                        if "maxInclusive" in facets and xValue > facets["maxInclusive"]:
-                            raise ValueError(" > maxInclusive {0}".format(facets["maxInclusive"]))
-                        if "maxExclusive" in facets and xValue >= facets["maxExclusive"]:
-                            raise ValueError(" >= maxInclusive {0}".format(facets["maxExclusive"]))
-                        if "minInclusive" in facets and xValue < facets["minInclusive"]:
-                            raise ValueError(" < minInclusive {0}".format(facets["minInclusive"]))
-                        if "minExclusive" in facets and xValue <= facets["minExclusive"]:
-                            raise ValueError(" <= minExclusive {0}".format(facets["minExclusive"]))
-                elif baseXsdType == "boolean":
-                    if value in ("true", "1"):  
-                        xValue = sValue = True
-                    elif value in ("false", "0"): 
-                        xValue = sValue = False
-                    else: raise ValueError
-                elif baseXsdType == "QName":
-                    xValue = qnameEltPfxName(elt, value, prefixException=ValueError)
-                    #xValue = qname(elt, value, castException=ValueError, prefixException=ValueError)
-                    sValue = value
-                    ''' not sure here, how are explicitDimensions validated, but bad units not?
-                    if xValue.namespaceURI in modelXbrl.namespaceDocs:
-                        if (xValue not in modelXbrl.qnameConcepts and 
-                            xValue not in modelXbrl.qnameTypes and
-                            xValue not in modelXbrl.qnameAttributes and
-                            xValue not in modelXbrl.qnameAttributeGroups):
-                            raise ValueError("qname not defined " + str(xValue))
-                    '''
-                elif baseXsdType == "enumerationHrefs":
-                    xValue = [qnameHref(href) for href in value.split()]
-                    sValue = value
-                elif baseXsdType == "enumerationQNames":
-                    xValue = [qnameEltPfxName(elt, qn, prefixException=ValueError) for qn in value.split()]
-                    sValue = value
-                elif baseXsdType in ("XBRLI_DECIMALSUNION", "XBRLI_PRECISIONUNION"):
-                    xValue = sValue = value if value == "INF" else _INT(value)
-                elif baseXsdType in ("XBRLI_NONZERODECIMAL"):
-                    xValue = sValue = _INT(value)
-                    if xValue == 0:
-                        raise ValueError("invalid value")
-                elif baseXsdType == "XBRLI_DATEUNION":
-                    xValue = dateTime(value, type=DATEUNION, castException=ValueError)
-                    sValue = value
-                elif baseXsdType == "dateTime":
-                    xValue = dateTime(value, type=DATETIME, castException=ValueError)
-                    sValue = value
-                elif baseXsdType == "date":
-                    xValue = dateTime(value, type=DATE, castException=ValueError)
-                    sValue = value
-                elif baseXsdType == "regex-pattern":
-                    # for facet compiling
-                    try:
-                        sValue = value
-                        if value in xmlSchemaPatterns:
-                            xValue = xmlSchemaPatterns[value]
-                        else:
-                            if r"\i" in value or r"\c" in value:
-                                value = value.replace(r"[\i-[:]]", iNameChar).replace(r"\i", iNameChar) \
-                                              .replace(r"[\c-[:]]", cMinusCNameChar).replace(r"\c", cNameChar)
-                            xValue = re_compile(value + "$") # must match whole string
-                    except Exception as err:
-                        raise ValueError(err)
-                elif baseXsdType == "fraction":
-                    numeratorStr, denominatorStr = elt.fractionValue
-                    if numeratorStr == INVALIDixVALUE or denominatorStr == INVALIDixVALUE:
-                        sValue = xValue = INVALIDixVALUE
-                        xValid = INVALID
-                    else:
-                        sValue = value
-                        numeratorNum = float(numeratorStr)
-                        denominatorNum = float(denominatorStr)
-                        if numeratorNum.is_integer() and denominatorNum.is_integer():
-                            xValue = Fraction(int(numeratorNum), int(denominatorNum))
-                        else:
-                            xValue = Fraction(numeratorNum / denominatorNum)
-                else:
-                    if baseXsdType in lexicalPatterns:
-                        match = lexicalPatterns[baseXsdType].match(value)
-                        if match is None:
-                            raise ValueError("lexical pattern mismatch")
-                        if baseXsdType == "gMonthDay":
-                            month, day, zSign, zHrMin, zHr, zMin = match.groups()
-                            if int(day) > {2:29, 4:30, 6:30, 9:30, 11:30, 1:31, 3:31, 5:31, 7:31, 8:31, 10:31, 12:31}[int(month)]:
-                                raise ValueError("invalid day {0} for month {1}".format(day, month))
-                            xValue = gMonthDay(month, day)
-                        elif baseXsdType == "gYearMonth":
-                            year, month, zSign, zHrMin, zHr, zMin = match.groups()
-                            xValue = gYearMonth(year, month)
-                        elif baseXsdType == "gYear":
-                            year, zSign, zHrMin, zHr, zMin = match.groups()
-                            xValue = gYear(year)
-                        elif baseXsdType == "gMonth":
-                            month, zSign, zHrMin, zHr, zMin = match.groups()
-                            xValue = gMonth(month)
-                        elif baseXsdType == "gDay":
-                            day, zSign, zHrMin, zHr, zMin = match.groups()
-                            xValue = gDay(day)
-                        elif baseXsdType == "duration":
-                            xValue = isoDuration(value)
-                        else:
-                            xValue = value
-                    else: # no lexical pattern, forget compiling value
-                        xValue = value
-                    sValue = value
+            xValid, xValue, sValue = validator(elt, value, isNillable, isNil)
         except (ValueError, InvalidOperation) as err:
+            baseXsdType = validator.baseXsdType # item type of list types
+            value = validator.normalizeWhitespace(value)
             if ModelInlineValueObject is not None and isinstance(elt, ModelInlineValueObject):
                 errElt = "{0} fact {1}".format(elt.elementQname, elt.qname)
             else:
@@ -552,6 +343,16 @@ def validateValue(modelXbrl, elt, attrTag, baseXsdType, value, isNillable=False,
             xValue = None
             sValue = value
             xValid = INVALID
+        else:
+            valueInterner = modelXbrl.valueInterner
+            if valueInterner is not None: # deduplicate values repeated in contexts, units and facts
+                if sValue is xValue:
+                    xValue = sValue = valueInterner.intern(xValue)
+                else:
+                    xValue = valueInterner.intern(xValue)
+                    sValue = valueInterner.intern(sValue)
+                if attrTag:
+                    value = valueInterner.intern(value)
     else:
         xValue = sValue = None
         xValid = UNKNOWN
@@ -566,6 +367,293 @@ def validateValue(modelXbrl, elt, attrTag, baseXsdType, value, isNillable=False,
         elt.xValue = xValue
         elt.sValue = sValue
 
+def valueValidator(modelXbrl, baseXsdType, facets=None):
+    """Returns the validator of values of baseXsdType with facets, compiled on first use for modelXbrl.
+    
+    Facets are those of a type or attribute declaration (which are cached by the declaration), or constant facets,
+    as validators are cached by the identity of facets, in modelXbrl.valueValidators (released when it is closed).
+    """
+    valueValidators = modelXbrl.valueValidators
+    try:
+        return valueValidators[baseXsdType, id(facets)][1]
+    except KeyError:
+        validator = compileValueValidator(baseXsdType, facets)
+        valueValidators[baseXsdType, id(facets)] = (facets, validator) # facets kept so their id is not reused
+        return validator
+
+def compileValueValidator(baseXsdType, facets):
+    """Compiles a validator of values of baseXsdType with facets, a function of (elt, value, isNillable, isNil)
+    returning (xValid, xValue, sValue), which bundles whitespace normalization, lexical pattern, facet checks and
+    value conversion, raising ValueError (or InvalidOperation) for an invalid value.  The validator's baseXsdType
+    (the item type of list types) and normalizeWhitespace are for reporting invalid values.
+    """
+    whitespaceReplace = (baseXsdType == "normalizedString")
+    whitespaceCollapse = (not whitespaceReplace and baseXsdType != "string")
+    isList = baseXsdType in {"IDREFS", "ENTITIES", "NMTOKENS"}
+    if isList:
+        baseXsdType = baseXsdType[:-1] # remove plural
+        if facets:
+            if "minLength" not in facets:
+                facets = facets.copy()
+                facets["minLength"] = 1
+        else:
+            facets = {"minLength": 1}
+    pattern = baseXsdTypePatterns.get(baseXsdType)
+    if facets:
+        if "pattern" in facets:
+            pattern = facets["pattern"]
+            # note multiple patterns are or'ed togetner, which isn't yet implemented!
+        if "whiteSpace" in facets:
+            whitespaceReplace, whitespaceCollapse = {"preserve":(False,False), "replace":(True,False), "collapse":(False,True)}[facets["whiteSpace"]]
+    
+    if whitespaceReplace:
+        def normalizeWhitespace(value):
+            return normalizeWhitespacePattern.sub(' ', value) # replace tab, line feed, return with space
+    elif whitespaceCollapse:
+        def normalizeWhitespace(value):
+            return collapseWhitespacePattern.sub(' ', value).strip(' ') # collapse multiple spaces, tabs, line feeds and returns to single space
+    else:
+        def normalizeWhitespace(value):
+            return value
+    
+    if baseXsdType == "noContent":
+        def validateNoContent(elt, value, isNillable, isNil):
+            value = normalizeWhitespace(value)
+            if len(value) > 0 and not value.isspace():
+                raise ValueError("value content not permitted")
+            # note that sValue and xValue are not innerText but only text elements on specific element (or attribute)
+            return VALID_NO_CONTENT, None, None # notify others that element may contain subelements (for stringValue needs)
+        validateNoContent.baseXsdType = baseXsdType
+        validateNoContent.normalizeWhitespace = normalizeWhitespace
+        return validateNoContent
+    
+    if facets:
+        enumeration = facets.get("enumeration")
+        length = facets.get("length")
+        minLength = facets.get("minLength")
+        maxLength = facets.get("maxLength")
+        hasStringFacets = any(f is not None for f in (enumeration, length, minLength, maxLength))
+    else:
+        hasStringFacets = False
+    convert = valueConverters.get(baseXsdType)
+    if convert is None:
+        convert = lexicalValueConverter(baseXsdType)
+    if baseXsdType in numericValueTypes and facets:
+        totalDigits = facets.get("totalDigits")
+        fractionDigits = facets.get("fractionDigits")
+        maxInclusive = facets.get("maxInclusive")
+        maxExclusive = facets.get("maxExclusive")
+        minInclusive = facets.get("minInclusive")
+        minExclusive = facets.get("minExclusive")
+        hasNumericFacets = any(f is not None for f in (totalDigits, fractionDigits, maxInclusive, maxExclusive, minInclusive, minExclusive))
+    else:
+        hasNumericFacets = False
+    
+    def validate(elt, value, isNillable, isNil):
+        value = normalizeWhitespace(value)
+        if not value and isNil and isNillable: # rest of types get None if nil/empty value
+            return VALID, None, None
+        if pattern is not None:
+            if ((isList and any(pattern.match(v) is None for v in value.split())) or
+                (not isList and pattern.match(value) is None)):
+                raise ValueError("pattern facet " + facets["pattern"].pattern if facets and "pattern" in facets else "pattern mismatch")
+        if hasStringFacets:
+            if enumeration is not None and value not in enumeration:
+                raise ValueError("{0} is not in {1}".format(value, enumeration.keys()))
+            if length is not None and len(value) != length:
+                raise ValueError("length {0}, expected {1}".format(len(value), length))
+            if minLength is not None and len(value) < minLength:
+                raise ValueError("length {0}, minLength {1}".format(len(value), minLength))
+            if maxLength is not None and len(value) > maxLength:
+                raise ValueError("length {0}, maxLength {1}".format(len(value), maxLength))
+        xValid, xValue, sValue = convert(elt, value)
+        if hasNumericFacets:
+            if totalDigits is not None and len(value.replace(".","")) > totalDigits:
+                raise ValueError("totalDigits facet {0}".format(totalDigits))
+            if fractionDigits is not None and ( '.' in value and
+                len(value[value.index('.') + 1:]) > fractionDigits):
+                raise ValueError("fraction digits facet {0}".format(fractionDigits))
+            if maxInclusive is not None and xValue > maxInclusive:
+                raise ValueError(" > maxInclusive {0}".format(maxInclusive))
+            if maxExclusive is not None and xValue >= maxExclusive:
+                raise ValueError(" >= maxInclusive {0}".format(maxExclusive))
+            if minInclusive is not None and xValue < minInclusive:
+                raise ValueError(" < minInclusive {0}".format(minInclusive))
+            if minExclusive is not None and xValue <= minExclusive:
+                raise ValueError(" <= minExclusive {0}".format(minExclusive))
+        return xValid, xValue, sValue
+    validate.baseXsdType = baseXsdType
+    validate.normalizeWhitespace = normalizeWhitespace
+    return validate
+
+# value converters, of (elt, value) returning (xValid, xValue, sValue), value is whitespace normalized and pattern checked
+
+def convertString(elt, value):
+    return VALID, value, value
+
+def convertID(elt, value):
+    return VALID_ID, value, value
+
+def convertAnyURI(elt, value):
+    if value:  # allow empty strings to be valid anyURIs
+        if UrlUtil.relativeUrlPattern.match(value) is None:
+            raise ValueError("IETF RFC 2396 4.3 syntax")
+    # encode PSVI xValue similarly to Xerces and other implementations
+    return VALID, anyURI(UrlUtil.anyUriQuoteForPSVI(value)), value
+
+def convertDecimal(elt, value):
+    if decimalPattern.match(value) is None:
+        raise ValueError("lexical pattern mismatch")
+    return VALID, Decimal(value), float(value) # s-value uses Number (float) representation
+
+def convertNonZeroDecimal(elt, value):
+    if decimalPattern.match(value) is None:
+        raise ValueError("lexical pattern mismatch")
+    xValue = Decimal(value)
+    sValue = float(value) # s-value uses Number (float) representation
+    if sValue == 0:
+        raise ValueError("zero is not allowed")
+    return VALID, xValue, sValue
+
+def convertFloat(elt, value):
+    if floatPattern.match(value) is None:
+        raise ValueError("lexical pattern mismatch")
+    xValue = float(value)
+    return VALID, xValue, xValue
+
+def integerValueConverter(baseXsdType, isInRange=None):
+    def convertInteger(elt, value):
+        xValue = _INT(value)
+        if isInRange is not None and not isInRange(xValue):
+            raise ValueError("{0} is not {1}".format(value, baseXsdType))
+        return VALID, xValue, xValue
+    return convertInteger
+
+def convertBoolean(elt, value):
+    if value in ("true", "1"):  
+        return VALID, True, True
+    elif value in ("false", "0"): 
+        return VALID, False, False
+    raise ValueError
+
+def convertQName(elt, value):
+    return VALID, qnameEltPfxName(elt, value, prefixException=ValueError), value
+
+def convertEnumerationHrefs(elt, value):
+    return VALID, [qnameHref(href) for href in value.split()], value
+
+def convertEnumerationQNames(elt, value):
+    return VALID, [qnameEltPfxName(elt, qn, prefixException=ValueError) for qn in value.split()], value
+
+def convertDecimalsUnion(elt, value):
+    xValue = value if value == "INF" else _INT(value)
+    return VALID, xValue, xValue
+
+def dateTimeValueConverter(type):
+    def convertDateTime(elt, value):
+        return VALID, dateTime(value, type=type, castException=ValueError), value
+    return convertDateTime
+
+def convertRegexPattern(elt, value):
+    # for facet compiling
+    try:
+        sValue = value
+        if value in xmlSchemaPatterns:
+            xValue = xmlSchemaPatterns[value]
+        else:
+            if r"\i" in value or r"\c" in value:
+                value = value.replace(r"[\i-[:]]", iNameChar).replace(r"\i", iNameChar) \
+                              .replace(r"[\c-[:]]", cMinusCNameChar).replace(r"\c", cNameChar)
+            xValue = re_compile(value + "$") # must match whole string
+    except Exception as err:
+        raise ValueError(err)
+    return VALID, xValue, sValue
+
+def convertFraction(elt, value):
+    numeratorStr, denominatorStr = elt.fractionValue
+    if numeratorStr == INVALIDixVALUE or denominatorStr == INVALIDixVALUE:
+        return INVALID, INVALIDixVALUE, INVALIDixVALUE
+    numeratorNum = float(numeratorStr)
+    denominatorNum = float(denominatorStr)
+    if numeratorNum.is_integer() and denominatorNum.is_integer():
+        xValue = Fraction(int(numeratorNum), int(denominatorNum))
+    else:
+        xValue = Fraction(numeratorNum / denominatorNum)
+    return VALID, xValue, value
+
+def lexicalValueConverter(baseXsdType):
+    lexicalPattern = lexicalPatterns.get(baseXsdType)
+    def convertLexical(elt, value):
+        if lexicalPattern is None: # no lexical pattern, forget compiling value
+            return VALID, value, value
+        match = lexicalPattern.match(value)
+        if match is None:
+            raise ValueError("lexical pattern mismatch")
+        if baseXsdType == "gMonthDay":
+            month, day, zSign, zHrMin, zHr, zMin = match.groups()
+            if int(day) > {2:29, 4:30, 6:30, 9:30, 11:30, 1:31, 3:31, 5:31, 7:31, 8:31, 10:31, 12:31}[int(month)]:
+                raise ValueError("invalid day {0} for month {1}".format(day, month))
+            xValue = gMonthDay(month, day)
+        elif baseXsdType == "gYearMonth":
+            year, month, zSign, zHrMin, zHr, zMin = match.groups()
+            xValue = gYearMonth(year, month)
+        elif baseXsdType == "gYear":
+            year, zSign, zHrMin, zHr, zMin = match.groups()
+            xValue = gYear(year)
+        elif baseXsdType == "gMonth":
+            month, zSign, zHrMin, zHr, zMin = match.groups()
+            xValue = gMonth(month)
+        elif baseXsdType == "gDay":
+            day, zSign, zHrMin, zHr, zMin = match.groups()
+            xValue = gDay(day)
+        elif baseXsdType == "duration":
+            xValue = isoDuration(value)
+        else:
+            xValue = value
+        return VALID, xValue, value
+    return convertLexical
+
+valueConverters = {
+    "string": convertString, "normalizedString": convertString, "language": convertString, "token": convertString,
+    "NMTOKEN": convertString, "Name": convertString, "NCName": convertString, "IDREF": convertString, "ENTITY": convertString,
+    "ID": convertID,
+    "anyURI": convertAnyURI,
+    "decimal": convertDecimal,
+    "XBRLI_NONZERODECIMAL": convertNonZeroDecimal,
+    "float": convertFloat,
+    "double": convertFloat,
+    "integer": integerValueConverter("integer"),
+    "nonPositiveInteger": integerValueConverter("nonPositiveInteger", lambda x: x <= 0),
+    "negativeInteger": integerValueConverter("negativeInteger"),
+    "nonNegativeInteger": integerValueConverter("nonNegativeInteger", lambda x: x >= 0),
+    "positiveInteger": integerValueConverter("positiveInteger", lambda x: x > 0),
+    "long": integerValueConverter("long"),
+    "unsignedLong": integerValueConverter("unsignedLong", lambda x: x >= 0),
+    "int": integerValueConverter("int"),
+    "unsignedInt": integerValueConverter("unsignedInt", lambda x: x >= 0),
+    "short": integerValueConverter("short", lambda x: -32768 <= x < 32767),
+    "unsignedShort": integerValueConverter("unsignedShort", lambda x: 0 <= x < 65535),
+    "byte": integerValueConverter("byte", lambda x: -128 <= x < 127),
+    "unsignedByte": integerValueConverter("unsignedByte", lambda x: 0 <= x < 255),
+    "boolean": convertBoolean,
+    "QName": convertQName,
+    "enumerationHrefs": convertEnumerationHrefs,
+    "enumerationQNames": convertEnumerationQNames,
+    "XBRLI_DECIMALSUNION": convertDecimalsUnion,
+    "XBRLI_PRECISIONUNION": convertDecimalsUnion,
+    "XBRLI_DATEUNION": dateTimeValueConverter(DATEUNION),
+    "dateTime": dateTimeValueConverter(DATETIME),
+    "date": dateTimeValueConverter(DATE),
+    "regex-pattern": convertRegexPattern,
+    "fraction": convertFraction,
+    }
+
+numericValueTypes = {"decimal", "float", "double", "XBRLI_NONZERODECIMAL",
+                     "integer", "nonPositiveInteger", "negativeInteger", "nonNegativeInteger", "positiveInteger",
+                     "long", "unsignedLong", "int", "unsignedInt", "short", "unsignedShort", "byte", "unsignedByte"}
+
+whiteSpaceFacets = {"enumeration": {"replace","preserve","collapse"}}
+
 def validateFacet(typeElt, facetElt):
     facetName = facetElt.localName
     value = facetElt.get("value")
@@ -577,7 +665,7 @@ def validateFacet(typeElt, facetElt):
         facets = None
     elif facetName == "whiteSpace":
         baseXsdType = "string"
-        facets = {"enumeration": {"replace","preserve","collapse"}}
+        facets = whiteSpaceFacets
     elif facetName == "pattern":
         baseXsdType = "regex-pattern"
         facets = None
@@ -268,10 +268,12 @@ def checkFootnoteHrefs(modelXbrl, footnoteLink):
 
 def dropContext(modelXbrl, cntx):
     del modelXbrl.contexts[cntx.id]
+    modelXbrl.unindexContext(cntx)
     dropObject(modelXbrl, cntx)
     
 def dropUnit(modelXbrl, unit):
     del modelXbrl.units[unit.id]
+    modelXbrl.unindexUnit(unit)
     dropObject(modelXbrl, unit)
     
 def dropFootnoteLink(modelXbrl, footnoteLink):
@@ -0,0 +1,113 @@
+'''
+Export DTS Package is a plug-in to export the documents of a discovered DTS as a taxonomy package, so that
+later command line runs may load the DTS from the package (activated by --packages), without per-document
+web cache checks or retrieval.
+
+The package is a zip file (uncompressed so that documents are read directly from the file) of the original
+files of every schema and linkbase of the DTS (including the web-hosted ones, which saveDTS does not package),
+with a catalog remapping each directory of the DTS's document URLs to the package, and a manifest of the
+documents and entry points.  It is not a serialization of the discovered model: loading from the package
+parses and discovers the documents as loading from their original locations does.  Documents keep their
+original URLs, so messages, relationships and further discovery are as if loaded from their original
+locations.  As for any taxonomy package, documents of remapped directories which were not in the exported
+DTS can not be loaded while the package is active.
+
+Export a DTS package:
+   arelleCmdLine --plugins exportDtsPackage -f http://xbrl.fasb.org/us-gaap/2018/entire/us-gaap-entryPoint-std-2018-01-31.xsd
+      --exportDtsPackage us-gaap-2018.zip
+
+Validate instances using the package for this run (| separated if more than one):
+   arelleCmdLine --packages us-gaap-2018.zip -f filing.xml -v
+
+(c) Copyright 2026 Mark V Systems Limited, All rights reserved.
+'''
+import os, json, time, zipfile
+from collections import OrderedDict
+from arelle import ModelDocument, XmlUtil
+from arelle.UrlUtil import isHttpUrl
+
+PACKAGE_MANIFEST = "META-INF/dtsPackage.json"
+PACKAGE_DOC_TYPES = {ModelDocument.Type.SCHEMA, ModelDocument.Type.LINKBASE}
+
+def packageMemberName(url):
+    # document path in the package by its url, web-hosted documents as scheme/host/path, local files under file/
+    scheme, sep, path = url.partition("://")
+    if sep:
+        return scheme + "/" + path.partition("#")[0].partition("?")[0]
+    return "file/" + os.path.splitdrive(os.path.abspath(url))[1].replace(os.sep, "/").lstrip("/")
+
+def escapedAttr(value):
+    return XmlUtil.escapedText(value).replace('"', "&quot;")
+
+def exportDtsPackage(modelXbrl, packageFile):
+    startedAt = time.time()
+    # includes schemas loaded by xsi:schemaLocation (not inDTS), which are needed to load the DTS again
+    docs = sorted(set(doc for doc in modelXbrl.urlDocs.values()
+                      if doc.type in PACKAGE_DOC_TYPES),
+                  key=lambda doc: doc.uri)
+    entryPoints = [doc.uri for doc in modelXbrl.modelDocument.referencesDocument.keys()
+                   if doc.type in PACKAGE_DOC_TYPES
+                   ] if modelXbrl.modelDocument.type not in PACKAGE_DOC_TYPES else [modelXbrl.modelDocument.uri]
+    manifest = OrderedDict((("entryPoints", entryPoints), ("documents", [])))
+    remappings = OrderedDict() # directory url prefix: package directory
+    name = os.path.splitext(os.path.basename(packageFile))[0]
+    with zipfile.ZipFile(packageFile, "w", zipfile.ZIP_STORED) as zipFile:
+        for doc in docs:
+            memberName = packageMemberName(doc.uri)
+            _file = modelXbrl.fileSource.file(doc.filepath, binary=True)[0]
+            zipFile.writestr(name + "/" + memberName, _file.read())
+            _file.close()
+            urlDir = doc.uri.rpartition("/" if isHttpUrl(doc.uri) else os.sep)[0] + ("/" if isHttpUrl(doc.uri) else os.sep)
+            remappings[urlDir] = memberName.rpartition("/")[0] + "/"
+            manifest["documents"].append(OrderedDict((("url", doc.uri),
+                                                      ("member", memberName),
+                                                      ("type", ModelDocument.Type.typeName[doc.type]))))
+        zipFile.writestr(name + "/META-INF/taxonomyPackage.xml",
+            '<?xml version="1.0" encoding="utf-8"?>\n'
+            '<tp:taxonomyPackage xml:lang="en" xmlns:tp="http://xbrl.org/2016/taxonomy-package">\n'
+            '  <tp:identifier>{0}</tp:identifier>\n'
+            '  <tp:name>{1}</tp:name>\n'
+            '  <tp:description>DTS exported {2}</tp:description>\n'
+            '  <tp:entryPoints>\n{3}'
+            '  </tp:entryPoints>\n'
+            '</tp:taxonomyPackage>\n'.format(
+                XmlUtil.escapedText(name), XmlUtil.escapedText(name), time.strftime("%Y-%m-%dT%H:%M:%S"),
+                ''.join('    <tp:entryPoint><tp:name>{0}</tp:name><tp:entryPointDocument href="{1}"/></tp:entryPoint>\n'.format(
+                            XmlUtil.escapedText(os.path.basename(url)), escapedAttr(url))
+                        for url in entryPoints)))
+        zipFile.writestr(name + "/META-INF/catalog.xml",
+            '<?xml version="1.0" encoding="utf-8"?>\n'
+            '<catalog xmlns="urn:oasis:names:tc:entity:xmlns:xml:catalog">\n{0}'
+            '</catalog>\n'.format(
+                ''.join('  <rewriteURI uriStartString="{0}" rewritePrefix="../{1}"/>\n'.format(
+                            escapedAttr(prefix), escapedAttr(member))
+                        for prefix, member in remappings.items())))
+        zipFile.writestr(name + "/" + PACKAGE_MANIFEST, json.dumps(manifest, indent=1))
+    modelXbrl.info("info:exportDtsPackage",
+                   _("DTS package %(packageFile)s exported, %(numberOfFiles)s documents, in %(time)s secs"),
+                   modelObject=modelXbrl, packageFile=packageFile, numberOfFiles=len(docs),
+                   time="{:.3f}".format(time.time() - startedAt))
+
+def exportDtsPackageCommandLineOptionExtender(parser, *args, **kwargs):
+    parser.add_option("--exportDtsPackage",
+                      action="store",
+                      dest="exportDtsPackage",
+                      help=_("Export the documents of the loaded DTS as a taxonomy package file (zip), "
+                             "from which later runs may load the DTS when the package is activated by --packages."))
+
+def exportDtsPackageCommandLineXbrlLoaded(cntlr, options, modelXbrl, *args, **kwargs):
+    if getattr(options, "exportDtsPackage", None):
+        exportDtsPackage(modelXbrl, options.exportDtsPackage)
+
+__pluginInfo__ = {
+    'name': 'Export DTS Package',
+    'version': '1.0',
+    'description': "This plug-in exports the documents of a discovered DTS as a taxonomy package, "
+                   "from which the DTS may be loaded instead of from its original locations.",
+    'license': 'Apache-2',
+    'author': 'Mark V Systems Limited',
+    'copyright': '(c) Copyright 2026 Mark V Systems Limited, All rights reserved.',
+    # classes of mount points (required)
+    'CntlrCmdLine.Options': exportDtsPackageCommandLineOptionExtender,
+    'CntlrCmdLine.Xbrl.Loaded': exportDtsPackageCommandLineXbrlLoaded,
+}
@@ -322,8 +322,7 @@ def genFact(dts, concept, preferredLabel, arcrole, relationshipSet, level, visit
                     cntxId = cntx.id
                     if concept.isNumeric:
                         if concept.isMonetary:
-                            unitMeasure = qname(XbrlConst.iso4217, "USD")
-                            unitMeasure.prefix = "iso4217" # want to save with a recommended prefix
+                            unitMeasure = qname(XbrlConst.iso4217, "iso4217:USD") # saved with a recommended prefix
                             decimals = 2
                         elif concept.isShares:
                             unitMeasure = XbrlConst.qnXbrliShares
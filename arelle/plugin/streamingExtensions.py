@@ -18,7 +18,7 @@ Calls these plug-in classes:
 import io, os, time, sys, re, gc
 from decimal import Decimal, InvalidOperation
 from lxml import etree
-from arelle import XbrlConst, XmlUtil, XmlValidate, ValidateXbrlDimensions
+from arelle import XbrlConst, XmlUtil, XmlValidate, ValidateXbrlDimensions, ValidateXbrlCalcs, ModelFactTable
 from arelle.ModelDocument import ModelDocument, Type
 from arelle.ModelObjectFactory import parser
 from arelle.ModelObject import ModelObject
@@ -221,8 +221,6 @@ def streamingExtensionsLoader(modelXbrl, mappedUri, filepath, *args, **kwargs):
             incompatibleValidations.append("GFM")
         if _validateDisclosureSystem and _disclosureSystem.validationType == "HMRC":
             incompatibleValidations.append("HMRC")
-        if modelXbrl.modelManager.validateCalcLB:
-            incompatibleValidations.append("calculation LB")
         if incompatibleValidations:
             modelXbrl.error("streamingExtensions:incompatibleValidation",
                     _("Streaming instance validation does not support %(incompatibleValidations)s validation"),
@@ -245,9 +243,15 @@ def streamingExtensionsLoader(modelXbrl, mappedUri, filepath, *args, **kwargs):
         _file.close()
         return None
 
+    factTable = None
+    if modelXbrl.modelManager.loadFactTable:
+        factTable = modelXbrl.factTable = ModelFactTable.FactTable(modelXbrl)
+        contextBufferLimit = unitBufferLimit = Decimal("INF") # rows of the fact table refer to contexts and units
+
     _encoding = XmlUtil.encoding(_file.read(512))
     _file.seek(0,io.SEEK_SET) # allow reparsing
 
+    calcsValidator = None
     if _streamingExtensionsValidate:
         validator = Validate(modelXbrl)
         instValidator = validator.instValidator
@@ -547,7 +551,8 @@ def streamingExtensionsLoader(modelXbrl, mappedUri, filepath, *args, **kwargs):
                                _("Stream processing this instance."),
                                modelObject = modelDocument)
             elif mdlObj.getparent() is not None:
-                mdlObj._init() # requires discovery as part of start elements
+                if getattr(mdlObj, "modelDocument", None) is None: # not initialized when lxml created its proxy
+                    mdlObj._init() # requires discovery as part of start elements
                 if mdlObj.getparent().tag == "{http://www.xbrl.org/2003/instance}xbrl":
                     if not foundInstance:
                         foundInstance = True
@@ -565,6 +570,10 @@ def streamingExtensionsLoader(modelXbrl, mappedUri, filepath, *args, **kwargs):
                         beforeInstanceStream = False
                         if _streamingExtensionsValidate:
                             instValidator.validate(modelXbrl, modelXbrl.modelManager.formulaOptions.typedParameters(modelXbrl.prefixedNamespaces))
+                            if modelXbrl.modelManager.validateCalcLB: # summations checked as facts arrive
+                                calcsValidator = ValidateXbrlCalcs.ValidateStreamingCalcs(modelXbrl,
+                                                     inferDecimals=modelXbrl.modelManager.validateInferDecimals,
+                                                     deDuplicate=modelXbrl.modelManager.validateDedupCalcs)
                         else: # need default dimensions
                             ValidateXbrlDimensions.loadDimensionDefaults(modelXbrl)
                 elif not beforeInstanceStream and beforeStartStreamingPlugin:
@@ -618,6 +627,8 @@ def streamingExtensionsLoader(modelXbrl, mappedUri, filepath, *args, **kwargs):
                     if _streamingExtensionsValidate:
                         instValidator.checkUnits( (mdlObj,) )
                 elif ln == "xbrl": # end of document
+                    if calcsValidator is not None:
+                        calcsValidator.finish()
                     # check remaining batched facts if any
                     if _streamingFactsPlugin or _streamingValidateFactsPlugin:
                         # plugin attempts to process batch of all root facts not yet processed (not just current one)
@@ -709,12 +720,18 @@ def streamingExtensionsLoader(modelXbrl, mappedUri, filepath, *args, **kwargs):
                 modelDocument.factDiscover(mdlObj, modelXbrl.facts)
                 if factsCheckVersion:
                     factCheckFact(mdlObj)
-                if _streamingExtensionsValidate or _streamingFactsPlugin or _streamingValidateFactsPlugin:
+                if factTable is not None:
+                    factView = factTable.fact(factTable.appendFact(mdlObj))
+                if (_streamingExtensionsValidate or _streamingFactsPlugin or _streamingValidateFactsPlugin or
+                    factTable is not None):
                     factsToCheck = (mdlObj,)  # validate current fact by itself
                     if _streamingExtensionsValidate:
                         instValidator.checkFacts(factsToCheck)
                         if modelXbrl.hasXDT:
                             instValidator.checkFactsDimensions(factsToCheck)
+                        if calcsValidator is not None:
+                            # calculations of a fact table are validated over its view, as the element is dropped
+                            calcsValidator.streamFacts((factView,) if factTable is not None else factsToCheck)
                     if _streamingFactsPlugin or _streamingValidateFactsPlugin:
                         # plugin attempts to process batch of all root facts not yet processed (not just current one)
                         # use batches of 1000 facts
@@ -778,10 +795,12 @@ def checkFootnoteHrefs(modelXbrl, footnoteLink):
 
 def dropContext(modelXbrl, cntx):
     del modelXbrl.contexts[cntx.id]
+    modelXbrl.unindexContext(cntx)
     dropObject(modelXbrl, cntx)
     
 def dropUnit(modelXbrl, unit):
     del modelXbrl.units[unit.id]
+    modelXbrl.unindexUnit(unit)
     dropObject(modelXbrl, unit)
     
 def dropFootnoteLink(modelXbrl, footnoteLink):
@@ -529,6 +529,10 @@ def checkCalc2(val, *args, **kwargs):
 
 
    
+def blockStreaming(modelXbrl):
+    # calculation 2.0 needs all facts of the instance (such as for section fact relationships), not streamed facts
+    return "Calc2"
+
 __pluginInfo__ = {
     # Do not use _( ) in pluginInfo itself (it is applied later, after loading
     'name': 'Calc2',
@@ -538,5 +542,6 @@ __pluginInfo__ = {
     'author': 'Mark V Systems Limited',
     'copyright': '(c) Copyright 2019 Mark V Systems Limited, All rights reserved.',
     # classes of mount points (required)
+    'Streaming.BlockStreaming': blockStreaming,
     'Validate.XBRL.Finally': checkCalc2
 }
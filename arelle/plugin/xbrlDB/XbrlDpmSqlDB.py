@@ -424,6 +424,8 @@ class XbrlSqlDatabaseConnection(SqlDbConnection):
     
     def correctQnamePrefix(self, qn):
         if qn.prefix != self.dpmNsPrefix[qn.namespaceURI]:
+            if self.modelXbrl.valueInterner is not None: # qn may be interned by its prior prefix
+                self.modelXbrl.valueInterner.discard(qn)
             qn.prefix = self.dpmNsPrefix[qn.namespaceURI]
             
     def correctFactQnamePrefixes(self, f, xValue):
@@ -0,0 +1,129 @@
+'''
+Created on Oct 18, 2026
+
+Tests of the contexts and units index of a modelXbrl (used by matchContext, matchUnit and the canonical context
+and unit ids), for contexts and units which are added to modelXbrl.contexts and modelXbrl.units outside of
+discovery, as by plugins (e.g., bigInstance and streamingExtensions), and for those which are dropped.
+
+$ py.test arelle_contextsIndex_test.py
+  -or-
+$ python arelle_contextsIndex_test.py
+
+@author: Mark V Systems Limited
+(c) Copyright 2026 Mark V Systems Limited, All rights reserved.
+'''
+import os, tempfile, shutil
+from arelle import Cntlr, XbrlConst, XmlUtil, XmlValidate
+from arelle.ModelValue import qname, dateTime, DATE
+
+SCHEMA = '''<?xml version="1.0" encoding="utf-8"?>
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema" xmlns:xbrli="http://www.xbrl.org/2003/instance"
+  targetNamespace="http://example.com/test" elementFormDefault="qualified">
+  <xs:import namespace="http://www.xbrl.org/2003/instance" schemaLocation="http://www.xbrl.org/2003/xbrl-instance-2003-12-31.xsd"/>
+  <xs:element name="A" id="A" type="xbrli:monetaryItemType" substitutionGroup="xbrli:item" nillable="true" xbrli:periodType="instant"/>
+</xs:schema>
+'''
+
+INSTANCE = '''<?xml version="1.0" encoding="utf-8"?>
+<xbrli:xbrl xmlns:xbrli="http://www.xbrl.org/2003/instance" xmlns:link="http://www.xbrl.org/2003/linkbase"
+  xmlns:xlink="http://www.w3.org/1999/xlink" xmlns:iso4217="http://www.xbrl.org/2003/iso4217" xmlns:t="http://example.com/test">
+  <link:schemaRef xlink:type="simple" xlink:href="test.xsd"/>
+  <xbrli:context id="c1"><xbrli:entity><xbrli:identifier scheme="http://example.com">E1</xbrli:identifier></xbrli:entity>
+    <xbrli:period><xbrli:instant>2020-12-31</xbrli:instant></xbrli:period></xbrli:context>
+  <xbrli:unit id="u1"><xbrli:measure>iso4217:USD</xbrli:measure></xbrli:unit>
+  <t:A contextRef="c1" unitRef="u1" decimals="0">1</t:A>
+</xbrli:xbrl>
+'''
+
+SCHEME = "http://example.com"
+USD = qname(XbrlConst.iso4217, "iso4217:USD")
+EUR = qname(XbrlConst.iso4217, "iso4217:EUR")
+
+def loadInstance():
+    dir = tempfile.mkdtemp()
+    for fileName, content in (("test.xsd", SCHEMA), ("test.xbrl", INSTANCE)):
+        with open(os.path.join(dir, fileName), "w") as f:
+            f.write(content)
+    cntlr = Cntlr.Cntlr(logFileName="logToBuffer")
+    cntlr.webCache.workOffline = True # uses the cached xbrl.org schemas
+    modelXbrl = cntlr.modelManager.load(os.path.join(dir, "test.xbrl"))
+    return dir, modelXbrl
+
+def addContextElement(modelXbrl, id, entity, instant):
+    # adds a context element, validated but not discovered, as a plugin may
+    xbrlElt = modelXbrl.modelDocument.xmlRootElement
+    cntxElt = XmlUtil.addChild(xbrlElt, XbrlConst.xbrli, "context", attributes=("id", id))
+    entityElt = XmlUtil.addChild(cntxElt, XbrlConst.xbrli, "entity")
+    XmlUtil.addChild(entityElt, XbrlConst.xbrli, "identifier", attributes=("scheme", SCHEME), text=entity)
+    periodElt = XmlUtil.addChild(cntxElt, XbrlConst.xbrli, "period")
+    XmlUtil.addChild(periodElt, XbrlConst.xbrli, "instant", text=instant)
+    XmlValidate.validate(modelXbrl, cntxElt)
+    return cntxElt
+
+def addUnitElement(modelXbrl, id, measure):
+    # adds a unit element, validated but not discovered, as a plugin may
+    xbrlElt = modelXbrl.modelDocument.xmlRootElement
+    unitElt = XmlUtil.addChild(xbrlElt, XbrlConst.xbrli, "unit", attributes=("id", id))
+    XmlUtil.addChild(unitElt, XbrlConst.xbrli, "measure", text=XmlUtil.addQnameValue(xbrlElt, measure))
+    XmlValidate.validate(modelXbrl, unitElt)
+    return unitElt
+
+def matchInstantContext(modelXbrl, entity, instant):
+    return modelXbrl.matchContext(SCHEME, entity, "instant", None, dateTime(instant, type=DATE), {}, [], [])
+
+def test_contextAddedOutsideDiscovery():
+    dir, modelXbrl = loadInstance()
+    try:
+        c1 = modelXbrl.contexts["c1"]
+        assert matchInstantContext(modelXbrl, "E1", "2020-12-31") is c1 # indexes c1
+        c2 = addContextElement(modelXbrl, "c2", "E2", "2020-12-31")
+        c3 = addContextElement(modelXbrl, "c3", "E1", "2020-12-31") # equal to c1
+        modelXbrl.contexts[c2.id] = c2
+        modelXbrl.contexts[c3.id] = c3
+        assert matchInstantContext(modelXbrl, "E2", "2020-12-31") is c2
+        assert modelXbrl.contextCanonicalIds["c2"] == "c2"
+        assert modelXbrl.contextCanonicalIds["c3"] == "c1"
+        # dropped as by a plugin, with or without unindexing it
+        del modelXbrl.contexts[c2.id]
+        modelXbrl.unindexContext(c2)
+        modelXbrl.unindexContext(c2) # no longer indexed
+        assert matchInstantContext(modelXbrl, "E2", "2020-12-31") is None
+        assert "c2" not in modelXbrl.contextCanonicalIds
+        c4 = addContextElement(modelXbrl, "c4", "E1", "2020-12-31") # equal to c1 and c3
+        modelXbrl.contexts[c4.id] = c4
+        assert modelXbrl.contextCanonicalIds["c4"] == "c1"
+        del modelXbrl.contexts[c1.id]
+        assert matchInstantContext(modelXbrl, "E1", "2020-12-31") is c3
+        assert "c1" not in modelXbrl.contextCanonicalIds
+        assert modelXbrl.contextCanonicalIds["c3"] == "c3"
+        assert modelXbrl.contextCanonicalIds["c4"] == "c3"
+        c5 = addContextElement(modelXbrl, "c5", "E1", "2020-12-31") # equal context indexed after the drop
+        modelXbrl.contexts[c5.id] = c5
+        assert modelXbrl.contextCanonicalIds["c5"] == "c3"
+    finally:
+        modelXbrl.close()
+        shutil.rmtree(dir)
+
+def test_unitAddedOutsideDiscovery():
+    dir, modelXbrl = loadInstance()
+    try:
+        u1 = modelXbrl.units["u1"]
+        assert modelXbrl.matchUnit([USD], []) is u1 # indexes u1
+        u2 = addUnitElement(modelXbrl, "u2", EUR)
+        u3 = addUnitElement(modelXbrl, "u3", USD) # equal to u1
+        modelXbrl.units[u2.id] = u2
+        modelXbrl.units[u3.id] = u3
+        assert modelXbrl.matchUnit([EUR], []) is u2
+        assert modelXbrl.unitCanonicalIds["u3"] == "u1"
+        # dropped as by a plugin, without unindexing it
+        del modelXbrl.units[u1.id]
+        assert modelXbrl.matchUnit([USD], []) is u3
+        assert modelXbrl.unitCanonicalIds["u3"] == "u3"
+    finally:
+        modelXbrl.close()
+        shutil.rmtree(dir)
+
+if __name__ == "__main__":
+    test_contextAddedOutsideDiscovery()
+    test_unitAddedOutsideDiscovery()
+    print("contexts and units index tests passed")
@@ -0,0 +1,34 @@
+#!/bin/bash
+
+# Benchmark DTS discovery with and without discovery read ahead threads (--discoveryThreads),
+# loading each entry point with a cold (empty) web cache and then with a warm web cache
+
+ARELLEDIR=..
+
+LOGDIR=~/temp/discoveryBenchmark
+
+THREADS=8
+
+ENTRYPOINTS="http://xbrl.ifrs.org/taxonomy/2018-03-16/full_ifrs_entry_point_2018-03-16.xsd
+http://xbrl.fasb.org/us-gaap/2018/entire/us-gaap-entryPoint-all-2018-01-31.xsd"
+
+mkdir -p ${LOGDIR}
+
+loadTime() {
+    # $1 entry point, $2 discovery threads, $3 config home (its cache subdirectory is the web cache), $4 log file
+    XDG_CONFIG_HOME=$3 python3 ${ARELLEDIR}/arelleCmdLine.py --file "$1" --discoveryThreads $2 --internetRecheck never --logFile "$4" > /dev/null 2>&1
+    sed -n 's/.*loaded in \([0-9.]*\) secs.*/\1/p' "$4"
+}
+
+printf "%-70s %8s %10s %10s\n" "entry point" "threads" "cold secs" "warm secs"
+for ENTRYPOINT in ${ENTRYPOINTS}; do
+    NAME=$(basename ${ENTRYPOINT} .xsd)
+    for DISCOVERYTHREADS in 0 ${THREADS}; do
+        CONFIGHOME=${LOGDIR}/config-${NAME}-${DISCOVERYTHREADS}
+        rm -rf ${CONFIGHOME}
+        mkdir -p ${CONFIGHOME}
+        COLD=$(loadTime "${ENTRYPOINT}" ${DISCOVERYTHREADS} ${CONFIGHOME} ${LOGDIR}/${NAME}-${DISCOVERYTHREADS}-cold-log.txt)
+        WARM=$(loadTime "${ENTRYPOINT}" ${DISCOVERYTHREADS} ${CONFIGHOME} ${LOGDIR}/${NAME}-${DISCOVERYTHREADS}-warm-log.txt)
+        printf "%-70s %8s %10s %10s\n" ${NAME} ${DISCOVERYTHREADS} ${COLD} ${WARM}
+    done
+done
@@ -0,0 +1,247 @@
+'''
+Created on Oct 18, 2026
+
+Benchmark of FormulaEvaluator.EvaluationRegistry, which detects unnecessary (duplicate or extra fallback)
+evaluations of a variable set by hash lookups of projected evaluations, against the prior detection by
+intersecting per-variable hash indexes of the completed evaluations and scanning the matching evaluations.
+
+A taxonomy with a formula linkbase of fallback-heavy value assertions (fact variables falling back, covering
+the period aspect, and filtered by other variables) and an instance with facts missing for some concepts are
+generated, and validated (Validate, with formulas) once with each way of detection.  Both ways must evaluate
+and skip the same evaluations, with the same assertion results; the evaluations, skipped evaluations,
+assertion results, time of validation and of detection, and the projections built by the registry (at most
+MAX_EVALUATION_PROJECTIONS retained) are reported.
+
+usage: python3 runEvaluationRegistryBenchmark.py [numberOfEntities] [numberOfPeriods]
+
+@author: Mark V Systems Limited
+(c) Copyright 2026 Mark V Systems Limited, All rights reserved.
+'''
+import os, sys, tempfile, shutil, time
+from collections import defaultdict
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from arelle import Cntlr, Validate, FormulaEvaluator # Cntlr imports model modules in dependency order
+from arelle.ModelFormulaObject import FormulaOptions
+
+SCHEMA = '''<?xml version="1.0" encoding="utf-8"?>
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema" xmlns:xbrli="http://www.xbrl.org/2003/instance"
+  xmlns:link="http://www.xbrl.org/2003/linkbase" xmlns:xlink="http://www.w3.org/1999/xlink"
+  xmlns:b="http://example.com/bench" targetNamespace="http://example.com/bench" elementFormDefault="qualified">
+  <xs:import namespace="http://www.xbrl.org/2003/instance" schemaLocation="http://www.xbrl.org/2003/xbrl-instance-2003-12-31.xsd"/>
+  <xs:annotation><xs:appinfo>
+    <link:linkbaseRef xlink:type="simple" xlink:href="bench-formula.xml" xlink:arcrole="http://www.w3.org/1999/xlink/properties/linkbase"/>
+  </xs:appinfo></xs:annotation>
+  <xs:element name="A" id="b_A" type="xbrli:monetaryItemType" substitutionGroup="xbrli:item" xbrli:periodType="instant"/>
+  <xs:element name="B" id="b_B" type="xbrli:monetaryItemType" substitutionGroup="xbrli:item" xbrli:periodType="instant"/>
+  <xs:element name="C" id="b_C" type="xbrli:monetaryItemType" substitutionGroup="xbrli:item" xbrli:periodType="instant"/>
+  <xs:element name="D" id="b_D" type="xbrli:monetaryItemType" substitutionGroup="xbrli:item" xbrli:periodType="instant"/>
+</xs:schema>
+'''
+
+FORMULA_LINKBASE = '''<?xml version="1.0" encoding="utf-8"?>
+<link:linkbase xmlns:link="http://www.xbrl.org/2003/linkbase" xmlns:xlink="http://www.w3.org/1999/xlink"
+  xmlns:generic="http://xbrl.org/2008/generic" xmlns:va="http://xbrl.org/2008/assertion/value"
+  xmlns:variable="http://xbrl.org/2008/variable" xmlns:cf="http://xbrl.org/2008/filter/concept"
+  xmlns:gf="http://xbrl.org/2008/filter/general" xmlns:acf="http://xbrl.org/2010/filter/aspect-cover"
+  xmlns:b="http://example.com/bench" xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"
+  xsi:schemaLocation="http://xbrl.org/2008/generic http://www.xbrl.org/2008/generic-link.xsd
+    http://xbrl.org/2008/assertion/value http://www.xbrl.org/2008/value-assertion.xsd
+    http://xbrl.org/2008/variable http://www.xbrl.org/2008/variable.xsd
+    http://xbrl.org/2008/filter/concept http://www.xbrl.org/2008/concept-filter.xsd
+    http://xbrl.org/2008/filter/general http://www.xbrl.org/2008/general-filter.xsd
+    http://xbrl.org/2010/filter/aspect-cover http://www.xbrl.org/2010/aspect-cover-filter.xsd">
+ <link:arcroleRef arcroleURI="http://xbrl.org/arcrole/2008/variable-set" xlink:type="simple" xlink:href="http://www.xbrl.org/2008/variable.xsd#variable-set"/>
+ <link:arcroleRef arcroleURI="http://xbrl.org/arcrole/2008/variable-filter" xlink:type="simple" xlink:href="http://www.xbrl.org/2008/variable.xsd#variable-filter"/>
+ <generic:link xlink:type="extended" xlink:role="http://www.xbrl.org/2003/role/link">
+  <cf:conceptName xlink:type="resource" xlink:label="fA"><cf:concept><cf:qname>b:A</cf:qname></cf:concept></cf:conceptName>
+  <cf:conceptName xlink:type="resource" xlink:label="fB"><cf:concept><cf:qname>b:B</cf:qname></cf:concept></cf:conceptName>
+  <cf:conceptName xlink:type="resource" xlink:label="fC"><cf:concept><cf:qname>b:C</cf:qname></cf:concept></cf:conceptName>
+  <cf:conceptName xlink:type="resource" xlink:label="fD"><cf:concept><cf:qname>b:D</cf:qname></cf:concept></cf:conceptName>
+  <acf:aspectCover xlink:type="resource" xlink:label="fPeriod"><acf:aspect>period</acf:aspect></acf:aspectCover>
+  <gf:general xlink:type="resource" xlink:label="fRefB" test=". ge 0 or $b ge 0"/>
+  <gf:general xlink:type="resource" xlink:label="fRefC" test=". ge 0 or $c ge 0"/>
+
+  <!-- variables falling back, $c filtered by $b -->
+  <va:valueAssertion xlink:type="resource" xlink:label="va1" id="va1" aspectModel="dimensional" implicitFiltering="true"
+      test="$a + $b + $c + $d ge 0"/>
+  <variable:factVariable xlink:type="resource" xlink:label="va1a" bindAsSequence="false"/>
+  <variable:factVariable xlink:type="resource" xlink:label="va1b" bindAsSequence="false" fallbackValue="0"/>
+  <variable:factVariable xlink:type="resource" xlink:label="va1c" bindAsSequence="false" fallbackValue="0"/>
+  <variable:factVariable xlink:type="resource" xlink:label="va1d" bindAsSequence="false" fallbackValue="0"/>
+  <variable:variableArc xlink:type="arc" xlink:arcrole="http://xbrl.org/arcrole/2008/variable-set" xlink:from="va1" xlink:to="va1a" name="a"/>
+  <variable:variableArc xlink:type="arc" xlink:arcrole="http://xbrl.org/arcrole/2008/variable-set" xlink:from="va1" xlink:to="va1b" name="b"/>
+  <variable:variableArc xlink:type="arc" xlink:arcrole="http://xbrl.org/arcrole/2008/variable-set" xlink:from="va1" xlink:to="va1c" name="c"/>
+  <variable:variableArc xlink:type="arc" xlink:arcrole="http://xbrl.org/arcrole/2008/variable-set" xlink:from="va1" xlink:to="va1d" name="d"/>
+  <variable:variableFilterArc xlink:type="arc" xlink:arcrole="http://xbrl.org/arcrole/2008/variable-filter" xlink:from="va1a" xlink:to="fA" complement="false" cover="true"/>
+  <variable:variableFilterArc xlink:type="arc" xlink:arcrole="http://xbrl.org/arcrole/2008/variable-filter" xlink:from="va1b" xlink:to="fB" complement="false" cover="true"/>
+  <variable:variableFilterArc xlink:type="arc" xlink:arcrole="http://xbrl.org/arcrole/2008/variable-filter" xlink:from="va1c" xlink:to="fC" complement="false" cover="true"/>
+  <variable:variableFilterArc xlink:type="arc" xlink:arcrole="http://xbrl.org/arcrole/2008/variable-filter" xlink:from="va1c" xlink:to="fRefB" complement="false" cover="false"/>
+  <variable:variableFilterArc xlink:type="arc" xlink:arcrole="http://xbrl.org/arcrole/2008/variable-filter" xlink:from="va1d" xlink:to="fD" complement="false" cover="true"/>
+
+  <!-- variables falling back and covering the period (binding the facts of all periods of the entity), $d filtered by $c -->
+  <va:valueAssertion xlink:type="resource" xlink:label="va2" id="va2" aspectModel="dimensional" implicitFiltering="true"
+      test="$a ge $b - $c - $d"/>
+  <variable:factVariable xlink:type="resource" xlink:label="va2a" bindAsSequence="false"/>
+  <variable:factVariable xlink:type="resource" xlink:label="va2b" bindAsSequence="false" fallbackValue="0"/>
+  <variable:factVariable xlink:type="resource" xlink:label="va2c" bindAsSequence="false" fallbackValue="0"/>
+  <variable:factVariable xlink:type="resource" xlink:label="va2d" bindAsSequence="false" fallbackValue="0"/>
+  <variable:variableArc xlink:type="arc" xlink:arcrole="http://xbrl.org/arcrole/2008/variable-set" xlink:from="va2" xlink:to="va2a" name="a"/>
+  <variable:variableArc xlink:type="arc" xlink:arcrole="http://xbrl.org/arcrole/2008/variable-set" xlink:from="va2" xlink:to="va2b" name="b"/>
+  <variable:variableArc xlink:type="arc" xlink:arcrole="http://xbrl.org/arcrole/2008/variable-set" xlink:from="va2" xlink:to="va2c" name="c"/>
+  <variable:variableArc xlink:type="arc" xlink:arcrole="http://xbrl.org/arcrole/2008/variable-set" xlink:from="va2" xlink:to="va2d" name="d"/>
+  <variable:variableFilterArc xlink:type="arc" xlink:arcrole="http://xbrl.org/arcrole/2008/variable-filter" xlink:from="va2a" xlink:to="fA" complement="false" cover="true"/>
+  <variable:variableFilterArc xlink:type="arc" xlink:arcrole="http://xbrl.org/arcrole/2008/variable-filter" xlink:from="va2b" xlink:to="fB" complement="false" cover="true"/>
+  <variable:variableFilterArc xlink:type="arc" xlink:arcrole="http://xbrl.org/arcrole/2008/variable-filter" xlink:from="va2b" xlink:to="fPeriod" complement="false" cover="true"/>
+  <variable:variableFilterArc xlink:type="arc" xlink:arcrole="http://xbrl.org/arcrole/2008/variable-filter" xlink:from="va2c" xlink:to="fC" complement="false" cover="true"/>
+  <variable:variableFilterArc xlink:type="arc" xlink:arcrole="http://xbrl.org/arcrole/2008/variable-filter" xlink:from="va2c" xlink:to="fPeriod" complement="false" cover="true"/>
+  <variable:variableFilterArc xlink:type="arc" xlink:arcrole="http://xbrl.org/arcrole/2008/variable-filter" xlink:from="va2d" xlink:to="fD" complement="false" cover="true"/>
+  <variable:variableFilterArc xlink:type="arc" xlink:arcrole="http://xbrl.org/arcrole/2008/variable-filter" xlink:from="va2d" xlink:to="fRefC" complement="false" cover="false"/>
+ </generic:link>
+</link:linkbase>
+'''
+
+CONTEXT = '''<xbrli:context id="c{e}_{p}"><xbrli:entity><xbrli:identifier scheme="http://example.com">E{e}</xbrli:identifier></xbrli:entity>
+ <xbrli:period><xbrli:instant>{year}-12-31</xbrli:instant></xbrli:period></xbrli:context>
+'''
+
+def generate(dir, numEntities, numPeriods):
+    with open(os.path.join(dir, "bench.xsd"), "w") as f:
+        f.write(SCHEMA)
+    with open(os.path.join(dir, "bench-formula.xml"), "w") as f:
+        f.write(FORMULA_LINKBASE)
+    with open(os.path.join(dir, "bench.xbrl"), "w") as f:
+        f.write('<?xml version="1.0" encoding="utf-8"?>\n'
+                '<xbrli:xbrl xmlns:xbrli="http://www.xbrl.org/2003/instance" xmlns:link="http://www.xbrl.org/2003/linkbase" '
+                'xmlns:xlink="http://www.w3.org/1999/xlink" xmlns:iso4217="http://www.xbrl.org/2003/iso4217" '
+                'xmlns:b="http://example.com/bench">\n'
+                '<link:schemaRef xlink:type="simple" xlink:href="bench.xsd"/>\n'
+                '<xbrli:unit id="usd"><xbrli:measure>iso4217:USD</xbrli:measure></xbrli:unit>\n')
+        for e in range(numEntities):
+            for p in range(numPeriods):
+                f.write(CONTEXT.format(e=e, p=p, year=2000 + p))
+                i = e * numPeriods + p
+                # A in every context, B in half, C in two thirds, D in a quarter, so that B, C and D fall back
+                for concept, isPresent in (("A", True), ("B", i % 2 == 0), ("C", i % 3 != 0), ("D", i % 4 == 1)):
+                    if isPresent:
+                        f.write('<b:{0} contextRef="c{1}_{2}" unitRef="usd" decimals="0">{3}</b:{0}>\n'.format(
+                                concept, e, p, (i * 7 + ord(concept)) % 100))
+        f.write('</xbrli:xbrl>\n')
+
+class ScanningRegistry:
+    # prior detection of unnecessary evaluations: completed evaluations, with hash indexes by variable, the
+    # evaluations matching by all indexes being scanned
+    def __init__(self):
+        self.evaluations = []
+        self.hashDicts = {}
+        self.varQnames = ()
+
+    def __len__(self):
+        return len(self.evaluations)
+
+    def add(self, thisEval):
+        if not self.evaluations:
+            self.varQnames = tuple(thisEval.keys())
+        for vQn, vBoundFact in thisEval.items():
+            if vQn not in self.hashDicts: self.hashDicts[vQn] = defaultdict(set)
+            self.hashDicts[vQn][hash(vBoundFact)].add(len(self.evaluations))
+        self.evaluations.append(thisEval)
+
+    def isUnnecessary(self, thisEval, varBindings):
+        otherEvals = self.evaluations
+        if otherEvals:
+            otherEvalHashDicts = self.hashDicts
+            if all(e is None for e in thisEval.values()):
+                return True
+            otherEvalSets = [otherEvalHashDicts[vQn][hash(vBoundFact)]
+                             for vQn, vBoundFact in thisEval.items()
+                             if vBoundFact is not None
+                             if vQn in otherEvalHashDicts
+                             if hash(vBoundFact) in otherEvalHashDicts[vQn]]
+            if otherEvalSets:
+                matchingEvals = [otherEvals[i] for i in set.intersection(*otherEvalSets)]
+            else:
+                matchingEvals = otherEvals
+            dependentQnames = set(
+                vQn
+                for vQn, vBoundFact in thisEval.items()
+                if vBoundFact is not None and
+                   any(varBindings[varRefQn].isFallback and
+                       any(m[varRefQn] is not None for m in matchingEvals)
+                       for varRefQn in varBindings[vQn].var.variableRefs()))
+            return any(all([vBoundFact == matchingEval[vQn]
+                            for vQn, vBoundFact in thisEval.items()
+                            if vBoundFact is not None
+                            and vQn not in dependentQnames])
+                       for matchingEval in matchingEvals)
+        return False
+
+    def clear(self):
+        del self.evaluations[:]
+        self.hashDicts.clear()
+
+def measuringRegistry(registryClass, stats):
+    # registryClass, counting evaluations, skipped evaluations and projections, and timing detection, into stats
+    class MeasuringRegistry(registryClass):
+        def add(self, thisEval):
+            startedAt = time.time()
+            super(MeasuringRegistry, self).add(thisEval)
+            stats["detection time"] += time.time() - startedAt
+
+        def isUnnecessary(self, thisEval, varBindings):
+            startedAt = time.time()
+            isUnnecessary = super(MeasuringRegistry, self).isUnnecessary(thisEval, varBindings)
+            stats["detection time"] += time.time() - startedAt
+            stats["evaluations"] += 1
+            if isUnnecessary:
+                stats["skipped"] += 1
+            return isUnnecessary
+
+        def clear(self):
+            stats["projections built"] += getattr(self, "projectionsBuilt", 0)
+            super(MeasuringRegistry, self).clear()
+    return MeasuringRegistry
+
+def run(cntlr, instanceFile, registryClass):
+    stats = defaultdict(float)
+    FormulaEvaluator.EvaluationRegistry = measuringRegistry(registryClass, stats)
+    modelXbrl = cntlr.modelManager.load(instanceFile)
+    startedAt = time.time()
+    Validate.validate(modelXbrl)
+    stats["validation time"] = time.time() - startedAt
+    results = dict((varSet.id, (varSet.countSatisfied, varSet.countNotSatisfied))
+                   for varSet in modelXbrl.modelVariableSets)
+    errors = [e for e in modelXbrl.errors if isinstance(e, str)] # not assertion result counts
+    modelXbrl.close()
+    return stats, results, errors
+
+def main():
+    numEntities = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    numPeriods = int(sys.argv[2]) if len(sys.argv) > 2 else 12
+    dir = tempfile.mkdtemp()
+    generate(dir, numEntities, numPeriods)
+    cntlr = Cntlr.Cntlr(logFileName="logToBuffer")
+    cntlr.webCache.workOffline = True # uses the cached xbrl.org schemas
+    cntlr.modelManager.formulaOptions = FormulaOptions()
+    instanceFile = os.path.join(dir, "bench.xbrl")
+    evaluationRegistry = FormulaEvaluator.EvaluationRegistry
+    print("{} entities, {} periods".format(numEntities, numPeriods))
+    print("{:20} {:>12} {:>10} {:>20} {:>10} {:>10} {:>12}".format(
+          "detection", "evaluations", "skipped", "satisfied/unsatisfied", "validation", "detection", "projections"))
+    runs = []
+    try:
+        for name, registryClass in (("scanning", ScanningRegistry), ("hashed projections", evaluationRegistry)):
+            stats, results, errors = run(cntlr, instanceFile, registryClass)
+            runs.append((stats["evaluations"], stats["skipped"], results))
+            print("{:20} {:>12.0f} {:>10.0f} {:>20} {:>10.3f} {:>10.3f} {:>12.0f}".format(
+                  name, stats["evaluations"], stats["skipped"],
+                  " ".join("{}:{}/{}".format(id, *results[id]) for id in sorted(results)),
+                  stats["validation time"], stats["detection time"], stats["projections built"]))
+            if errors:
+                print("errors: {}".format(", ".join(str(e) for e in errors)))
+    finally:
+        FormulaEvaluator.EvaluationRegistry = evaluationRegistry
+        shutil.rmtree(dir)
+    print("identical evaluations and results" if runs[0] == runs[1] else "evaluations or results differ")
+
+if __name__ == "__main__":
+    main()
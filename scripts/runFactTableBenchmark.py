@@ -0,0 +1,115 @@
+'''
+Created on Oct 18, 2026
+
+Benchmark of loading a large instance as a columnar fact table (ModelFactTable, by the streamingExtensions
+plug-in with the modelManager's loadFactTable), against loading its DOM (fact elements), by peak memory (resident
+set size) and load time.
+
+A streamable instance of numeric and string facts (some in tuples) is generated.  Each way of loading runs in its
+own process, so that its peak memory is its own; the fact values of both must be the same.
+
+usage: python3 runFactTableBenchmark.py [numberOfFacts]
+
+@author: Mark V Systems Limited
+(c) Copyright 2026 Mark V Systems Limited, All rights reserved.
+'''
+import os, sys, tempfile, time, subprocess, resource, hashlib
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+NS = "http://example.com/bench"
+
+SCHEMA = '''<?xml version="1.0" encoding="utf-8"?>
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema" xmlns:xbrli="http://www.xbrl.org/2003/instance"
+  xmlns:b="{ns}" targetNamespace="{ns}" elementFormDefault="qualified">
+  <xs:import namespace="http://www.xbrl.org/2003/instance" schemaLocation="http://www.xbrl.org/2003/xbrl-instance-2003-12-31.xsd"/>
+  {concepts}
+  <xs:element name="T" id="b_T" substitutionGroup="xbrli:tuple" nillable="true">
+    <xs:complexType><xs:complexContent><xs:restriction base="xs:anyType"><xs:sequence>
+      <xs:element ref="b:N0" minOccurs="0"/><xs:element ref="b:S0" minOccurs="0"/>
+    </xs:sequence></xs:restriction></xs:complexContent></xs:complexType>
+  </xs:element>
+</xs:schema>
+'''
+
+CONCEPTS = ('<xs:element name="N{0}" id="b_N{0}" type="xbrli:monetaryItemType" substitutionGroup="xbrli:item" nillable="true" xbrli:periodType="instant"/>'
+            '<xs:element name="S{0}" id="b_S{0}" type="xbrli:stringItemType" substitutionGroup="xbrli:item" nillable="true" xbrli:periodType="instant"/>')
+
+def generate(dir, numFacts):
+    numConcepts = 50
+    numContexts = max(numFacts // 100, 1)
+    with open(os.path.join(dir, "bench.xsd"), "w") as f:
+        f.write(SCHEMA.format(ns=NS, concepts="\n  ".join(CONCEPTS.format(i) for i in range(numConcepts))))
+    with open(os.path.join(dir, "bench.xbrl"), "w") as f:
+        f.write('<?xml version="1.0" encoding="utf-8"?>\n'
+                '<xbrli:xbrl xmlns:xbrli="http://www.xbrl.org/2003/instance" xmlns:link="http://www.xbrl.org/2003/linkbase" '
+                'xmlns:xlink="http://www.w3.org/1999/xlink" xmlns:iso4217="http://www.xbrl.org/2003/iso4217" '
+                'xmlns:b="{}">\n'
+                '<?xbrl-streamable-instance version="1.0"?>\n'
+                '<link:schemaRef xlink:type="simple" xlink:href="bench.xsd"/>\n'.format(NS))
+        for i in range(numContexts):
+            f.write('<xbrli:context id="c{0}"><xbrli:entity><xbrli:identifier scheme="http://example.com">E{1}</xbrli:identifier></xbrli:entity>'
+                    '<xbrli:period><xbrli:instant>2020-{2:02}-28</xbrli:instant></xbrli:period></xbrli:context>\n'.format(i, i % 97, i % 12 + 1))
+        f.write('<xbrli:unit id="usd"><xbrli:measure>iso4217:USD</xbrli:measure></xbrli:unit>\n')
+        i = 0
+        while i < numFacts:
+            c = i % numContexts
+            n = (i // numContexts) % numConcepts
+            if i % 50 == 49: # tuple of a numeric and a string fact
+                f.write('<b:T><b:N0 contextRef="c{0}" unitRef="usd" decimals="-3">{1}000</b:N0><b:S0 contextRef="c{0}">tuple {1}</b:S0></b:T>\n'.format(c, i))
+                i += 3
+            elif i % 2:
+                f.write('<b:S{0} contextRef="c{1}">text of fact {2}</b:S{0}>\n'.format(n, c, i))
+                i += 1
+            else:
+                f.write('<b:N{0} contextRef="c{1}" unitRef="usd" decimals="2">{2}.{3:02}</b:N{0}>\n'.format(n, c, i * 37, i % 100))
+                i += 1
+        f.write('</xbrli:xbrl>\n')
+
+def load(mode, instFile):
+    # loads instFile by DOM or fact table in this process, printing facts, load secs, peak KB and values digest
+    from arelle import Cntlr, PluginManager
+    cntlr = Cntlr.Cntlr(logFileName="logToBuffer")
+    cntlr.webCache.workOffline = True # uses the cached xbrl.org schemas
+    if mode == "table":
+        PluginManager.addPluginModule("streamingExtensions")
+        PluginManager.reset()
+        cntlr.modelManager.loadFactTable = True
+    startedAt = time.time()
+    modelXbrl = cntlr.modelManager.load(instFile)
+    loadTime = time.time() - startedAt
+    peakKB = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss # KB on linux, bytes on macOS
+    if sys.platform == "darwin":
+        peakKB //= 1024
+    digest = hashlib.md5()
+    if mode == "table":
+        facts = list(modelXbrl.factTable)
+    else:
+        facts = list(modelXbrl.factsInInstance)
+    facts.sort(key=lambda f: (f.sourceline, str(f.qname))) # tuple facts are on the lines of their tuples
+    for f in facts:
+        digest.update("{} {} {} {}\n".format(f.qname, f.contextID, f.decimals,
+                                             "" if f.isTuple else f.xValue).encode("utf-8"))
+    print(len(facts), loadTime, peakKB, digest.hexdigest())
+    modelXbrl.close()
+
+def main():
+    if len(sys.argv) > 2 and sys.argv[1] in ("dom", "table"):
+        load(sys.argv[1], sys.argv[2])
+        return
+    numFacts = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    dir = tempfile.mkdtemp()
+    generate(dir, numFacts)
+    instFile = os.path.join(dir, "bench.xbrl")
+    print("{} facts, instance {:.1f} MB".format(numFacts, os.path.getsize(instFile) / 1048576))
+    print("{:12} {:>10} {:>10} {:>12}".format("load", "facts", "secs", "peak MB"))
+    digests = []
+    for mode in ("dom", "table"):
+        output = subprocess.check_output([sys.executable, os.path.abspath(__file__), mode, instFile])
+        count, loadTime, peakKB, digest = output.decode("utf-8").split()[-4:]
+        digests.append(digest)
+        print("{:12} {:>10} {:>10.3f} {:>12.1f}".format(mode, count, float(loadTime), int(peakKB) / 1024))
+    if digests[0] != digests[1]:
+        print("fact values differ")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+'''
+Created on Oct 18, 2026
+
+Micro-benchmark of FormulaEvaluator.factsPartitions, which buckets facts by the signature of their aspect
+value keys, against partitioning by comparing each fact with the first fact of every partition (aspectsMatch).
+
+A synthetic instance is generated, with explicit dimensions (in scenario), typed dimensions (in segment) and
+non-XDT segment and scenario content, and facts are partitioned on several sets of aspects, checking that
+both ways of partitioning produce the same partitions.
+
+usage: python3 runFactsPartitionsBenchmark.py [numberOfContexts]
+
+@author: Mark V Systems Limited
+(c) Copyright 2026 Mark V Systems Limited, All rights reserved.
+'''
+import os, sys, tempfile, time
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from arelle import Cntlr, XPathContext, FormulaEvaluator
+from arelle.ModelValue import qname
+from arelle.ModelFormulaObject import Aspect
+from arelle.FormulaEvaluator import factsPartitions, aspectsMatch
+
+NS = "http://example.com/bench"
+
+SCHEMA = '''<?xml version="1.0" encoding="utf-8"?>
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema" xmlns:xbrli="http://www.xbrl.org/2003/instance"
+  xmlns:xbrldt="http://xbrl.org/2005/xbrldt" xmlns:b="{ns}" targetNamespace="{ns}" elementFormDefault="qualified">
+  <xs:import namespace="http://www.xbrl.org/2003/instance" schemaLocation="http://www.xbrl.org/2003/xbrl-instance-2003-12-31.xsd"/>
+  <xs:import namespace="http://xbrl.org/2005/xbrldt" schemaLocation="http://www.xbrl.org/2005/xbrldt-2005.xsd"/>
+  <xs:element name="A" id="b_A" type="xbrli:monetaryItemType" substitutionGroup="xbrli:item" xbrli:periodType="instant"/>
+  <xs:element name="B" id="b_B" type="xbrli:monetaryItemType" substitutionGroup="xbrli:item" xbrli:periodType="instant"/>
+  <xs:element name="ExplicitDim" id="b_ExplicitDim" type="xbrli:stringItemType" substitutionGroup="xbrldt:dimensionItem" abstract="true" xbrli:periodType="duration"/>
+  <xs:element name="TypedDim" id="b_TypedDim" type="xbrli:stringItemType" substitutionGroup="xbrldt:dimensionItem" abstract="true" xbrli:periodType="duration" xbrldt:typedDomainRef="#b_Key"/>
+  <xs:element name="Key" id="b_Key" type="xs:string"/>
+  <xs:element name="Note" type="xs:string"/>
+  {members}
+</xs:schema>
+'''
+
+MEMBER = '<xs:element name="M{0}" id="b_M{0}" type="xbrli:stringItemType" substitutionGroup="xbrli:item" abstract="true" xbrli:periodType="duration"/>'
+
+CONTEXT = '''<xbrli:context id="c{i}"><xbrli:entity><xbrli:identifier scheme="http://example.com">E{entity}</xbrli:identifier>
+ <xbrli:segment><xbrldi:typedMember dimension="b:TypedDim"><b:Key>K{key}</b:Key></xbrldi:typedMember>{segmentNote}</xbrli:segment></xbrli:entity>
+ <xbrli:period><xbrli:instant>2020-{month:02}-28</xbrli:instant></xbrli:period>
+ <xbrli:scenario><xbrldi:explicitMember dimension="b:ExplicitDim">b:M{member}</xbrldi:explicitMember>{scenarioNote}</xbrli:scenario></xbrli:context>
+'''
+
+def generate(dir, numContexts):
+    with open(os.path.join(dir, "bench.xsd"), "w") as f:
+        f.write(SCHEMA.format(ns=NS, members="\n  ".join(MEMBER.format(i) for i in range(10))))
+    with open(os.path.join(dir, "bench.xbrl"), "w") as f:
+        f.write('<?xml version="1.0" encoding="utf-8"?>\n'
+                '<xbrli:xbrl xmlns:xbrli="http://www.xbrl.org/2003/instance" xmlns:link="http://www.xbrl.org/2003/linkbase" '
+                'xmlns:xlink="http://www.w3.org/1999/xlink" xmlns:iso4217="http://www.xbrl.org/2003/iso4217" '
+                'xmlns:xbrldi="http://xbrl.org/2006/xbrldi" xmlns:b="{}">\n'
+                '<link:schemaRef xlink:type="simple" xlink:href="bench.xsd"/>\n'.format(NS))
+        for i in range(numContexts):
+            f.write(CONTEXT.format(i=i, entity=i % 7, key=i % 13, month=i % 12 + 1, member=i % 10,
+                                   segmentNote="<b:Note>s{}</b:Note>".format(i % 3) if i % 2 else "",
+                                   scenarioNote="<b:Note>c{}</b:Note>".format(i % 5) if i % 3 else ""))
+        f.write('<xbrli:unit id="usd"><xbrli:measure>iso4217:USD</xbrli:measure></xbrli:unit>\n'
+                '<xbrli:unit id="eur"><xbrli:measure>iso4217:EUR</xbrli:measure></xbrli:unit>\n')
+        for i in range(numContexts):
+            for concept in ("A", "B"):
+                f.write('<b:{0} contextRef="c{1}" unitRef="{2}" decimals="0">{1}</b:{0}>\n'.format(concept, i, ("usd", "eur")[i % 2]))
+        f.write('</xbrli:xbrl>\n')
+
+def linearFactsPartitions(xpCtx, facts, aspects):
+    # partitioning by comparing each fact with the first fact of each partition
+    partitions = []
+    for fact in facts:
+        for partition in partitions:
+            if aspectsMatch(xpCtx, fact, partition[0], aspects):
+                partition.append(fact)
+                break
+        else:
+            partitions.append([fact,])
+    return partitions
+
+def main():
+    numContexts = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    dir = tempfile.mkdtemp()
+    generate(dir, numContexts)
+    cntlr = Cntlr.Cntlr(logFileName="logToPrint")
+    cntlr.webCache.workOffline = True # uses the cached xbrl.org schemas
+    modelXbrl = cntlr.modelManager.load(os.path.join(dir, "bench.xbrl"))
+    modelXbrl.modelFormulaEqualityDefinitions = {}
+    FormulaEvaluator.init()
+    xpCtx = XPathContext.create(modelXbrl)
+    facts = modelXbrl.facts
+    aspectSets = (("concept, period", (Aspect.CONCEPT, Aspect.PERIOD)),
+                  ("period, entity, unit", (Aspect.PERIOD, Aspect.ENTITY_IDENTIFIER, Aspect.UNIT)),
+                  ("explicit dimension", (Aspect.PERIOD, qname(NS, "ExplicitDim"))),
+                  ("typed dimension", (Aspect.PERIOD, qname(NS, "TypedDim"))),
+                  ("non-XDT segment", (Aspect.PERIOD, Aspect.NON_XDT_SEGMENT)),
+                  ("complete scenario", (Aspect.UNIT, Aspect.COMPLETE_SCENARIO)),
+                  ("all", (Aspect.CONCEPT, Aspect.PERIOD, Aspect.ENTITY_IDENTIFIER, Aspect.UNIT, qname(NS, "ExplicitDim"),
+                           qname(NS, "TypedDim"), Aspect.NON_XDT_SEGMENT, Aspect.NON_XDT_SCENARIO)))
+    print("{} facts".format(len(facts)))
+    print("{:24} {:>10} {:>10} {:>10} {:>8}".format("aspects", "partitions", "linear", "hashed", "speedup"))
+    for name, aspects in aspectSets:
+        startedAt = time.time()
+        linearPartitions = linearFactsPartitions(xpCtx, facts, aspects)
+        linearTime = time.time() - startedAt
+        startedAt = time.time()
+        hashedPartitions = factsPartitions(xpCtx, facts, aspects)
+        hashedTime = time.time() - startedAt
+        if hashedPartitions != linearPartitions:
+            print("{}: partitions differ".format(name))
+        print("{:24} {:>10} {:>10.3f} {:>10.3f} {:>8.1f}".format(name, len(hashedPartitions), linearTime, hashedTime,
+                                                              linearTime / hashedTime if hashedTime else 0))
+    modelXbrl.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+#!/bin/bash
+
+# Run XBRL Formula Conformance Suite tests with compiled XPath evaluation (the default) and with the
+# XPath interpreter (--formulaInterpretXPath), and compare the test reports of the two runs
+
+ARELLEDIR=..
+
+LOGDIR=~/temp/formulaCompiledXPath
+
+TESTSDIR=~/Documents/mvsl/projects/XBRL.org/conformance-formula/trunk
+TESTCASESINDEXFILE=${TESTSDIR}/index.xml
+
+mkdir -p ${LOGDIR}
+rm -f ${LOGDIR}/Formula-*
+
+for MODE in compiled interpreted; do
+    if [ ${MODE} == interpreted ]; then
+        MODEOPTION=--formulaInterpretXPath
+    else
+        MODEOPTION=
+    fi
+    STARTED=$(date +%s.%N)
+    python3 ${ARELLEDIR}/arelleCmdLine.py --file "${TESTCASESINDEXFILE}" --validate ${MODEOPTION} --testReportCols "Testcase Id Name Status Expected Actual" --csvTestReport "${LOGDIR}/Formula-${MODE}-report.csv" --logFile "${LOGDIR}/Formula-${MODE}-log.txt" 2> "${LOGDIR}/Formula-${MODE}-err.txt"
+    echo "${MODE}: $(echo "$(date +%s.%N) - ${STARTED}" | bc) secs, $(grep -c ',pass,' ${LOGDIR}/Formula-${MODE}-report.csv) passed, $(grep -c ',fail,' ${LOGDIR}/Formula-${MODE}-report.csv) failed"
+done
+
+# reports are the same when compiled evaluation conforms as the interpreter does
+if diff ${LOGDIR}/Formula-interpreted-report.csv ${LOGDIR}/Formula-compiled-report.csv > ${LOGDIR}/Formula-report-diff.txt; then
+    echo "compiled and interpreted test results are the same"
+else
+    echo "compiled and interpreted test results differ, see ${LOGDIR}/Formula-report-diff.txt"
+fi
@@ -0,0 +1,34 @@
+#!/bin/bash
+
+# Run XBRL Formula Conformance Suite tests comparing the recursive descent XPath parser with the
+# pyparsing grammar on every expression of the suite (--formulaXPathParser compare), and then with
+# each parser alone, comparing the test reports of the two runs
+
+ARELLEDIR=..
+
+LOGDIR=~/temp/formulaXPathParser
+
+TESTSDIR=~/Documents/mvsl/projects/XBRL.org/conformance-formula/trunk
+TESTCASESINDEXFILE=${TESTSDIR}/index.xml
+
+mkdir -p ${LOGDIR}
+rm -f ${LOGDIR}/Formula-*
+
+for MODE in compare pyparsing descent; do
+    STARTED=$(date +%s.%N)
+    python3 ${ARELLEDIR}/arelleCmdLine.py --file "${TESTCASESINDEXFILE}" --validate --formulaXPathParser ${MODE} --testReportCols "Testcase Id Name Status Expected Actual" --csvTestReport "${LOGDIR}/Formula-${MODE}-report.csv" --logFile "${LOGDIR}/Formula-${MODE}-log.txt" 2> "${LOGDIR}/Formula-${MODE}-err.txt"
+    echo "${MODE}: $(echo "$(date +%s.%N) - ${STARTED}" | bc) secs, $(grep -c ',pass,' ${LOGDIR}/Formula-${MODE}-report.csv) passed, $(grep -c ',fail,' ${LOGDIR}/Formula-${MODE}-report.csv) failed"
+done
+
+# every expression parsed by both parsers, differences of their expression stacks are logged
+grep "formula:xpathParserDifference" ${LOGDIR}/Formula-compare-log.txt > ${LOGDIR}/Formula-parser-differences.txt
+echo "$(wc -l < ${LOGDIR}/Formula-parser-differences.txt) expression parsing differences, see ${LOGDIR}/Formula-parser-differences.txt"
+grep "formula:xpathParserComparison" ${LOGDIR}/Formula-compare-log.txt | awk -F'differences, ' '{print $2}' | \
+    awk '{p += $2; d += $5} END {printf "parse time pyparsing %.3f secs, descent %.3f secs\n", p, d}'
+
+# reports are the same when the descent parser conforms as the pyparsing grammar does
+if diff ${LOGDIR}/Formula-pyparsing-report.csv ${LOGDIR}/Formula-descent-report.csv > ${LOGDIR}/Formula-report-diff.txt; then
+    echo "pyparsing and descent parser test results are the same"
+else
+    echo "pyparsing and descent parser test results differ, see ${LOGDIR}/Formula-report-diff.txt"
+fi
@@ -0,0 +1,159 @@
+'''
+Created on Oct 18, 2026
+
+Benchmark of FormulaEvaluator.implicitFilter, which intersects the instance's fact indexes by aspect value
+(ModelXbrl.factsByAspectValue) for the indexed aspects, against scanning the candidate facts with aspectMatches
+(as implicitFilter did before the indexes, and still does when tracing variable filter winnowing).
+
+A synthetic instance is generated, with instant, duration and forever periods, several entities, single and
+divide units, explicit dimensions (in scenario), typed dimensions (in segment), non-numeric facts and tuples.
+Facts are implicitly filtered on several sets of uncovered aspects, matching each of a sample of facts as the
+uncovered aspects' fact, checking that both ways of filtering produce the same facts.  The time of the first
+index path includes building the indexes of its aspects.
+
+usage: python3 runImplicitFilterBenchmark.py [numberOfContexts] [numberOfMatchedFacts]
+
+@author: Mark V Systems Limited
+(c) Copyright 2026 Mark V Systems Limited, All rights reserved.
+'''
+import os, sys, tempfile, shutil, time
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from arelle import Cntlr, XPathContext, FormulaEvaluator
+from arelle.ModelValue import qname
+from arelle.ModelFormulaObject import Aspect, FormulaOptions
+from arelle.FormulaEvaluator import implicitFilter, aspectMatches
+
+NS = "http://example.com/bench"
+
+SCHEMA = '''<?xml version="1.0" encoding="utf-8"?>
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema" xmlns:xbrli="http://www.xbrl.org/2003/instance"
+  xmlns:xbrldt="http://xbrl.org/2005/xbrldt" xmlns:b="{ns}" targetNamespace="{ns}" elementFormDefault="qualified">
+  <xs:import namespace="http://www.xbrl.org/2003/instance" schemaLocation="http://www.xbrl.org/2003/xbrl-instance-2003-12-31.xsd"/>
+  <xs:import namespace="http://xbrl.org/2005/xbrldt" schemaLocation="http://www.xbrl.org/2005/xbrldt-2005.xsd"/>
+  <xs:element name="A" id="b_A" type="xbrli:monetaryItemType" substitutionGroup="xbrli:item" xbrli:periodType="instant"/>
+  <xs:element name="D" id="b_D" type="xbrli:monetaryItemType" substitutionGroup="xbrli:item" xbrli:periodType="duration"/>
+  <xs:element name="P" id="b_P" type="xbrli:decimalItemType" substitutionGroup="xbrli:item" xbrli:periodType="duration"/>
+  <xs:element name="S" id="b_S" type="xbrli:stringItemType" substitutionGroup="xbrli:item" xbrli:periodType="duration"/>
+  <xs:element name="F" id="b_F" type="xbrli:stringItemType" substitutionGroup="xbrli:item" xbrli:periodType="duration"/>
+  <xs:element name="T" id="b_T" substitutionGroup="xbrli:tuple">
+    <xs:complexType><xs:complexContent><xs:restriction base="xs:anyType">
+      <xs:sequence><xs:element ref="b:S" minOccurs="0"/></xs:sequence>
+    </xs:restriction></xs:complexContent></xs:complexType>
+  </xs:element>
+  <xs:element name="ExplicitDim" id="b_ExplicitDim" type="xbrli:stringItemType" substitutionGroup="xbrldt:dimensionItem" abstract="true" xbrli:periodType="duration"/>
+  <xs:element name="TypedDim" id="b_TypedDim" type="xbrli:stringItemType" substitutionGroup="xbrldt:dimensionItem" abstract="true" xbrli:periodType="duration" xbrldt:typedDomainRef="#b_Key"/>
+  <xs:element name="Key" id="b_Key" type="xs:string"/>
+  {members}
+</xs:schema>
+'''
+
+MEMBER = '<xs:element name="M{0}" id="b_M{0}" type="xbrli:stringItemType" substitutionGroup="xbrli:item" abstract="true" xbrli:periodType="duration"/>'
+
+PERIODS = ("<xbrli:instant>2020-{month:02}-28</xbrli:instant>",
+           "<xbrli:startDate>2020-01-01</xbrli:startDate><xbrli:endDate>2020-{month:02}-28</xbrli:endDate>",
+           "<xbrli:forever/>")
+
+CONTEXT = '''<xbrli:context id="c{i}"><xbrli:entity><xbrli:identifier scheme="http://example.com">E{entity}</xbrli:identifier>{segment}</xbrli:entity>
+ <xbrli:period>{period}</xbrli:period>{scenario}</xbrli:context>
+'''
+
+SEGMENT = '<xbrli:segment><xbrldi:typedMember dimension="b:TypedDim"><b:Key>K{key}</b:Key></xbrldi:typedMember></xbrli:segment>'
+
+SCENARIO = '<xbrli:scenario><xbrldi:explicitMember dimension="b:ExplicitDim">b:M{member}</xbrldi:explicitMember></xbrli:scenario>'
+
+def generate(dir, numContexts):
+    with open(os.path.join(dir, "bench.xsd"), "w") as f:
+        f.write(SCHEMA.format(ns=NS, members="\n  ".join(MEMBER.format(i) for i in range(10))))
+    with open(os.path.join(dir, "bench.xbrl"), "w") as f:
+        f.write('<?xml version="1.0" encoding="utf-8"?>\n'
+                '<xbrli:xbrl xmlns:xbrli="http://www.xbrl.org/2003/instance" xmlns:link="http://www.xbrl.org/2003/linkbase" '
+                'xmlns:xlink="http://www.w3.org/1999/xlink" xmlns:iso4217="http://www.xbrl.org/2003/iso4217" '
+                'xmlns:xbrldi="http://xbrl.org/2006/xbrldi" xmlns:b="{}">\n'
+                '<link:schemaRef xlink:type="simple" xlink:href="bench.xsd"/>\n'.format(NS))
+        for i in range(numContexts):
+            f.write(CONTEXT.format(i=i, entity=i % 7, period=PERIODS[i % 3].format(month=i % 12 + 1),
+                                   segment=SEGMENT.format(key=i % 13) if i % 4 == 0 else "",
+                                   scenario=SCENARIO.format(member=i % 10) if i % 5 else ""))
+        f.write('<xbrli:unit id="usd"><xbrli:measure>iso4217:USD</xbrli:measure></xbrli:unit>\n'
+                '<xbrli:unit id="eur"><xbrli:measure>iso4217:EUR</xbrli:measure></xbrli:unit>\n'
+                '<xbrli:unit id="usdPerShare"><xbrli:divide><xbrli:unitNumerator><xbrli:measure>iso4217:USD</xbrli:measure></xbrli:unitNumerator>'
+                '<xbrli:unitDenominator><xbrli:measure>xbrli:shares</xbrli:measure></xbrli:unitDenominator></xbrli:divide></xbrli:unit>\n')
+        for i in range(numContexts):
+            if i % 3 == 0: # instant
+                f.write('<b:A contextRef="c{0}" unitRef="{1}" decimals="0">{0}</b:A>\n'.format(i, ("usd", "eur")[i % 2]))
+            elif i % 3 == 1: # duration
+                f.write('<b:D contextRef="c{0}" unitRef="{1}" decimals="0">{0}</b:D>\n'.format(i, ("usd", "eur")[i % 2]))
+                f.write('<b:P contextRef="c{0}" unitRef="usdPerShare" decimals="2">{0}.5</b:P>\n'.format(i))
+                f.write('<b:T><b:S contextRef="c{0}">s{0}</b:S></b:T>\n'.format(i))
+            else: # forever
+                f.write('<b:F contextRef="c{0}">f{0}</b:F>\n'.format(i))
+        f.write('</xbrli:xbrl>\n')
+
+class BenchVariableBinding:
+    # fact variable binding of the implicit filter, with its uncovered aspects, as FormulaEvaluator.VariableBinding
+    def __init__(self, modelXbrl, aspects):
+        self.aspectsDefined = set(aspects)
+        self.aspectsCovered = set()
+        self.instances = [modelXbrl]
+        self.var = None
+        self.qname = None
+
+def scanFilter(xpCtx, facts, uncoveredAspectFacts):
+    # implicit filter by scanning the facts, matching each uncovered aspect by aspectMatches
+    return [fact
+            for fact in facts
+            if all(aspectMatches(xpCtx, uncoveredAspectFact, fact, aspect)
+                   for aspect, uncoveredAspectFact in uncoveredAspectFacts.items())]
+
+def main():
+    numContexts = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+    numMatchedFacts = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    dir = tempfile.mkdtemp()
+    generate(dir, numContexts)
+    cntlr = Cntlr.Cntlr(logFileName="logToPrint")
+    cntlr.webCache.workOffline = True # uses the cached xbrl.org schemas
+    cntlr.modelManager.formulaOptions = FormulaOptions()
+    modelXbrl = cntlr.modelManager.load(os.path.join(dir, "bench.xbrl"))
+    modelXbrl.modelFormulaEqualityDefinitions = {}
+    FormulaEvaluator.init()
+    xpCtx = XPathContext.create(modelXbrl)
+    xpCtx.varBindings = {}
+    facts = [f for f in modelXbrl.factsInInstance]
+    facts.sort(key=lambda f: f.objectIndex)
+    matchedFacts = facts[::max(1, len(facts) // numMatchedFacts)]
+    aspectSets = (("concept", (Aspect.CONCEPT,)),
+                  ("period", (Aspect.PERIOD,)),
+                  ("entity, unit", (Aspect.ENTITY_IDENTIFIER, Aspect.UNIT)),
+                  ("location, concept", (Aspect.LOCATION, Aspect.CONCEPT)),
+                  ("explicit dimension", (Aspect.PERIOD, qname(NS, "ExplicitDim"))),
+                  ("typed dimension", (Aspect.PERIOD, qname(NS, "TypedDim"))),
+                  ("segment, scenario", (Aspect.ENTITY_IDENTIFIER, Aspect.COMPLETE_SEGMENT, Aspect.COMPLETE_SCENARIO)),
+                  ("all indexed", (Aspect.LOCATION, Aspect.CONCEPT, Aspect.ENTITY_IDENTIFIER, Aspect.PERIOD, Aspect.UNIT,
+                                   qname(NS, "ExplicitDim"))))
+    print("{} facts, {} matched facts".format(len(facts), len(matchedFacts)))
+    print("{:20} {:>10} {:>10} {:>10} {:>8}".format("aspects", "filtered", "scan", "indexed", "speedup"))
+    differences = 0
+    for name, aspects in aspectSets:
+        vb = BenchVariableBinding(modelXbrl, aspects)
+        filteredCount = 0
+        scanTime = indexedTime = 0.0
+        for matchedFact in matchedFacts:
+            uncoveredAspectFacts = dict((aspect, matchedFact) for aspect in aspects)
+            startedAt = time.time()
+            scannedFacts = scanFilter(xpCtx, facts, uncoveredAspectFacts)
+            scanTime += time.time() - startedAt
+            startedAt = time.time()
+            indexedFacts = implicitFilter(xpCtx, vb, facts, uncoveredAspectFacts)
+            indexedTime += time.time() - startedAt
+            if set(indexedFacts) != set(scannedFacts) or len(indexedFacts) != len(scannedFacts):
+                differences += 1
+                print("{}: filtered facts differ for fact {}".format(name, matchedFact.objectIndex))
+            filteredCount += len(scannedFacts)
+        print("{:20} {:>10} {:>10.3f} {:>10.3f} {:>8.1f}".format(name, filteredCount, scanTime, indexedTime,
+                                                              scanTime / indexedTime if indexedTime else 0))
+    print("identical results" if not differences else "{} results differ".format(differences))
+    modelXbrl.close()
+    shutil.rmtree(dir)
+
+if __name__ == "__main__":
+    main()
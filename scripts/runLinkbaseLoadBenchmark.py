@@ -0,0 +1,148 @@
+'''
+Created on Oct 18, 2026
+
+Benchmark of loading a large taxonomy with lazy linkbases (modelManager's lazyLinkbases, where label and reference
+resources are left unproxied until accessed), against loading it eagerly, by peak memory (resident set size) and
+load time.
+
+A taxonomy shaped like a full IFRS DTS is generated: a schema of concepts, a presentation linkbase, label linkbases
+of several languages and label roles, and a reference linkbase with several references of several parts per concept.
+Each way of loading runs in its own process, so that its peak memory is its own.  After the load, the labels of all
+concepts, and the references of a few, are accessed; these (and the presentation relationships) must be the same
+for both ways of loading.
+
+usage: python3 runLinkbaseLoadBenchmark.py [numberOfConcepts]
+
+@author: Mark V Systems Limited
+(c) Copyright 2026 Mark V Systems Limited, All rights reserved.
+'''
+import os, sys, tempfile, time, subprocess, resource, hashlib
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+NS = "http://example.com/bench"
+LANGS = ("en", "fr", "de", "es")
+LABEL_ROLES = ("http://www.xbrl.org/2003/role/label",
+               "http://www.xbrl.org/2003/role/terseLabel",
+               "http://www.xbrl.org/2003/role/documentation")
+REFERENCE_ROLES = ("http://www.xbrl.org/2003/role/disclosureRef",
+                   "http://www.xbrl.org/2003/role/exampleRef",
+                   "http://www.xbrl.org/2003/role/measurementRef")
+
+SCHEMA = '''<?xml version="1.0" encoding="utf-8"?>
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema" xmlns:xbrli="http://www.xbrl.org/2003/instance"
+  xmlns:link="http://www.xbrl.org/2003/linkbase" xmlns:xlink="http://www.w3.org/1999/xlink"
+  xmlns:b="{ns}" targetNamespace="{ns}" elementFormDefault="qualified">
+  <xs:annotation><xs:appinfo>
+    {linkbaseRefs}
+  </xs:appinfo></xs:annotation>
+  <xs:import namespace="http://www.xbrl.org/2003/instance" schemaLocation="http://www.xbrl.org/2003/xbrl-instance-2003-12-31.xsd"/>
+  {concepts}
+</xs:schema>
+'''
+
+LINKBASE_REF = '<link:linkbaseRef xlink:type="simple" xlink:href="{}" xlink:arcrole="http://www.w3.org/1999/xlink/properties/linkbase"/>'
+
+CONCEPT = '<xs:element name="C{0}" id="b_C{0}" type="xbrli:monetaryItemType" substitutionGroup="xbrli:item" nillable="true" xbrli:periodType="duration"/>'
+
+LINKBASE = '''<?xml version="1.0" encoding="utf-8"?>
+<link:linkbase xmlns:link="http://www.xbrl.org/2003/linkbase" xmlns:xlink="http://www.w3.org/1999/xlink"
+  xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" xmlns:ref="http://www.xbrl.org/2006/ref"
+  xsi:schemaLocation="http://www.xbrl.org/2003/linkbase http://www.xbrl.org/2003/xbrl-linkbase-2003-12-31.xsd http://www.xbrl.org/2006/ref http://www.xbrl.org/2006/ref-2006-02-27.xsd">
+<link:{link} xlink:type="extended" xlink:role="http://www.xbrl.org/2003/role/link">
+'''
+
+def generate(dir, numConcepts):
+    linkbases = ["pre.xml", "ref.xml"] + ["lab-{}.xml".format(lang) for lang in LANGS]
+    with open(os.path.join(dir, "bench.xsd"), "w") as f:
+        f.write(SCHEMA.format(ns=NS,
+                              linkbaseRefs="\n    ".join(LINKBASE_REF.format(lb) for lb in linkbases),
+                              concepts="\n  ".join(CONCEPT.format(i) for i in range(numConcepts))))
+    def loc(f, i):
+        f.write('<link:loc xlink:type="locator" xlink:href="bench.xsd#b_C{0}" xlink:label="loc_C{0}"/>\n'.format(i))
+    with open(os.path.join(dir, "pre.xml"), "w") as f:
+        f.write(LINKBASE.format(link="presentationLink"))
+        for i in range(numConcepts):
+            loc(f, i)
+            if i:
+                f.write('<link:presentationArc xlink:type="arc" xlink:arcrole="http://www.xbrl.org/2003/arcrole/parent-child" '
+                        'xlink:from="loc_C{0}" xlink:to="loc_C{1}" order="{1}"/>\n'.format((i - 1) // 10, i))
+        f.write('</link:presentationLink>\n</link:linkbase>\n')
+    for lang in LANGS:
+        with open(os.path.join(dir, "lab-{}.xml".format(lang)), "w") as f:
+            f.write(LINKBASE.format(link="labelLink"))
+            for i in range(numConcepts):
+                loc(f, i)
+                for role in LABEL_ROLES:
+                    f.write('<link:label xlink:type="resource" xlink:label="lab_C{0}" xlink:role="{1}" xml:lang="{2}" id="lab_C{0}_{3}_{2}">'
+                            'Concept {0} {3} label in {2}, long enough to be like the labels of a real taxonomy</link:label>\n'
+                            .format(i, role, lang, role.rpartition("/")[2]))
+                f.write('<link:labelArc xlink:type="arc" xlink:arcrole="http://www.xbrl.org/2003/arcrole/concept-label" '
+                        'xlink:from="loc_C{0}" xlink:to="lab_C{0}"/>\n'.format(i))
+            f.write('</link:labelLink>\n</link:linkbase>\n')
+    with open(os.path.join(dir, "ref.xml"), "w") as f:
+        f.write(LINKBASE.format(link="referenceLink"))
+        for i in range(numConcepts):
+            loc(f, i)
+            for j, role in enumerate(REFERENCE_ROLES):
+                f.write('<link:reference xlink:type="resource" xlink:label="ref_C{0}" xlink:role="{1}" id="ref_C{0}_{2}">'
+                        '<ref:Name>IAS</ref:Name><ref:Number>{2}</ref:Number><ref:IssueDate>2026-01-01</ref:IssueDate>'
+                        '<ref:Paragraph>{0}</ref:Paragraph><ref:Subparagraph>({2})</ref:Subparagraph>'
+                        '<ref:URI>http://example.com/ias/{2}#{0}</ref:URI></link:reference>\n'.format(i, role, j + 1))
+            f.write('<link:referenceArc xlink:type="arc" xlink:arcrole="http://www.xbrl.org/2003/arcrole/concept-reference" '
+                    'xlink:from="loc_C{0}" xlink:to="ref_C{0}"/>\n'.format(i))
+        f.write('</link:referenceLink>\n</link:linkbase>\n')
+
+def load(mode, entryFile):
+    # loads entryFile eagerly or lazily in this process, printing model objects, load secs, peak KB, access secs and digest
+    from arelle import Cntlr, XbrlConst
+    cntlr = Cntlr.Cntlr(logFileName="logToBuffer")
+    cntlr.webCache.workOffline = True # uses the cached xbrl.org schemas
+    cntlr.modelManager.lazyLinkbases = mode == "lazy"
+    startedAt = time.time()
+    modelXbrl = cntlr.modelManager.load(entryFile)
+    loadTime = time.time() - startedAt
+    peakKB = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss # KB on linux, bytes on macOS
+    if sys.platform == "darwin":
+        peakKB //= 1024
+    numModelObjects = len(modelXbrl.modelObjects)
+    startedAt = time.time()
+    digest = hashlib.md5()
+    concepts = sorted((c for c in modelXbrl.qnameConcepts.values() if c.modelDocument.targetNamespace == NS),
+                      key=lambda c: int(c.name[1:]))
+    for concept in concepts:
+        for lang in LANGS:
+            for role in LABEL_ROLES:
+                digest.update("{} {} {}\n".format(concept.name, lang, concept.label(role, lang=lang)).encode("utf-8"))
+    for rel in modelXbrl.relationshipSet(XbrlConst.parentChild).modelRelationships:
+        digest.update("{} {} {}\n".format(rel.fromModelObject.name, rel.toModelObject.name, rel.order).encode("utf-8"))
+    referenceRels = modelXbrl.relationshipSet(XbrlConst.conceptReference).fromModelObject
+    for concept in concepts[:10]:
+        for rel in referenceRels(concept):
+            digest.update("{} {}\n".format(concept.name, rel.toModelObject.viewText()).encode("utf-8"))
+    accessTime = time.time() - startedAt
+    print(numModelObjects, loadTime, peakKB, accessTime, digest.hexdigest())
+    modelXbrl.close()
+
+def main():
+    if len(sys.argv) > 2 and sys.argv[1] in ("eager", "lazy"):
+        load(sys.argv[1], sys.argv[2])
+        return
+    numConcepts = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    dir = tempfile.mkdtemp()
+    generate(dir, numConcepts)
+    entryFile = os.path.join(dir, "bench.xsd")
+    print("{} concepts, DTS {:.1f} MB".format(numConcepts,
+                                              sum(os.path.getsize(os.path.join(dir, f)) for f in os.listdir(dir)) / 1048576))
+    print("{:12} {:>14} {:>10} {:>12} {:>14}".format("load", "model objects", "secs", "peak MB", "access secs"))
+    digests = []
+    for mode in ("eager", "lazy"):
+        output = subprocess.check_output([sys.executable, os.path.abspath(__file__), mode, entryFile])
+        numModelObjects, loadTime, peakKB, accessTime, digest = output.decode("utf-8").split()[-5:]
+        digests.append(digest)
+        print("{:12} {:>14} {:>10.3f} {:>12.1f} {:>14.3f}".format(mode, numModelObjects, float(loadTime),
+                                                                  int(peakKB) / 1024, float(accessTime)))
+    if digests[0] != digests[1]:
+        print("labels, references or relationships differ")
+
+if __name__ == "__main__":
+    main()
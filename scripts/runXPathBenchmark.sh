@@ -0,0 +1,38 @@
+#!/bin/bash
+
+# Benchmark formula XPath evaluation throughput, compiled (the default) and interpreted (--formulaInterpretXPath),
+# by the total variable set evaluation time (--formulaVarSetTiming) of filings with formula linkbases
+
+ARELLEDIR=..
+
+LOGDIR=~/temp/xpathBenchmark
+
+RUNS=3
+
+FILINGS="$@"
+if [ -z "${FILINGS}" ]; then
+    echo "usage: runXPathBenchmark.sh filing-with-formulae.xbrl ..."
+    exit 1
+fi
+
+mkdir -p ${LOGDIR}
+
+formulaTime() {
+    # $1 filing, $2 mode option, $3 log file
+    python3 ${ARELLEDIR}/arelleCmdLine.py --file "$1" --formula run --formulaVarSetTiming $2 --internetConnectivity offline --logFile "$3" > /dev/null 2>&1
+    sed -n 's/.*Variable set .* time for [0-9]* evaluations: \([0-9.]*\).*/\1/p' "$3" | awk '{total += $1} END {printf "%.3f", total}'
+}
+
+printf "%-50s %12s %12s %8s\n" "filing" "interpreted" "compiled" "speedup"
+for FILING in ${FILINGS}; do
+    NAME=$(basename ${FILING})
+    BEST_INTERPRETED=
+    BEST_COMPILED=
+    for RUN in $(seq ${RUNS}); do
+        INTERPRETED=$(formulaTime "${FILING}" --formulaInterpretXPath ${LOGDIR}/${NAME}-interpreted-${RUN}-log.txt)
+        COMPILED=$(formulaTime "${FILING}" "" ${LOGDIR}/${NAME}-compiled-${RUN}-log.txt)
+        BEST_INTERPRETED=$(echo "${BEST_INTERPRETED:-${INTERPRETED}} ${INTERPRETED}" | awk '{print ($1 < $2) ? $1 : $2}')
+        BEST_COMPILED=$(echo "${BEST_COMPILED:-${COMPILED}} ${COMPILED}" | awk '{print ($1 < $2) ? $1 : $2}')
+    done
+    printf "%-50s %12s %12s %8s\n" ${NAME} ${BEST_INTERPRETED} ${BEST_COMPILED} $(echo "${BEST_INTERPRETED} ${BEST_COMPILED}" | awk '{printf "%.2f", ($2 > 0) ? $1 / $2 : 0}')
+done